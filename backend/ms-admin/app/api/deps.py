@@ -1,4 +1,5 @@
 from ..schemas.auth import TokenPayload, User
+from ..services.internal_client import internal_client
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
@@ -23,21 +24,20 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     """
     try:
         # Chamar o serviço de autenticação para validar o token
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{AUTH_SERVICE_URL}/api/auth/validate-token",
-                headers={"Authorization": f"Bearer {token}"}
-            )
+        response = await internal_client.get(
+            f"{AUTH_SERVICE_URL}/api/auth/validate-token",
+            headers={"Authorization": f"Bearer {token}"}
+        )
 
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Token inválido ou expirado",
-                    headers={"WWW-Authenticate": "Bearer"},
-                )
+        if response.status_code != 200:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token inválido ou expirado",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
 
-            user_data = response.json()
-            return User(**user_data)
+        user_data = response.json()
+        return User(**user_data)
 
     except (JWTError, ValidationError, httpx.RequestError):
         raise HTTPException(
@@ -3,6 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 import logging
 from datetime import datetime
 
+from .services.internal_client import internal_client, propagate_deadline
+
 # Configuração de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +35,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Propaga o deadline recebido para as chamadas aos outros microsserviços
+app.middleware("http")(propagate_deadline)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    logger.info("Shutting down MS-Admin service...")
+    await internal_client.close()
+
 # Rotas
 
 
@@ -1,4 +1,3 @@
-import httpx
 import os
 from typing import Dict, Any, List, Optional
 from datetime import datetime, date, timedelta
@@ -6,6 +5,7 @@ import asyncio
 import logging
 from ..schemas.dashboard import DashboardData, SystemMetrics, MetricCount, GrowthData
 from ..crud import system_log
+from .internal_client import internal_client
 
 # URLs dos microsserviços
 AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://ms-auth:5000")
@@ -75,14 +75,14 @@ async def get_dashboard_data(period: str = "day") -> DashboardData:
 async def get_user_metrics() -> Dict[str, int]:
     """Obtém métricas de usuários do MS-Auth"""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{AUTH_SERVICE_URL}/api/auth/metrics/users")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning(
-                    f"Erro ao obter métricas de usuários: {response.status_code}")
-                return {"total": 0, "active": 0, "premium": 0}
+        response = await internal_client.get(
+            f"{AUTH_SERVICE_URL}/api/auth/metrics/users", timeout=5.0)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.warning(
+                f"Erro ao obter métricas de usuários: {response.status_code}")
+            return {"total": 0, "active": 0, "premium": 0}
     except Exception as e:
         logger.error(f"Erro na comunicação com MS-Auth: {str(e)}")
         return {"total": 0, "active": 0, "premium": 0}
@@ -91,14 +91,14 @@ async def get_user_metrics() -> Dict[str, int]:
 async def get_study_metrics() -> Dict[str, int]:
     """Obtém métricas de estudos do MS-Study"""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{STUDY_SERVICE_URL}/api/study/metrics")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning(
-                    f"Erro ao obter métricas de estudos: {response.status_code}")
-                return {"active_plans": 0, "completed_plans": 0}
+        response = await internal_client.get(
+            f"{STUDY_SERVICE_URL}/api/study/metrics", timeout=5.0)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.warning(
+                f"Erro ao obter métricas de estudos: {response.status_code}")
+            return {"active_plans": 0, "completed_plans": 0}
     except Exception as e:
         logger.error(f"Erro na comunicação com MS-Study: {str(e)}")
         return {"active_plans": 0, "completed_plans": 0}
@@ -107,14 +107,14 @@ async def get_study_metrics() -> Dict[str, int]:
 async def get_chat_metrics() -> Dict[str, Any]:
     """Obtém métricas do chat do MS-ChatIA"""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{CHAT_SERVICE_URL}/api/chat/metrics")
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning(
-                    f"Erro ao obter métricas do chat: {response.status_code}")
-                return {"messages_today": 0, "average_per_user": 0}
+        response = await internal_client.get(
+            f"{CHAT_SERVICE_URL}/api/chat/metrics", timeout=5.0)
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.warning(
+                f"Erro ao obter métricas do chat: {response.status_code}")
+            return {"messages_today": 0, "average_per_user": 0}
     except Exception as e:
         logger.error(f"Erro na comunicação com MS-ChatIA: {str(e)}")
         return {"messages_today": 0, "average_per_user": 0}
@@ -123,15 +123,15 @@ async def get_chat_metrics() -> Dict[str, Any]:
 async def get_bible_metrics() -> int:
     """Obtém métricas da Bíblia do MS-Bible"""
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{BIBLE_SERVICE_URL}/api/bible/metrics/views")
-            if response.status_code == 200:
-                data = response.json()
-                return data.get("total_views", 0)
-            else:
-                logger.warning(
-                    f"Erro ao obter métricas da Bíblia: {response.status_code}")
-                return 0
+        response = await internal_client.get(
+            f"{BIBLE_SERVICE_URL}/api/bible/metrics/views", timeout=5.0)
+        if response.status_code == 200:
+            data = response.json()
+            return data.get("total_views", 0)
+        else:
+            logger.warning(
+                f"Erro ao obter métricas da Bíblia: {response.status_code}")
+            return 0
     except Exception as e:
         logger.error(f"Erro na comunicação com MS-Bible: {str(e)}")
         return 0
@@ -151,9 +151,9 @@ async def get_system_health() -> str:
 
     for name, url in services:
         try:
-            async with httpx.AsyncClient(timeout=2.0) as client:
-                response = await client.get(f"{url}/health")
-                services_status.append(response.status_code == 200)
+            response = await internal_client.get(
+                f"{url}/health", timeout=2.0, idempotent=False)
+            services_status.append(response.status_code == 200)
         except Exception:
             services_status.append(False)
 
@@ -1,11 +1,14 @@
-import httpx
+import asyncio
 import os
 from typing import Dict, Any, List, Optional
 import logging
 from ..schemas.auth import User
+from .internal_client import internal_client
 
 # URL do microsserviço de autenticação
 AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://ms-auth:5000")
+STUDY_SERVICE_URL = os.getenv("STUDY_SERVICE_URL", "http://ms-study:5000")
+CHAT_SERVICE_URL = os.getenv("CHAT_SERVICE_URL", "http://ms-chatia:5000")
 
 logger = logging.getLogger("ms-admin")
 
@@ -51,23 +54,23 @@ async def get_users(
             params["is_premium"] = "true" if is_premium else "false"
 
         # Realiza a chamada ao MS-Auth
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{AUTH_SERVICE_URL}/api/auth/admin/users",
-                params=params
-            )
-
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning(
-                    f"Erro ao obter usuários do MS-Auth: {response.status_code}")
-                return {
-                    "items": [],
-                    "total": 0,
-                    "page": 1,
-                    "size": limit
-                }
+        response = await internal_client.get(
+            f"{AUTH_SERVICE_URL}/api/auth/admin/users",
+            params=params,
+            timeout=10.0
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.warning(
+                f"Erro ao obter usuários do MS-Auth: {response.status_code}")
+            return {
+                "items": [],
+                "total": 0,
+                "page": 1,
+                "size": limit
+            }
     except Exception as e:
         logger.error(f"Erro na comunicação com MS-Auth: {str(e)}")
         return {
@@ -89,17 +92,17 @@ async def get_user_details(user_id: str) -> Optional[Dict[str, Any]]:
         Dados do usuário ou None se não encontrado
     """
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f"{AUTH_SERVICE_URL}/api/auth/admin/users/{user_id}"
-            )
-
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.warning(
-                    f"Erro ao obter detalhes do usuário {user_id}: {response.status_code}")
-                return None
+        response = await internal_client.get(
+            f"{AUTH_SERVICE_URL}/api/auth/admin/users/{user_id}",
+            timeout=5.0
+        )
+
+        if response.status_code == 200:
+            return response.json()
+        else:
+            logger.warning(
+                f"Erro ao obter detalhes do usuário {user_id}: {response.status_code}")
+            return None
     except Exception as e:
         logger.error(
             f"Erro na comunicação com MS-Auth para usuário {user_id}: {str(e)}")
@@ -118,13 +121,13 @@ async def block_user(user_id: str, blocked: bool) -> bool:
         True se a operação foi bem-sucedida
     """
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.patch(
-                f"{AUTH_SERVICE_URL}/api/auth/admin/users/{user_id}/block",
-                json={"blocked": blocked}
-            )
+        response = await internal_client.patch(
+            f"{AUTH_SERVICE_URL}/api/auth/admin/users/{user_id}/block",
+            json={"blocked": blocked},
+            timeout=5.0
+        )
 
-            return response.status_code == 200
+        return response.status_code == 200
     except Exception as e:
         logger.error(
             f"Erro ao {('bloquear' if blocked else 'desbloquear')} usuário {user_id}: {str(e)}")
@@ -144,16 +147,16 @@ async def add_user_note(user_id: str, note: str, author_id: str) -> bool:
         True se a operação foi bem-sucedida
     """
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.post(
-                f"{AUTH_SERVICE_URL}/api/auth/admin/users/{user_id}/notes",
-                json={
-                    "text": note,
-                    "author_id": author_id
-                }
-            )
-
-            return response.status_code == 201
+        response = await internal_client.post(
+            f"{AUTH_SERVICE_URL}/api/auth/admin/users/{user_id}/notes",
+            json={
+                "text": note,
+                "author_id": author_id
+            },
+            timeout=5.0
+        )
+
+        return response.status_code == 201
     except Exception as e:
         logger.error(f"Erro ao adicionar nota ao usuário {user_id}: {str(e)}")
         return False
@@ -172,34 +175,33 @@ async def get_user_activity(user_id: str) -> Dict[str, Any]:
     # Constrói os dados de atividade consultando diferentes microsserviços
     try:
         # Coleta dados de forma paralela
-        async with httpx.AsyncClient(timeout=5.0) as client:
+        login_response, study_response, chat_response = await asyncio.gather(
             # Dados de login
-            login_task = client.get(
-                f"{AUTH_SERVICE_URL}/api/auth/admin/users/{user_id}/activity")
+            internal_client.get(
+                f"{AUTH_SERVICE_URL}/api/auth/admin/users/{user_id}/activity",
+                timeout=5.0),
             # Dados de estudo
-            study_task = client.get(
-                f"{STUDY_SERVICE_URL}/api/study/admin/user/{user_id}/activity")
+            internal_client.get(
+                f"{STUDY_SERVICE_URL}/api/study/admin/user/{user_id}/activity",
+                timeout=5.0),
             # Dados de chat
-            chat_task = client.get(
-                f"{CHAT_SERVICE_URL}/api/chat/admin/user/{user_id}/activity")
+            internal_client.get(
+                f"{CHAT_SERVICE_URL}/api/chat/admin/user/{user_id}/activity",
+                timeout=5.0),
+        )
 
-            # Executa as chamadas
-            login_response = await login_task
-            study_response = await study_task
-            chat_response = await chat_task
+        # Processa as respostas
+        login_data = login_response.json() if login_response.status_code == 200 else {}
+        study_data = study_response.json() if study_response.status_code == 200 else {}
+        chat_data = chat_response.json() if chat_response.status_code == 200 else {}
 
-            # Processa as respostas
-            login_data = login_response.json() if login_response.status_code == 200 else {}
-            study_data = study_response.json() if study_response.status_code == 200 else {}
-            chat_data = chat_response.json() if chat_response.status_code == 200 else {}
-
-            # Combina os dados
-            return {
-                "login_activity": login_data,
-                "study_activity": study_data,
-                "chat_activity": chat_data,
-                "last_seen": login_data.get("last_login_at")
-            }
+        # Combina os dados
+        return {
+            "login_activity": login_data,
+            "study_activity": study_data,
+            "chat_activity": chat_data,
+            "last_seen": login_data.get("last_login_at")
+        }
     except Exception as e:
         logger.error(f"Erro ao obter atividade do usuário {user_id}: {str(e)}")
         return {
@@ -1,6 +1,9 @@
 from app.db.session import create_tables
 from app.api.api import api_router
-from fastapi import FastAPI
+from app.services.internal_client import (
+    internal_client, propagate_deadline, require_internal_caller
+)
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
 from datetime import datetime
@@ -47,6 +50,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Propaga o deadline recebido para as chamadas aos outros microsserviços
+app.middleware("http")(propagate_deadline)
+
 # Importar e incluir as rotas da API
 app.include_router(api_router, prefix="/api/admin")
 
@@ -81,8 +87,14 @@ def startup_event():
 
 
 @app.on_event("shutdown")
-def shutdown_event():
+async def shutdown_event():
     logger.info("Shutting down MS-Admin service...")
+    await internal_client.close()
+
+@app.get("/metrics/internal-http", tags=["healthcheck"],
+         dependencies=[Depends(require_internal_caller)])
+def internal_http_metrics():
+    return internal_client.get_metrics()
 
 # Rota raiz para informações da API
 
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz ao PYTHONPATH
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
@@ -7,7 +7,7 @@ from app.domain.auth.service import AuthService
 from app.core.dependencies import get_auth_service, get_current_user_id
 from app.infrastructure.database import get_db
 from app.core.config import get_settings
-import httpx
+from app.infrastructure.internal_client import internal_client
 import json
 import logging
 from datetime import datetime, timedelta
@@ -162,53 +162,52 @@ async def create_user_preferences(
         # Forward preferences to MS-Study service
         if settings.ms_study_url:
             try:
-                async with httpx.AsyncClient(timeout=10.0) as client:
-                    # Include user information with preferences
-                    payload = {
-                        "user_id": user_id,
-                        "name": user.name,
-                        "email": user.email,
-                        "objectives": preferences.objectives,
-                        "bible_experience_level": preferences.bible_experience_level,
-                        "content_preferences": preferences.content_preferences,
-                        "preferred_time": preferences.preferred_time,
-                        "onboarding_completed": preferences.onboarding_completed
-                    }
-
-                    # Enviar preferências para o MS-Study
+                # Include user information with preferences
+                payload = {
+                    "user_id": user_id,
+                    "name": user.name,
+                    "email": user.email,
+                    "objectives": preferences.objectives,
+                    "bible_experience_level": preferences.bible_experience_level,
+                    "content_preferences": preferences.content_preferences,
+                    "preferred_time": preferences.preferred_time,
+                    "onboarding_completed": preferences.onboarding_completed
+                }
+
+                # Enviar preferências para o MS-Study
+                logger.info(
+                    f"Sending preferences to MS-Study for user {user_id}")
+                response = await internal_client.post(
+                    f"{settings.ms_study_url}/api/v1/study/preferences",
+                    json=payload,
+                    headers={
+                        "Authorization": f"Bearer {settings.service_api_key}"}
+                )
+
+                if response.status_code in (200, 201):
                     logger.info(
-                        f"Sending preferences to MS-Study for user {user_id}")
-                    response = await client.post(
-                        f"{settings.ms_study_url}/api/v1/study/preferences",
-                        json=payload,
-                        headers={
-                            "Authorization": f"Bearer {settings.service_api_key}"}
-                    )
+                        f"Successfully sent preferences to MS-Study for user {user_id}")
 
-                    if response.status_code in (200, 201):
+                    # Se o onboarding estiver completo, gerar plano de estudo
+                    if preferences.onboarding_completed:
                         logger.info(
-                            f"Successfully sent preferences to MS-Study for user {user_id}")
+                            f"Initiating study plan generation for user {user_id}")
+                        plan_response = await internal_client.post(
+                            f"{settings.ms_study_url}/api/v1/study/init-plan",
+                            json=payload,
+                            headers={
+                                "Authorization": f"Bearer {settings.service_api_key}"}
+                        )
 
-                        # Se o onboarding estiver completo, gerar plano de estudo
-                        if preferences.onboarding_completed:
+                        if plan_response.status_code == 201:
                             logger.info(
-                                f"Initiating study plan generation for user {user_id}")
-                            plan_response = await client.post(
-                                f"{settings.ms_study_url}/api/v1/study/init-plan",
-                                json=payload,
-                                headers={
-                                    "Authorization": f"Bearer {settings.service_api_key}"}
-                            )
-
-                            if plan_response.status_code == 201:
-                                logger.info(
-                                    f"Successfully generated study plan for user {user_id}")
-                            else:
-                                logger.error(
-                                    f"Failed to generate study plan: {plan_response.status_code} - {plan_response.text}")
-                    else:
-                        logger.error(
-                            f"Failed to send preferences to MS-Study: {response.status_code} - {response.text}")
+                                f"Successfully generated study plan for user {user_id}")
+                        else:
+                            logger.error(
+                                f"Failed to generate study plan: {plan_response.status_code} - {plan_response.text}")
+                else:
+                    logger.error(
+                        f"Failed to send preferences to MS-Study: {response.status_code} - {response.text}")
             except Exception as e:
                 logger.error(f"Error communicating with MS-Study: {str(e)}")
                 # Não falhar a requisição se a comunicação com MS-Study falhar
@@ -30,6 +30,15 @@ class Settings(BaseSettings):
     ms_study_url: str = Field(default="http://ms-study:8004")
     service_api_key: str = Field(default="internal_service_key")
 
+    # Shared internal HTTP client (connection pools per target service)
+    internal_http_timeout: float = Field(default=10.0)
+    internal_http_max_connections: int = Field(default=50)
+    internal_http_max_keepalive: int = Field(default=20)
+    internal_http_retries: int = Field(default=2)
+    internal_http2: bool = Field(default=False)
+    # Largest deadline accepted in the X-Request-Deadline header (seconds)
+    internal_http_max_deadline: float = Field(default=60.0)
+
     # Pydantic V2 configuration
     model_config = SettingsConfigDict(
         env_file=".env",
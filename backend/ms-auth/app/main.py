@@ -1,10 +1,13 @@
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, RedirectResponse
 import os
 from .api.v1.auth.routes import router as auth_router
 from .core.config import get_settings
 from .infrastructure.db_init import init_db
+from .infrastructure.internal_client import (
+    internal_client, propagate_deadline, require_internal_caller
+)
 import logging
 
 # Configurar logging
@@ -64,6 +67,9 @@ async def content_type_middleware(request: Request, call_next):
     response = await call_next(request)
     return response
 
+# Propagate the caller's deadline to outgoing inter-service calls
+app.middleware("http")(propagate_deadline)
+
 # Include routers
 app.include_router(auth_router, prefix="/api/v1/auth")
 
@@ -97,3 +103,20 @@ def startup_event():
     """Initialize the database on startup."""
     init_db()
     logger.info("MS-Auth service started and database initialized")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close the shared inter-service HTTP connection pools."""
+    await internal_client.close()
+    logger.info("MS-Auth internal HTTP client closed")
+
+
+@app.get("/api/v1/auth/metrics/internal-http",
+         dependencies=[Depends(require_internal_caller)])
+def internal_http_metrics():
+    """
+    Latency metrics of outgoing inter-service calls, per target service.
+    Restricted to internal callers (X-Internal-Key header).
+    """
+    return internal_client.get_metrics()
@@ -0,0 +1,294 @@
+"""
+Testes unitários do cliente HTTP interno.
+
+Cobre o pool por destino, os retries de chamadas idempotentes, a
+propagação do deadline (aceito só de chamadores internos), a proteção das
+rotas internas e as métricas por destino. As respostas vêm de um
+`httpx.MockTransport`; nenhum serviço é chamado.
+"""
+import time
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.infrastructure import internal_client as internal_client_module
+from app.infrastructure.internal_client import (
+    DEADLINE_HEADER, INTERNAL_KEY_HEADER, InternalClient, TargetMetrics,
+    deadline, get_deadline, propagate_deadline, require_internal_caller
+)
+
+TARGET = "http://ms-auth:5000"
+SERVICE_KEY = "chave-de-teste"
+
+
+def mock_client(handler, **kwargs) -> InternalClient:
+    """Cliente interno cujo pool do destino responde com `handler`."""
+    client = InternalClient(backoff=0, **kwargs)
+    client._clients[TARGET] = httpx.AsyncClient(
+        base_url=TARGET, transport=httpx.MockTransport(handler))
+    client._metrics[TARGET] = TargetMetrics()
+    return client
+
+
+def responses(*status_codes):
+    """Handler que responde os códigos em sequência e guarda as requisições."""
+    codes = list(status_codes)
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(codes.pop(0))
+
+    return handler, seen
+
+
+@pytest.mark.unit
+class TestPool:
+    """Testes do pool de conexões por destino."""
+
+    @pytest.mark.asyncio
+    async def test_one_client_per_target(self):
+        """Testa se cada origem tem um único AsyncClient reaproveitado."""
+        client = InternalClient()
+
+        auth = client._client_for(TARGET)
+        assert client._client_for(TARGET) is auth
+        assert client._client_for("http://ms-bible:8000") is not auth
+
+        await client.close()
+        assert client._clients == {}
+        assert auth.is_closed
+
+    @pytest.mark.asyncio
+    async def test_request_uses_target_pool(self):
+        """Testa se a URL absoluta é enviada ao pool do destino."""
+        handler, seen = responses(200)
+        client = mock_client(handler)
+
+        response = await client.get(f"{TARGET}/api/users/1?full=1")
+
+        assert response.status_code == 200
+        assert str(seen[0].url) == f"{TARGET}/api/users/1?full=1"
+        await client.close()
+
+
+@pytest.mark.unit
+class TestRetries:
+    """Testes das novas tentativas."""
+
+    @pytest.mark.asyncio
+    async def test_idempotent_call_is_retried(self):
+        """Testa se um GET com 503 é repetido até dar certo."""
+        handler, seen = responses(503, 502, 200)
+        client = mock_client(handler, retries=2)
+
+        response = await client.get(f"{TARGET}/health")
+
+        assert response.status_code == 200
+        assert len(seen) == 3
+        assert client.get_metrics()[TARGET]["retries"] == 2
+        assert client.get_metrics()[TARGET]["errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_last_failure_is_returned(self):
+        """Testa se, esgotadas as tentativas, a última resposta é retornada."""
+        handler, seen = responses(503, 503)
+        client = mock_client(handler, retries=1)
+
+        response = await client.get(f"{TARGET}/health")
+
+        assert response.status_code == 503
+        assert len(seen) == 2
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried(self):
+        """Testa se métodos não idempotentes não são repetidos."""
+        handler, seen = responses(503, 200)
+        client = mock_client(handler, retries=2)
+
+        response = await client.post(f"{TARGET}/api/messages", json={"a": 1})
+
+        assert response.status_code == 503
+        assert len(seen) == 1
+
+    @pytest.mark.asyncio
+    async def test_transport_error_is_raised_after_retries(self):
+        """Testa o erro de conexão repetido em todas as tentativas."""
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            raise httpx.ConnectError("recusada", request=request)
+
+        client = mock_client(handler, retries=2)
+
+        with pytest.raises(httpx.ConnectError):
+            await client.get(f"{TARGET}/health")
+        assert len(attempts) == 3
+        assert client.get_metrics()[TARGET]["errors"] == 3
+
+
+@pytest.mark.unit
+class TestDeadline:
+    """Testes da propagação do deadline."""
+
+    @pytest.mark.asyncio
+    async def test_deadline_header_is_sent(self):
+        """Testa se o deadline atual segue no header da chamada."""
+        handler, seen = responses(200)
+        client = mock_client(handler)
+
+        with deadline(5) as target:
+            await client.get(f"{TARGET}/health")
+
+        assert float(seen[0].headers[DEADLINE_HEADER]) == target
+
+    @pytest.mark.asyncio
+    async def test_default_deadline_from_timeout(self):
+        """Testa o deadline derivado do timeout quando não há um atual."""
+        handler, seen = responses(200)
+        client = mock_client(handler)
+
+        before = time.time()
+        await client.get(f"{TARGET}/health", timeout=3)
+
+        sent = float(seen[0].headers[DEADLINE_HEADER])
+        assert before + 3 <= sent <= time.time() + 3
+
+    def test_shorter_deadline_is_kept(self):
+        """Testa se um bloco interno não estende o deadline do chamador."""
+        with deadline(1) as outer:
+            with deadline(60) as inner:
+                assert inner == outer
+            with deadline(0.5) as shorter:
+                assert shorter < outer
+        assert get_deadline() is None
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_is_not_called(self):
+        """Testa se a chamada com o deadline vencido nem é enviada."""
+        handler, seen = responses(200)
+        client = mock_client(handler)
+
+        with deadline(-1):
+            with pytest.raises(httpx.TimeoutException):
+                await client.get(f"{TARGET}/health")
+        assert seen == []
+
+    @pytest.mark.asyncio
+    async def test_service_key_header_is_sent(self):
+        """Testa se a chave de serviço segue nas chamadas internas."""
+        handler, seen = responses(200)
+        client = mock_client(handler, service_key=SERVICE_KEY)
+
+        await client.get(f"{TARGET}/health")
+
+        assert seen[0].headers[INTERNAL_KEY_HEADER] == SERVICE_KEY
+
+
+@pytest.fixture
+def service_client(monkeypatch):
+    """Substitui o cliente do módulo por um com chave de serviço conhecida."""
+    client = InternalClient(service_key=SERVICE_KEY, max_deadline=30)
+    monkeypatch.setattr(internal_client_module, "internal_client", client)
+    return client
+
+
+@pytest.mark.unit
+class TestAcceptDeadline:
+    """Testes da validação do deadline recebido."""
+
+    def headers(self, value, key=SERVICE_KEY):
+        headers = {DEADLINE_HEADER: value}
+        if key is not None:
+            headers[INTERNAL_KEY_HEADER] = key
+        return headers
+
+    def test_internal_deadline_is_accepted(self, service_client):
+        """Testa o deadline de um chamador interno dentro do limite."""
+        target = time.time() + 5
+        assert service_client.accept_deadline(self.headers(str(target))) == target
+
+    @pytest.mark.parametrize("key", [None, "", "chave-errada"])
+    def test_external_deadline_is_ignored(self, service_client, key):
+        """Testa se o header é ignorado sem a chave de serviço correta."""
+        value = str(time.time() + 5)
+        assert service_client.accept_deadline(self.headers(value, key)) is None
+
+    def test_no_service_key_accepts_nothing(self):
+        """Testa se, sem chave configurada, nenhum chamador é interno."""
+        client = InternalClient()
+        value = str(time.time() + 5)
+        assert client.accept_deadline(self.headers(value, "")) is None
+        assert not client.is_internal({INTERNAL_KEY_HEADER: ""})
+
+    @pytest.mark.parametrize("value", ["x", "nan", "inf", "-inf", "123.5"])
+    def test_invalid_deadline_is_ignored(self, service_client, value):
+        """Testa valores não numéricos, infinitos e vencidos."""
+        assert service_client.accept_deadline(self.headers(value)) is None
+
+    def test_deadline_is_clamped(self, service_client):
+        """Testa se um deadline distante é limitado a `max_deadline`."""
+        before = time.time()
+        accepted = service_client.accept_deadline(self.headers(str(before + 3600)))
+        assert before + 30 <= accepted <= time.time() + 30
+
+
+@pytest.mark.unit
+class TestInternalRoutes:
+    """Testes do middleware e da dependência de chamador interno."""
+
+    @pytest.fixture
+    def app(self, service_client):
+        app = FastAPI()
+        app.middleware("http")(propagate_deadline)
+
+        @app.get("/deadline")
+        async def read_deadline():
+            return {"deadline": get_deadline()}
+
+        @app.get("/internal", dependencies=[Depends(require_internal_caller)])
+        async def internal_route():
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_middleware_propagates_internal_deadline(self, app):
+        """Testa se o deadline de um chamador interno vale durante a requisição."""
+        target = time.time() + 5
+        headers = {DEADLINE_HEADER: str(target), INTERNAL_KEY_HEADER: SERVICE_KEY}
+
+        assert app.get("/deadline", headers=headers).json() == {"deadline": target}
+        assert app.get("/deadline").json() == {"deadline": None}
+
+    def test_middleware_ignores_external_deadline(self, app):
+        """Testa se um chamador externo não consegue definir o deadline."""
+        headers = {DEADLINE_HEADER: str(time.time() + 5)}
+        assert app.get("/deadline", headers=headers).json() == {"deadline": None}
+
+    def test_internal_route_requires_service_key(self, app):
+        """Testa se a rota interna recusa chamadores sem a chave de serviço."""
+        assert app.get("/internal").status_code == 403
+        assert app.get("/internal", headers={INTERNAL_KEY_HEADER: "x"}).status_code == 403
+        assert app.get(
+            "/internal", headers={INTERNAL_KEY_HEADER: SERVICE_KEY}).json() == {"ok": True}
+
+
+@pytest.mark.unit
+class TestMetrics:
+    """Testes das métricas por destino."""
+
+    def test_to_dict(self):
+        """Testa a média, o máximo e os erros acumulados."""
+        metrics = TargetMetrics()
+        metrics.observe(10.0, error=False)
+        metrics.observe(30.0, error=True)
+
+        assert metrics.to_dict() == {
+            "requests": 2, "errors": 1, "retries": 0, "avg_ms": 20.0, "max_ms": 30.0}
+
+    def test_empty(self):
+        """Testa as métricas de um destino sem chamadas."""
+        assert TargetMetrics().to_dict()["avg_ms"] == 0.0
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .routes import books, chapters, verses, search, random_verse, verse_of_day
+from .routes import books, chapters, verses, search, random_verse, verse_of_day, references
 
 api_router = APIRouter()
 
@@ -7,6 +7,7 @@ api_router.include_router(books.router, prefix="/books", tags=["books"])
 api_router.include_router(
     chapters.router, prefix="/chapters", tags=["chapters"])
 api_router.include_router(verses.router, prefix="/verses", tags=["verses"])
+api_router.include_router(references.router, tags=["verses"])
 api_router.include_router(search.router, prefix="/search", tags=["search"])
 api_router.include_router(
     random_verse.router, prefix="/random-verse", tags=["random-verse"])
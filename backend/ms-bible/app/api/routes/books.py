@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
+from fastapi import APIRouter, Depends, Query, Path, HTTPException, Request, Response, status
 from typing import Optional
 
 from app.services.bible_service import BibleService
+from app.services.catalog_cache import catalog_cache
+from app.services.verse_store import get_verse_store
 from app.schemas.bible import Book, BooksResponse, ChaptersResponse
 from app.api.deps import get_current_user
 
@@ -10,6 +12,8 @@ router = APIRouter()
 
 @router.get("/", response_model=BooksResponse)
 async def get_books(
+    request: Request,
+    response: Response,
     testament: Optional[str] = Query(
         None, description="Filter by testament ('old' or 'new')"),
     current_user: Optional[dict] = Depends(get_current_user)
@@ -18,8 +22,16 @@ async def get_books(
     Get a list of all Bible books.
 
     This endpoint returns all books in the Bible, optionally filtered by testament.
+    Served pre-serialized with a translation-aware ETag for revalidation;
+    responses built without the verse store are never cached.
     No authentication is required for this endpoint.
     """
+    store = get_verse_store()
+    if store is not None and testament in (None, "old", "new"):
+        return await catalog_cache.respond(
+            request, store, f"books:{testament or 'all'}", BooksResponse,
+            lambda: BibleService.get_books(testament=testament))
+    response.headers["Cache-Control"] = "no-store"
     return await BibleService.get_books(testament=testament)
 
 
@@ -39,6 +51,8 @@ async def get_book(
 
 @router.get("/{book_id}/chapters", response_model=ChaptersResponse)
 async def get_book_chapters(
+    request: Request,
+    response: Response,
     book_id: int = Path(...,
                         description="The ID of the book to retrieve chapters for"),
     current_user: Optional[dict] = Depends(get_current_user)
@@ -47,6 +61,14 @@ async def get_book_chapters(
     Get all chapters for a specific Bible book.
 
     This endpoint returns a list of all chapters in a book.
+    Served pre-serialized with a translation-aware ETag for revalidation;
+    responses built without the verse store are never cached.
     No authentication is required for this endpoint.
     """
+    store = get_verse_store()
+    if store is not None:
+        return await catalog_cache.respond(
+            request, store, f"chapters:{book_id}", ChaptersResponse,
+            lambda: BibleService.get_chapters(book_id))
+    response.headers["Cache-Control"] = "no-store"
     return await BibleService.get_chapters(book_id)
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, Path, HTTPException, status
+from fastapi import APIRouter, Depends, Path, HTTPException, Request, Response, status
 from typing import Optional
+from sqlalchemy.orm import Session
 
+from app.infrastructure.database import get_db
 from app.services.bible_service import BibleService
-from app.schemas.bible import VersesResponse
-from app.api.deps import get_current_user
+from app.services.catalog_cache import catalog_cache
+from app.services.verse_store import get_verse_store
+from app.schemas.bible import VersesResponse, ChapterFavoritesResponse
+from app.api.deps import get_current_user, get_current_active_user
 
 router = APIRouter()
 
 
 @router.get("/{chapter_id}/verses", response_model=VersesResponse)
 async def get_chapter_verses(
+    request: Request,
+    response: Response,
     chapter_id: int = Path(...,
                            description="The ID of the chapter to retrieve verses for"),
     current_user: Optional[dict] = Depends(get_current_user)
@@ -18,6 +24,34 @@ async def get_chapter_verses(
     Get all verses for a specific Bible chapter.
 
     This endpoint returns a list of all verses in a chapter.
+    Served pre-serialized with a translation-aware ETag for revalidation;
+    responses built without the verse store are never cached.
     No authentication is required for this endpoint.
     """
+    store = get_verse_store()
+    if store is not None:
+        return await catalog_cache.respond(
+            request, store, f"verses:{chapter_id}", VersesResponse,
+            lambda: BibleService.get_verses(chapter_id))
+    response.headers["Cache-Control"] = "no-store"
     return await BibleService.get_verses(chapter_id)
+
+
+@router.get("/{chapter_id}/favorites", response_model=ChapterFavoritesResponse)
+def get_chapter_favorites(
+    chapter_id: int = Path(...,
+                           description="The ID of the chapter to check favorites for"),
+    current_user: dict = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the current user's favorite verses in a chapter.
+
+    Returns the IDs of the chapter's verses marked as favorite, answered
+    with a single lookup in the user's cached favorites set.
+    Authentication is required for this endpoint.
+    """
+    return ChapterFavoritesResponse(
+        chapter_id=chapter_id,
+        verse_ids=BibleService(db).get_chapter_favorites(current_user["id"], chapter_id)
+    )
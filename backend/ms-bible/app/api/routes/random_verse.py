@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import Optional
+from sqlalchemy.orm import Session
 
-from app.services.bible_service import BibleService
+from app.infrastructure.database import get_db
+from app.services.daily_verse import DailyVerseService
 from app.schemas.bible import VerseDetail
 from app.api.deps import get_current_user
 
@@ -9,13 +11,25 @@ router = APIRouter()
 
 
 @router.get("/", response_model=VerseDetail)
-async def get_random_verse(
-    current_user: Optional[dict] = Depends(get_current_user)
+def get_random_verse(
+    response: Response,
+    current_user: Optional[dict] = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Get a random verse from the Bible.
 
-    This endpoint returns a randomly selected verse from the Bible.
+    This endpoint returns a verse drawn uniformly among all verses of the
+    Bible, so every verse is equally likely.
     No authentication is required for this endpoint.
     """
-    return await BibleService.get_random_verse()
+    try:
+        verse = DailyVerseService(db).get_random_verse()
+    except LookupError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Verse not available"
+        )
+
+    response.headers["Cache-Control"] = "no-store"
+    return verse
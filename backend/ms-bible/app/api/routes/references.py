@@ -0,0 +1,120 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from sqlalchemy.orm import Session
+
+from app.infrastructure.database import get_db
+from app.services.reference_parser import (
+    BOOK_NAMES,
+    MAX_REFERENCES,
+    get_reference_resolver,
+    parse_references,
+)
+from app.services.daily_verse import DailyVerseService
+from app.services.related_verses import get_related_verses
+from app.services.verse_store import get_verse_store
+from app.schemas.bible_schemas import (
+    ReferenceResolveRequest,
+    ReferenceResolveResponse,
+    ResolvedReference,
+    ResolvedVerse,
+)
+from app.schemas.bible import RelatedTextRequest, RelatedVerse, RelatedVersesResponse
+from app.api.deps import get_current_user
+
+router = APIRouter()
+
+
+@router.post("/verses:resolve", response_model=ReferenceResolveResponse)
+def resolve_references(
+    request: ReferenceResolveRequest,
+    current_user: Optional[dict] = Depends(get_current_user)
+):
+    """
+    Resolve Bible references to verses in a single call.
+
+    Accepts a list of references ("Jo 3:16-18; Sl 23", "1 Coríntios 13.4,7")
+    and/or a free text (e.g. an AI answer) whose references are extracted.
+    Book names and abbreviations are matched in pt-BR, ignoring accents.
+    Each passage is returned with its canonical label and verses, capped per
+    passage; `unparsed` lists the inputs where no reference was recognized.
+    No authentication is required for this endpoint.
+    """
+    store = get_verse_store()
+    if store is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Verse store not loaded"
+        )
+
+    references = []
+    unparsed = []
+    for value in request.references:
+        parsed = parse_references(value)
+        if not parsed:
+            unparsed.append(value)
+        references.extend(parsed)
+    if request.text:
+        references.extend(parse_references(request.text))
+
+    if len(references) > MAX_REFERENCES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_REFERENCES} references per request"
+        )
+
+    resolver = get_reference_resolver(store)
+    items = []
+    for reference in references:
+        verses = resolver.verses(reference)
+        book = store.book(resolver.book_rows[reference.book]) if verses is not None else None
+        items.append(ResolvedReference(
+            source=reference.source,
+            reference=reference.label,
+            book_id=book["id"] if book else None,
+            book_name=book["name"] if book else BOOK_NAMES[reference.book],
+            chapter=reference.chapter,
+            verse=reference.verse,
+            chapter_end=reference.chapter_end,
+            verse_end=reference.verse_end,
+            found=bool(verses),
+            verses=[
+                ResolvedVerse(
+                    id=verse["id"],
+                    chapter_id=verse["chapter_id"],
+                    chapter_number=verse["chapter_number"],
+                    number=verse["number"],
+                    text=verse["text"] if request.include_text else None
+                )
+                for verse in verses or []
+            ]
+        ))
+    return ReferenceResolveResponse(items=items, unparsed=unparsed)
+
+
+@router.post("/verses:related", response_model=RelatedVersesResponse)
+def find_related_verses(
+    request: RelatedTextRequest,
+    current_user: Optional[dict] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Find the verses most related by content to a free text.
+
+    The text (e.g. a user question) is projected onto the same LSA space as
+    the precomputed verse neighbors, so related passages can ground an
+    answer without any generation. No authentication is required.
+    """
+    related = get_related_verses()
+    if related is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Related verses not built"
+        )
+
+    service = DailyVerseService(db)
+    items = []
+    for verse_id, score in related.for_text(request.text, request.limit):
+        verse = service.get_verse_by_id(verse_id)
+        if verse is not None:
+            items.append(RelatedVerse(verse=verse, score=round(score, 4)))
+    return RelatedVersesResponse(items=items)
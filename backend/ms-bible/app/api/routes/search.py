@@ -1,26 +1,41 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, status
 from typing import Optional
+from sqlalchemy.orm import Session
 
-from app.services.bible_service import BibleService
-from app.schemas.bible import SearchResponse
+from app.infrastructure.database import get_db
+from app.services.search_service import VerseSearchService
+from app.services.verse_index import get_verse_index
+from app.schemas.bible_schemas import VerseSearchResponse
 from app.api.deps import get_current_user
 
 router = APIRouter()
 
 
-@router.get("/", response_model=SearchResponse)
-async def search_bible(
+@router.get("/", response_model=VerseSearchResponse)
+def search_bible(
     q: str = Query(..., min_length=2, description="Search query"),
     testament: Optional[str] = Query(
         None, description="Filter by testament ('old' or 'new')"),
     book_id: Optional[int] = Query(None, description="Filter by book ID"),
-    current_user: Optional[dict] = Depends(get_current_user)
+    phrase: bool = Query(
+        False, description="Match the whole query as an exact phrase"),
+    fuzzy: bool = Query(
+        True, description="Tolerate typos in the query words"),
+    limit: int = Query(20, ge=1, le=100, description="Results per page"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor returned by the previous page"),
+    current_user: Optional[dict] = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Search the Bible for a specific text.
 
-    This endpoint allows searching the Bible for specific words or phrases,
-    optionally filtered by testament or book.
+    Results are ranked by relevance, ignoring accents and plural forms.
+    Supports "quoted phrases", `OR` and `prefix*` in the query, optional
+    testament or book filters and cursor pagination. With `fuzzy`, misspelled
+    words also match their closest spellings; `suggestion` carries the
+    corrected query ("did you mean"). Served from the
+    in-memory index when it is loaded, otherwise from Postgres.
     No authentication is required for this endpoint.
     """
     if not q or len(q.strip()) < 2:
@@ -29,8 +44,30 @@ async def search_bible(
             detail="Search query must be at least 2 characters long"
         )
 
-    return await BibleService.search_bible(
-        query=q,
-        testament=testament,
-        book_id=book_id
-    )
+    try:
+        # Índice em memória quando carregado; Postgres como alternativa
+        index = get_verse_index()
+        if index is not None:
+            return index.search(
+                query=q,
+                testament=testament,
+                book_id=book_id,
+                limit=limit,
+                cursor=cursor,
+                phrase=phrase,
+                fuzzy=fuzzy
+            )
+        return VerseSearchService(db).search(
+            query=q,
+            testament=testament,
+            book_id=book_id,
+            limit=limit,
+            cursor=cursor,
+            phrase=phrase,
+            fuzzy=fuzzy
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
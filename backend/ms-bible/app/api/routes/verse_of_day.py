@@ -1,7 +1,10 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from typing import Optional
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
 
-from app.services.bible_service import BibleService
+from app.infrastructure.database import get_db
+from app.services.daily_verse import DailyVerseService
 from app.schemas.bible import VerseOfDayResponse
 from app.api.deps import get_current_user
 
@@ -9,14 +12,29 @@ router = APIRouter()
 
 
 @router.get("/", response_model=VerseOfDayResponse)
-async def get_verse_of_day(
-    current_user: Optional[dict] = Depends(get_current_user)
+def get_verse_of_day(
+    response: Response,
+    current_user: Optional[dict] = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """
     Get the verse of the day.
 
     This endpoint returns a specially selected verse for the current day,
-    along with a theme and reflection. The verse changes daily.
+    along with a theme and reflection. The verse changes daily and comes
+    from the precomputed yearly schedule; the response may be cached by
+    clients until midnight.
     No authentication is required for this endpoint.
     """
-    return await BibleService.get_verse_of_day()
+    try:
+        verse_of_day = DailyVerseService(db).get_verse_of_day()
+    except LookupError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Verse not available"
+        )
+
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    response.headers["Cache-Control"] = f"public, max-age={int((midnight - now).total_seconds())}"
+    return verse_of_day
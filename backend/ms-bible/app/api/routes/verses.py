@@ -1,8 +1,21 @@
-from fastapi import APIRouter, Depends, Path, Body, HTTPException, status
+from fastapi import APIRouter, Depends, Path, Body, HTTPException, Query, status
 from typing import Optional
+from sqlalchemy.orm import Session
 
+from app.infrastructure.database import get_db
 from app.services.bible_service import BibleService
-from app.schemas.bible import Verse, VerseDetail
+from app.services.daily_verse import DailyVerseService
+from app.services.related_verses import RELATED_TOP_K, get_related_verses
+from app.services.verse_store import get_verse_store
+from app.schemas.bible import (
+    Verse,
+    VerseDetail,
+    FavoriteCheckRequest,
+    FavoriteCheckResponse,
+    FavoriteToggleResponse,
+    RelatedVerse,
+    RelatedVersesResponse,
+)
 from app.api.deps import get_current_user, get_current_active_user
 
 router = APIRouter()
@@ -19,6 +32,16 @@ async def get_verse(
     This endpoint returns a verse with detailed book information.
     No authentication is required for this endpoint.
     """
+    store = get_verse_store()
+    if store is not None:
+        verse = store.get_verse(verse_id)
+        if verse is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Verse not found"
+            )
+        return verse
+
     # In a real implementation, this would fetch from the database
     # For this example, we'll use a mock implementation as this endpoint isn't provided
     # in the BibleService yet
@@ -46,11 +69,31 @@ async def get_verse(
     )
 
 
-@router.post("/{verse_id}/favorite", status_code=status.HTTP_200_OK)
-async def toggle_favorite(
+@router.post("/favorites/check", response_model=FavoriteCheckResponse)
+def check_favorites(
+    request: FavoriteCheckRequest,
+    current_user: dict = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Check which of the given verses are favorites of the current user.
+
+    Answers for up to 500 verse IDs with a single cache lookup, e.g. to draw
+    the favorite markers of a page of search results.
+    Authentication is required for this endpoint.
+    """
+    favorites = BibleService(db).get_favorite_verse_ids(
+        current_user["id"], request.verse_ids)
+    return FavoriteCheckResponse(
+        verse_ids=[verse_id for verse_id in request.verse_ids if verse_id in favorites])
+
+
+@router.post("/{verse_id}/favorite", response_model=FavoriteToggleResponse)
+def toggle_favorite(
     verse_id: int = Path(...,
                          description="The ID of the verse to favorite/unfavorite"),
-    current_user: dict = Depends(get_current_active_user)
+    current_user: dict = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
 ):
     """
     Toggle a verse as favorite for the current user.
@@ -58,6 +101,50 @@ async def toggle_favorite(
     This endpoint allows users to mark/unmark a verse as a favorite.
     Authentication is required for this endpoint.
     """
-    # In a real implementation, this would toggle the favorite status in the database
-    # For this example, we'll return a mock response
-    return {"success": True, "message": "Verse favorite status toggled successfully"}
+    service = BibleService(db)
+    user_id = current_user["id"]
+    if service.is_favorite(user_id, verse_id):
+        service.remove_favorite(user_id, verse_id)
+        return FavoriteToggleResponse(
+            success=True, is_favorite=False, message="Verse removed from favorites")
+
+    service.add_favorite(user_id, verse_id)
+    return FavoriteToggleResponse(
+        success=True, is_favorite=True, message="Verse added to favorites")
+
+
+@router.get("/{verse_id}/related", response_model=RelatedVersesResponse)
+def get_related_verses_route(
+    verse_id: int = Path(..., description="The ID of the verse"),
+    limit: int = Query(10, ge=1, le=RELATED_TOP_K, description="Number of related verses"),
+    current_user: Optional[dict] = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the verses most related by content to a verse.
+
+    Neighbors are precomputed offline (TF-IDF reduced with LSA) and verses
+    from the same chapter are left out, so this is a single array lookup.
+    No authentication is required for this endpoint.
+    """
+    related = get_related_verses()
+    if related is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Related verses not built"
+        )
+
+    neighbors = related.related(verse_id, limit)
+    if neighbors is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Verse not found"
+        )
+
+    service = DailyVerseService(db)
+    items = []
+    for neighbor_id, score in neighbors:
+        verse = service.get_verse_by_id(neighbor_id)
+        if verse is not None:
+            items.append(RelatedVerse(verse=verse, score=round(score, 4)))
+    return RelatedVersesResponse(verse_id=verse_id, items=items)
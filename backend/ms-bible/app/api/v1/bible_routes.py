@@ -1,21 +1,36 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from app.models.bible_models import Book, Chapter, Verse
 from app.schemas.bible_schemas import BookSchema, ChapterSchema, VerseSchema
 from app.infrastructure.database import get_db
+from app.services.catalog_cache import catalog_cache
+from app.services.search_service import VerseSearchService
+from app.services.translations import active_translation_clause
+from app.services.verse_store import get_verse_store
 
 router = APIRouter()
 
 
 @router.get("/books", response_model=List[BookSchema], summary="Obter todos os livros da Bíblia")
-async def get_books(db: Session = Depends(get_db)):
+async def get_books(request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Recupera todos os livros da Bíblia.
     """
+    store = get_verse_store()
+    if store is not None:
+        async def build():
+            return store.books()
+
+        return await catalog_cache.respond(
+            request, store, "v1:books", List[BookSchema], build)
+
+    # Postgres e exemplos ficam fora dos caches HTTP
+    response.headers["Cache-Control"] = "no-store"
+
     try:
-        books = db.query(Book).all()
+        books = db.query(Book).filter(active_translation_clause()).all()
         if not books:
             # Se não houver livros, retornar alguns exemplos para evitar erros
             return [
@@ -37,10 +52,24 @@ async def get_books(db: Session = Depends(get_db)):
 
 
 @router.get("/books/{book_id}/chapters", response_model=List[ChapterSchema], summary="Obter capítulos de um livro")
-async def get_chapters(book_id: int, db: Session = Depends(get_db)):
+async def get_chapters(book_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Recupera todos os capítulos de um livro específico da Bíblia.
     """
+    store = get_verse_store()
+    if store is not None:
+        async def build():
+            chapters = store.chapters(book_id)
+            if chapters is None:
+                raise HTTPException(status_code=404, detail="Livro não encontrado")
+            return chapters
+
+        return await catalog_cache.respond(
+            request, store, f"v1:chapters:{book_id}", List[ChapterSchema], build)
+
+    # Postgres e exemplos ficam fora dos caches HTTP
+    response.headers["Cache-Control"] = "no-store"
+
     try:
         chapters = db.query(Chapter).filter(Chapter.book_id == book_id).all()
         if not chapters:
@@ -54,10 +83,24 @@ async def get_chapters(book_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/chapters/{chapter_id}/verses", response_model=List[VerseSchema], summary="Obter versículos de um capítulo")
-async def get_verses(chapter_id: int, db: Session = Depends(get_db)):
+async def get_verses(chapter_id: int, request: Request, response: Response, db: Session = Depends(get_db)):
     """
     Recupera todos os versículos de um capítulo específico.
     """
+    store = get_verse_store()
+    if store is not None:
+        async def build():
+            chapter = store.chapter_verses(chapter_id)
+            if chapter is None:
+                raise HTTPException(status_code=404, detail="Capítulo não encontrado")
+            return chapter["verses"]
+
+        return await catalog_cache.respond(
+            request, store, f"v1:verses:{chapter_id}", List[VerseSchema], build)
+
+    # Postgres e exemplos ficam fora dos caches HTTP
+    response.headers["Cache-Control"] = "no-store"
+
     try:
         verses = db.query(Verse).filter(Verse.chapter_id == chapter_id).all()
         if not verses:
@@ -87,7 +130,7 @@ async def search_verses(
     Busca versículos que contenham a palavra-chave fornecida.
     """
     try:
-        verses = db.query(Verse).filter(Verse.text.ilike(f"%{query}%")).all()
+        verses = VerseSearchService(db).search(query, limit=50).items
         if not verses:
             # Se não houver resultados, retornar alguns exemplos para evitar erros
             return [
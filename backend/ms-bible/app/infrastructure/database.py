@@ -33,9 +33,18 @@ def init_db():
     try:
         # Importar modelos para garantir que sejam registrados
         from app.models import bible_models
+        from app.infrastructure.search import (
+            ensure_search_config, ensure_search_vector, ensure_trigram_index)
+        from app.infrastructure.translations import ensure_translation_columns
+
+        # A coluna de busca depende da configuração portuguese_unaccent
+        ensure_search_config(engine)
 
         # Criar tabelas
         Base.metadata.create_all(bind=engine)
+        ensure_translation_columns(engine)
+        ensure_search_vector(engine)
+        ensure_trigram_index(engine)
         print("Tabelas criadas com sucesso!")
     except Exception as e:
         print(f"Erro ao inicializar o banco de dados: {str(e)}")
@@ -0,0 +1,17 @@
+import os
+
+import redis
+
+# URL do Redis (banco 3 reservado ao ms-bible no docker-compose)
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/3")
+
+redis_client = redis.Redis.from_url(
+    REDIS_URL,
+    decode_responses=True,
+    socket_timeout=1.0,
+    socket_connect_timeout=1.0
+)
+
+
+def get_redis() -> redis.Redis:
+    return redis_client
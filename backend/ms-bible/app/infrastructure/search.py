@@ -0,0 +1,95 @@
+"""
+Estrutura de busca textual dos versículos no Postgres.
+
+A configuração `portuguese_unaccent` é a `portuguese` (stemming e stopwords)
+com `unaccent` aplicado antes do dicionário, então "coração", "coracao" e
+"corações" geram o mesmo lexema. `to_tsvector` com a configuração explícita
+é IMMUTABLE e pode ser usado na coluna gerada `search_vector`, indexada com GIN.
+
+Para a busca tolerante a erros de digitação, `pg_trgm` indexa com GIN os
+trigramas do texto em minúsculas e sem acentos. Como `unaccent()` não é
+IMMUTABLE, o índice de expressão usa a função `bible_unaccent`, que fixa o
+dicionário e pode ser declarada IMMUTABLE.
+"""
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("ms-bible")
+
+# Configuração de busca usada pela coluna gerada e pelas consultas
+SEARCH_CONFIG = "portuguese_unaccent"
+
+# Expressão da coluna gerada bible_verses.search_vector
+SEARCH_VECTOR_EXPRESSION = (
+    f"to_tsvector('{SEARCH_CONFIG}'::regconfig, coalesce(text, ''))"
+)
+
+# Texto normalizado (minúsculas, sem acentos) indexado por trigramas
+FUZZY_FUNCTION = "bible_unaccent"
+
+_CREATE_FUZZY_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION {FUZZY_FUNCTION}(text) RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, lower($1))
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+"""
+
+# Índices GIN dos versículos (nome -> DDL); a carga de traduções os recria
+SEARCH_INDEXES = {
+    "ix_bible_verses_search_vector":
+        "CREATE INDEX IF NOT EXISTS ix_bible_verses_search_vector "
+        "ON bible_verses USING gin (search_vector)",
+    "ix_bible_verses_text_trgm":
+        "CREATE INDEX IF NOT EXISTS ix_bible_verses_text_trgm "
+        f"ON bible_verses USING gin ({FUZZY_FUNCTION}(text) gin_trgm_ops)",
+}
+
+_CREATE_CONFIG = f"""
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = '{SEARCH_CONFIG}') THEN
+        CREATE TEXT SEARCH CONFIGURATION {SEARCH_CONFIG} (COPY = portuguese);
+        ALTER TEXT SEARCH CONFIGURATION {SEARCH_CONFIG}
+            ALTER MAPPING FOR hword, hword_part, word
+            WITH unaccent, portuguese_stem;
+    END IF;
+END
+$$
+"""
+
+
+def ensure_search_config(engine: Engine) -> None:
+    """Cria a extensão unaccent e a configuração de busca (antes das tabelas)."""
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+        connection.execute(text(_CREATE_CONFIG))
+
+
+def ensure_search_vector(engine: Engine) -> None:
+    """
+    Garante a coluna gerada e o índice GIN em bancos já existentes.
+
+    Em bancos novos o create_all já cria a coluna; aqui ela é adicionada às
+    tabelas criadas antes da busca textual (o ADD COLUMN reescreve a tabela
+    uma única vez).
+    """
+    with engine.begin() as connection:
+        connection.execute(text(
+            "ALTER TABLE bible_verses ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+        ))
+        connection.execute(text(SEARCH_INDEXES["ix_bible_verses_search_vector"]))
+    logger.info("Índice de busca textual dos versículos verificado")
+
+
+def ensure_trigram_index(engine: Engine) -> None:
+    """
+    Garante a extensão pg_trgm, a função `bible_unaccent` e o índice GIN de
+    trigramas usado pela busca aproximada (operador `<%`).
+    """
+    with engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.execute(text(_CREATE_FUZZY_FUNCTION))
+        connection.execute(text(SEARCH_INDEXES["ix_bible_verses_text_trgm"]))
+    logger.info("Índice de trigramas dos versículos verificado")
@@ -0,0 +1,47 @@
+"""
+Estrutura das traduções da Bíblia em bancos já existentes.
+
+Bancos novos recebem `bible_translations` e `bible_books.translation_id`
+pelo create_all; nos criados antes das traduções a coluna é adicionada aqui
+e o índice único em `bible_books.name` é trocado pelo único por
+(tradução, nome), já que cada tradução tem os seus 66 livros.
+"""
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("ms-bible")
+
+_REPLACE_NAME_INDEX = """
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_indexes
+        WHERE indexname = 'ix_bible_books_name' AND indexdef LIKE 'CREATE UNIQUE%'
+    ) THEN
+        DROP INDEX ix_bible_books_name;
+        CREATE INDEX ix_bible_books_name ON bible_books (name);
+    END IF;
+END
+$$
+"""
+
+
+def ensure_translation_columns(engine: Engine) -> None:
+    """Garante a coluna translation_id e os índices dos livros (após o create_all)."""
+    with engine.begin() as connection:
+        connection.execute(text(
+            "ALTER TABLE bible_books ADD COLUMN IF NOT EXISTS translation_id integer "
+            "REFERENCES bible_translations (id)"
+        ))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_bible_books_translation_id "
+            "ON bible_books (translation_id)"
+        ))
+        connection.execute(text(_REPLACE_NAME_INDEX))
+        connection.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_bible_books_translation_name "
+            "ON bible_books (translation_id, name)"
+        ))
+    logger.info("Colunas de tradução dos livros verificadas")
@@ -1,20 +1,55 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
+from sqlalchemy import (
+    Boolean, Column, Computed, DateTime, Integer, Index, String, ForeignKey, Text, UniqueConstraint
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 
 from app.infrastructure.database import Base
+from app.infrastructure.search import SEARCH_VECTOR_EXPRESSION
+
+
+class Translation(Base):
+    __tablename__ = "bible_translations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String(20), unique=True, nullable=False)  # "ARA", "NVI", "ACF"
+    name = Column(String(200), nullable=False)
+    active = Column(Boolean, default=False, nullable=False)  # tradução servida nas leituras
+    verse_count = Column(Integer, default=0, nullable=False)
+    loaded_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relacionamento com livros
+    books = relationship("Book", back_populates="translation")
+
+    __table_args__ = (
+        # No máximo uma tradução ativa
+        Index("uq_bible_translations_active", active, unique=True,
+              postgresql_where=active.is_(True)),
+    )
+
+    def __repr__(self):
+        return f"<Translation(id={self.id}, code='{self.code}', active={self.active})>"
 
 
 class Book(Base):
     __tablename__ = "bible_books"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), unique=True, index=True)
+    name = Column(String(100), index=True)
     testament = Column(String(50))  # "Antigo" ou "Novo"
+    # Tradução do livro; nulo nos dados importados antes das traduções
+    translation_id = Column(Integer, ForeignKey("bible_translations.id"), index=True)
 
-    # Relacionamento com capítulos
+    # Relacionamentos
+    translation = relationship("Translation", back_populates="books")
     chapters = relationship(
         "Chapter", back_populates="book", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        UniqueConstraint("translation_id", "name", name="uq_bible_books_translation_name"),
+    )
+
     def __repr__(self):
         return f"<Book(id={self.id}, name='{self.name}', testament='{self.testament}')>"
 
@@ -43,8 +78,52 @@ class Verse(Base):
     number = Column(Integer)  # Número do versículo
     text = Column(Text)  # Texto do versículo
 
+    # Lexemas do texto (portuguese + unaccent), mantidos pelo Postgres
+    search_vector = Column(
+        TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+
     # Relacionamento
     chapter = relationship("Chapter", back_populates="verses")
 
+    __table_args__ = (
+        Index("ix_bible_verses_search_vector",
+              search_vector, postgresql_using="gin"),
+    )
+
     def __repr__(self):
         return f"<Verse(id={self.id}, chapter_id={self.chapter_id}, number={self.number})>"
+
+
+class VerseOfDay(Base):
+    __tablename__ = "bible_verse_of_day"
+
+    day = Column(String(5), primary_key=True)  # "MM-DD", inclui "02-29"
+    verse_id = Column(Integer, ForeignKey("bible_verses.id"), nullable=False)
+    theme = Column(String(100), nullable=False)
+    reflection = Column(Text)
+    curated = Column(Boolean, default=False, nullable=False)  # preservado ao regerar
+
+    # Relacionamento
+    verse = relationship("Verse")
+
+    def __repr__(self):
+        return f"<VerseOfDay(day='{self.day}', verse_id={self.verse_id}, theme='{self.theme}')>"
+
+
+class Favorite(Base):
+    __tablename__ = "bible_favorites"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(String, index=True, nullable=False)  # ID do usuário do MS-Auth
+    verse_id = Column(Integer, ForeignKey("bible_verses.id"), nullable=False)
+    added_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relacionamento
+    verse = relationship("Verse")
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "verse_id", name="uq_bible_favorites_user_verse"),
+    )
+
+    def __repr__(self):
+        return f"<Favorite(id={self.id}, user_id={self.user_id}, verse_id={self.verse_id})>"
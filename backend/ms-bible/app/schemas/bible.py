@@ -3,36 +3,121 @@ from typing import Optional, List, Dict, Any
 from enum import Enum
 
 class Testament(str, Enum):
-    ""Enum for Bible testaments.""
+    """Enum for Bible testaments."""
     OLD = "old"
     NEW = "new"
 
 class BookBase(BaseModel):
-    ""Base schema for Bible book.""
+    """Base schema for Bible book."""
     name: str
     abbreviation: str
     testament: Testament
     position: int
 
 class BookCreate(BookBase):
-    ""Schema for creating a Bible book.""
+    """Schema for creating a Bible book."""
     chapters_count: int = 0
 
 class Book(BookBase):
-    ""Schema for a Bible book.""
+    """Schema for a Bible book."""
     id: int
     chapters_count: int
 
 class ChapterBase(BaseModel):
-    ""Base schema for a Bible chapter.""
+    """Base schema for a Bible chapter."""
     book_id: int
     number: int
 
 class ChapterCreate(ChapterBase):
-    ""Schema for creating a Bible chapter.""
+    """Schema for creating a Bible chapter."""
     verses_count: int = 0
 
 class Chapter(ChapterBase):
-    ""Schema for a Bible chapter.""
+    """Schema for a Bible chapter."""
     id: int
     verses_count: int
+
+class BooksResponse(BaseModel):
+    """Schema for a list of Bible books."""
+    items: List[Book]
+    total: int
+
+class ChaptersResponse(BaseModel):
+    """Schema for the chapters of a Bible book."""
+    book_id: int
+    book_name: str
+    testament: Testament
+    items: List[Chapter]
+    total: int
+
+class Verse(BaseModel):
+    """Schema for a Bible verse."""
+    id: int
+    chapter_id: int
+    book_id: int
+    chapter_number: int
+    verse_number: int
+    text: str
+
+class VersesResponse(BaseModel):
+    """Schema for the verses of a Bible chapter."""
+    chapter_id: int
+    book_id: int
+    book_name: str
+    chapter_number: int
+    items: List[Verse]
+    total: int
+
+class VerseDetail(Verse):
+    """Schema for a Bible verse with book information."""
+    book_name: str
+    book_abbreviation: str
+    testament: Testament
+
+class SearchResult(BaseModel):
+    """Schema for a single search match."""
+    book_name: str
+    chapter_number: int
+    verse_number: int
+    verse_text: str
+    verse_id: int
+
+class VerseOfDayResponse(BaseModel):
+    """Schema for the verse of the day."""
+    verse: VerseDetail
+    theme: str
+    reflection: str
+
+class FavoriteCheckRequest(BaseModel):
+    """Schema for a bulk favorites membership check."""
+    verse_ids: List[int] = Field(..., max_length=500)
+
+class FavoriteCheckResponse(BaseModel):
+    """Schema for the favorite verse IDs among the requested ones."""
+    verse_ids: List[int]
+
+class ChapterFavoritesResponse(BaseModel):
+    """Schema for the user's favorite verses in a chapter."""
+    chapter_id: int
+    verse_ids: List[int]
+
+class FavoriteToggleResponse(BaseModel):
+    """Schema for the result of toggling a favorite."""
+    success: bool
+    is_favorite: bool
+    message: str
+
+class RelatedVerse(BaseModel):
+    """Schema for a verse related by content, with its similarity score."""
+    verse: VerseDetail
+    score: float
+
+class RelatedVersesResponse(BaseModel):
+    """Schema for the verses related to a verse or to a free text."""
+    verse_id: Optional[int] = None
+    items: List[RelatedVerse]
+
+class RelatedTextRequest(BaseModel):
+    """Schema for finding the verses related to a free text."""
+    text: str = Field(..., min_length=1, max_length=5000)
+    limit: int = Field(5, ge=1, le=20)
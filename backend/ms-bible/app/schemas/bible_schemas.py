@@ -91,3 +91,96 @@ class SearchResponseSchema(BaseModel):
                 "count": 1
             }
         }
+
+
+class VerseSearchHit(BaseModel):
+    id: int
+    chapter_id: int
+    number: int
+    text: str
+    book_id: int
+    book_name: str
+    chapter_number: int
+    headline: str
+    rank: float
+
+    class Config:
+        orm_mode = True
+        schema_extra = {
+            "example": {
+                "id": 23250,
+                "chapter_id": 997,
+                "number": 16,
+                "text": "Porque Deus amou o mundo de tal maneira...",
+                "book_id": 43,
+                "book_name": "João",
+                "chapter_number": 3,
+                "headline": "Porque Deus <mark>amou</mark> o mundo de tal maneira...",
+                "rank": 0.1
+            }
+        }
+
+
+class VerseSearchResponse(BaseModel):
+    query: str
+    items: List[VerseSearchHit]
+    next_cursor: Optional[str] = None
+    suggestion: Optional[str] = Field(
+        None, description="Query with misspelled words corrected (\"did you mean\")")
+
+
+class ReferenceResolveRequest(BaseModel):
+    references: List[str] = Field(
+        default_factory=list, max_length=50,
+        description="References such as \"Jo 3:16-18; Sl 23\"")
+    text: Optional[str] = Field(
+        None, max_length=20000,
+        description="Free text whose references are extracted and resolved")
+    include_text: bool = True
+
+
+class ResolvedVerse(BaseModel):
+    id: int
+    chapter_id: int
+    chapter_number: int
+    number: int
+    text: Optional[str] = None
+
+
+class ResolvedReference(BaseModel):
+    source: str
+    reference: str
+    book_id: Optional[int] = None
+    book_name: str
+    chapter: int
+    verse: Optional[int] = None
+    chapter_end: int
+    verse_end: Optional[int] = None
+    found: bool
+    verses: List[ResolvedVerse] = []
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "source": "Jo 3:16-17",
+                "reference": "João 3:16-17",
+                "book_id": 43,
+                "book_name": "João",
+                "chapter": 3,
+                "verse": 16,
+                "chapter_end": 3,
+                "verse_end": 17,
+                "found": True,
+                "verses": [
+                    {"id": 23250, "chapter_id": 997, "chapter_number": 3,
+                     "number": 16, "text": "Porque Deus amou o mundo de tal maneira..."},
+                    {"id": 23251, "chapter_id": 997, "chapter_number": 3,
+                     "number": 17, "text": "Porque Deus enviou o seu Filho ao mundo..."}
+                ]
+            }
+        }
+
+
+class ReferenceResolveResponse(BaseModel):
+    items: List[ResolvedReference]
+    unparsed: List[str] = []
@@ -1,20 +1,24 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Sequence, Set
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
 import logging
 from fastapi import HTTPException, status
 import random
-from datetime import datetime, date
+from datetime import datetime
 
-from ..models import Book, Chapter, Verse, Favorite
-from ..schemas.bible import SearchResult, VerseDetail, BooksResponse, ChaptersResponse, VersesResponse, SearchResponse, VerseOfDayResponse, Testament
+from ..models import Book, Chapter, Verse, Favorite, bible_models
+from ..schemas.bible import SearchResult, VerseDetail, BooksResponse, ChaptersResponse, VersesResponse, Testament
+from .favorites_cache import FavoritesCache
+from .search_service import VerseSearchService
+from .verse_store import get_verse_store
 
 logger = logging.getLogger(__name__)
 
 
 class BibleService:
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, favorites: Optional[FavoritesCache] = None):
         self.db = db
+        self.favorites = favorites or FavoritesCache()
 
     # Métodos para Books
     def get_books(self) -> List[Book]:
@@ -41,6 +45,16 @@ class BibleService:
     # Métodos para Chapters
     def get_chapters_by_book(self, book_id: int) -> List[Chapter]:
         """Retorna todos os capítulos de um livro específico"""
+        store = get_verse_store()
+        if store is not None:
+            chapters = store.chapters(book_id)
+            if chapters is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Livro com ID {book_id} não encontrado"
+                )
+            return chapters
+
         book = self.get_book_by_id(book_id)  # Verifica se o livro existe
         try:
             return self.db.query(Chapter).filter(Chapter.book_id == book_id).order_by(Chapter.number).all()
@@ -66,6 +80,16 @@ class BibleService:
     # Métodos para Verses
     def get_verses_by_chapter(self, chapter_id: int) -> List[Verse]:
         """Retorna todos os versículos de um capítulo específico"""
+        store = get_verse_store()
+        if store is not None:
+            chapter = store.chapter_verses(chapter_id)
+            if chapter is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Capítulo com ID {chapter_id} não encontrado"
+                )
+            return chapter["verses"]
+
         chapter = self.get_chapter(chapter_id)  # Verifica se o capítulo existe
         try:
             return self.db.query(Verse).filter(Verse.chapter_id == chapter_id).order_by(Verse.number).all()
@@ -79,7 +103,11 @@ class BibleService:
 
     def get_verse(self, verse_id: int) -> Verse:
         """Retorna um versículo específico pelo ID"""
-        verse = self.db.query(Verse).filter(Verse.id == verse_id).first()
+        store = get_verse_store()
+        if store is not None:
+            verse = store.get_verse(verse_id)
+        else:
+            verse = self.db.query(Verse).filter(Verse.id == verse_id).first()
         if not verse:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -89,7 +117,7 @@ class BibleService:
 
     # Métodos para Search
     def search_verses(self, query: str) -> List[SearchResult]:
-        """Busca versículos que contenham o texto da query"""
+        """Busca versículos por relevância (busca textual do Postgres)"""
         if not query or len(query.strip()) < 3:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -97,39 +125,7 @@ class BibleService:
             )
 
         try:
-            # Busca por texto no versículo
-            query_filter = Verse.text.ilike(f"%{query}%")
-
-            # Junção com Chapter e Book para obter informações completas
-            results = (
-                self.db.query(
-                    Book.name.label("book_name"),
-                    Chapter.number.label("chapter_number"),
-                    Verse.number.label("verse_number"),
-                    Verse.text.label("verse_text"),
-                    Verse.id.label("verse_id")
-                )
-                .join(Verse.chapter)
-                .join(Chapter.book)
-                .filter(query_filter)
-                .limit(50)  # Limitar resultados para performance
-                .all()
-            )
-
-            # Converter para o esquema SearchResult
-            search_results = []
-            for result in results:
-                search_results.append(
-                    SearchResult(
-                        book_name=result.book_name,
-                        chapter_number=result.chapter_number,
-                        verse_number=result.verse_number,
-                        verse_text=result.verse_text,
-                        verse_id=result.verse_id
-                    )
-                )
-
-            return search_results
+            results = VerseSearchService(self.db).search(query, limit=50)
         except Exception as e:
             logger.error(
                 f"Erro ao buscar versículos com query '{query}': {str(e)}")
@@ -138,6 +134,17 @@ class BibleService:
                 detail="Erro ao realizar busca na Bíblia"
             )
 
+        return [
+            SearchResult(
+                book_name=hit.book_name,
+                chapter_number=hit.chapter_number,
+                verse_number=hit.number,
+                verse_text=hit.text,
+                verse_id=hit.id
+            )
+            for hit in results.items
+        ]
+
     # Métodos para Favorites
     def add_favorite(self, user_id: str, verse_id: int) -> Favorite:
         """Adiciona um versículo aos favoritos do usuário"""
@@ -159,6 +166,7 @@ class BibleService:
             self.db.add(favorite)
             self.db.commit()
             self.db.refresh(favorite)
+            self.favorites.invalidate(user_id)
             return favorite
         except Exception as e:
             self.db.rollback()
@@ -184,6 +192,7 @@ class BibleService:
         try:
             self.db.delete(favorite)
             self.db.commit()
+            self.favorites.invalidate(user_id)
         except Exception as e:
             self.db.rollback()
             logger.error(f"Erro ao remover favorito: {str(e)}")
@@ -193,39 +202,53 @@ class BibleService:
             )
 
     def get_user_favorites(self, user_id: str) -> List[dict]:
-        """Retorna todos os versículos favoritos de um usuário com informações completas"""
+        """
+        Retorna todos os versículos favoritos de um usuário com informações completas.
+
+        A query lê só a tabela de favoritos; livro, capítulo e texto vêm do
+        armazenamento de versículos (ou de um join, se ele não foi gerado).
+        """
         try:
-            results = (
-                self.db.query(
-                    Book.name.label("book_name"),
-                    Chapter.number.label("chapter_number"),
-                    Verse.number.label("verse_number"),
-                    Verse.text.label("verse_text"),
-                    Verse.id.label("verse_id"),
+            store = get_verse_store()
+            if store is not None:
+                rows = self.db.execute(
+                    select(Favorite.id, Favorite.verse_id, Favorite.added_at)
+                    .where(Favorite.user_id == user_id)
+                    .order_by(Favorite.added_at.desc())
+                ).all()
+                favorites = []
+                for favorite_id, verse_id, added_at in rows:
+                    verse = store.get_verse(verse_id)
+                    if verse is None:
+                        continue
+                    favorites.append({
+                        "favorite_id": favorite_id,
+                        "verse_id": verse_id,
+                        "book_name": verse["book_name"],
+                        "chapter_number": verse["chapter_number"],
+                        "verse_number": verse["verse_number"],
+                        "verse_text": verse["text"],
+                        "added_at": added_at
+                    })
+                return favorites
+
+            results = self.db.execute(
+                select(
+                    bible_models.Book.name.label("book_name"),
+                    bible_models.Chapter.number.label("chapter_number"),
+                    bible_models.Verse.number.label("verse_number"),
+                    bible_models.Verse.text.label("verse_text"),
+                    bible_models.Verse.id.label("verse_id"),
                     Favorite.id.label("favorite_id"),
                     Favorite.added_at.label("added_at")
                 )
                 .join(Favorite.verse)
-                .join(Verse.chapter)
-                .join(Chapter.book)
-                .filter(Favorite.user_id == user_id)
+                .join(bible_models.Verse.chapter)
+                .join(bible_models.Chapter.book)
+                .where(Favorite.user_id == user_id)
                 .order_by(Favorite.added_at.desc())
-                .all()
-            )
-
-            favorites = []
-            for result in results:
-                favorites.append({
-                    "favorite_id": result.favorite_id,
-                    "verse_id": result.verse_id,
-                    "book_name": result.book_name,
-                    "chapter_number": result.chapter_number,
-                    "verse_number": result.verse_number,
-                    "verse_text": result.verse_text,
-                    "added_at": result.added_at
-                })
-
-            return favorites
+            ).all()
+            return [dict(result._mapping) for result in results]
         except Exception as e:
             logger.error(
                 f"Erro ao buscar favoritos do usuário {user_id}: {str(e)}")
@@ -234,14 +257,38 @@ class BibleService:
                 detail="Erro ao buscar versículos favoritos"
             )
 
+    def _favorite_verse_ids(self, user_id: str) -> List[int]:
+        return self.db.execute(
+            select(Favorite.verse_id).where(Favorite.user_id == user_id)
+        ).scalars().all()
+
+    def get_favorite_verse_ids(self, user_id: str, verse_ids: Sequence[int]) -> Set[int]:
+        """Quais dos versículos informados são favoritos do usuário (uma consulta)"""
+        return self.favorites.members(
+            user_id, verse_ids, lambda: self._favorite_verse_ids(user_id))
+
+    def get_chapter_favorites(self, user_id: str, chapter_id: int) -> List[int]:
+        """Ids dos versículos favoritos do usuário em um capítulo"""
+        store = get_verse_store()
+        if store is not None:
+            verse_ids = store.chapter_verse_ids(chapter_id)
+        else:
+            verse_ids = self.db.execute(
+                select(bible_models.Verse.id)
+                .where(bible_models.Verse.chapter_id == chapter_id)
+                .order_by(bible_models.Verse.number)
+            ).scalars().all()
+        if not verse_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Capítulo com ID {chapter_id} não encontrado"
+            )
+        favorites = self.get_favorite_verse_ids(user_id, verse_ids)
+        return [verse_id for verse_id in verse_ids if verse_id in favorites]
+
     def is_favorite(self, user_id: str, verse_id: int) -> bool:
         """Verifica se um versículo é favorito do usuário"""
-        favorite = self.db.query(Favorite).filter(
-            Favorite.user_id == user_id,
-            Favorite.verse_id == verse_id
-        ).first()
-
-        return favorite is not None
+        return verse_id in self.get_favorite_verse_ids(user_id, [verse_id])
 
     # Mock data for testing
     _books = [
@@ -272,6 +319,13 @@ class BibleService:
         Returns:
             BooksResponse with list of books
         """
+        store = get_verse_store()
+        if store is not None:
+            books = store.books()
+            if testament:
+                books = [book for book in books if book["testament"] == testament]
+            return BooksResponse(items=books, total=len(books))
+
         books = BibleService._books
 
         if testament:
@@ -299,6 +353,16 @@ class BibleService:
         Raises:
             HTTPException: If book not found
         """
+        store = get_verse_store()
+        if store is not None:
+            row = store.book_row(book_id)
+            if row is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Book not found"
+                )
+            return store.book(row)
+
         for book in BibleService._books:
             if book["id"] == book_id:
                 return Book(**book)
@@ -323,6 +387,24 @@ class BibleService:
         Raises:
             HTTPException: If book not found
         """
+        store = get_verse_store()
+        if store is not None:
+            row = store.book_row(book_id)
+            if row is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Book not found"
+                )
+            book = store.book(row)
+            chapters = store.chapters(book_id)
+            return ChaptersResponse(
+                book_id=book["id"],
+                book_name=book["name"],
+                testament=book["testament"],
+                items=chapters,
+                total=len(chapters)
+            )
+
         # Get book info first
         book = await BibleService.get_book(book_id)
 
@@ -359,6 +441,23 @@ class BibleService:
         Raises:
             HTTPException: If chapter not found
         """
+        store = get_verse_store()
+        if store is not None:
+            chapter = store.chapter_verses(chapter_id)
+            if chapter is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Chapter not found"
+                )
+            return VersesResponse(
+                chapter_id=chapter["chapter_id"],
+                book_id=chapter["book_id"],
+                book_name=chapter["book_name"],
+                chapter_number=chapter["chapter_number"],
+                items=chapter["verses"],
+                total=len(chapter["verses"])
+            )
+
         # In a real implementation, we would query the database
         # For mock purposes, we'll extract the book_id from the chapter_id
         book_id = chapter_id // 1000
@@ -402,152 +501,3 @@ class BibleService:
             items=verses,
             total=len(verses)
         )
-
-    @staticmethod
-    async def search_bible(query: str, testament: Optional[str] = None, book_id: Optional[int] = None) -> SearchResponse:
-        """
-        Search the Bible for a specific text.
-
-        Args:
-            query: The search text
-            testament: Optional filter by testament
-            book_id: Optional filter by book
-
-        Returns:
-            SearchResponse with matching verses
-        """
-        # In a real implementation, we would use a text search engine
-        # For mock purposes, we'll generate some random matches
-
-        # Generate some random matches
-        matches = []
-        books = BibleService._books
-
-        if testament:
-            books = [book for book in books if book["testament"] == testament]
-
-        if book_id:
-            books = [book for book in books if book["id"] == book_id]
-
-        # Generate between 5 and 15 matches
-        match_count = random.randint(5, 15)
-
-        for _ in range(match_count):
-            # Pick a random book
-            book = random.choice(books)
-
-            # Generate a random chapter and verse
-            chapter_number = random.randint(1, book["chapters_count"])
-            verse_number = random.randint(1, 30)
-
-            # Create a verse with the search term embedded
-            words = query.split()
-            text_parts = [
-                "Este é um versículo que contém as palavras",
-                *words,
-                "em seu texto, demonstrando como funciona a busca."
-            ]
-
-            matches.append(
-                VerseDetail(
-                    id=(book["id"] * 1000000) +
-                    (chapter_number * 1000) + verse_number,
-                    chapter_id=(book["id"] * 1000) + chapter_number,
-                    book_id=book["id"],
-                    chapter_number=chapter_number,
-                    verse_number=verse_number,
-                    text=" ".join(text_parts),
-                    book_name=book["name"],
-                    book_abbreviation=book["abbreviation"],
-                    testament=book["testament"]
-                )
-            )
-
-        return SearchResponse(
-            query=query,
-            items=matches,
-            total=len(matches)
-        )
-
-    @staticmethod
-    async def get_random_verse() -> VerseDetail:
-        """
-        Get a random verse from the Bible.
-
-        Returns:
-            VerseDetail object
-        """
-        # Pick a random book
-        book = random.choice(BibleService._books)
-
-        # Generate a random chapter and verse
-        chapter_number = random.randint(1, book["chapters_count"])
-        verse_number = random.randint(1, 30)
-
-        return VerseDetail(
-            id=(book["id"] * 1000000) + (chapter_number * 1000) + verse_number,
-            chapter_id=(book["id"] * 1000) + chapter_number,
-            book_id=book["id"],
-            chapter_number=chapter_number,
-            verse_number=verse_number,
-            text=f"Este é um versículo aleatório do capítulo {chapter_number} de {book['name']}.",
-            book_name=book["name"],
-            book_abbreviation=book["abbreviation"],
-            testament=book["testament"]
-        )
-
-    @staticmethod
-    async def get_verse_of_day() -> VerseOfDayResponse:
-        """
-        Get the verse of the day.
-
-        Returns:
-            VerseOfDayResponse with verse and additional information
-        """
-        # In a real implementation, this would be precomputed or stored
-        # For mock purposes, we'll determine based on today's date
-
-        # Get today's date
-        today = date.today()
-        day_of_year = today.timetuple().tm_yday
-
-        # Use the day of year to seed our random generator for consistency
-        random.seed(day_of_year)
-
-        # Pick a random book
-        book = random.choice(BibleService._books)
-
-        # Generate a random chapter and verse
-        chapter_number = random.randint(1, book["chapters_count"])
-        verse_number = random.randint(1, 30)
-
-        # Generate a verse
-        verse = VerseDetail(
-            id=(book["id"] * 1000000) + (chapter_number * 1000) + verse_number,
-            chapter_id=(book["id"] * 1000) + chapter_number,
-            book_id=book["id"],
-            chapter_number=chapter_number,
-            verse_number=verse_number,
-            text=f"Este é o versículo do dia {today.strftime('%d/%m/%Y')} do capítulo {chapter_number} de {book['name']}.",
-            book_name=book["name"],
-            book_abbreviation=book["abbreviation"],
-            testament=book["testament"]
-        )
-
-        # Generate a theme and reflection
-        themes = [
-            "Fé", "Esperança", "Amor", "Paciência", "Perseverança",
-            "Gratidão", "Humildade", "Perdão", "Salvação", "Graça"
-        ]
-
-        theme = random.choice(themes)
-        reflection = f"Reflita sobre o tema de {theme} em sua vida diária. Como este versículo se aplica à sua situação atual?"
-
-        # Reset random seed
-        random.seed()
-
-        return VerseOfDayResponse(
-            verse=verse,
-            theme=theme,
-            reflection=reflection
-        )
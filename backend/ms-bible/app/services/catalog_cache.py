@@ -0,0 +1,165 @@
+"""
+Respostas pré-serializadas do catálogo bíblico (livros, capítulos e
+versículos de um capítulo).
+
+O texto bíblico não muda enquanto o processo usa o mesmo armazenamento
+de versículos, então cada resposta é serializada uma única vez por
+processo em bytes, junto com as versões comprimidas (gzip e, se o pacote `brotli` estiver
+instalado, br). As requisições seguintes só escolhem a codificação pelo
+Accept-Encoding, sem FastAPI/Pydantic/SQLAlchemy no caminho.
+
+As respostas levam um ETag com a tradução do armazenamento e um hash do
+conteúdo, e `Cache-Control: public, max-age=...`: navegadores e o cache do
+nginx as reaproveitam durante CATALOG_MAX_AGE e depois revalidam com If-None-Match, que recebe 304 enquanto a tradução e o
+conteúdo forem os mesmos. Ativar outra tradução muda o ETag. Só entram no
+cache respostas servidas pelo armazenamento de versículos; os dados do
+Postgres ou de exemplo continuam no caminho normal, com `no-store`.
+"""
+import gzip
+import hashlib
+import os
+import threading
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependência opcional
+    brotli = None
+
+# Validade das respostas do catálogo no cache HTTP antes da revalidação (1 hora)
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "3600"))
+
+# Corpos menores que isso não compensam a compressão
+MIN_COMPRESS_SIZE = 512
+
+CACHE_CONTROL = f"public, max-age={CATALOG_MAX_AGE}"
+
+# Sufixos do ETag de cada codificação
+_ENCODING_SUFFIXES = ("-gzip", "-br")
+
+
+class CachedBody(NamedTuple):
+    """Corpo JSON serializado e suas versões comprimidas."""
+    etag: str
+    identity: bytes
+    gzip: Optional[bytes]
+    br: Optional[bytes]
+
+
+def encode_body(schema: Any, data: Any, translation: str = "") -> CachedBody:
+    """
+    Valida `data` com o schema de resposta e serializa uma única vez.
+
+    O ETag é "{tradução}.{hash do corpo}" (só o hash sem tradução ativa).
+    """
+    adapter = TypeAdapter(schema)
+    body = adapter.dump_json(adapter.validate_python(data))
+    compress = len(body) >= MIN_COMPRESS_SIZE
+    digest = hashlib.sha256(body).hexdigest()[:20]
+    return CachedBody(
+        etag=f"{translation}.{digest}" if translation else digest,
+        identity=body,
+        gzip=gzip.compress(body, compresslevel=9, mtime=0) if compress else None,
+        br=brotli.compress(body, quality=11) if compress and brotli is not None else None,
+    )
+
+
+def _accepted(accept_encoding: str) -> set:
+    """Codificações aceitas pelo cliente (ignora as com q=0)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding:
+            accepted.add(coding)
+    return accepted
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match vale para qualquer codificação do mesmo conteúdo."""
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        tag = tag.removeprefix("W/").strip('"')
+        for suffix in _ENCODING_SUFFIXES:
+            tag = tag.removesuffix(suffix)
+        if tag == etag:
+            return True
+    return False
+
+
+def build_response(request: Request, cached: CachedBody) -> Response:
+    """Resposta 200 na melhor codificação aceita ou 304 se o ETag confere."""
+    headers = {"Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    accepted = _accepted(request.headers.get("accept-encoding", ""))
+    if cached.br is not None and "br" in accepted:
+        body, etag = cached.br, f'"{cached.etag}-br"'
+        headers["Content-Encoding"] = "br"
+    elif cached.gzip is not None and ("gzip" in accepted or "*" in accepted):
+        body, etag = cached.gzip, f'"{cached.etag}-gzip"'
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body, etag = cached.identity, f'"{cached.etag}"'
+    headers["ETag"] = etag
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, cached.etag):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+class CatalogCache:
+    """
+    Corpos serializados por chave, construídos na primeira requisição.
+
+    O cache pertence a um armazenamento de versículos: se o processo abrir
+    outro arquivo, as entradas antigas são descartadas. A tradução do
+    armazenamento entra no ETag.
+    """
+
+    def __init__(self):
+        self._bodies: Dict[str, CachedBody] = {}
+        self._store = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+
+    async def respond(
+        self,
+        request: Request,
+        store,
+        key: str,
+        schema: Any,
+        build: Callable[[], Awaitable[Any]]
+    ) -> Response:
+        """
+        Resposta da chave, construindo o corpo com `build` na primeira vez.
+
+        Exceções de `build` (ex.: 404) são propagadas e nada é guardado.
+        """
+        if store is not self._store:
+            with self._lock:
+                self._bodies.clear()
+                self._store = store
+
+        cached = self._bodies.get(key)
+        if cached is None:
+            cached = encode_body(schema, await build(), store.translation)
+            with self._lock:
+                self._bodies[key] = cached
+        return build_response(request, cached)
+
+
+# Cache do processo
+catalog_cache = CatalogCache()
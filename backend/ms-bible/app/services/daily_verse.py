@@ -0,0 +1,319 @@
+"""
+Versículo do dia e versículo aleatório.
+
+O versículo do dia vem de uma tabela anual pré-calculada
+(`bible_verse_of_day`, uma linha por "MM-DD", 366 dias) gerada pelo script
+`build_verse_of_day`; dias curados (tema e reflexão escolhidos à mão) são
+preservados quando a tabela é regerada. A resposta de cada data é montada uma
+vez por processo e reaproveitada até a virada do dia.
+
+Os sorteios usam instâncias próprias de `random.Random` (nunca o gerador
+global) sobre os versículos que existem de fato: um array com a contagem
+acumulada de versículos por capítulo é percorrido com bisect, então cada
+versículo tem a mesma probabilidade, independentemente do tamanho do
+capítulo ou do livro.
+"""
+import logging
+import random
+import threading
+from bisect import bisect_right
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..models.bible_models import Book, Chapter, Verse, VerseOfDay
+from ..schemas.bible import VerseDetail, VerseOfDayResponse
+from .reference_parser import book_abbreviation, get_reference_resolver, parse_references
+from .search_service import TESTAMENTS
+from .translations import active_translation_clause
+from .verse_store import get_verse_store
+
+logger = logging.getLogger(__name__)
+
+THEMES = [
+    "Fé", "Esperança", "Amor", "Paciência", "Perseverança",
+    "Gratidão", "Humildade", "Perdão", "Salvação", "Graça"
+]
+
+REFLECTION = ("Reflita sobre o tema de {theme} em sua vida diária. "
+              "Como este versículo se aplica à sua situação atual?")
+
+# Dias da tabela anual (ano bissexto, para incluir 29 de fevereiro)
+SCHEDULE_DAYS = [
+    (date(2024, 1, 1) + timedelta(days=i)).strftime("%m-%d") for i in range(366)
+]
+
+# Quantas datas o cache de respostas mantém (hoje, ontem e amanhã por fuso)
+DAILY_CACHE_SIZE = 3
+
+TESTAMENT_VALUES = {name: value for value, name in TESTAMENTS.items()}
+
+
+def day_key(day: date) -> str:
+    """Chave da tabela anual para a data ("MM-DD")."""
+    return day.strftime("%m-%d")
+
+
+class VerseSampler:
+    """
+    Amostragem uniforme sobre os versículos existentes.
+
+    `cumulative[i]` é o total de versículos dos capítulos 0..i; um índice
+    global sorteado em [0, total) é localizado com bisect no capítulo e no
+    deslocamento dentro dele.
+    """
+
+    def __init__(self, chapter_ids: Sequence[int], counts: Sequence[int]):
+        self.chapter_ids = list(chapter_ids)
+        self.cumulative = list(accumulate(counts))
+        self.total = self.cumulative[-1] if self.cumulative else 0
+        self._random = random.Random()
+
+    @classmethod
+    def from_store(cls, store) -> "VerseSampler":
+        chapter_ids, counts = store.chapter_verse_counts()
+        return cls(chapter_ids.tolist(), counts.tolist())
+
+    @classmethod
+    def from_db(cls, db: Session) -> "VerseSampler":
+        rows = db.execute(
+            select(Verse.chapter_id, func.count(Verse.id))
+            .join(Chapter, Chapter.id == Verse.chapter_id)
+            .join(Book, Book.id == Chapter.book_id)
+            .where(active_translation_clause())
+            .group_by(Verse.chapter_id)
+            .order_by(Verse.chapter_id)
+        ).all()
+        return cls([row[0] for row in rows], [row[1] for row in rows])
+
+    def locate(self, index: int) -> Tuple[int, int]:
+        """(id do capítulo, deslocamento no capítulo) do índice global."""
+        position = bisect_right(self.cumulative, index)
+        start = self.cumulative[position - 1] if position else 0
+        return self.chapter_ids[position], index - start
+
+    def sample(self, rng: Optional[random.Random] = None) -> Tuple[int, int]:
+        """Sorteia um versículo; `rng` permite sorteios reprodutíveis."""
+        if not self.total:
+            raise LookupError("Nenhum versículo carregado")
+        return self.locate((rng or self._random).randrange(self.total))
+
+    def sample_distinct(self, k: int, rng: random.Random) -> List[Tuple[int, int]]:
+        """Sorteia k versículos distintos (sem reposição)."""
+        return [self.locate(i) for i in rng.sample(range(self.total), min(k, self.total))]
+
+
+# Amostrador do processo (criado no primeiro sorteio)
+_sampler: Optional[VerseSampler] = None
+_sampler_lock = threading.Lock()
+
+# Respostas do versículo do dia por data ISO
+_daily_cache: Dict[str, VerseOfDayResponse] = {}
+_daily_lock = threading.Lock()
+
+
+def get_verse_sampler(db: Session) -> VerseSampler:
+    """Amostrador do armazenamento de versículos ou, sem ele, do Postgres."""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is not None:
+            return _sampler
+        store = get_verse_store()
+        sampler = VerseSampler.from_store(store) if store is not None \
+            else VerseSampler.from_db(db)
+        # Sem versículos o amostrador não fica em cache: a importação pode vir depois
+        if sampler.total:
+            _sampler = sampler
+        return sampler
+
+
+class DailyVerseService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_verse(self, chapter_id: int, offset: int) -> Optional[VerseDetail]:
+        """Versículo pelo deslocamento dentro do capítulo."""
+        store = get_verse_store()
+        if store is not None:
+            chapter_row = store.chapter_row(chapter_id)
+            rows = store.verse_rows_by_number(chapter_row) if chapter_row is not None else ()
+            return VerseDetail(**store.verse(rows[offset])) if offset < len(rows) else None
+
+        verse_id = self.db.execute(
+            select(Verse.id)
+            .where(Verse.chapter_id == chapter_id)
+            .order_by(Verse.number)
+            .offset(offset)
+            .limit(1)
+        ).scalar()
+        return self.get_verse_by_id(verse_id) if verse_id is not None else None
+
+    def get_verse_by_id(self, verse_id: int) -> Optional[VerseDetail]:
+        store = get_verse_store()
+        if store is not None:
+            verse = store.get_verse(verse_id)
+            return VerseDetail(**verse) if verse is not None else None
+
+        row = self.db.execute(
+            select(Verse.id, Verse.chapter_id, Verse.number, Verse.text,
+                   Chapter.number, Book.id, Book.name, Book.testament)
+            .join(Chapter, Chapter.id == Verse.chapter_id)
+            .join(Book, Book.id == Chapter.book_id)
+            .where(Verse.id == verse_id)
+        ).first()
+        if row is None:
+            return None
+        verse_id, chapter_id, number, text, chapter_number, book_id, book_name, testament = row
+        return VerseDetail(
+            id=verse_id,
+            chapter_id=chapter_id,
+            book_id=book_id,
+            chapter_number=chapter_number,
+            verse_number=number,
+            text=text,
+            book_name=book_name,
+            book_abbreviation=book_abbreviation(book_name),
+            testament=TESTAMENT_VALUES.get(testament, "old")
+        )
+
+    def get_random_verse(self) -> VerseDetail:
+        """Versículo sorteado uniformemente entre todos os versículos."""
+        verse = self.get_verse(*get_verse_sampler(self.db).sample())
+        if verse is None:
+            raise LookupError("Versículo sorteado não encontrado")
+        return verse
+
+    def get_verse_of_day(self, day: Optional[date] = None) -> VerseOfDayResponse:
+        """
+        Versículo do dia pela tabela anual, com cache por data.
+
+        Sem linha na tabela (tabela não gerada ou versículo removido), o
+        versículo é sorteado com uma semente derivada da data: o resultado
+        continua o mesmo durante todo o dia e em todos os workers.
+        """
+        day = day or date.today()
+        key = day.isoformat()
+        cached = _daily_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            response = self._scheduled(day)
+            cacheable = True
+        except SQLAlchemyError as e:
+            # Sem banco o sorteio pela data ainda atende, mas não vai para o cache
+            logger.error(f"Erro ao ler a tabela do versículo do dia: {str(e)}")
+            self.db.rollback()
+            response, cacheable = None, False
+
+        response = response or self._drawn(day)
+        if not cacheable:
+            return response
+        with _daily_lock:
+            if len(_daily_cache) >= DAILY_CACHE_SIZE:
+                _daily_cache.clear()
+            _daily_cache[key] = response
+        return response
+
+    def _scheduled(self, day: date) -> Optional[VerseOfDayResponse]:
+        entry = self.db.get(VerseOfDay, day_key(day))
+        if entry is None:
+            return None
+        verse = self.get_verse_by_id(entry.verse_id)
+        if verse is None:
+            logger.warning(f"Versículo {entry.verse_id} do dia {entry.day} não encontrado")
+            return None
+        return VerseOfDayResponse(
+            verse=verse,
+            theme=entry.theme,
+            reflection=entry.reflection or REFLECTION.format(theme=entry.theme)
+        )
+
+    def _drawn(self, day: date) -> VerseOfDayResponse:
+        rng = random.Random(day.toordinal())
+        verse = self.get_verse(*get_verse_sampler(self.db).sample(rng))
+        if verse is None:
+            raise LookupError("Versículo sorteado não encontrado")
+        theme = rng.choice(THEMES)
+        return VerseOfDayResponse(
+            verse=verse, theme=theme, reflection=REFLECTION.format(theme=theme))
+
+    def rebuild_schedule(
+        self,
+        seed: int,
+        curated: Sequence[dict] = (),
+        reset_curated: bool = False
+    ) -> Dict[str, int]:
+        """
+        Regera a tabela anual do versículo do dia.
+
+        Dias curados já gravados são mantidos (a não ser com `reset_curated`)
+        e os de `curated` são gravados por cima; os demais dias recebem
+        versículos distintos sorteados com a semente informada, então a
+        mesma semente gera sempre a mesma tabela.
+
+        Args:
+            seed: Semente do sorteio
+            curated: Itens {"day": "MM-DD", "reference": "Sl 23:1",
+                "theme": ..., "reflection": ...}; exige o armazenamento
+            reset_curated: Descarta os dias curados gravados
+
+        Returns:
+            Quantidade de dias curados e sorteados
+        """
+        entries: Dict[str, VerseOfDay] = {}
+        if not reset_curated:
+            for entry in self.db.execute(
+                    select(VerseOfDay).where(VerseOfDay.curated.is_(True))).scalars():
+                entries[entry.day] = VerseOfDay(
+                    day=entry.day, verse_id=entry.verse_id, theme=entry.theme,
+                    reflection=entry.reflection, curated=True)
+
+        if curated:
+            store = get_verse_store()
+            if store is None:
+                raise LookupError("Dias curados exigem o armazenamento de versículos")
+            resolver = get_reference_resolver(store)
+            for item in curated:
+                if item["day"] not in SCHEDULE_DAYS:
+                    raise ValueError(f"Dia inválido: {item['day']}")
+                references = parse_references(item["reference"])
+                verses = resolver.verses(references[0]) if references else None
+                if not verses:
+                    raise ValueError(f"Referência não encontrada: {item['reference']}")
+                entries[item["day"]] = VerseOfDay(
+                    day=item["day"], verse_id=verses[0]["id"], theme=item["theme"],
+                    reflection=item.get("reflection"), curated=True)
+        curated_count = len(entries)
+
+        rng = random.Random(seed)
+        used = {entry.verse_id for entry in entries.values()}
+        open_days = [day for day in SCHEDULE_DAYS if day not in entries]
+        candidates = get_verse_sampler(self.db).sample_distinct(
+            len(open_days) + len(used), rng)
+        for chapter_id, offset in candidates:
+            if len(entries) == len(SCHEDULE_DAYS):
+                break
+            verse = self.get_verse(chapter_id, offset)
+            if verse is None or verse.id in used:
+                continue
+            used.add(verse.id)
+            day = open_days[len(entries) - curated_count]
+            entries[day] = VerseOfDay(
+                day=day, verse_id=verse.id, theme=rng.choice(THEMES), curated=False)
+
+        try:
+            self.db.execute(delete(VerseOfDay))
+            self.db.add_all(entries.values())
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        with _daily_lock:
+            _daily_cache.clear()
+        return {"curated": curated_count, "drawn": len(entries) - curated_count}
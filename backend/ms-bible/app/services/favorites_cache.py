@@ -0,0 +1,125 @@
+"""
+Cache dos versículos favoritos de cada usuário em um conjunto do Redis.
+
+A chave `bible:favorites:{user_id}` guarda os ids dos versículos favoritos
+mais um marcador, para diferenciar "usuário sem favoritos" de "conjunto não
+carregado". Saber quais versículos de um capítulo são favoritos é um único
+SMISMEMBER (em pipeline com EXISTS); na primeira consulta o conjunto é
+carregado do Postgres com uma query só na tabela de favoritos.
+
+`add_favorite`/`remove_favorite` invalidam a chave após o commit e
+incrementam a geração do usuário (`bible:favorites:{user_id}:generation`).
+O preenchimento lê a geração antes de ir ao banco e só grava o conjunto, em
+um script Lua, se ela não mudou: uma leitura anterior a uma alteração nunca
+repõe o conjunto antigo depois da invalidação. Se o Redis estiver
+indisponível, as consultas vão direto ao banco.
+"""
+import logging
+import os
+from typing import Callable, Iterable, Sequence, Set
+
+import redis
+
+from ..infrastructure.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Tempo de vida do conjunto de favoritos de um usuário
+FAVORITES_CACHE_TTL = int(os.getenv("FAVORITES_CACHE_TTL", "86400"))
+
+# Membro que marca o conjunto como carregado (ids de versículo são inteiros)
+_LOADED = "-"
+
+# Ids gravados por SADD dentro do script (limite de argumentos do unpack)
+_FILL_CHUNK = 1000
+
+# Grava o conjunto se a geração ainda for a lida antes da consulta ao banco.
+# ARGV: geração, TTL, marcador e ids. Retorna 1 se gravou.
+_FILL_SCRIPT = f"""
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('DEL', KEYS[1])
+for i = 3, #ARGV, {_FILL_CHUNK} do
+    redis.call('SADD', KEYS[1], unpack(ARGV, i, math.min(i + {_FILL_CHUNK} - 1, #ARGV)))
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+class FavoritesCache:
+    def __init__(self, redis_client: redis.Redis = None):
+        self.redis = redis_client or get_redis()
+        self._fill = self.redis.register_script(_FILL_SCRIPT)
+
+    @staticmethod
+    def key(user_id: str) -> str:
+        return f"bible:favorites:{user_id}"
+
+    @staticmethod
+    def generation_key(user_id: str) -> str:
+        return f"bible:favorites:{user_id}:generation"
+
+    def fill(self, user_id: str, loader: Callable[[], Iterable[int]]) -> Set[int]:
+        """
+        Carrega os favoritos do banco e grava o conjunto, se nenhuma
+        alteração tiver invalidado o cache durante a consulta.
+        """
+        try:
+            generation = self.redis.get(self.generation_key(user_id)) or "0"
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao ler favoritos do cache: {str(e)}")
+            return set(loader())
+
+        verse_ids = set(loader())
+        try:
+            self._fill(
+                keys=[self.key(user_id), self.generation_key(user_id)],
+                args=[generation, FAVORITES_CACHE_TTL, _LOADED, *verse_ids])
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao gravar favoritos no cache: {str(e)}")
+        return verse_ids
+
+    def all(self, user_id: str, loader: Callable[[], Iterable[int]]) -> Set[int]:
+        """Todos os ids favoritos do usuário."""
+        try:
+            members = self.redis.smembers(self.key(user_id))
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao ler favoritos do cache: {str(e)}")
+            return set(loader())
+        if not members:
+            return self.fill(user_id, loader)
+        return {int(member) for member in members if member != _LOADED}
+
+    def members(
+        self,
+        user_id: str,
+        verse_ids: Sequence[int],
+        loader: Callable[[], Iterable[int]]
+    ) -> Set[int]:
+        """Quais dos `verse_ids` são favoritos, em uma ida ao Redis."""
+        if not verse_ids:
+            return set()
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.exists(self.key(user_id))
+            pipe.smismember(self.key(user_id), [str(verse_id) for verse_id in verse_ids])
+            loaded, flags = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao ler favoritos do cache: {str(e)}")
+            return set(loader()).intersection(verse_ids)
+        if not loaded:
+            return self.fill(user_id, loader).intersection(verse_ids)
+        return {verse_id for verse_id, flag in zip(verse_ids, flags) if flag}
+
+    def invalidate(self, user_id: str) -> None:
+        """Remove o conjunto e muda a geração (descarta preenchimentos em curso)."""
+        try:
+            pipe = self.redis.pipeline()
+            pipe.incr(self.generation_key(user_id))
+            pipe.expire(self.generation_key(user_id), FAVORITES_CACHE_TTL)
+            pipe.delete(self.key(user_id))
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao invalidar favoritos do cache: {str(e)}")
@@ -0,0 +1,375 @@
+"""
+Reconhecimento e resolução de referências bíblicas em texto livre.
+
+Respostas do chat, conteúdos de planos de estudo e reflexões citam
+passagens como "Jo 3:16-18; Sl 23" ou "1 Coríntios 13.4,7". Os nomes e
+abreviações dos 66 livros (pt-BR) são compilados uma única vez em uma
+expressão regular fatorada por prefixos (uma trie), aplicada sobre o texto
+sem acentos e em minúsculas; cada ocorrência de livro é seguida por um
+pequeno analisador de capítulos, versículos, intervalos e listas.
+
+A resolução usa o armazenamento mapeado em memória (`verse_store`), então um
+lote inteiro de referências é resolvido sem consultas ao banco.
+
+Formatos reconhecidos (após o nome do livro):
+
+    Sl 23              capítulo inteiro
+    Sl 23-24           intervalo de capítulos
+    Jo 3:16 / Jo 3.16  versículo (também "3,16" sem espaço)
+    Jo 3:16-18         intervalo de versículos
+    Jo 3:16-4:2        intervalo entre capítulos
+    Jo 3:16,18-20      lista de versículos do mesmo capítulo
+    Jo 3:16; 4:1       lista de capítulos do mesmo livro
+"""
+import re
+import threading
+import unicodedata
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Limites por requisição do resolvedor
+MAX_REFERENCES = 50
+MAX_VERSES_PER_REFERENCE = 200
+
+# (posição canônica, nome, abreviação, apelidos adicionais)
+BOOKS: List[Tuple[int, str, str, Tuple[str, ...]]] = [
+    (1, "Gênesis", "Gn", ("gen",)),
+    (2, "Êxodo", "Êx", ("ex", "exo")),
+    (3, "Levítico", "Lv", ("lev",)),
+    (4, "Números", "Nm", ("num",)),
+    (5, "Deuteronômio", "Dt", ("deut",)),
+    (6, "Josué", "Js", ("jos",)),
+    (7, "Juízes", "Jz", ("jui",)),
+    (8, "Rute", "Rt", ()),
+    (9, "1 Samuel", "1Sm", ("1 sam",)),
+    (10, "2 Samuel", "2Sm", ("2 sam",)),
+    (11, "1 Reis", "1Rs", ()),
+    (12, "2 Reis", "2Rs", ()),
+    (13, "1 Crônicas", "1Cr", ("1 cron",)),
+    (14, "2 Crônicas", "2Cr", ("2 cron",)),
+    (15, "Esdras", "Ed", ("esd",)),
+    (16, "Neemias", "Ne", ("nee",)),
+    (17, "Ester", "Et", ("est",)),
+    (18, "Jó", "Jó", ()),
+    (19, "Salmos", "Sl", ("salmo", "sal")),
+    (20, "Provérbios", "Pv", ("prov",)),
+    (21, "Eclesiastes", "Ec", ("ecl",)),
+    (22, "Cânticos", "Ct", ("cantares", "cantico dos canticos", "cant")),
+    (23, "Isaías", "Is", ("isa",)),
+    (24, "Jeremias", "Jr", ("jer",)),
+    (25, "Lamentações", "Lm", ("lam",)),
+    (26, "Ezequiel", "Ez", ("eze",)),
+    (27, "Daniel", "Dn", ("dan",)),
+    (28, "Oseias", "Os", ("oséias",)),
+    (29, "Joel", "Jl", ()),
+    (30, "Amós", "Am", ()),
+    (31, "Obadias", "Ob", ()),
+    (32, "Jonas", "Jn", ()),
+    (33, "Miqueias", "Mq", ("miquéias",)),
+    (34, "Naum", "Na", ()),
+    (35, "Habacuque", "Hc", ("hab",)),
+    (36, "Sofonias", "Sf", ()),
+    (37, "Ageu", "Ag", ()),
+    (38, "Zacarias", "Zc", ("zac",)),
+    (39, "Malaquias", "Ml", ("mal",)),
+    (40, "Mateus", "Mt", ("mat",)),
+    (41, "Marcos", "Mc", ("mar",)),
+    (42, "Lucas", "Lc", ("luc",)),
+    (43, "João", "Jo", ()),
+    (44, "Atos", "At", ("atos dos apostolos",)),
+    (45, "Romanos", "Rm", ("rom",)),
+    (46, "1 Coríntios", "1Co", ("1 cor",)),
+    (47, "2 Coríntios", "2Co", ("2 cor",)),
+    (48, "Gálatas", "Gl", ("gal",)),
+    (49, "Efésios", "Ef", ("efe",)),
+    (50, "Filipenses", "Fp", ("fil",)),
+    (51, "Colossenses", "Cl", ("col",)),
+    (52, "1 Tessalonicenses", "1Ts", ("1 tes",)),
+    (53, "2 Tessalonicenses", "2Ts", ("2 tes",)),
+    (54, "1 Timóteo", "1Tm", ("1 tim",)),
+    (55, "2 Timóteo", "2Tm", ("2 tim",)),
+    (56, "Tito", "Tt", ()),
+    (57, "Filemom", "Fm", ("filemon",)),
+    (58, "Hebreus", "Hb", ("heb",)),
+    (59, "Tiago", "Tg", ()),
+    (60, "1 Pedro", "1Pe", ("1 ped",)),
+    (61, "2 Pedro", "2Pe", ("2 ped",)),
+    (62, "1 João", "1Jo", ()),
+    (63, "2 João", "2Jo", ()),
+    (64, "3 João", "3Jo", ()),
+    (65, "Judas", "Jd", ()),
+    (66, "Apocalipse", "Ap", ("apoc",)),
+]
+
+# Formas de escrever o número dos livros numerados ("1 Co", "I Co", "1ª Co"...)
+_ORDINALS = {
+    "1": ("1", "1a", "1o", "i", "primeira", "primeiro"),
+    "2": ("2", "2a", "2o", "ii", "segunda", "segundo"),
+    "3": ("3", "3a", "3o", "iii", "terceira", "terceiro"),
+}
+
+# Grafias que colidem sem acentos: padrão e formas acentuadas ("Jo" x "Jó")
+_AMBIGUOUS = {"jo": (43, {"jó": 18})}
+
+# Abreviações que também são palavras comuns: só valem com inicial maiúscula
+_CAPITALIZED = frozenset({"os", "na"})
+
+
+class Reference(NamedTuple):
+    """Passagem contínua: do (capítulo, versículo) inicial ao final."""
+    book: int
+    chapter: int
+    verse: Optional[int]
+    chapter_end: int
+    verse_end: Optional[int]
+    source: str
+
+    @property
+    def label(self) -> str:
+        """Forma canônica, ex.: "João 3:16-18"."""
+        label = f"{BOOK_NAMES[self.book]} {self.chapter}"
+        if self.verse is not None:
+            label += f":{self.verse}"
+        if (self.chapter_end, self.verse_end) == (self.chapter, self.verse):
+            return label
+        if self.chapter_end == self.chapter:
+            return f"{label}-{self.verse_end}"
+        if self.verse_end is None:
+            return f"{label}-{self.chapter_end}"
+        return f"{label}-{self.chapter_end}:{self.verse_end}"
+
+
+BOOK_NAMES = {position: name for position, name, _, _ in BOOKS}
+BOOK_ABBREVIATIONS = {position: abbreviation for position, _, abbreviation, _ in BOOKS}
+
+
+def fold(value: str) -> str:
+    """
+    Minúsculas e sem acentos, preservando o comprimento do texto para que as
+    posições das ocorrências valham no texto original.
+    """
+    folded = []
+    for char in value.lower():
+        base = "".join(
+            c for c in unicodedata.normalize("NFKD", char) if not unicodedata.combining(c))
+        folded.append(base if len(base) == 1 else char)
+    return "".join(folded)
+
+
+def _compact(value: str) -> str:
+    return re.sub(r"\s+", "", value)
+
+
+def _spellings() -> Dict[str, int]:
+    """
+    Todas as grafias aceitas (sem acentos) -> posição do livro.
+
+    Nas grafias, " " aceita zero ou mais espaços e "_" exige ao menos um
+    ("1co", "1 co", mas "i co" e "primeira co" separados).
+    """
+    spellings: Dict[str, int] = {}
+    for position, name, abbreviation, extra in BOOKS:
+        for spelling in (name, abbreviation) + extra:
+            spelling = fold(spelling)
+            number, rest = spelling[0], spelling[1:].strip()
+            if number not in _ORDINALS or not rest:
+                spellings.setdefault(spelling, position)
+                continue
+            for ordinal in _ORDINALS[number]:
+                separator = "_" if ordinal.isalpha() else " "
+                spellings.setdefault(f"{ordinal}{separator}{rest}", position)
+    for spelling, (position, _) in _AMBIGUOUS.items():
+        spellings[spelling] = position
+    return spellings
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Alternância fatorada por prefixos: as grafias viram um único autômato
+    em que cada caractere do texto é examinado uma vez por ramo da trie, em
+    vez de testar centenas de alternativas em sequência.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        end = "" in node
+        branches = [
+            _SEPARATORS.get(char, re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if end else body
+
+    return build(trie)
+
+
+_SEPARATORS = {" ": r"\s*", "_": r"\s+"}
+
+_SPELLINGS = _spellings()
+
+# Grafia sem espaços -> posição do livro
+ALIASES = {_compact(spelling.replace("_", " ")): position
+           for spelling, position in _SPELLINGS.items()}
+
+# Livro seguido de capítulo; as grafias mais longas vencem pela trie gulosa
+_BOOK = re.compile(rf"(?<!\w)({_trie_pattern(list(_SPELLINGS))})\.?\s*(?=\d)")
+
+# capítulo [:versículo] [-fim]   (fim: versículo, capítulo ou capítulo:versículo)
+_SPEC = re.compile(
+    r"(\d{1,3})(?:\s*:\s*(\d{1,3})|[.,](\d{1,3}))?[a-c]?"
+    r"(?:\s*[-–]\s*(\d{1,3})(?:\s*:\s*(\d{1,3})|\.(\d{1,3}))?[a-c]?)?"
+    r"(?!\d)"
+)
+# ", 18" ou ", 18-20" no mesmo capítulo (não confunde com ", 4:1")
+_VERSE_ITEM = re.compile(r"\s*,\s*(\d{1,3})[a-c]?(?:\s*[-–]\s*(\d{1,3})[a-c]?)?(?!\d|\s*[:.]\d)")
+# "; 4:1" continua no mesmo livro
+_CONTINUATION = re.compile(r"\s*;\s*(?=\d)")
+
+
+def book_abbreviation(name: str) -> str:
+    """Abreviação pt-BR do livro pelo nome ("" se não reconhecido)."""
+    position = ALIASES.get(_compact(fold(name)))
+    return BOOK_ABBREVIATIONS[position] if position else ""
+
+
+def _book_at(text: str, match: re.Match) -> Optional[int]:
+    """Livro da ocorrência, aplicando as regras de acento e de maiúscula."""
+    alias = _compact(match.group(1))
+    original = _compact(text[match.start(1):match.end(1)])
+    if alias in _CAPITALIZED and not original[0].isupper():
+        return None
+    if alias in _AMBIGUOUS:
+        default, accented = _AMBIGUOUS[alias]
+        return accented.get(original.lower(), default)
+    return ALIASES.get(alias)
+
+
+def _spec(book: int, match: re.Match, source: str) -> Optional[Reference]:
+    chapter, verse_a, verse_b, end, end_verse_a, end_verse_b = match.groups()
+    chapter = int(chapter)
+    verse = verse_a or verse_b
+    end_verse = end_verse_a or end_verse_b
+    verse = int(verse) if verse else None
+    if end is None:
+        reference = Reference(book, chapter, verse, chapter, verse, source)
+    elif end_verse is not None:
+        reference = Reference(book, chapter, verse or 1, int(end), int(end_verse), source)
+    elif verse is not None:
+        reference = Reference(book, chapter, verse, chapter, int(end), source)
+    else:
+        reference = Reference(book, chapter, None, int(end), None, source)
+    if reference.chapter < 1 or (reference.chapter_end, reference.verse_end or 0) < (
+            reference.chapter, reference.verse or 0):
+        return None
+    return reference
+
+
+def iter_references(text: str) -> Iterator[Reference]:
+    """Referências na ordem em que aparecem no texto."""
+    folded = fold(text)
+    position = 0
+    while True:
+        match = _BOOK.search(folded, position)
+        if match is None:
+            return
+        position = match.end()
+        book = _book_at(text, match)
+        if book is None:
+            continue
+
+        start = match.start()
+        while True:
+            spec = _SPEC.match(folded, position)
+            if spec is None:
+                break
+            position = spec.end()
+            reference = _spec(book, spec, text[start:position])
+            if reference is not None:
+                yield reference
+            # Versículos avulsos do mesmo capítulo
+            while reference is not None and reference.chapter == reference.chapter_end:
+                item = _VERSE_ITEM.match(folded, position)
+                if item is None or reference.verse is None:
+                    break
+                first = int(item.group(1))
+                last = int(item.group(2) or first)
+                position = item.end()
+                if last >= first:
+                    yield Reference(book, reference.chapter, first, reference.chapter, last,
+                                    text[item.start(1):position])
+            continuation = _CONTINUATION.match(folded, position)
+            if continuation is None:
+                break
+            position = start = continuation.end()
+
+
+def parse_references(text: str) -> List[Reference]:
+    """Referências do texto, sem repetições, na ordem de aparição."""
+    seen = set()
+    references = []
+    for reference in iter_references(text):
+        key = reference[:5]
+        if key not in seen:
+            seen.add(key)
+            references.append(reference)
+    return references
+
+
+class ReferenceResolver:
+    """
+    Resolve referências contra o armazenamento de versículos.
+
+    Os livros do arquivo são associados às posições canônicas pelo nome; se
+    o nome gravado não for reconhecido, vale a ordem do arquivo.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.book_rows: Dict[int, int] = {}
+        for row, book in enumerate(store.books()):
+            position = ALIASES.get(_compact(fold(book["name"])), book["position"])
+            self.book_rows.setdefault(position, row)
+
+    def verses(self, reference: Reference) -> Optional[List[dict]]:
+        """
+        Versículos da passagem ou None se o livro ou o capítulo inicial não
+        existirem. Passagens longas são truncadas em MAX_VERSES_PER_REFERENCE.
+        """
+        book_row = self.book_rows.get(reference.book)
+        if book_row is None:
+            return None
+        if self.store.chapter_row_by_number(book_row, reference.chapter) is None:
+            return None
+
+        verses: List[dict] = []
+        for number in range(reference.chapter, reference.chapter_end + 1):
+            chapter_row = self.store.chapter_row_by_number(book_row, number)
+            if chapter_row is None:
+                break
+            first = reference.verse if number == reference.chapter and reference.verse else 1
+            last = reference.verse_end if number == reference.chapter_end else None
+            for row in self.store.verse_rows_by_number(chapter_row, first, last):
+                if len(verses) == MAX_VERSES_PER_REFERENCE:
+                    return verses
+                verses.append(self.store.verse(row))
+        return verses
+
+
+# Resolvedor do armazenamento atual (criado na primeira resolução)
+_resolver: Optional[ReferenceResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_reference_resolver(store) -> ReferenceResolver:
+    """Resolvedor associado ao armazenamento do processo."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None or _resolver.store is not store:
+            _resolver = ReferenceResolver(store)
+        return _resolver
@@ -0,0 +1,245 @@
+"""
+Versículos relacionados por similaridade de conteúdo (TF-IDF + LSA).
+
+Pipeline offline (`scripts/build_related_verses`):
+
+1. Matriz TF-IDF esparsa dos versículos (tf sublinear, idf suavizado),
+   com os mesmos tokens do índice de busca (sem acentos, stemmer leve,
+   sem stopwords) e sem termos que aparecem em um único versículo.
+2. Redução LSA (SVD truncada): cada versículo vira um vetor denso
+   normalizado com `LSA_COMPONENTS` dimensões, aproximando sinônimos e
+   temas que não compartilham as mesmas palavras.
+3. Vizinhos mais próximos por similaridade de cosseno, em lotes de
+   produtos de matrizes; versículos do mesmo capítulo são ignorados, já
+   que o leitor já os tem à vista.
+
+O artefato `.npz` guarda os `RELATED_TOP_K` vizinhos de cada versículo
+(índices int32 e notas float16) e, para consultas por texto livre, o
+vocabulário, o idf, a projeção LSA e os vetores dos versículos, além da
+tradução de que foi gerado (artefatos de outra tradução não são carregados).
+O serviço só precisa de NumPy; o SciPy é usado apenas na geração.
+"""
+import logging
+import math
+import os
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .verse_index import STOPWORDS, VerseDocument, _pack_strings, _unpack_strings, tokenize
+
+logger = logging.getLogger(__name__)
+
+# Caminho do artefato gerado por scripts/build_related_verses.py
+RELATED_VERSES_PATH = os.getenv("RELATED_VERSES_PATH", "data/related_verses.npz")
+
+# Vizinhos guardados por versículo
+RELATED_TOP_K = 20
+
+# Dimensões da redução LSA
+LSA_COMPONENTS = 128
+
+# Versículos por lote no cálculo dos vizinhos (lote x versículos em float32)
+_BATCH_SIZE = 512
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class RelatedVerses:
+    """Vizinhos pré-calculados e projeção LSA (ver docstring do módulo)."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.verse_ids = arrays["verse_ids"]
+        self.neighbors = arrays["neighbors"]
+        self.scores = arrays["scores"]
+        # float16 no disco, float32 em memória para os produtos
+        self.embeddings = arrays["embeddings"].astype(np.float32)
+        self.projection = arrays["projection"].astype(np.float32)
+        self.idf = arrays["idf"]
+        self.terms: List[str] = list(arrays["terms"])
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+        # Tradução dos versículos (artefatos antigos: gerados sem tradução ativa)
+        self.translation = str(arrays.get("translation", ""))
+
+    def __len__(self) -> int:
+        return len(self.verse_ids)
+
+    @property
+    def top_k(self) -> int:
+        return self.neighbors.shape[1]
+
+    # Construção e artefato
+
+    @classmethod
+    def build(
+        cls,
+        documents: Iterable[VerseDocument],
+        top_k: int = RELATED_TOP_K,
+        components: int = LSA_COMPONENTS,
+        translation: str = ""
+    ) -> "RelatedVerses":
+        """Calcula TF-IDF, LSA e os vizinhos de todos os versículos."""
+        from scipy.sparse import csr_matrix, diags
+        from scipy.sparse.linalg import svds
+
+        documents = sorted(documents, key=lambda doc: doc.id)
+        count = len(documents)
+
+        vocabulary: Dict[str, int] = {}
+        rows, cols, values = [], [], []
+        for i, doc in enumerate(documents):
+            counts = Counter(
+                token for token in tokenize(doc.text or "") if token not in STOPWORDS)
+            for term, tf in counts.items():
+                rows.append(i)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                values.append(1.0 + math.log(tf))
+
+        cols = np.array(cols, dtype=np.int64)
+        df = np.bincount(cols, minlength=len(vocabulary))
+        # Termos de um único versículo não aproximam versículos entre si
+        kept = np.flatnonzero(df >= 2)
+        remap = np.full(len(vocabulary), -1, dtype=np.int64)
+        remap[kept] = np.arange(len(kept))
+        mask = remap[cols] >= 0
+        terms = np.array(list(vocabulary))[kept].tolist()
+
+        idf = (np.log((1 + count) / (1 + df[kept])) + 1).astype(np.float32)
+        tfidf = csr_matrix(
+            (np.array(values, dtype=np.float32)[mask],
+             (np.array(rows)[mask], remap[cols][mask])),
+            shape=(count, len(kept)), dtype=np.float32) @ diags(idf)
+        norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1))).ravel()
+        norms[norms == 0] = 1.0
+        tfidf = diags(1.0 / norms) @ tfidf
+
+        components = max(1, min(components, min(tfidf.shape) - 1))
+        u, s, vt = svds(tfidf, k=components)
+        embeddings = _normalize_rows((u * s).astype(np.float32))
+        projection = vt.T.astype(np.float32)
+
+        chapter_ids = np.array([doc.chapter_id for doc in documents], dtype=np.int32)
+        top_k = min(top_k, max(count - 1, 1))
+        neighbors = np.zeros((count, top_k), dtype=np.int32)
+        scores = np.zeros((count, top_k), dtype=np.float16)
+        for start in range(0, count, _BATCH_SIZE):
+            stop = min(start + _BATCH_SIZE, count)
+            similarity = embeddings[start:stop] @ embeddings.T
+            # Mesmo capítulo (inclui o próprio versículo) fica de fora
+            similarity[chapter_ids[start:stop, None] == chapter_ids[None, :]] = -np.inf
+            candidates = np.argpartition(-similarity, top_k - 1, axis=1)[:, :top_k]
+            candidate_scores = np.take_along_axis(similarity, candidates, axis=1)
+            order = np.argsort(-candidate_scores, axis=1, kind="stable")
+            neighbors[start:stop] = np.take_along_axis(candidates, order, axis=1)
+            scores[start:stop] = np.take_along_axis(candidate_scores, order, axis=1)
+
+        return cls({
+            "verse_ids": np.array([doc.id for doc in documents], dtype=np.int32),
+            "neighbors": neighbors,
+            "scores": scores,
+            "embeddings": embeddings.astype(np.float16),
+            "projection": projection.astype(np.float16),
+            "idf": idf,
+            "terms": terms,
+            "translation": translation,
+        })
+
+    def save(self, path: str) -> None:
+        """Grava o artefato (escrita atômica: arquivo temporário + rename)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            verse_ids=self.verse_ids,
+            neighbors=self.neighbors,
+            scores=self.scores,
+            embeddings=self.embeddings.astype(np.float16),
+            projection=self.projection.astype(np.float16),
+            idf=self.idf,
+            **_pack_strings("terms", self.terms),
+            translation=np.array(self.translation),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RelatedVerses":
+        """Carrega um artefato gerado por `save`."""
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        arrays["terms"] = _unpack_strings(arrays, "terms")
+        return cls(arrays)
+
+    # Consulta
+
+    def _row(self, verse_id: int) -> Optional[int]:
+        row = int(np.searchsorted(self.verse_ids, verse_id))
+        if row < len(self.verse_ids) and self.verse_ids[row] == verse_id:
+            return row
+        return None
+
+    def related(self, verse_id: int, limit: int = 10) -> Optional[List[Tuple[int, float]]]:
+        """Vizinhos pré-calculados do versículo ou None se ele não existir."""
+        row = self._row(verse_id)
+        if row is None:
+            return None
+        limit = min(limit, self.top_k)
+        return [
+            (int(self.verse_ids[neighbor]), float(score))
+            for neighbor, score in zip(self.neighbors[row, :limit], self.scores[row, :limit])
+            if score > 0
+        ]
+
+    def for_text(self, text: str, limit: int = 5) -> List[Tuple[int, float]]:
+        """
+        Versículos mais próximos de um texto livre (ex.: a pergunta do
+        usuário), projetando o TF-IDF do texto no espaço LSA.
+        """
+        counts = Counter(
+            token for token in tokenize(text) if token not in STOPWORDS and token in self.term_ids)
+        if not counts:
+            return []
+        ids = np.array([self.term_ids[term] for term in counts], dtype=np.int64)
+        weights = np.array([1.0 + math.log(tf) for tf in counts.values()], dtype=np.float32)
+        weights *= self.idf[ids]
+        vector = weights @ self.projection[ids]
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return []
+
+        similarity = self.embeddings @ (vector / norm)
+        limit = min(limit, len(similarity))
+        top = np.argpartition(-similarity, limit - 1)[:limit]
+        top = top[np.argsort(-similarity[top], kind="stable")]
+        return [(int(self.verse_ids[i]), float(similarity[i])) for i in top if similarity[i] > 0]
+
+
+# Artefato do processo (carregado na inicialização)
+_related: Optional[RelatedVerses] = None
+_related_lock = threading.Lock()
+
+
+def init_related_verses(path: str = RELATED_VERSES_PATH) -> Optional[RelatedVerses]:
+    """Carrega o artefato dos versículos relacionados, se existir e for da tradução ativa."""
+    from .translations import artifact_matches, current_translation
+
+    global _related
+    with _related_lock:
+        if _related is None and os.path.exists(path):
+            related = RelatedVerses.load(path)
+            if not artifact_matches("Versículos relacionados", related.translation,
+                                    current_translation()):
+                return None
+            _related = related
+            logger.info(f"Versículos relacionados carregados de {path}: {len(_related)} versículos")
+        return _related
+
+
+def get_related_verses() -> Optional[RelatedVerses]:
+    """Artefato do processo ou None se não foi gerado."""
+    return _related
@@ -0,0 +1,242 @@
+import base64
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy import REAL, and_, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from ..infrastructure.search import FUZZY_FUNCTION, SEARCH_CONFIG
+from ..models.bible_models import Book, Chapter, Verse
+from ..schemas.bible_schemas import VerseSearchHit, VerseSearchResponse
+from .translations import active_translation_clause
+
+logger = logging.getLogger(__name__)
+
+# Testamento da API ("old"/"new") para o valor gravado em bible_books
+TESTAMENTS = {"old": "Antigo", "new": "Novo"}
+
+# Trechos destacados: até 2 fragmentos de 10 a 30 palavras
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, "
+    "MaxFragments=2, MinWords=10, MaxWords=30, FragmentDelimiter=\" … \""
+)
+
+# Similaridade mínima (word_similarity do pg_trgm) da busca aproximada
+FUZZY_THRESHOLD = 0.5
+
+
+def encode_search_cursor(rank: float, verse_id: int) -> str:
+    """Cursor opaco da posição (relevância, id) nos resultados."""
+    raw = f"{rank!r}|{verse_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decodifica um cursor de busca.
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        rank, verse_id = raw.split("|")
+        return float(rank), int(verse_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor de busca inválido") from e
+
+
+class VerseSearchService:
+    """
+    Busca textual de versículos no Postgres.
+
+    As consultas usam a coluna gerada `bible_verses.search_vector` (índice
+    GIN) com a configuração `portuguese_unaccent`, ordenam por ts_rank_cd e
+    paginam por cursor (relevância, id). Os trechos com ts_headline são
+    gerados apenas para os versículos da página.
+
+    Se a primeira página vier vazia (palavras com erro de digitação), a
+    busca aproximada usa o índice de trigramas sobre o texto sem acentos,
+    ordenando por word_similarity.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @staticmethod
+    def build_query(query: str, phrase: bool = False):
+        """
+        Monta o tsquery da busca.
+
+        Sem `phrase`, usa a sintaxe de buscadores (websearch_to_tsquery):
+        palavras são combinadas com AND, "entre aspas" vira frase, `or`
+        alterna termos e `-palavra` exclui. Com `phrase`, o texto inteiro é
+        uma frase (palavras adjacentes, na ordem).
+        """
+        builder = func.phraseto_tsquery if phrase else func.websearch_to_tsquery
+        return builder(literal(SEARCH_CONFIG).cast(REGCONFIG), query)
+
+    def search(
+        self,
+        query: str,
+        testament: Optional[str] = None,
+        book_id: Optional[int] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        phrase: bool = False,
+        fuzzy: bool = True
+    ) -> VerseSearchResponse:
+        """
+        Busca versículos por relevância.
+
+        Args:
+            query: Texto da busca
+            testament: Filtrar por testamento ("old" ou "new")
+            book_id: Filtrar por livro
+            limit: Resultados por página
+            cursor: Cursor retornado pela página anterior
+            phrase: Busca o texto como frase exata
+            fuzzy: Sem resultados, tenta a busca aproximada (uma página, sem cursor)
+
+        Returns:
+            Página de resultados e o cursor da próxima página
+
+        Raises:
+            ValueError: Se o cursor ou o testamento forem inválidos
+        """
+        tsquery = self.build_query(query, phrase)
+        rank = func.ts_rank_cd(Verse.search_vector, tsquery).label("rank")
+
+        matches = (
+            select(
+                Verse.id,
+                Verse.chapter_id,
+                Verse.number,
+                Verse.text,
+                Chapter.book_id,
+                Chapter.number.label("chapter_number"),
+                Book.name.label("book_name"),
+                rank
+            )
+            .join(Chapter, Chapter.id == Verse.chapter_id)
+            .join(Book, Book.id == Chapter.book_id)
+            .where(Verse.search_vector.op("@@")(tsquery))
+            .where(active_translation_clause())
+        )
+
+        if testament:
+            if testament not in TESTAMENTS:
+                raise ValueError("Testamento inválido. Use 'old' ou 'new'")
+            matches = matches.where(Book.testament == TESTAMENTS[testament])
+        if book_id:
+            matches = matches.where(Chapter.book_id == book_id)
+
+        matches = matches.subquery()
+
+        page = select(matches)
+        if cursor:
+            last_rank, last_id = decode_search_cursor(cursor)
+            last_rank = cast(literal(last_rank), REAL)
+            page = page.where(or_(
+                matches.c.rank < last_rank,
+                and_(matches.c.rank == last_rank, matches.c.id > last_id)
+            ))
+        page = (
+            page.order_by(matches.c.rank.desc(), matches.c.id)
+            .limit(limit + 1)
+            .subquery()
+        )
+
+        # ts_headline relê o texto; calculado só para a página
+        headline = func.ts_headline(
+            literal(SEARCH_CONFIG).cast(REGCONFIG),
+            page.c.text,
+            tsquery,
+            HEADLINE_OPTIONS
+        ).label("headline")
+
+        try:
+            rows = self.db.execute(
+                select(page, headline).order_by(page.c.rank.desc(), page.c.id)
+            ).all()
+        except Exception as e:
+            logger.error(f"Erro ao buscar versículos com query '{query}': {str(e)}")
+            raise
+
+        if not rows and fuzzy and not cursor:
+            rows = self.fuzzy_search(query, testament, book_id, limit)
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_search_cursor(rows[-1].rank, rows[-1].id)
+
+        return VerseSearchResponse(
+            query=query,
+            items=[
+                VerseSearchHit(
+                    id=row.id,
+                    chapter_id=row.chapter_id,
+                    number=row.number,
+                    text=row.text,
+                    book_id=row.book_id,
+                    book_name=row.book_name,
+                    chapter_number=row.chapter_number,
+                    headline=row.headline,
+                    rank=row.rank
+                )
+                for row in rows
+            ],
+            next_cursor=next_cursor
+        )
+
+    def fuzzy_search(
+        self,
+        query: str,
+        testament: Optional[str] = None,
+        book_id: Optional[int] = None,
+        limit: int = 20
+    ) -> list:
+        """
+        Versículos com trechos parecidos com a consulta (pg_trgm).
+
+        O operador `<%` usa o índice GIN de trigramas sobre
+        `bible_unaccent(text)`, então a consulta não varre a tabela; o limite
+        de similaridade vale só para a transação atual.
+        """
+        target = getattr(func, FUZZY_FUNCTION)(Verse.text)
+        normalized = getattr(func, FUZZY_FUNCTION)(query)
+        rank = func.word_similarity(normalized, target).label("rank")
+
+        matches = (
+            select(
+                Verse.id,
+                Verse.chapter_id,
+                Verse.number,
+                Verse.text,
+                Chapter.book_id,
+                Chapter.number.label("chapter_number"),
+                Book.name.label("book_name"),
+                rank,
+                Verse.text.label("headline")
+            )
+            .join(Chapter, Chapter.id == Verse.chapter_id)
+            .join(Book, Book.id == Chapter.book_id)
+            .where(normalized.op("<%")(target))
+            .where(active_translation_clause())
+        )
+        if testament:
+            matches = matches.where(Book.testament == TESTAMENTS[testament])
+        if book_id:
+            matches = matches.where(Chapter.book_id == book_id)
+
+        try:
+            self.db.execute(select(func.set_config(
+                "pg_trgm.word_similarity_threshold", str(FUZZY_THRESHOLD), True)))
+            return self.db.execute(
+                matches.order_by(rank.desc(), Verse.id).limit(limit)
+            ).all()
+        except Exception as e:
+            logger.error(f"Erro na busca aproximada com query '{query}': {str(e)}")
+            raise
@@ -0,0 +1,318 @@
+"""
+Leitura de traduções da Bíblia em formatos padrão, versículo a versículo.
+
+Formatos aceitos:
+
+- OSIS (XML): versículos como contêiner (`<verse osisID="Gen.1.1">...`) ou
+  como marcos (`<verse sID=.../>...<verse eID=.../>`); lido com um parser
+  SAX incremental, sem carregar o documento inteiro. Notas são ignoradas.
+- USFM: um arquivo ou um diretório com um arquivo por livro; lido linha a
+  linha. Títulos, cabeçalhos, notas de rodapé e referências cruzadas são
+  ignorados; marcadores de caractere (`\\w`, `\\nd`, `\\add`...) ficam só
+  com o texto.
+- JSON: lista de livros `[{"abbrev"|"name": "gn", "chapters": [[v1, v2],
+  ...]}]` (formato dos arquivos de traduções pt-BR mais difundidos), lista
+  de versículos `[{"book", "chapter", "verse", "text"}]` ou JSON Lines
+  (`.jsonl`) com um versículo por linha, este lido em streaming.
+
+Os livros são identificados pelos códigos OSIS/USFM ou pelos nomes e
+abreviações pt-BR do `reference_parser`, e entregues pela posição canônica
+(1 = Gênesis ... 66 = Apocalipse). Livros fora do cânon de 66 são ignorados.
+"""
+import json
+import os
+import re
+import xml.sax
+from typing import Iterator, List, NamedTuple, Optional, Union
+
+from .reference_parser import _AMBIGUOUS, ALIASES, _compact, fold
+
+# Códigos OSIS dos livros, na ordem canônica
+OSIS_BOOKS = (
+    "Gen Exod Lev Num Deut Josh Judg Ruth 1Sam 2Sam 1Kgs 2Kgs 1Chr 2Chr Ezra Neh "
+    "Esth Job Ps Prov Eccl Song Isa Jer Lam Ezek Dan Hos Joel Amos Obad Jonah Mic "
+    "Nah Hab Zeph Hag Zech Mal Matt Mark Luke John Acts Rom 1Cor 2Cor Gal Eph Phil "
+    "Col 1Thess 2Thess 1Tim 2Tim Titus Phlm Heb Jas 1Pet 2Pet 1John 2John 3John "
+    "Jude Rev"
+).split()
+
+# Códigos USFM dos livros, na ordem canônica
+USFM_BOOKS = (
+    "GEN EXO LEV NUM DEU JOS JDG RUT 1SA 2SA 1KI 2KI 1CH 2CH EZR NEH EST JOB PSA "
+    "PRO ECC SNG ISA JER LAM EZK DAN HOS JOL AMO OBA JON MIC NAM HAB ZEP HAG ZEC "
+    "MAL MAT MRK LUK JHN ACT ROM 1CO 2CO GAL EPH PHP COL 1TH 2TH 1TI 2TI TIT PHM "
+    "HEB JAS 1PE 2PE 1JN 2JN 3JN JUD REV"
+).split()
+
+_OSIS_POSITIONS = {code.lower(): i for i, code in enumerate(OSIS_BOOKS, 1)}
+_USFM_POSITIONS = {code.lower(): i for i, code in enumerate(USFM_BOOKS, 1)}
+
+FORMATS = ("osis", "usfm", "json")
+
+# Bytes lidos por vez do arquivo OSIS
+_READ_SIZE = 1 << 16
+
+
+class ParsedVerse(NamedTuple):
+    """Versículo lido de uma tradução."""
+    book: int  # posição canônica do livro (1-66)
+    chapter: int
+    verse: int
+    text: str
+
+
+def book_position(value: Union[str, int]) -> Optional[int]:
+    """Posição canônica do livro por número, código OSIS/USFM ou nome pt-BR."""
+    if isinstance(value, int):
+        return value if 1 <= value <= 66 else None
+    key = value.strip().lower()
+    if key.isdigit():
+        return book_position(int(key))
+    alias = _compact(fold(key)).rstrip(".")
+    # Grafias que só os acentos distinguem ("jó" x "jo")
+    accented = _AMBIGUOUS.get(alias, (None, {}))[1].get(_compact(key).rstrip("."))
+    return (_OSIS_POSITIONS.get(key) or _USFM_POSITIONS.get(key)
+            or accented or ALIASES.get(alias))
+
+
+def _clean(text: str) -> str:
+    return " ".join(text.split())
+
+
+def detect_format(path: str) -> str:
+    """Formato pela extensão (diretórios são USFM)."""
+    if os.path.isdir(path):
+        return "usfm"
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".xml", ".osis"):
+        return "osis"
+    if extension in (".usfm", ".sfm", ".ptx"):
+        return "usfm"
+    if extension in (".json", ".jsonl"):
+        return "json"
+    raise ValueError(f"Formato não reconhecido para {path}; use --format")
+
+
+def read_translation(path: str, fmt: Optional[str] = None) -> Iterator[ParsedVerse]:
+    """Versículos da tradução no arquivo (ou diretório USFM)."""
+    fmt = fmt or detect_format(path)
+    if fmt == "osis":
+        return read_osis(path)
+    if fmt == "usfm":
+        return read_usfm(path)
+    if fmt == "json":
+        return read_json(path)
+    raise ValueError(f"Formato inválido: {fmt}. Use um de {', '.join(FORMATS)}")
+
+
+# OSIS
+
+class _OsisHandler(xml.sax.ContentHandler):
+    def __init__(self):
+        super().__init__()
+        self.verses: List[ParsedVerse] = []
+        self._current = None  # (livro, capítulo, versículo)
+        self._container = False
+        self._text: List[str] = []
+        self._skip = 0
+
+    @staticmethod
+    def _reference(osis_id: str):
+        parts = osis_id.split()[0].split(".")
+        if len(parts) < 3 or not parts[1].isdigit() or not parts[2].isdigit():
+            return None
+        book = _OSIS_POSITIONS.get(parts[0].lower())
+        return (book, int(parts[1]), int(parts[2])) if book else None
+
+    def _finish(self):
+        if self._current is not None:
+            text = _clean("".join(self._text))
+            if text:
+                self.verses.append(ParsedVerse(*self._current, text))
+        self._current = None
+        self._text = []
+
+    def startElement(self, name, attrs):
+        tag = name.rsplit(":", 1)[-1]
+        if tag == "note":
+            self._skip += 1
+        elif tag == "verse":
+            if "eID" in attrs:
+                self._finish()
+            elif "osisID" in attrs:
+                self._finish()
+                self._current = self._reference(attrs["osisID"])
+                self._container = "sID" not in attrs
+        elif tag == "chapter" and "eID" in attrs:
+            self._finish()
+
+    def endElement(self, name):
+        tag = name.rsplit(":", 1)[-1]
+        if tag == "note":
+            self._skip -= 1
+        elif tag == "verse" and self._container:
+            self._finish()
+            self._container = False
+
+    def characters(self, content):
+        if self._current is not None and not self._skip:
+            self._text.append(content)
+
+    def endDocument(self):
+        self._finish()
+
+
+def read_osis(path: str) -> Iterator[ParsedVerse]:
+    """Versículos de um documento OSIS, lido em blocos."""
+    handler = _OsisHandler()
+    parser = xml.sax.make_parser()
+    parser.setContentHandler(handler)
+    with open(path, "rb") as source:
+        while True:
+            chunk = source.read(_READ_SIZE)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            yield from handler.verses
+            handler.verses.clear()
+    parser.close()
+    yield from handler.verses
+
+
+# USFM
+
+_USFM_MARKER = re.compile(r"\\(\+?[a-z]+\d*)\*?\s*(.*)", re.S)
+# Notas de rodapé e referências cruzadas, com o conteúdo
+_USFM_NOTES = re.compile(r"\\(f|fe|ef|x|ex)\s.*?\\\1\*", re.S)
+# Atributos de palavra (\w graça|strong="G5485"\w*)
+_USFM_ATTRIBUTES = re.compile(r"\|[^\\]*")
+_USFM_INLINE = re.compile(r"\\\+?[a-z]+\d*\*?")
+_USFM_VERSE = re.compile(r"\\v\s+(\d+)\S*\s*")
+
+# Marcadores cujo conteúdo não é texto de versículo
+_USFM_SKIP = frozenset("""
+id ide h toc toca mt mte ms mr s sr r d sp rem usfm cl cd sts restore periph
+imt is ip ipi im io iot ili ie
+""".split())
+
+
+def _usfm_text(value: str) -> str:
+    value = _USFM_NOTES.sub("", value)
+    value = _USFM_ATTRIBUTES.sub("", value)
+    return _USFM_INLINE.sub("", value)
+
+
+def _usfm_files(path: str) -> List[str]:
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if os.path.splitext(name)[1].lower() in (".usfm", ".sfm", ".ptx"))
+
+
+def read_usfm(path: str) -> Iterator[ParsedVerse]:
+    """Versículos de um arquivo USFM ou de um diretório com um livro por arquivo."""
+    for file_path in _usfm_files(path):
+        book = chapter = verse = None
+        text: List[str] = []
+
+        def finish():
+            if book and chapter and verse:
+                cleaned = _clean(_usfm_text(" ".join(text)))
+                if cleaned:
+                    return ParsedVerse(book, chapter, verse, cleaned)
+            return None
+
+        with open(file_path, encoding="utf-8-sig") as source:
+            for line in source:
+                match = _USFM_MARKER.match(line.strip())
+                if match is None:
+                    if verse is not None:
+                        text.append(line)
+                    continue
+                marker, content = match.group(1), match.group(2)
+                base = marker.rstrip("0123456789")
+                if marker == "id":
+                    parsed = finish()
+                    if parsed:
+                        yield parsed
+                    book = _USFM_POSITIONS.get(content[:3].lower())
+                    chapter = verse = None
+                    text = []
+                elif marker == "c":
+                    parsed = finish()
+                    if parsed:
+                        yield parsed
+                    number = content.split()[0] if content.split() else ""
+                    chapter = int(number) if number.isdigit() else None
+                    verse = None
+                    text = []
+                elif base in _USFM_SKIP:
+                    continue
+                else:
+                    # Marcadores de parágrafo/poesia continuam o versículo atual;
+                    # \v pode aparecer mais de uma vez na mesma linha
+                    content = line.strip() if marker == "v" else content
+                    parts = _USFM_VERSE.split(content)
+                    if verse is not None:
+                        text.append(parts[0])
+                    for number, rest in zip(parts[1::2], parts[2::2]):
+                        parsed = finish()
+                        if parsed:
+                            yield parsed
+                        verse = int(number)
+                        text = [rest]
+        parsed = finish()
+        if parsed:
+            yield parsed
+
+
+# JSON
+
+def _json_verse(item: dict) -> Optional[ParsedVerse]:
+    book = book_position(item.get("book", item.get("book_id", "")))
+    if not book:
+        return None
+    text = _clean(str(item.get("text", "")))
+    if not text:
+        return None
+    return ParsedVerse(book, int(item["chapter"]), int(item["verse"]), text)
+
+
+def read_json(path: str) -> Iterator[ParsedVerse]:
+    """Versículos de um arquivo JSON (lista de livros ou de versículos) ou JSON Lines."""
+    if path.lower().endswith(".jsonl"):
+        with open(path, encoding="utf-8-sig") as source:
+            for line in source:
+                if line.strip():
+                    parsed = _json_verse(json.loads(line))
+                    if parsed:
+                        yield parsed
+        return
+
+    with open(path, encoding="utf-8-sig") as source:
+        data = json.load(source)
+    if isinstance(data, dict):
+        data = data.get("books") or data.get("verses") or []
+
+    for index, item in enumerate(data, 1):
+        if "chapters" not in item:
+            parsed = _json_verse(item)
+            if parsed:
+                yield parsed
+            continue
+        book = None
+        for key in ("abbrev", "abbreviation", "name", "book"):
+            if item.get(key):
+                book = book_position(str(item[key]))
+                if book:
+                    break
+        # Sem nome reconhecido, uma lista de 66 livros segue a ordem canônica
+        book = book or (index if len(data) == 66 else None)
+        if not book:
+            continue
+        for chapter, verses in enumerate(item["chapters"], 1):
+            for verse, text in enumerate(verses, 1):
+                text = _clean(str(text))
+                if text:
+                    yield ParsedVerse(book, chapter, verse, text)
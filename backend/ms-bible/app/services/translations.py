@@ -0,0 +1,334 @@
+"""
+Traduções da Bíblia: carga em massa e tradução ativa.
+
+Cada tradução tem os seus livros (`bible_books.translation_id`), capítulos
+e versículos. As leituras no Postgres filtram pela tradução ativa com
+`active_translation_clause()`, avaliado dentro da própria consulta, e os
+artefatos (armazenamento de versículos, índice, relacionados) são gerados
+a partir dela. Dados importados antes das traduções (`translation_id` nulo)
+continuam visíveis enquanto nenhuma tradução estiver ativa.
+
+Cada artefato grava o código da tradução de que foi gerado. Na
+inicialização o serviço compara esse código com a tradução ativa e recusa
+artefatos de outra tradução (as leituras voltam ao Postgres e o índice de
+busca é reconstruído do banco). Depois de ativar uma tradução, regere os
+artefatos e reinicie o serviço: workers em execução só olham a tradução ao
+iniciar.
+
+A carga (`TranslationService.load`) roda em uma única transação:
+
+1. os versículos lidos em streaming vão em lotes, via COPY, para uma tabela
+   temporária;
+2. livros, capítulos e versículos são inseridos com INSERT ... SELECT
+   ordenados, sem ORM por linha;
+3. em um banco vazio os índices GIN de busca são removidos antes e
+   recriados depois da carga (mais rápido que mantê-los linha a linha);
+4. a tradução nova é marcada como ativa no mesmo commit.
+
+Até o commit nada da tradução nova é visível, e depois dele todas as
+consultas passam a vê-la de uma vez: nenhuma leitura encontra uma versão
+pela metade.
+"""
+import io
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, exists, insert, or_, select, text, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from ..infrastructure.search import SEARCH_INDEXES
+from ..models.bible_models import Book, Translation
+from .reference_parser import BOOK_NAMES
+from .translation_formats import ParsedVerse
+
+logger = logging.getLogger(__name__)
+
+# Versículos por COPY
+COPY_BATCH_ROWS = 5000
+
+# Cargas simultâneas são serializadas por este advisory lock
+_LOAD_LOCK_ID = 460_470
+
+# Livros do Antigo Testamento (posições 1-39)
+_OLD_TESTAMENT_BOOKS = 39
+
+# Tradução dos artefatos gerados quando nenhuma tradução está ativa
+NO_TRANSLATION = ""
+
+_CREATE_STAGING = """
+CREATE TEMP TABLE load_verses (
+    book smallint NOT NULL,
+    chapter smallint NOT NULL,
+    verse smallint NOT NULL,
+    text text NOT NULL
+) ON COMMIT DROP;
+CREATE TEMP TABLE load_books (
+    position smallint PRIMARY KEY,
+    id integer NOT NULL
+) ON COMMIT DROP
+"""
+
+_INSERT_CHAPTERS = """
+INSERT INTO bible_chapters (book_id, number)
+SELECT b.id, v.chapter
+FROM (SELECT DISTINCT book, chapter FROM load_verses) v
+JOIN load_books b ON b.position = v.book
+ORDER BY v.book, v.chapter
+"""
+
+_INSERT_VERSES = """
+INSERT INTO bible_verses (chapter_id, number, text)
+SELECT c.id, v.verse, v.text
+FROM load_verses v
+JOIN load_books b ON b.position = v.book
+JOIN bible_chapters c ON c.book_id = b.id AND c.number = v.chapter
+ORDER BY v.book, v.chapter, v.verse
+"""
+
+
+def active_translation_clause():
+    """
+    Filtro dos livros da tradução ativa (ou dos livros sem tradução, se
+    nenhuma estiver ativa), para consultas que já fazem join com Book.
+    """
+    active = select(Translation.id).where(Translation.active.is_(True))
+    return or_(
+        Book.translation_id == active.scalar_subquery(),
+        and_(Book.translation_id.is_(None), ~exists(active))
+    )
+
+
+def active_translation_code(db: Session) -> str:
+    """Código da tradução ativa (NO_TRANSLATION se nenhuma estiver ativa)."""
+    code = db.execute(
+        select(Translation.code).where(Translation.active.is_(True))).scalar()
+    return code or NO_TRANSLATION
+
+
+def snapshot_translation(db: Session) -> str:
+    """
+    Fixa um snapshot para as leituras da sessão e retorna a tradução ativa.
+
+    Em REPEATABLE READ todas as consultas seguintes veem o mesmo estado do
+    banco: uma ativação durante a geração de um artefato não mistura a
+    tradução gravada com os versículos lidos. Chamar antes de qualquer
+    consulta da sessão.
+    """
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    return active_translation_code(db)
+
+
+def current_translation() -> Optional[str]:
+    """
+    Tradução ativa lida do banco, para validar os artefatos na inicialização.
+
+    Returns:
+        Código da tradução ou None se o banco estiver indisponível
+    """
+    from ..infrastructure.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        return active_translation_code(db)
+    except SQLAlchemyError as e:
+        logger.warning(f"Erro ao ler a tradução ativa: {str(e)}")
+        return None
+    finally:
+        db.close()
+
+
+def artifact_matches(name: str, artifact_translation: str, translation: Optional[str]) -> bool:
+    """
+    Confere a tradução gravada no artefato com a ativa.
+
+    Sem banco (`translation` None) o artefato é aceito como está.
+    """
+    if translation is None or artifact_translation == translation:
+        return True
+    logger.warning(
+        f"{name} gerado para a tradução '{artifact_translation or '-'}', mas a ativa é "
+        f"'{translation or '-'}'; regere os artefatos")
+    return False
+
+
+def _copy_escape(value: str) -> str:
+    """Valor no formato texto do COPY."""
+    return (value.replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+class TranslationService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_translations(self) -> List[Translation]:
+        return self.db.execute(select(Translation).order_by(Translation.code)).scalars().all()
+
+    def activate(self, code: str) -> Translation:
+        """
+        Torna a tradução a ativa.
+
+        Raises:
+            LookupError: Se a tradução não existir
+        """
+        translation = self.db.execute(
+            select(Translation).where(Translation.code == code)).scalar_one_or_none()
+        if translation is None:
+            raise LookupError(f"Tradução {code} não encontrada")
+        try:
+            self._switch(translation.id)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+        return translation
+
+    def _switch(self, translation_id: int) -> None:
+        # Dois comandos na mesma transação: o índice único parcial não admite
+        # duas ativas nem no meio de um único UPDATE
+        self.db.execute(
+            update(Translation).where(Translation.active.is_(True)).values(active=False))
+        self.db.execute(
+            update(Translation).where(Translation.id == translation_id).values(active=True))
+
+    def load(
+        self,
+        code: str,
+        name: str,
+        verses: Iterable[ParsedVerse],
+        activate: bool = True,
+        batch_size: int = COPY_BATCH_ROWS,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Dict[str, float]:
+        """
+        Carrega uma tradução inteira em uma transação.
+
+        Args:
+            code: Código da tradução ("ARA", "NVI", "ACF")
+            name: Nome completo
+            verses: Versículos lidos (ver translation_formats)
+            activate: Torna a tradução a ativa no mesmo commit
+            batch_size: Versículos por COPY
+            progress: Chamado com o total de versículos copiados a cada lote
+
+        Returns:
+            Contagens e tempos de cada etapa, em segundos
+
+        Raises:
+            ValueError: Se a tradução já existir, estiver vazia ou repetir versículos
+        """
+        started = time.perf_counter()
+        try:
+            self.db.execute(select(text(f"pg_advisory_xact_lock({_LOAD_LOCK_ID})")))
+            if self.db.execute(select(Translation.id).where(Translation.code == code)).first():
+                raise ValueError(f"Tradução {code} já carregada")
+
+            translation = Translation(code=code, name=name, active=False)
+            self.db.add(translation)
+            self.db.flush()
+
+            self.db.execute(text(_CREATE_STAGING))
+            rows = self._copy(verses, batch_size, progress)
+            if not rows:
+                raise ValueError("Nenhum versículo encontrado na fonte")
+            duplicate = self.db.execute(text(
+                "SELECT book, chapter, verse FROM load_verses "
+                "GROUP BY book, chapter, verse HAVING count(*) > 1 LIMIT 1")).first()
+            if duplicate:
+                raise ValueError(
+                    f"Versículo repetido: livro {duplicate[0]}, {duplicate[1]}:{duplicate[2]}")
+            copied = time.perf_counter()
+
+            # Banco vazio: índices de busca recriados depois, de uma vez
+            rebuild_indexes = not self.db.execute(text("SELECT 1 FROM bible_verses LIMIT 1")).first()
+            if rebuild_indexes:
+                for index in SEARCH_INDEXES:
+                    self.db.execute(text(f"DROP INDEX IF EXISTS {index}"))
+
+            books = self._insert_books(translation.id)
+            chapters = self.db.execute(text(_INSERT_CHAPTERS)).rowcount
+            inserted = self.db.execute(text(_INSERT_VERSES)).rowcount
+            written = time.perf_counter()
+
+            if rebuild_indexes:
+                self.db.execute(text("SET LOCAL maintenance_work_mem = '128MB'"))
+                for ddl in SEARCH_INDEXES.values():
+                    self.db.execute(text(ddl))
+            for table in ("bible_books", "bible_chapters", "bible_verses"):
+                self.db.execute(text(f"ANALYZE {table}"))
+            indexed = time.perf_counter()
+
+            translation.verse_count = inserted
+            if activate:
+                self._switch(translation.id)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        total = time.perf_counter() - started
+        return {
+            "books": books,
+            "chapters": chapters,
+            "verses": inserted,
+            "copy_seconds": copied - started,
+            "insert_seconds": written - copied,
+            "index_seconds": indexed - written,
+            "total_seconds": total,
+            "rows_per_second": inserted / total if total else 0.0,
+            "indexes_rebuilt": rebuild_indexes,
+        }
+
+    def _copy(
+        self,
+        verses: Iterable[ParsedVerse],
+        batch_size: int,
+        progress: Optional[Callable[[int], None]]
+    ) -> int:
+        """Copia os versículos para a tabela temporária em lotes."""
+        cursor = self.db.connection().connection.cursor()
+        rows = 0
+        buffer = io.StringIO()
+        pending = 0
+        try:
+            for verse in verses:
+                buffer.write(f"{verse.book}\t{verse.chapter}\t{verse.verse}\t"
+                             f"{_copy_escape(verse.text)}\n")
+                pending += 1
+                if pending == batch_size:
+                    rows += self._flush(cursor, buffer, pending, progress, rows)
+                    buffer, pending = io.StringIO(), 0
+            if pending:
+                rows += self._flush(cursor, buffer, pending, progress, rows)
+        finally:
+            cursor.close()
+        return rows
+
+    @staticmethod
+    def _flush(cursor, buffer: io.StringIO, pending: int, progress, rows: int) -> int:
+        buffer.seek(0)
+        cursor.copy_expert("COPY load_verses (book, chapter, verse, text) FROM STDIN", buffer)
+        if progress:
+            progress(rows + pending)
+        return pending
+
+    def _insert_books(self, translation_id: int) -> int:
+        """Livros presentes na fonte, na ordem canônica."""
+        positions = self.db.execute(
+            text("SELECT DISTINCT book FROM load_verses ORDER BY book")).scalars().all()
+        mapping = []
+        for position in positions:
+            book_id = self.db.execute(
+                insert(Book)
+                .values(
+                    name=BOOK_NAMES[position],
+                    testament="Antigo" if position <= _OLD_TESTAMENT_BOOKS else "Novo",
+                    translation_id=translation_id)
+                .returning(Book.id)
+            ).scalar()
+            mapping.append({"position": position, "id": book_id})
+        self.db.execute(
+            text("INSERT INTO load_books (position, id) VALUES (:position, :id)"), mapping)
+        return len(mapping)
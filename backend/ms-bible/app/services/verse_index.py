@@ -0,0 +1,752 @@
+"""
+Índice invertido em memória para a busca de versículos.
+
+O texto bíblico é imutável e pequeno (~31 mil versículos), então cada worker
+pode manter o índice inteiro em arrays NumPy e responder buscas sem acessar o
+banco. Os tokens são normalizados (minúsculas, sem acentos) e reduzidos por
+um stemmer leve de plurais; cada termo aponta para um intervalo de arrays
+ordenados (layout CSR):
+
+- `post_docs[post_offsets[t]:post_offsets[t + 1]]`: documentos do termo t
+- `post_tf`: frequência do termo em cada documento
+- `positions[pos_offsets[p]:pos_offsets[p + 1]]`: posições da postagem p
+
+AND/OR viram interseção/união de arrays ordenados, prefixos expandem um
+intervalo do vocabulário ordenado e frases verificam posições consecutivas
+apenas nos candidatos da interseção. O ranking é BM25 vetorizado.
+
+Palavras fora do vocabulário (erros de digitação) são corrigidas por uma
+busca de distância de edição limitada no vocabulário ordenado, percorrido
+como uma trie implícita: cada nó é o intervalo de termos com o mesmo
+prefixo, e ramos cuja distância mínima já excede o limite são podados. A
+busca só visita prefixos próximos da palavra, nunca os versículos; os
+termos corrigidos entram na consulta com peso menor e formam a sugestão
+"você quis dizer".
+
+O índice é gerado a partir do Postgres (`VerseIndex.build`) e salvo como
+artefato `.npz` pelo script `build_verse_index`; na inicialização o serviço
+carrega o artefato ou, se ele não existir ou for de outra tradução que não a
+ativa, constrói o índice a partir do banco.
+"""
+import logging
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from ..schemas.bible_schemas import VerseSearchHit, VerseSearchResponse
+from .search_service import TESTAMENTS, decode_search_cursor, encode_search_cursor
+
+logger = logging.getLogger(__name__)
+
+# Caminho do artefato pré-gerado do índice
+VERSE_INDEX_PATH = os.getenv("VERSE_INDEX_PATH", "data/verse_index.npz")
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Máximo de termos do vocabulário expandidos por um prefixo
+MAX_PREFIX_TERMS = 256
+
+# Erros de digitação tolerados pelo tamanho da palavra (a partir de N letras)
+FUZZY_MIN_LENGTH = 4
+FUZZY_TWO_EDITS_LENGTH = 8
+
+# Máximo de termos do vocabulário usados por palavra corrigida
+MAX_FUZZY_TERMS = 5
+
+# Palavras corrigidas guardadas por processo (consultas se repetem muito)
+CORRECTIONS_CACHE_SIZE = 4096
+
+# Bits reservados para a posição nas chaves (documento, posição) das frases
+_POSITION_BITS = 17
+
+_TOKEN = re.compile(r"\w+")
+_QUERY_PART = re.compile(r'"[^"]*"|\S+')
+
+# Palavras ignoradas fora de frases (aparecem em quase todos os versículos)
+STOPWORDS = frozenset("""
+a ao aos as com da das de do dos e em na nas no nos o os para pela pelas pelo
+pelos por que se um uma
+""".split())
+
+# Redução de plurais e advérbios (sobre o token já sem acentos)
+_SUFFIXES = (
+    ("mente", ""),
+    ("oes", "ao"),
+    ("aes", "ao"),
+    ("ais", "al"),
+    ("eis", "el"),
+    ("res", "r"),
+    ("zes", "z"),
+    ("ns", "m"),
+    ("s", ""),
+)
+
+
+def normalize(value: str) -> str:
+    """Minúsculas e sem acentos."""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    return "".join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def stem(token: str) -> str:
+    """Stemmer leve: remove um sufixo de plural ou de advérbio."""
+    for suffix, replacement in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def tokenize(value: str) -> List[str]:
+    """Termos indexados de um texto, na ordem em que aparecem."""
+    return [stem(token) for token in _TOKEN.findall(normalize(value))]
+
+
+class VerseDocument(NamedTuple):
+    """Versículo usado na construção do índice."""
+    id: int
+    chapter_id: int
+    number: int
+    book_id: int
+    chapter_number: int
+    book_name: str
+    testament: str
+    text: str
+
+
+def max_edits(word: str) -> int:
+    """Distância de edição tolerada para a palavra."""
+    if len(word) >= FUZZY_TWO_EDITS_LENGTH:
+        return 2
+    return 1 if len(word) >= FUZZY_MIN_LENGTH else 0
+
+
+class ParsedQuery(NamedTuple):
+    """Consulta como OR de grupos; cada grupo é um AND de cláusulas."""
+    groups: List[List[Tuple[str, object]]]
+
+
+def parse_query(query: str) -> ParsedQuery:
+    """
+    Interpreta a consulta.
+
+    Sintaxe: palavras separadas por espaço são combinadas com AND, `OR`
+    separa alternativas, "entre aspas" é uma frase e `prefixo*` expande
+    para todos os termos com o prefixo.
+    """
+    groups: List[List[Tuple[str, object]]] = [[]]
+    for part in _QUERY_PART.findall(query):
+        if part in ("OR", "or", "|"):
+            if groups[-1]:
+                groups.append([])
+            continue
+        if part.startswith('"'):
+            words = tokenize(part.strip('"'))
+            if len(words) > 1:
+                groups[-1].append(("phrase", words))
+            elif words:
+                groups[-1].append(("term", words[0]))
+        elif part.endswith("*") and len(part) > 1:
+            prefix = normalize(part.rstrip("*"))
+            if prefix:
+                groups[-1].append(("prefix", prefix))
+        else:
+            groups[-1].extend(
+                ("term", word) for word in tokenize(part)
+                if word not in STOPWORDS)
+    return ParsedQuery([group for group in groups if group])
+
+
+class VerseIndex:
+    """Índice invertido imutável dos versículos (ver docstring do módulo)."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.verse_ids = arrays["verse_ids"]
+        self.chapter_ids = arrays["chapter_ids"]
+        self.numbers = arrays["numbers"]
+        self.book_ids = arrays["book_ids"]
+        self.chapter_numbers = arrays["chapter_numbers"]
+        self.testaments = arrays["testaments"]
+        self.doc_lengths = arrays["doc_lengths"]
+        self.post_offsets = arrays["post_offsets"]
+        self.post_docs = arrays["post_docs"]
+        self.post_tf = arrays["post_tf"]
+        self.pos_offsets = arrays["pos_offsets"]
+        self.positions = arrays["positions"]
+        self.book_name_ids = arrays["book_name_ids"]
+
+        self.terms: List[str] = list(arrays["terms"])
+        self.term_ids = {term: i for i, term in enumerate(self.terms)}
+        self.book_names: List[str] = list(arrays["book_names"])
+        self.texts: List[str] = list(arrays["texts"])
+        # Forma mais comum de cada termo no texto (artefatos antigos não têm)
+        self.surfaces: List[str] = list(arrays.get("surfaces") or self.terms)
+        # Tradução dos versículos (artefatos antigos: gerados sem tradução ativa)
+        self.translation = str(arrays.get("translation", ""))
+        self._corrections: Dict[str, List[Tuple[str, int]]] = {}
+
+        self.avg_length = float(self.doc_lengths.mean()) if len(self.doc_lengths) else 0.0
+        # Fator de normalização de tamanho do BM25 por documento
+        self._norm = (BM25_K1 * (1 - BM25_B + BM25_B * self.doc_lengths /
+                                 max(self.avg_length, 1.0))).astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.verse_ids)
+
+    # Construção e artefato
+
+    @classmethod
+    def build(cls, documents: Iterable[VerseDocument], translation: str = "") -> "VerseIndex":
+        """Constrói o índice a partir dos versículos da tradução informada."""
+        documents = sorted(documents, key=lambda doc: doc.id)
+        book_names = sorted({doc.book_name for doc in documents})
+        book_name_ids = {name: i for i, name in enumerate(book_names)}
+        testament_codes = {value: code for code, value in enumerate(TESTAMENTS.values(), 1)}
+
+        postings: Dict[str, List[Tuple[int, List[int]]]] = {}
+        surfaces: Dict[str, Counter] = {}
+        doc_lengths = np.zeros(len(documents), dtype=np.float32)
+        for doc_index, doc in enumerate(documents):
+            term_positions: Dict[str, List[int]] = {}
+            tokens = tokenize(doc.text or "")
+            for position, term in enumerate(tokens):
+                term_positions.setdefault(term, []).append(position)
+            words = _TOKEN.findall((doc.text or "").lower())
+            if len(words) == len(tokens):
+                for term, word in zip(tokens, words):
+                    surfaces.setdefault(term, Counter())[word] += 1
+            for term, term_pos in term_positions.items():
+                postings.setdefault(term, []).append((doc_index, term_pos))
+            doc_lengths[doc_index] = len(tokens)
+
+        terms = sorted(postings)
+        post_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        post_docs, post_tf, pos_lengths, positions = [], [], [], []
+        for i, term in enumerate(terms):
+            for doc_index, term_pos in postings[term]:
+                post_docs.append(doc_index)
+                post_tf.append(len(term_pos))
+                pos_lengths.append(len(term_pos))
+                positions.extend(term_pos)
+            post_offsets[i + 1] = len(post_docs)
+
+        pos_offsets = np.zeros(len(post_docs) + 1, dtype=np.int64)
+        np.cumsum(pos_lengths, out=pos_offsets[1:])
+
+        return cls({
+            "verse_ids": np.array([doc.id for doc in documents], dtype=np.int32),
+            "chapter_ids": np.array([doc.chapter_id for doc in documents], dtype=np.int32),
+            "numbers": np.array([doc.number for doc in documents], dtype=np.int16),
+            "book_ids": np.array([doc.book_id for doc in documents], dtype=np.int16),
+            "chapter_numbers": np.array([doc.chapter_number for doc in documents], dtype=np.int16),
+            "book_name_ids": np.array([book_name_ids[doc.book_name] for doc in documents], dtype=np.int16),
+            "testaments": np.array([testament_codes.get(doc.testament, 0) for doc in documents], dtype=np.int8),
+            "doc_lengths": doc_lengths,
+            "post_offsets": post_offsets,
+            "post_docs": np.array(post_docs, dtype=np.int32),
+            "post_tf": np.array(post_tf, dtype=np.uint16),
+            "pos_offsets": pos_offsets,
+            "positions": np.array(positions, dtype=np.uint16),
+            "terms": terms,
+            "book_names": book_names,
+            "texts": [doc.text or "" for doc in documents],
+            "surfaces": [
+                surfaces[term].most_common(1)[0][0] if term in surfaces else term
+                for term in terms
+            ],
+            "translation": translation,
+        })
+
+    def save(self, path: str) -> None:
+        """Grava o artefato (escrita atômica: arquivo temporário + rename)."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(
+            tmp_path,
+            verse_ids=self.verse_ids,
+            chapter_ids=self.chapter_ids,
+            numbers=self.numbers,
+            book_ids=self.book_ids,
+            chapter_numbers=self.chapter_numbers,
+            book_name_ids=self.book_name_ids,
+            testaments=self.testaments,
+            doc_lengths=self.doc_lengths,
+            post_offsets=self.post_offsets,
+            post_docs=self.post_docs,
+            post_tf=self.post_tf,
+            pos_offsets=self.pos_offsets,
+            positions=self.positions,
+            **_pack_strings("terms", self.terms),
+            **_pack_strings("book_names", self.book_names),
+            **_pack_strings("texts", self.texts),
+            **_pack_strings("surfaces", self.surfaces),
+            translation=np.array(self.translation),
+        )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "VerseIndex":
+        """Carrega um artefato gerado por `save`."""
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+        for name in ("terms", "book_names", "texts", "surfaces"):
+            if f"{name}_data" in arrays:
+                arrays[name] = _unpack_strings(arrays, name)
+        return cls(arrays)
+
+    # Consulta
+
+    def _term_postings(self, term_id: int) -> Tuple[int, int]:
+        return int(self.post_offsets[term_id]), int(self.post_offsets[term_id + 1])
+
+    def _docs(self, term: str) -> np.ndarray:
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            return np.empty(0, dtype=np.int32)
+        start, stop = self._term_postings(term_id)
+        return self.post_docs[start:stop]
+
+    def expand_prefix(self, prefix: str) -> List[str]:
+        """Termos do vocabulário que começam com o prefixo."""
+        start = bisect_left(self.terms, prefix)
+        stop = bisect_left(self.terms, prefix + "\uffff", lo=start)
+        return self.terms[start:min(stop, start + MAX_PREFIX_TERMS)]
+
+    def fuzzy_terms(self, word: str, edits: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Termos do vocabulário a até `edits` edições da palavra (inserção,
+        remoção, troca ou transposição de letras vizinhas).
+
+        O vocabulário ordenado é percorrido como trie: a linha da matriz de
+        distâncias é estendida uma letra por nó e o ramo é abandonado quando
+        o menor valor da linha passa do limite.
+
+        Returns:
+            (id do termo, distância), do mais próximo e frequente ao menos
+        """
+        edits = max_edits(word) if edits is None else edits
+        if not edits or not self.terms:
+            return []
+
+        terms = self.terms
+        size = len(word)
+        # Valores acima do limite são todos equivalentes: fora da faixa
+        # |depth - k| <= edits a linha nem é calculada
+        over = edits + 1
+        found: List[Tuple[int, int]] = []
+        first_row = [min(k, over) for k in range(size + 1)]
+
+        def walk(lo, hi, depth, row, previous_row, previous_char):
+            # terms[lo:hi] têm o mesmo prefixo de tamanho depth; o termo igual
+            # ao prefixo, se existir, vem primeiro
+            if len(terms[lo]) == depth:
+                if row[size] <= edits:
+                    found.append((lo, row[size]))
+                lo += 1
+            if depth >= size + edits:
+                return
+            i = depth + 1
+            first, last = max(1, i - edits), min(size, i + edits)
+            while lo < hi:
+                char = terms[lo][depth]
+                stop = bisect_left(terms, terms[lo][:depth] + chr(ord(char) + 1), lo, hi)
+                next_row = [over] * (size + 1)
+                next_row[0] = min(i, over)
+                best = next_row[0]
+                for k in range(first, last + 1):
+                    cost = row[k - 1] if word[k - 1] == char else row[k - 1] + 1
+                    if row[k] + 1 < cost:
+                        cost = row[k] + 1
+                    if next_row[k - 1] + 1 < cost:
+                        cost = next_row[k - 1] + 1
+                    if (k > 1 and previous_char == word[k - 1] and word[k - 2] == char
+                            and previous_row[k - 2] + 1 < cost):
+                        cost = previous_row[k - 2] + 1
+                    next_row[k] = cost if cost < over else over
+                    if cost < best:
+                        best = cost
+                if best <= edits:
+                    walk(lo, stop, i, next_row, row, char)
+                lo = stop
+
+        walk(0, len(terms), 0, first_row, None, None)
+        df = self.post_offsets[1:] - self.post_offsets[:-1]
+        found.sort(key=lambda item: (item[1], -int(df[item[0]]), item[0]))
+        return found
+
+    def corrections(self, query: str) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        Correções das palavras da consulta que não estão no vocabulário.
+
+        Returns:
+            Termo digitado -> até MAX_FUZZY_TERMS (termo, distância)
+        """
+        corrections = {}
+        for word in tokenize(query):
+            if word in self.term_ids or word in STOPWORDS or word in corrections:
+                continue
+            candidates = self._correct(word)
+            if candidates:
+                corrections[word] = candidates
+        return corrections
+
+    def _correct(self, word: str) -> List[Tuple[str, int]]:
+        """
+        Correções de uma palavra, com cache. A busca com duas edições (a mais
+        cara) só é feita quando nenhuma correção a uma edição é encontrada.
+        """
+        cached = self._corrections.get(word)
+        if cached is not None:
+            return cached
+
+        candidates = []
+        for edits in range(1, max_edits(word) + 1):
+            candidates = self.fuzzy_terms(word, edits)
+            if candidates:
+                break
+        cached = [(self.terms[term_id], distance)
+                  for term_id, distance in candidates[:MAX_FUZZY_TERMS]]
+        if len(self._corrections) >= CORRECTIONS_CACHE_SIZE:
+            self._corrections.clear()
+        self._corrections[word] = cached
+        return cached
+
+    def suggest(self, query: str, corrections: Dict[str, List[Tuple[str, int]]]) -> Optional[str]:
+        """Consulta com cada palavra corrigida trocada pela melhor correção."""
+        if not corrections:
+            return None
+
+        def replace(match):
+            word = stem(normalize(match[0]))
+            if word not in corrections:
+                return match[0]
+            return self.surfaces[self.term_ids[corrections[word][0][0]]]
+
+        return _TOKEN.sub(replace, query)
+
+    def _position_keys(self, term_id: int, docs: np.ndarray, shift: int) -> np.ndarray:
+        """
+        Chaves (documento, posição + shift) das ocorrências do termo nos
+        documentos informados, em ordem crescente.
+        """
+        start, stop = self._term_postings(term_id)
+        postings = start + np.searchsorted(self.post_docs[start:stop], docs)
+        first = self.pos_offsets[postings]
+        lengths = self.pos_offsets[postings + 1] - first
+        # Índice de cada posição: início da postagem + deslocamento dentro dela
+        within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        positions = self.positions[np.repeat(first, lengths) + within].astype(np.int64)
+        return (np.repeat(docs.astype(np.int64), lengths) << _POSITION_BITS) | (positions + shift)
+
+    def _phrase_docs(self, words: List[str]) -> np.ndarray:
+        term_ids = [self.term_ids.get(word) for word in words]
+        if any(term_id is None for term_id in term_ids):
+            return np.empty(0, dtype=np.int32)
+
+        candidates = _intersect([self._docs(word) for word in words])
+        # A i-ésima palavra desloca suas posições em -i: uma frase na posição
+        # p gera a mesma chave (documento, p + n) para todas as palavras
+        n = len(term_ids)
+        keys = None
+        for i, term_id in enumerate(term_ids):
+            if not len(candidates):
+                break
+            term_keys = self._position_keys(term_id, candidates, n - i)
+            keys = term_keys if keys is None else np.intersect1d(
+                keys, term_keys, assume_unique=True)
+            candidates = np.unique(keys >> _POSITION_BITS).astype(np.int32)
+        return candidates
+
+    def _clause(self, kind: str, value) -> Tuple[np.ndarray, List[str]]:
+        """Documentos e termos pontuados de uma cláusula."""
+        if kind == "term":
+            return self._docs(value), [value]
+        if kind == "fuzzy":
+            docs = [self._docs(term) for term, _ in value]
+            return np.unique(np.concatenate(docs)), [term for term, _ in value]
+        if kind == "prefix":
+            terms = self.expand_prefix(value)
+            docs = [self._docs(term) for term in terms]
+            return (np.unique(np.concatenate(docs)) if docs
+                    else np.empty(0, dtype=np.int32)), terms
+        return self._phrase_docs(value), list(value)
+
+    def match(self, parsed: ParsedQuery) -> Tuple[np.ndarray, List[str]]:
+        """
+        Documentos que satisfazem a consulta.
+
+        Returns:
+            Índices de documentos (ordenados) e os termos usados no ranking
+        """
+        matched = np.empty(0, dtype=np.int32)
+        scoring: List[str] = []
+        for group in parsed.groups:
+            clauses = [self._clause(kind, value) for kind, value in group]
+            docs = _intersect([docs for docs, _ in clauses])
+            matched = np.union1d(matched, docs) if len(matched) else docs
+            for _, terms in clauses:
+                scoring.extend(terms)
+        return matched, list(dict.fromkeys(scoring))
+
+    def bm25(
+        self,
+        docs: np.ndarray,
+        terms: List[str],
+        weights: Optional[Dict[str, float]] = None
+    ) -> np.ndarray:
+        """
+        Pontuação BM25 dos documentos para os termos.
+
+        As contribuições de cada termo são somadas sobre toda a lista de
+        postagens em um vetor denso (O(df) por termo) e lidas nos documentos;
+        `weights` reduz o peso de termos vindos de correções.
+        """
+        if not len(docs):
+            return np.zeros(0, dtype=np.float32)
+
+        dense = np.zeros(len(self), dtype=np.float32)
+        total = len(self)
+        for term in terms:
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, stop = self._term_postings(term_id)
+            term_docs = self.post_docs[start:stop]
+            tf = self.post_tf[start:stop].astype(np.float32)
+            df = stop - start
+            idf = np.float32(np.log(1 + (total - df + 0.5) / (df + 0.5)))
+            if weights and term in weights:
+                idf *= np.float32(weights[term])
+            dense[term_docs] += idf * tf * (BM25_K1 + 1) / (tf + self._norm[term_docs])
+        return dense[docs]
+
+    def search(
+        self,
+        query: str,
+        testament: Optional[str] = None,
+        book_id: Optional[int] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        phrase: bool = False,
+        fuzzy: bool = True
+    ) -> VerseSearchResponse:
+        """
+        Busca versículos por relevância (BM25) sem acessar o banco.
+
+        Mesmos parâmetros e resposta de `VerseSearchService.search`; com
+        `phrase`, o texto inteiro é tratado como uma frase. Com `fuzzy`,
+        palavras fora do vocabulário são trocadas pelas correções (em frases,
+        pela melhor delas); a sugestão é devolvida em qualquer caso.
+
+        Raises:
+            ValueError: Se o cursor ou o testamento forem inválidos
+        """
+        parsed = parse_query(f'"{query.replace(chr(34), " ")}"' if phrase else query)
+        corrections = self.corrections(query)
+        weights = None
+        if fuzzy and corrections:
+            parsed = _apply_corrections(parsed, corrections)
+            weights = {term: 1 / (1 + distance)
+                       for candidates in corrections.values() for term, distance in candidates}
+        docs, terms = self.match(parsed)
+
+        if testament:
+            if testament not in TESTAMENTS:
+                raise ValueError("Testamento inválido. Use 'old' ou 'new'")
+            code = list(TESTAMENTS).index(testament) + 1
+            docs = docs[self.testaments[docs] == code]
+        if book_id:
+            docs = docs[self.book_ids[docs] == book_id]
+
+        scores = self.bm25(docs, terms, weights)
+        verse_ids = self.verse_ids[docs]
+
+        if cursor:
+            last_score, last_id = decode_search_cursor(cursor)
+            last_score = np.float32(last_score)
+            keep = (scores < last_score) | ((scores == last_score) & (verse_ids > last_id))
+            docs, scores, verse_ids = docs[keep], scores[keep], verse_ids[keep]
+
+        # Top-k parcial: mantém tudo que empata com o corte para que o
+        # desempate por id seja o mesmo entre páginas
+        if len(docs) > limit + 1:
+            threshold = np.partition(scores, len(scores) - limit - 1)[len(scores) - limit - 1]
+            top = scores >= threshold
+            docs, scores, verse_ids = docs[top], scores[top], verse_ids[top]
+        order = np.lexsort((verse_ids, -scores))[:limit + 1]
+
+        next_cursor = None
+        if len(order) > limit:
+            order = order[:limit]
+            last = order[-1]
+            next_cursor = encode_search_cursor(float(scores[last]), int(verse_ids[last]))
+
+        term_ids = [self.term_ids[term] for term in terms if term in self.term_ids]
+        return VerseSearchResponse(
+            query=query,
+            items=[
+                self._hit(int(docs[i]), float(scores[i]), term_ids)
+                for i in order
+            ],
+            next_cursor=next_cursor,
+            suggestion=self.suggest(query, corrections)
+        )
+
+    def highlight(self, doc: int, term_ids: List[int]) -> str:
+        """Marca com <mark> as palavras do versículo nas posições dos termos."""
+        marked = set()
+        for term_id in term_ids:
+            start, stop = self._term_postings(term_id)
+            posting = start + int(np.searchsorted(self.post_docs[start:stop], doc))
+            if posting < stop and self.post_docs[posting] == doc:
+                marked.update(self.positions[
+                    self.pos_offsets[posting]:self.pos_offsets[posting + 1]].tolist())
+
+        text = self.texts[doc]
+        if not marked:
+            return text
+        parts, last = [], 0
+        for position, match in enumerate(_TOKEN.finditer(text)):
+            if position in marked:
+                parts.append(f"{text[last:match.start()]}<mark>{match[0]}</mark>")
+                last = match.end()
+        parts.append(text[last:])
+        return "".join(parts)
+
+    def _hit(self, doc: int, score: float, term_ids: List[int]) -> VerseSearchHit:
+        text = self.texts[doc]
+        return VerseSearchHit(
+            id=int(self.verse_ids[doc]),
+            chapter_id=int(self.chapter_ids[doc]),
+            number=int(self.numbers[doc]),
+            text=text,
+            book_id=int(self.book_ids[doc]),
+            book_name=self.book_names[self.book_name_ids[doc]],
+            chapter_number=int(self.chapter_numbers[doc]),
+            headline=self.highlight(doc, term_ids),
+            rank=score
+        )
+
+
+def _pack_strings(name: str, values: List[str]) -> Dict[str, np.ndarray]:
+    """Strings como bytes UTF-8 concatenados e offsets (sem pickle no .npz)."""
+    encoded = [value.encode() for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return {
+        f"{name}_data": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        f"{name}_offsets": offsets,
+    }
+
+
+def _unpack_strings(arrays: Dict[str, np.ndarray], name: str) -> List[str]:
+    data = arrays.pop(f"{name}_data").tobytes()
+    offsets = arrays.pop(f"{name}_offsets").tolist()
+    return [data[offsets[i]:offsets[i + 1]].decode() for i in range(len(offsets) - 1)]
+
+
+def _apply_corrections(
+    parsed: ParsedQuery,
+    corrections: Dict[str, List[Tuple[str, int]]]
+) -> ParsedQuery:
+    """Troca termos desconhecidos por cláusulas com as correções."""
+    groups = []
+    for group in parsed.groups:
+        clauses = []
+        for kind, value in group:
+            if kind == "term" and value in corrections:
+                clauses.append(("fuzzy", corrections[value]))
+            elif kind == "phrase":
+                clauses.append((kind, [
+                    corrections[word][0][0] if word in corrections else word
+                    for word in value
+                ]))
+            else:
+                clauses.append((kind, value))
+        groups.append(clauses)
+    return ParsedQuery(groups)
+
+
+def _intersect(arrays: List[np.ndarray]) -> np.ndarray:
+    """Interseção de arrays ordenados, começando pelo menor."""
+    if not arrays:
+        return np.empty(0, dtype=np.int32)
+    arrays = sorted(arrays, key=len)
+    result = arrays[0]
+    for other in arrays[1:]:
+        if not len(result):
+            break
+        result = np.intersect1d(result, other, assume_unique=True)
+    return result
+
+
+# Índice do processo (carregado na inicialização)
+_index: Optional[VerseIndex] = None
+_index_lock = threading.Lock()
+
+
+def load_documents(db) -> List[VerseDocument]:
+    """
+    Lê os versículos da tradução ativa do Postgres para construir o índice
+    (use `snapshot_translation` na mesma sessão para saber qual é ela).
+    """
+    from sqlalchemy import select
+
+    from ..models.bible_models import Book, Chapter, Verse
+    from .translations import active_translation_clause
+
+    rows = db.execute(
+        select(Verse.id, Verse.chapter_id, Verse.number, Chapter.book_id,
+               Chapter.number, Book.name, Book.testament, Verse.text)
+        .join(Chapter, Chapter.id == Verse.chapter_id)
+        .join(Book, Book.id == Chapter.book_id)
+        .where(active_translation_clause())
+    ).all()
+    return [VerseDocument(*row) for row in rows]
+
+
+def init_verse_index(path: str = VERSE_INDEX_PATH) -> Optional[VerseIndex]:
+    """
+    Carrega o artefato do índice ou o constrói a partir do banco.
+
+    Um artefato de outra tradução que não a ativa é ignorado e o índice é
+    construído do banco. Sem artefato e sem versículos no banco, a busca
+    continua no Postgres.
+    """
+    from .translations import artifact_matches, current_translation, snapshot_translation
+
+    global _index
+    with _index_lock:
+        if _index is not None:
+            return _index
+        if os.path.exists(path):
+            index = VerseIndex.load(path)
+            if artifact_matches("Índice de versículos", index.translation, current_translation()):
+                _index = index
+                logger.info(f"Índice de versículos carregado de {path}: {len(_index)} versículos")
+                return _index
+
+        from ..infrastructure.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            translation = snapshot_translation(db)
+            documents = load_documents(db)
+        finally:
+            db.close()
+        if documents:
+            _index = VerseIndex.build(documents, translation)
+            logger.info(f"Índice de versículos construído do banco: {len(_index)} versículos")
+        return _index
+
+
+def get_verse_index() -> Optional[VerseIndex]:
+    """Índice do processo ou None se ainda não foi carregado."""
+    return _index
@@ -0,0 +1,448 @@
+"""
+Armazenamento binário compacto do texto bíblico, aberto com mmap.
+
+O arquivo é gerado uma vez a partir do Postgres (`build_verse_store`) e
+contém tabelas de tamanho fixo (livros, capítulos, versículos, índices por
+id) seguidas de um blob UTF-8 contínuo com os textos. Cada worker do uvicorn
+abre o mesmo arquivo em modo somente leitura, então as páginas ficam uma
+única vez no page cache e são compartilhadas entre processos.
+
+Layout:
+
+    magic (8 bytes) | tamanho do cabeçalho (uint32) | cabeçalho JSON (4084) |
+    seções alinhadas em 8 bytes (arrays NumPy) | blob de textos
+
+Capítulos ficam em ordem de (livro, número) e versículos em ordem de
+(capítulo, número), então os versículos de um capítulo são um intervalo
+contínuo: a leitura de um capítulo é uma fatia do blob, sem ORM.
+
+O cabeçalho guarda a tradução de que o arquivo foi gerado; um arquivo de
+outra tradução que não a ativa não é aberto na inicialização.
+"""
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .reference_parser import book_abbreviation
+
+logger = logging.getLogger(__name__)
+
+# Caminho do arquivo gerado por scripts/build_verse_store.py
+VERSE_STORE_PATH = os.getenv("VERSE_STORE_PATH", "data/verse_store.bin")
+
+MAGIC = b"FCJBIBLE"
+FORMAT_VERSION = 1
+
+# Área reservada para o cabeçalho JSON (completada com espaços)
+HEADER_SIZE = 4084
+
+# Testamento gravado em bible_books -> código no arquivo -> valor da API
+TESTAMENT_CODES = {"Antigo": 1, "Novo": 2}
+TESTAMENT_NAMES = {1: "old", 2: "new"}
+
+BOOK_DTYPE = np.dtype([
+    ("id", "<i4"),
+    ("position", "<i2"),
+    ("testament", "i1"),
+    ("name_start", "<u4"),
+    ("name_length", "<u2"),
+    ("first_chapter", "<i4"),
+    ("chapter_count", "<i2"),
+])
+
+CHAPTER_DTYPE = np.dtype([
+    ("id", "<i4"),
+    ("book_index", "<i2"),
+    ("number", "<i2"),
+    ("first_verse", "<i4"),
+    ("verse_count", "<i2"),
+])
+
+VERSE_DTYPE = np.dtype([
+    ("id", "<i4"),
+    ("chapter_index", "<i4"),
+    ("number", "<i2"),
+])
+
+# Seções do arquivo: nome -> dtype
+SECTIONS = {
+    "books": BOOK_DTYPE,
+    "chapters": CHAPTER_DTYPE,
+    "verses": VERSE_DTYPE,
+    # Início de cada texto no blob (n + 1 offsets)
+    "text_offsets": np.dtype("<u4"),
+    # ids ordenados e a posição correspondente em cada tabela
+    "book_ids": np.dtype("<i4"),
+    "book_rows": np.dtype("<i4"),
+    "chapter_ids": np.dtype("<i4"),
+    "chapter_rows": np.dtype("<i4"),
+    "verse_ids": np.dtype("<i4"),
+    "verse_rows": np.dtype("<i4"),
+}
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def write_store(
+    path: str,
+    books: List[Tuple[int, str, str]],
+    chapters: List[Tuple[int, int, int]],
+    verses: List[Tuple[int, int, int, str]],
+    translation: str = ""
+) -> Dict[str, int]:
+    """
+    Grava o arquivo do armazenamento (temporário + rename).
+
+    Args:
+        path: Caminho de destino
+        books: Tuplas (id, nome, testamento)
+        chapters: Tuplas (id, book_id, número)
+        verses: Tuplas (id, chapter_id, número, texto)
+        translation: Código da tradução dos versículos
+
+    Returns:
+        Contagens gravadas (livros, capítulos, versículos, bytes de texto)
+    """
+    books = sorted(books)
+    book_index = {book_id: i for i, (book_id, _, _) in enumerate(books)}
+    chapters = sorted(
+        (c for c in chapters if c[1] in book_index),
+        key=lambda c: (book_index[c[1]], c[2]))
+    chapter_index = {chapter_id: i for i, (chapter_id, _, _) in enumerate(chapters)}
+    verses = sorted(
+        (v for v in verses if v[1] in chapter_index),
+        key=lambda v: (chapter_index[v[1]], v[2]))
+
+    # Textos dos versículos seguidos dos nomes dos livros
+    blob = bytearray()
+    text_offsets = np.zeros(len(verses) + 1, dtype="<u4")
+    verse_table = np.zeros(len(verses), dtype=VERSE_DTYPE)
+    chapter_table = np.zeros(len(chapters), dtype=CHAPTER_DTYPE)
+    book_table = np.zeros(len(books), dtype=BOOK_DTYPE)
+
+    for i, (verse_id, chapter_id, number, text) in enumerate(verses):
+        blob += (text or "").encode()
+        text_offsets[i + 1] = len(blob)
+        verse_table[i] = (verse_id, chapter_index[chapter_id], number)
+
+    chapter_rows = verse_table["chapter_index"]
+    first_verses = np.searchsorted(chapter_rows, np.arange(len(chapters)))
+    verse_counts = np.bincount(chapter_rows, minlength=len(chapters))
+    for i, (chapter_id, book_id, number) in enumerate(chapters):
+        chapter_table[i] = (chapter_id, book_index[book_id], number,
+                            first_verses[i], verse_counts[i])
+
+    book_rows = chapter_table["book_index"]
+    first_chapters = np.searchsorted(book_rows, np.arange(len(books)))
+    chapter_counts = np.bincount(book_rows, minlength=len(books))
+    for i, (book_id, name, testament) in enumerate(books):
+        encoded = name.encode()
+        book_table[i] = (book_id, i + 1, TESTAMENT_CODES.get(testament, 0),
+                         len(blob), len(encoded), first_chapters[i], chapter_counts[i])
+        blob += encoded
+
+    arrays = {
+        "books": book_table,
+        "chapters": chapter_table,
+        "verses": verse_table,
+        "text_offsets": text_offsets,
+    }
+    for name, table in (("book", book_table), ("chapter", chapter_table),
+                        ("verse", verse_table)):
+        order = np.argsort(table["id"], kind="stable").astype("<i4")
+        arrays[f"{name}_ids"] = table["id"][order].astype("<i4")
+        arrays[f"{name}_rows"] = order
+
+    # Seções começam após a área fixa do cabeçalho
+    sections = {}
+    offset = len(MAGIC) + 4 + HEADER_SIZE
+    for name, array in arrays.items():
+        sections[name] = {"count": len(array), "offset": offset}
+        offset = _align(offset + array.nbytes)
+    header = {
+        "version": FORMAT_VERSION,
+        "translation": translation,
+        "sections": sections,
+        "text": {"offset": offset, "length": len(blob)}
+    }
+    encoded_header = json.dumps(header).encode()
+    if len(encoded_header) > HEADER_SIZE:
+        raise ValueError("Cabeçalho do armazenamento excede a área reservada")
+    encoded_header = encoded_header.ljust(HEADER_SIZE)
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC + struct.pack("<I", len(encoded_header)) + encoded_header)
+        for name, array in arrays.items():
+            f.write(b"\0" * (sections[name]["offset"] - f.tell()))
+            f.write(array.tobytes())
+        f.write(b"\0" * (header["text"]["offset"] - f.tell()))
+        f.write(blob)
+    os.replace(tmp_path, path)
+
+    return {"books": len(books), "chapters": len(chapters),
+            "verses": len(verses), "text_bytes": len(blob)}
+
+
+class VerseStore:
+    """
+    Leitura do armazenamento mapeado em memória.
+
+    Os arrays são views NumPy sobre o mmap (sem cópia) e os textos são
+    decodificados apenas quando lidos. Os métodos retornam dicionários no
+    formato dos schemas da API.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} não é um armazenamento de versículos")
+        (header_length,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self._mmap[start:start + header_length])
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Versão {header['version']} do armazenamento não suportada")
+        # Arquivos anteriores às traduções: gerados sem tradução ativa
+        self.translation: str = header.get("translation", "")
+
+        for name, dtype in SECTIONS.items():
+            section = header["sections"][name]
+            setattr(self, f"_{name}", np.frombuffer(
+                self._mmap, dtype=dtype, count=section["count"], offset=section["offset"]))
+        self._text_start = header["text"]["offset"]
+        self._abbreviations = [
+            book_abbreviation(self._slice(int(book["name_start"]), int(book["name_length"])))
+            for book in self._books
+        ]
+
+    def close(self) -> None:
+        # As views NumPy exportam o buffer do mmap: são descartadas antes
+        for name in SECTIONS:
+            setattr(self, f"_{name}", None)
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self._verses)
+
+    # Acesso de baixo nível
+
+    @staticmethod
+    def _row(ids: np.ndarray, rows: np.ndarray, key: int) -> Optional[int]:
+        i = int(np.searchsorted(ids, key))
+        if i < len(ids) and ids[i] == key:
+            return int(rows[i])
+        return None
+
+    def _slice(self, start: int, length: int) -> str:
+        start += self._text_start
+        return self._mmap[start:start + length].decode()
+
+    def _text(self, verse_row: int) -> str:
+        start, stop = self._text_offsets[verse_row], self._text_offsets[verse_row + 1]
+        return self._slice(int(start), int(stop - start))
+
+    def book_row(self, book_id: int) -> Optional[int]:
+        return self._row(self._book_ids, self._book_rows, book_id)
+
+    def chapter_row(self, chapter_id: int) -> Optional[int]:
+        return self._row(self._chapter_ids, self._chapter_rows, chapter_id)
+
+    def verse_row(self, verse_id: int) -> Optional[int]:
+        return self._row(self._verse_ids, self._verse_rows, verse_id)
+
+    def chapter_row_by_number(self, book_row: int, number: int) -> Optional[int]:
+        """Linha do capítulo pelo número dentro do livro."""
+        book = self._books[book_row]
+        first, count = int(book["first_chapter"]), int(book["chapter_count"])
+        numbers = self._chapters["number"][first:first + count]
+        i = int(np.searchsorted(numbers, number))
+        return first + i if i < count and numbers[i] == number else None
+
+    def verse_rows_by_number(
+        self,
+        chapter_row: int,
+        first: int = 1,
+        last: Optional[int] = None
+    ) -> range:
+        """Linhas dos versículos [first, last] de um capítulo."""
+        chapter = self._chapters[chapter_row]
+        start, count = int(chapter["first_verse"]), int(chapter["verse_count"])
+        numbers = self._verses["number"][start:start + count]
+        lo = int(np.searchsorted(numbers, first))
+        hi = int(np.searchsorted(numbers, last, side="right")) if last is not None else count
+        return range(start + lo, start + max(lo, hi))
+
+    def chapter_verse_counts(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids dos capítulos e quantidade de versículos, na ordem do arquivo."""
+        return self._chapters["id"], self._chapters["verse_count"]
+
+    # Leituras no formato da API
+
+    def book(self, row: int) -> dict:
+        book = self._books[row]
+        return {
+            "id": int(book["id"]),
+            "name": self._slice(int(book["name_start"]), int(book["name_length"])),
+            "testament": TESTAMENT_NAMES.get(int(book["testament"])),
+            "abbreviation": self._abbreviations[row],
+            "position": int(book["position"]),
+            "chapters_count": int(book["chapter_count"]),
+        }
+
+    def books(self) -> List[dict]:
+        """Todos os livros, na ordem do arquivo."""
+        return [self.book(row) for row in range(len(self._books))]
+
+    def chapter(self, row: int) -> dict:
+        chapter = self._chapters[row]
+        return {
+            "id": int(chapter["id"]),
+            "book_id": int(self._books[chapter["book_index"]]["id"]),
+            "number": int(chapter["number"]),
+            "verses_count": int(chapter["verse_count"]),
+        }
+
+    def chapters(self, book_id: int) -> Optional[List[dict]]:
+        """Capítulos do livro ou None se o livro não existir."""
+        row = self.book_row(book_id)
+        if row is None:
+            return None
+        book = self._books[row]
+        first = int(book["first_chapter"])
+        return [self.chapter(first + i) for i in range(int(book["chapter_count"]))]
+
+    def verse(self, row: int) -> dict:
+        """Versículo com informações do capítulo e do livro."""
+        verse = self._verses[row]
+        chapter = self._chapters[verse["chapter_index"]]
+        book = self.book(int(chapter["book_index"]))
+        return {
+            "id": int(verse["id"]),
+            "chapter_id": int(chapter["id"]),
+            "book_id": book["id"],
+            "chapter_number": int(chapter["number"]),
+            "verse_number": int(verse["number"]),
+            "number": int(verse["number"]),
+            "text": self._text(row),
+            "book_name": book["name"],
+            "book_abbreviation": book["abbreviation"],
+            "testament": book["testament"],
+        }
+
+    def get_verse(self, verse_id: int) -> Optional[dict]:
+        row = self.verse_row(verse_id)
+        return self.verse(row) if row is not None else None
+
+    def chapter_verse_ids(self, chapter_id: int) -> Optional[List[int]]:
+        """Ids dos versículos do capítulo ou None se não existir."""
+        row = self.chapter_row(chapter_id)
+        if row is None:
+            return None
+        chapter = self._chapters[row]
+        start, count = int(chapter["first_verse"]), int(chapter["verse_count"])
+        return self._verses["id"][start:start + count].tolist()
+
+    def chapter_verses(self, chapter_id: int) -> Optional[dict]:
+        """
+        Capítulo com seus versículos ou None se não existir.
+
+        Os textos do capítulo são contínuos no blob: uma única fatia.
+        """
+        row = self.chapter_row(chapter_id)
+        if row is None:
+            return None
+        chapter = self._chapters[row]
+        start, count = int(chapter["first_verse"]), int(chapter["verse_count"])
+        offsets = self._text_offsets[start:start + count + 1].astype(np.int64)
+        raw = self._mmap[self._text_start + offsets[0]:self._text_start + offsets[-1]]
+        relative = (offsets - offsets[0]).tolist()
+        numbers = self._verses["number"][start:start + count].tolist()
+        ids = self._verses["id"][start:start + count].tolist()
+
+        book = self.book(int(chapter["book_index"]))
+        return {
+            "chapter_id": int(chapter["id"]),
+            "book_id": book["id"],
+            "book_name": book["name"],
+            "testament": book["testament"],
+            "chapter_number": int(chapter["number"]),
+            "verses": [
+                {
+                    "id": ids[i],
+                    "chapter_id": int(chapter["id"]),
+                    "book_id": book["id"],
+                    "chapter_number": int(chapter["number"]),
+                    "verse_number": numbers[i],
+                    "number": numbers[i],
+                    "text": raw[relative[i]:relative[i + 1]].decode(),
+                }
+                for i in range(count)
+            ],
+        }
+
+
+def load_rows(db) -> Tuple[list, list, list]:
+    """
+    Lê livros, capítulos e versículos da tradução ativa para gerar o arquivo
+    (use `snapshot_translation` na mesma sessão para saber qual é ela).
+    """
+    from sqlalchemy import select
+
+    from ..models.bible_models import Book, Chapter, Verse
+    from .translations import active_translation_clause
+
+    active = active_translation_clause()
+    books = db.execute(
+        select(Book.id, Book.name, Book.testament).where(active)).all()
+    chapters = db.execute(
+        select(Chapter.id, Chapter.book_id, Chapter.number)
+        .join(Book, Book.id == Chapter.book_id)
+        .where(active)
+    ).all()
+    verses = db.execute(
+        select(Verse.id, Verse.chapter_id, Verse.number, Verse.text)
+        .join(Chapter, Chapter.id == Verse.chapter_id)
+        .join(Book, Book.id == Chapter.book_id)
+        .where(active)
+    ).all()
+    return ([tuple(row) for row in books], [tuple(row) for row in chapters],
+            [tuple(row) for row in verses])
+
+
+# Armazenamento do processo (aberto na inicialização)
+_store: Optional[VerseStore] = None
+_store_lock = threading.Lock()
+
+
+def init_verse_store(path: str = VERSE_STORE_PATH) -> Optional[VerseStore]:
+    """Abre o arquivo do armazenamento, se existir e for da tradução ativa."""
+    from .translations import artifact_matches, current_translation
+
+    global _store
+    with _store_lock:
+        if _store is None and os.path.exists(path):
+            store = VerseStore(path)
+            if not artifact_matches("Armazenamento de versículos", store.translation,
+                                    current_translation()):
+                store.close()
+                return None
+            _store = store
+            logger.info(f"Armazenamento de versículos aberto de {path}: {len(_store)} versículos")
+        return _store
+
+
+def get_verse_store() -> Optional[VerseStore]:
+    """Armazenamento do processo ou None se o arquivo não foi gerado."""
+    return _store
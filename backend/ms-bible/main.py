@@ -82,6 +82,31 @@ def health_check():
 @app.on_event("startup")
 def startup_event():
     logger.info("Starting up MS-Bible service...")
+
+    # Textos bíblicos em arquivo mapeado (sem ele, leituras usam o Postgres)
+    try:
+        from app.services.verse_store import init_verse_store
+        if init_verse_store() is None:
+            logger.warning("Armazenamento de versículos não gerado; leituras via banco")
+    except Exception as e:
+        logger.error(f"Erro ao abrir o armazenamento de versículos: {str(e)}")
+
+    # Índice invertido em memória para a busca (sem ele, a busca usa o Postgres)
+    try:
+        from app.services.verse_index import init_verse_index
+        if init_verse_index() is None:
+            logger.warning("Índice de versículos indisponível; busca via Postgres")
+    except Exception as e:
+        logger.error(f"Erro ao carregar o índice de versículos: {str(e)}")
+
+    # Vizinhos pré-calculados dos versículos (sem eles, /related responde 503)
+    try:
+        from app.services.related_verses import init_related_verses
+        if init_related_verses() is None:
+            logger.warning("Versículos relacionados não gerados")
+    except Exception as e:
+        logger.error(f"Erro ao carregar os versículos relacionados: {str(e)}")
+
     logger.info("MS-Bible service started successfully")
 
 
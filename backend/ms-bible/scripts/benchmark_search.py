@@ -0,0 +1,151 @@
+"""
+Benchmark da busca de versículos: ILIKE (busca antiga) x busca textual do
+Postgres x busca aproximada por trigramas x índice invertido em memória.
+
+Executa cada consulta N vezes em cada forma contra o banco configurado em
+DATABASE_URL e imprime latências, número de resultados e o nó principal do
+plano de execução (Seq Scan no ILIKE, Bitmap Index Scan nos índices GIN). O
+índice em memória é construído a partir do banco antes das medições; nele o
+cache de correções é limpo a cada execução, para medir o pior caso das
+consultas com erros de digitação.
+
+Termina com erro se o p95 da busca em memória ou da busca por trigramas
+passar do orçamento de latência (--budget-ms).
+
+Uso (a partir da raiz do ms-bible):
+    python -m scripts.benchmark_search
+    python -m scripts.benchmark_search --runs 50 --query "amor" --query "senhor é meu pastor"
+    python -m scripts.benchmark_search --budget-ms 15
+"""
+import argparse
+import statistics
+import sys
+import time
+
+from sqlalchemy import func, select, text
+
+from app.infrastructure.database import SessionLocal
+from app.models.bible_models import Book, Chapter, Verse
+from app.infrastructure.search import FUZZY_FUNCTION
+from app.services.search_service import VerseSearchService
+from app.services.verse_index import VerseIndex, load_documents, parse_query
+
+# Consultas comuns: termos frequentes, acentos, flexões e frases
+DEFAULT_QUERIES = [
+    "amor",
+    "fé",
+    "coração",
+    "misericordia",
+    "pastores",
+    "Deus amou o mundo",
+    "o senhor é o meu pastor",
+    "misericordai",
+    "senhr é meu pastr",
+    "\"nada me faltra\"",
+]
+
+# Orçamento de latência (p95) das formas servidas pela API
+DEFAULT_BUDGET_MS = 25.0
+
+
+def ilike_query(query: str, limit: int):
+    """Busca anterior: ILIKE sem ranking sobre todos os versículos"""
+    return (
+        select(Verse.id, Verse.text, Chapter.number, Book.name)
+        .join(Chapter, Chapter.id == Verse.chapter_id)
+        .join(Book, Book.id == Chapter.book_id)
+        .where(Verse.text.ilike(f"%{query}%"))
+        .limit(limit)
+    )
+
+
+def plan_root(db, statement) -> str:
+    """Nó de varredura da tabela de versículos no plano"""
+    compiled = statement.compile(
+        dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN {compiled}")).scalars().all()
+    for line in plan:
+        if "bible_verses" in line or "ix_bible_verses_" in line:
+            return line.strip().lstrip("-> ").split("  ")[0]
+    return plan[0].strip()
+
+
+def timed(fn, runs: int):
+    latencies = []
+    result = None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn()
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+    return result, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1]
+
+
+def fuzzy_query(query: str):
+    """Filtro da busca aproximada (índice de trigramas)"""
+    unaccent = getattr(func, FUZZY_FUNCTION)
+    return select(Verse.id).where(unaccent(query).op("<%")(unaccent(Verse.text)))
+
+
+def run(queries, runs: int, limit: int, budget_ms: float) -> bool:
+    """Executa as medições; retorna False se alguma forma passar do orçamento"""
+    db = SessionLocal()
+    service = VerseSearchService(db)
+    within_budget = True
+
+    def check(p95):
+        nonlocal within_budget
+        if p95 > budget_ms:
+            within_budget = False
+            return "  ACIMA DO ORÇAMENTO"
+        return ""
+
+    try:
+        if db.execute(select(Verse.id).limit(1)).first() is None:
+            print("Nenhum versículo carregado; importe a Bíblia antes do benchmark")
+            return False
+
+        index = VerseIndex.build(load_documents(db))
+
+        print(f"execuções por consulta: {runs} | limite: {limit} | orçamento p95: {budget_ms:.0f} ms")
+        print(f"{'consulta':<28}{'forma':<8}{'res.':>6}{'p50 ms':>10}{'p95 ms':>10}  plano")
+        for query in queries:
+            statement = ilike_query(query, limit)
+            rows, p50, p95 = timed(lambda: db.execute(statement).all(), runs)
+            print(f"{query[:27]:<28}{'ilike':<8}{len(rows):>6}{p50:>10.2f}{p95:>10.2f}  "
+                  f"{plan_root(db, statement)}")
+
+            page, p50, p95 = timed(lambda: service.search(query, limit=limit), runs)
+            print(f"{'':<28}{'fts':<8}{len(page.items):>6}{p50:>10.2f}{p95:>10.2f}  "
+                  f"{plan_root(db, select(Verse.id).where(Verse.search_vector.op('@@')(service.build_query(query))))}")
+
+            rows, p50, p95 = timed(lambda: service.fuzzy_search(query, limit=limit), runs)
+            db.rollback()
+            print(f"{'':<28}{'trgm':<8}{len(rows):>6}{p50:>10.2f}{p95:>10.2f}  "
+                  f"{plan_root(db, fuzzy_query(query))}{check(p95)}")
+
+            def cold_search():
+                index._corrections.clear()
+                return index.search(query, limit=limit)
+
+            page, p50, p95 = timed(cold_search, runs)
+            suggestion = f" | sugestão: {page.suggestion}" if page.suggestion else ""
+            print(f"{'':<28}{'memória':<8}{len(page.items):>6}{p50:>10.2f}{p95:>10.2f}  "
+                  f"{len(index.match(parse_query(query))[0])} versículos{suggestion}{check(p95)}")
+    finally:
+        db.close()
+    return within_budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--query", action="append",
+                        help="Consulta a medir (padrão: lista de consultas comuns)")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Orçamento de latência p95 da busca aproximada e em memória")
+    args = parser.parse_args()
+
+    if not run(args.query or DEFAULT_QUERIES, args.runs, args.limit, args.budget_ms):
+        sys.exit(1)
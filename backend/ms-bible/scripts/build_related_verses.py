@@ -0,0 +1,69 @@
+"""
+Calcula os versículos relacionados (TF-IDF + LSA) a partir do Postgres e
+grava o artefato com os vizinhos pré-calculados de cada versículo.
+
+Exige o SciPy apenas aqui; o serviço carrega o artefato só com NumPy. O
+arquivo é gravado de forma atômica (temporário + rename); workers já em
+execução continuam com o artefato antigo até reiniciarem.
+
+Uso (a partir da raiz do ms-bible):
+    python -m scripts.build_related_verses
+    python -m scripts.build_related_verses --top-k 30 --components 200
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.infrastructure.database import SessionLocal
+from app.services.related_verses import (
+    LSA_COMPONENTS,
+    RELATED_TOP_K,
+    RELATED_VERSES_PATH,
+    RelatedVerses,
+)
+from app.services.translations import snapshot_translation
+from app.services.verse_index import load_documents
+
+
+def build_related_verses(output, top_k, components):
+    """Lê os versículos, calcula os vizinhos e grava o artefato"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        translation = snapshot_translation(db)
+        documents = load_documents(db)
+        if not documents:
+            print("Nenhum versículo encontrado no banco")
+            sys.exit(1)
+        loaded = time.perf_counter()
+
+        related = RelatedVerses.build(
+            documents, top_k=top_k, components=components, translation=translation)
+        built = time.perf_counter()
+        related.save(output)
+
+        print(f"Tradução: {translation or '(nenhuma ativa)'}")
+        print(f"{len(related)} versículos lidos em {loaded - started:.1f}s")
+        print(f"{len(related.terms)} termos, {related.projection.shape[1]} componentes LSA, "
+              f"{related.top_k} vizinhos por versículo")
+        print(f"Vizinhos calculados em {built - loaded:.1f}s")
+        print(f"Artefato gravado em {output} ({os.path.getsize(output) / 1024 / 1024:.1f} MB)")
+    except Exception as e:
+        print(f"Erro ao calcular os versículos relacionados: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=RELATED_VERSES_PATH,
+                        help="Caminho do artefato (padrão: RELATED_VERSES_PATH)")
+    parser.add_argument("--top-k", type=int, default=RELATED_TOP_K,
+                        help="Vizinhos guardados por versículo")
+    parser.add_argument("--components", type=int, default=LSA_COMPONENTS,
+                        help="Dimensões da redução LSA")
+    args = parser.parse_args()
+
+    build_related_verses(args.output, args.top_k, args.components)
@@ -0,0 +1,57 @@
+"""
+Reconstrói o índice invertido dos versículos a partir do Postgres e grava o
+artefato carregado pelo serviço na inicialização.
+
+O arquivo é gravado de forma atômica (temporário + rename); workers já em
+execução continuam com o índice antigo até reiniciarem.
+
+Uso (a partir da raiz do ms-bible):
+    python -m scripts.build_verse_index
+    python -m scripts.build_verse_index --output /data/verse_index.npz
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.infrastructure.database import SessionLocal
+from app.services.translations import snapshot_translation
+from app.services.verse_index import VERSE_INDEX_PATH, VerseIndex, load_documents
+
+
+def build_verse_index(output):
+    """Lê os versículos, constrói o índice e grava o artefato"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        translation = snapshot_translation(db)
+        documents = load_documents(db)
+        if not documents:
+            print("Nenhum versículo encontrado no banco")
+            sys.exit(1)
+        loaded = time.perf_counter()
+
+        index = VerseIndex.build(documents, translation)
+        built = time.perf_counter()
+        index.save(output)
+
+        print(f"Tradução: {translation or '(nenhuma ativa)'}")
+        print(f"{len(index)} versículos lidos em {loaded - started:.1f}s")
+        print(f"{len(index.terms)} termos, {len(index.post_docs)} postagens, "
+              f"{len(index.positions)} posições")
+        print(f"Índice construído em {built - loaded:.1f}s")
+        print(f"Artefato gravado em {output} ({os.path.getsize(output) / 1024 / 1024:.1f} MB)")
+    except Exception as e:
+        print(f"Erro ao construir o índice de versículos: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=VERSE_INDEX_PATH,
+                        help="Caminho do artefato (padrão: VERSE_INDEX_PATH)")
+    args = parser.parse_args()
+
+    build_verse_index(args.output)
@@ -0,0 +1,59 @@
+"""
+Gera a tabela anual do versículo do dia (bible_verse_of_day).
+
+Os 366 dias ("MM-DD", incluindo 29/02) recebem versículos distintos
+sorteados de forma uniforme com a semente informada: a mesma semente gera
+sempre a mesma tabela. Dias curados, com referência, tema e reflexão
+escolhidos à mão, são lidos de um arquivo JSON e preservados nas próximas
+gerações. Workers em execução mantêm em cache a resposta do dia corrente e
+passam a usar a nova tabela a partir do dia seguinte.
+
+Formato do arquivo de curadoria:
+
+    [{"day": "12-25", "reference": "Lc 2:10-11", "theme": "Natal",
+      "reflection": "..."}]
+
+Uso (a partir da raiz do ms-bible):
+    python -m scripts.build_verse_of_day
+    python -m scripts.build_verse_of_day --seed 2025 --curated data/curated_days.json
+"""
+import argparse
+import json
+import sys
+
+from app.infrastructure.database import SessionLocal
+from app.services.daily_verse import DailyVerseService
+from app.services.verse_store import init_verse_store
+
+
+def build_verse_of_day(seed, curated_path=None, reset_curated=False):
+    """Sorteia os dias livres e grava a tabela com os dias curados"""
+    curated = []
+    if curated_path:
+        with open(curated_path, encoding="utf-8") as f:
+            curated = json.load(f)
+
+    init_verse_store()
+    db = SessionLocal()
+    try:
+        counts = DailyVerseService(db).rebuild_schedule(
+            seed, curated=curated, reset_curated=reset_curated)
+        print(f"{counts['curated']} dias curados, {counts['drawn']} dias sorteados "
+              f"(semente {seed})")
+    except Exception as e:
+        print(f"Erro ao gerar a tabela do versículo do dia: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Semente do sorteio dos dias livres")
+    parser.add_argument("--curated", help="Arquivo JSON com os dias curados")
+    parser.add_argument("--reset-curated", action="store_true",
+                        help="Descarta os dias curados já gravados")
+    args = parser.parse_args()
+
+    build_verse_of_day(args.seed, args.curated, args.reset_curated)
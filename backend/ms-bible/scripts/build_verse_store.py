@@ -0,0 +1,57 @@
+"""
+Gera o armazenamento binário dos textos bíblicos a partir do Postgres.
+
+O arquivo é aberto com mmap pelo serviço na inicialização e passa a servir
+livros, capítulos e versículos sem consultas ao banco. A escrita é atômica
+(temporário + rename); workers em execução continuam com o arquivo antigo
+até reiniciarem.
+
+Uso (a partir da raiz do ms-bible):
+    python -m scripts.build_verse_store
+    python -m scripts.build_verse_store --output /data/verse_store.bin
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.infrastructure.database import SessionLocal
+from app.services.translations import snapshot_translation
+from app.services.verse_store import VERSE_STORE_PATH, VerseStore, load_rows, write_store
+
+
+def build_verse_store(output):
+    """Lê livros, capítulos e versículos e grava o arquivo mapeável"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        translation = snapshot_translation(db)
+        books, chapters, verses = load_rows(db)
+        if not verses:
+            print("Nenhum versículo encontrado no banco")
+            sys.exit(1)
+
+        counts = write_store(output, books, chapters, verses, translation)
+        store = VerseStore(output)
+        store.close()
+
+        print(f"Tradução: {translation or '(nenhuma ativa)'}")
+        print(f"{counts['books']} livros, {counts['chapters']} capítulos, "
+              f"{counts['verses']} versículos")
+        print(f"{counts['text_bytes'] / 1024 / 1024:.1f} MB de texto, arquivo com "
+              f"{os.path.getsize(output) / 1024 / 1024:.1f} MB")
+        print(f"Armazenamento gravado em {output} em {time.perf_counter() - started:.1f}s")
+    except Exception as e:
+        print(f"Erro ao gerar o armazenamento de versículos: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=VERSE_STORE_PATH,
+                        help="Caminho do arquivo (padrão: VERSE_STORE_PATH)")
+    args = parser.parse_args()
+
+    build_verse_store(args.output)
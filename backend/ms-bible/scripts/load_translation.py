@@ -0,0 +1,120 @@
+"""
+Carrega uma tradução da Bíblia (OSIS, USFM ou JSON) no Postgres.
+
+A fonte é lida em streaming e gravada com COPY em lotes, em uma única
+transação; a tradução nova passa a ser a ativa no mesmo commit (a não ser
+com --no-activate), então as leituras nunca veem uma carga pela metade.
+Depois da carga, regere os artefatos da tradução ativa e reinicie o serviço:
+até lá, workers reiniciados recusam os artefatos da tradução anterior e
+leem do Postgres.
+
+Uso (a partir da raiz do ms-bible):
+    python -m scripts.load_translation ara.xml --code ARA --name "Almeida Revista e Atualizada"
+    python -m scripts.load_translation usfm/nvi/ --code NVI --name "Nova Versão Internacional" --no-activate
+    python -m scripts.load_translation acf.json --code ACF --name "Almeida Corrigida Fiel" --format json
+    python -m scripts.load_translation --activate NVI
+    python -m scripts.load_translation --list
+"""
+import argparse
+import sys
+import time
+
+from app.infrastructure.database import SessionLocal
+from app.services.translation_formats import FORMATS, read_translation
+from app.services.translations import COPY_BATCH_ROWS, TranslationService
+
+ARTIFACT_SCRIPTS = ("build_verse_store", "build_verse_index", "build_related_verses")
+
+
+def print_artifacts_hint():
+    print("Regere os artefatos da tradução ativa e reinicie o serviço:")
+    for script in ARTIFACT_SCRIPTS:
+        print(f"    python -m scripts.{script}")
+
+
+def load_translation(source, code, name, fmt, activate, batch_size):
+    """Lê a fonte e grava a tradução, mostrando o progresso"""
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+
+        def progress(rows):
+            elapsed = time.perf_counter() - started
+            print(f"  {rows} versículos copiados ({rows / elapsed:,.0f}/s)", end="\r")
+
+        stats = TranslationService(db).load(
+            code, name, read_translation(source, fmt),
+            activate=activate, batch_size=batch_size, progress=progress)
+        print()
+
+        print(f"{code}: {stats['books']} livros, {stats['chapters']} capítulos, "
+              f"{stats['verses']} versículos")
+        print(f"COPY {stats['copy_seconds']:.2f}s | inserção {stats['insert_seconds']:.2f}s | "
+              f"índices {stats['index_seconds']:.2f}s"
+              f"{' (recriados)' if stats['indexes_rebuilt'] else ''}")
+        print(f"Total {stats['total_seconds']:.2f}s ({stats['rows_per_second']:,.0f} versículos/s)")
+        if activate:
+            print(f"Tradução {code} ativa")
+            print_artifacts_hint()
+    except (ValueError, OSError) as e:
+        print(f"Erro ao carregar a tradução: {str(e)}")
+        sys.exit(1)
+    except Exception as e:
+        print(f"Erro ao gravar a tradução: {str(e)}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+def activate_translation(code):
+    db = SessionLocal()
+    try:
+        TranslationService(db).activate(code)
+        print(f"Tradução {code} ativa")
+        print_artifacts_hint()
+    except LookupError as e:
+        print(str(e))
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+def list_translations():
+    db = SessionLocal()
+    try:
+        translations = TranslationService(db).list_translations()
+        if not translations:
+            print("Nenhuma tradução carregada")
+        for translation in translations:
+            marker = "*" if translation.active else " "
+            print(f"{marker} {translation.code:<8}{translation.verse_count:>8} versículos  "
+                  f"{translation.name}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("source", nargs="?", help="Arquivo OSIS/USFM/JSON ou diretório USFM")
+    parser.add_argument("--code", help="Código da tradução (ex: ARA)")
+    parser.add_argument("--name", help="Nome da tradução")
+    parser.add_argument("--format", choices=FORMATS,
+                        help="Formato da fonte (padrão: pela extensão)")
+    parser.add_argument("--no-activate", action="store_true",
+                        help="Carrega sem tornar a tradução ativa")
+    parser.add_argument("--batch-size", type=int, default=COPY_BATCH_ROWS,
+                        help="Versículos por COPY")
+    parser.add_argument("--activate", metavar="CODE",
+                        help="Torna ativa uma tradução já carregada")
+    parser.add_argument("--list", action="store_true", help="Lista as traduções")
+    args = parser.parse_args()
+
+    if args.list:
+        list_translations()
+    elif args.activate:
+        activate_translation(args.activate)
+    elif args.source and args.code and args.name:
+        load_translation(args.source, args.code, args.name, args.format,
+                         not args.no_activate, args.batch_size)
+    else:
+        parser.error("informe a fonte, --code e --name (ou --activate/--list)")
@@ -0,0 +1,71 @@
+"""
+Configurações globais para testes do MS-Bible.
+Este arquivo contém fixtures compartilhadas entre testes unitários e de integração.
+
+Os testes usam o fakeredis no lugar do Redis e uma sessão simulada no lugar
+do Postgres; nenhum serviço externo é necessário.
+"""
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import fakeredis
+import pytest
+
+# Adicionar o diretório raiz ao PYTHONPATH
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+
+@pytest.fixture
+def redis_client() -> fakeredis.FakeRedis:
+    """Cliente Redis em memória (equivalente a get_redis)."""
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def db() -> MagicMock:
+    """Sessão do SQLAlchemy simulada; o retorno de `execute` é ajustado em cada teste."""
+    return MagicMock()
+
+
+# Livros, capítulos e versículos de exemplo (ids fora de ordem de propósito)
+BOOKS = [
+    (43, "João", "Novo"),
+    (1, "Gênesis", "Antigo"),
+    (19, "Salmos", "Antigo"),
+]
+CHAPTERS = [
+    (4301, 43, 3),
+    (101, 1, 1),
+    (102, 1, 2),
+    (1923, 19, 23),
+]
+VERSES = [
+    (43316, 4301, 16, "Porque Deus amou o mundo de tal maneira"),
+    (43317, 4301, 17, "Porque Deus enviou o seu Filho ao mundo"),
+    (43318, 4301, 18, "Quem crê nele não é condenado"),
+    (10101, 101, 1, "No princípio criou Deus os céus e a terra."),
+    (10102, 101, 2, "E a terra era sem forma e vazia"),
+    (10201, 102, 1, "Assim os céus, a terra e todo o seu exército foram acabados."),
+    (192301, 1923, 1, "O Senhor é o meu pastor; nada me faltará."),
+    (192302, 1923, 2, "Deitar-me faz em verdes pastos"),
+]
+
+
+@pytest.fixture
+def verse_rows():
+    """Tuplas (livros, capítulos, versículos) no formato de `write_store`."""
+    return BOOKS, CHAPTERS, VERSES
+
+
+@pytest.fixture
+def verse_store(tmp_path):
+    """Armazenamento mapeado em memória gerado com os versículos de exemplo."""
+    from app.services.verse_store import VerseStore, write_store
+
+    path = str(tmp_path / "verse_store.bin")
+    write_store(path, BOOKS, CHAPTERS, VERSES)
+    store = VerseStore(path)
+    yield store
+    store.close()
@@ -0,0 +1,76 @@
+"""
+Testes de integração para os cabeçalhos de cache dos endpoints do catálogo.
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.api import api_router
+from app.api.routes import books, chapters
+from app.schemas.bible import BooksResponse, ChaptersResponse, VersesResponse
+from app.services import bible_service
+from app.services.bible_service import BibleService
+from app.services.catalog_cache import catalog_cache
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/bible")
+    app.dependency_overrides[deps.get_current_user] = lambda: None
+    catalog_cache.clear()
+    return TestClient(app)
+
+
+def _use_store(monkeypatch, store):
+    for module in (books, chapters, bible_service):
+        monkeypatch.setattr(module, "get_verse_store", lambda: store)
+
+
+@pytest.mark.integration
+class TestCatalogCacheHeaders:
+    """Testes para as respostas com e sem o armazenamento de versículos."""
+
+    def test_store_responses_are_cacheable(self, client, verse_store, monkeypatch):
+        """Com o armazenamento, respostas levam ETag e aceitam revalidação."""
+        _use_store(monkeypatch, verse_store)
+
+        response = client.get("/api/bible/books/")
+        assert response.status_code == 200
+        assert "public" in response.headers["cache-control"]
+        assert "immutable" not in response.headers["cache-control"]
+        assert [book["id"] for book in response.json()["items"]] == [1, 19, 43]
+
+        revalidated = client.get(
+            "/api/bible/books/", headers={"If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
+
+        verses = client.get("/api/bible/chapters/101/verses")
+        assert "public" in verses.headers["cache-control"]
+
+    def test_fallback_responses_are_not_stored(self, client, monkeypatch):
+        """Sem o armazenamento, livros, capítulos e versículos vêm com no-store."""
+        _use_store(monkeypatch, None)
+
+        async def empty_books(testament=None):
+            return BooksResponse(items=[], total=0)
+
+        async def empty_chapters(book_id):
+            return ChaptersResponse(book_id=book_id, book_name="João", testament="new",
+                                    items=[], total=0)
+
+        async def empty_verses(chapter_id):
+            return VersesResponse(chapter_id=chapter_id, book_id=43, book_name="João",
+                                  chapter_number=1, items=[], total=0)
+
+        monkeypatch.setattr(BibleService, "get_books", staticmethod(empty_books))
+        monkeypatch.setattr(BibleService, "get_chapters", staticmethod(empty_chapters))
+        monkeypatch.setattr(BibleService, "get_verses", staticmethod(empty_verses))
+
+        for path in ("/api/bible/books/", "/api/bible/books/43/chapters",
+                     "/api/bible/chapters/1/verses"):
+            response = client.get(path)
+            assert response.status_code == 200, path
+            assert response.headers["cache-control"] == "no-store", path
+            assert "etag" not in response.headers
@@ -0,0 +1,104 @@
+"""
+Testes unitários para as respostas pré-serializadas do catálogo bíblico.
+"""
+import gzip
+import json
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from starlette.requests import Request
+
+from app.services.catalog_cache import CACHE_CONTROL, CatalogCache, build_response, encode_body
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+@pytest.fixture
+def body():
+    return encode_body(List[dict], [{"id": i, "text": "versículo " * 20} for i in range(10)])
+
+
+@pytest.mark.unit
+class TestBuildResponse:
+    """Testes para codificação, ETag e revalidação."""
+
+    def test_identity_and_gzip(self, body):
+        """Escolhe gzip quando aceito e sufixa o ETag por codificação."""
+        plain = build_response(_request(), body)
+        assert plain.headers["etag"] == f'"{body.etag}"'
+        assert plain.headers["cache-control"] == CACHE_CONTROL
+        assert plain.headers["vary"] == "Accept-Encoding"
+
+        compressed = build_response(_request(accept_encoding="gzip, deflate"), body)
+        assert compressed.headers["content-encoding"] == "gzip"
+        assert compressed.headers["etag"] == f'"{body.etag}-gzip"'
+        assert json.loads(gzip.decompress(compressed.body)) == json.loads(plain.body)
+
+    def test_refused_encoding(self, body):
+        """Codificação com q=0 não é usada."""
+        response = build_response(_request(accept_encoding="gzip;q=0"), body)
+        assert "content-encoding" not in response.headers
+
+    def test_not_modified(self, body):
+        """If-None-Match de qualquer codificação do conteúdo gera 304."""
+        translated = encode_body(List[dict], [{"id": 1}], "pt-BR")
+        assert build_response(
+            _request(if_none_match=f'"{translated.etag}-br"'), translated).status_code == 304
+        response = build_response(
+            _request(accept_encoding="gzip", if_none_match=f'W/"{body.etag}-gzip"'), body)
+        assert response.status_code == 304
+        assert response.body == b""
+        assert build_response(_request(if_none_match='"outro"'), body).status_code == 200
+
+
+@pytest.mark.unit
+class TestCatalogCache:
+    """Testes para o cache de corpos por chave."""
+
+    async def test_builds_once_per_store(self):
+        """O corpo é construído uma vez e descartado se o armazenamento mudar."""
+        cache, calls = CatalogCache(), []
+
+        async def build():
+            calls.append(1)
+            return [{"id": 1}]
+
+        store = SimpleNamespace(translation="ARA")
+        await cache.respond(_request(), store, "books", List[dict], build)
+        await cache.respond(_request(), store, "books", List[dict], build)
+        assert len(calls) == 1
+
+        await cache.respond(_request(), SimpleNamespace(translation="NVI"), "books", List[dict], build)
+        assert len(calls) == 2 and len(cache) == 1
+
+    async def test_translation_in_etag(self):
+        """Outra tradução muda o ETag, mesmo com o mesmo conteúdo."""
+        async def build():
+            return [{"id": 1}]
+
+        ara = await CatalogCache().respond(
+            _request(), SimpleNamespace(translation="ARA"), "books", List[dict], build)
+        assert ara.headers["etag"].startswith('"ARA.')
+        assert "immutable" not in ara.headers["cache-control"]
+
+        nvi = await CatalogCache().respond(
+            _request(if_none_match=ara.headers["etag"]),
+            SimpleNamespace(translation="NVI"), "books", List[dict], build)
+        assert nvi.status_code == 200
+        assert nvi.headers["etag"].startswith('"NVI.')
+
+    async def test_build_errors_are_not_cached(self):
+        """Exceções da construção são propagadas sem guardar nada."""
+        cache = CatalogCache()
+
+        async def build():
+            raise LookupError("sem livro")
+
+        with pytest.raises(LookupError):
+            await cache.respond(
+                _request(), SimpleNamespace(translation=""), "chapters:1", List[dict], build)
+        assert len(cache) == 0
@@ -0,0 +1,102 @@
+"""
+Testes unitários para o versículo do dia e o sorteio de versículos.
+"""
+import random
+from collections import Counter
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.models.bible_models import VerseOfDay
+from app.services import daily_verse
+from app.services.daily_verse import DailyVerseService, VerseSampler
+
+
+@pytest.fixture
+def service(db, verse_store, monkeypatch):
+    """Serviço lendo do armazenamento de exemplo, sem caches de outros testes."""
+    monkeypatch.setattr(daily_verse, "get_verse_store", lambda: verse_store)
+    monkeypatch.setattr(daily_verse, "_sampler", None)
+    monkeypatch.setattr(daily_verse, "_daily_cache", {})
+    return DailyVerseService(db)
+
+
+@pytest.mark.unit
+class TestVerseSampler:
+    """Testes para a amostragem uniforme por contagem acumulada."""
+
+    def test_locate(self):
+        """Índice global vira (capítulo, deslocamento)."""
+        sampler = VerseSampler([10, 20, 30], [2, 1, 3])
+        assert [sampler.locate(i) for i in range(6)] == [
+            (10, 0), (10, 1), (20, 0), (30, 0), (30, 1), (30, 2)]
+
+    def test_uniform_over_verses(self):
+        """Cada versículo tem a mesma chance, qualquer que seja o capítulo."""
+        sampler = VerseSampler([10, 20], [1, 9])
+        rng = random.Random(1)
+        counts = Counter(sampler.sample(rng)[0] for _ in range(10000))
+        assert 800 < counts[10] < 1200
+
+    def test_sample_distinct_and_empty(self):
+        """Sorteio sem reposição e erro sem versículos."""
+        sampler = VerseSampler([10, 20], [2, 2])
+        assert len(set(sampler.sample_distinct(10, random.Random(1)))) == 4
+        with pytest.raises(LookupError):
+            VerseSampler([], []).sample()
+
+
+@pytest.mark.unit
+class TestDailyVerseService:
+    """Testes para a tabela anual e o sorteio pela data."""
+
+    def test_scheduled_day_is_cached(self, service, db):
+        """Dia da tabela usa o versículo gravado e fica em cache."""
+        db.get.return_value = SimpleNamespace(
+            day="12-25", verse_id=43316, theme="Amor", reflection=None)
+
+        first = service.get_verse_of_day(date(2024, 12, 25))
+        second = service.get_verse_of_day(date(2024, 12, 25))
+
+        assert first.verse.id == 43316 and first.theme == "Amor"
+        assert "Amor" in first.reflection
+        assert second is first
+        db.get.assert_called_once_with(VerseOfDay, "12-25")
+
+    def test_missing_day_is_drawn_from_date(self, service, db, monkeypatch):
+        """Sem linha na tabela, a data define o sorteio em qualquer worker."""
+        db.get.return_value = None
+        first = service.get_verse_of_day(date(2024, 3, 1))
+        monkeypatch.setattr(daily_verse, "_daily_cache", {})
+        monkeypatch.setattr(daily_verse, "_sampler", None)
+        assert service.get_verse_of_day(date(2024, 3, 1)) == first
+
+    def test_database_error_is_not_cached(self, service, db):
+        """Com erro no banco responde pelo sorteio, sem guardar no cache."""
+        db.get.side_effect = OperationalError("select", {}, Exception("down"))
+        response = service.get_verse_of_day(date(2024, 3, 1))
+        assert response.verse.id
+        db.rollback.assert_called_once()
+        assert daily_verse._daily_cache == {}
+
+    def test_rebuild_schedule(self, service, db):
+        """Dias curados são gravados e os demais recebem versículos distintos."""
+        db.execute.return_value.scalars.return_value = []
+        counts = service.rebuild_schedule(
+            seed=7, curated=[{"day": "12-25", "reference": "Jo 3:16", "theme": "Amor"}])
+
+        entries = {entry.day: entry for entry in db.add_all.call_args.args[0]}
+        assert entries["12-25"].verse_id == 43316 and entries["12-25"].curated
+        verse_ids = [entry.verse_id for entry in entries.values()]
+        assert len(verse_ids) == len(set(verse_ids)) == 8
+        assert counts == {"curated": 1, "drawn": 7}
+        db.commit.assert_called_once()
+
+    def test_rebuild_schedule_rejects_unknown_reference(self, service, db):
+        """Referência curada inexistente gera ValueError."""
+        db.execute.return_value.scalars.return_value = []
+        with pytest.raises(ValueError):
+            service.rebuild_schedule(
+                seed=7, curated=[{"day": "01-01", "reference": "Ap 1:1", "theme": "Fé"}])
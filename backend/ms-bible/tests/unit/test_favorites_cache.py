@@ -0,0 +1,70 @@
+"""
+Testes unitários para o cache de versículos favoritos no Redis.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+import redis
+
+from app.services.favorites_cache import FavoritesCache
+
+
+@pytest.fixture
+def cache(redis_client) -> FavoritesCache:
+    return FavoritesCache(redis_client)
+
+
+@pytest.mark.unit
+class TestFavoritesCache:
+    """Testes para leitura, preenchimento e invalidação do conjunto."""
+
+    def test_members_loads_once(self, cache):
+        """A primeira consulta carrega do banco; as seguintes só leem o Redis."""
+        loader = MagicMock(return_value=[43316, 10101])
+
+        assert cache.members("u1", [43316, 43317], loader) == {43316}
+        assert cache.members("u1", [10101, 43317], loader) == {10101}
+        assert cache.all("u1", loader) == {43316, 10101}
+        loader.assert_called_once()
+
+    def test_user_without_favorites_is_cached(self, cache):
+        """Conjunto vazio também fica carregado (marcador)."""
+        loader = MagicMock(return_value=[])
+        assert cache.members("u1", [1, 2], loader) == set()
+        assert cache.all("u1", loader) == set()
+        loader.assert_called_once()
+
+    def test_invalidate_reloads(self, cache):
+        """Depois da invalidação, o conjunto é lido de novo do banco."""
+        cache.all("u1", lambda: [1])
+        cache.invalidate("u1")
+        assert cache.all("u1", lambda: [1, 2]) == {1, 2}
+
+    def test_fill_racing_a_change_is_discarded(self, cache, redis_client):
+        """Leitura do banco anterior a uma alteração não repõe o conjunto antigo."""
+        def stale_loader():
+            # Outra requisição grava um favorito e invalida durante a consulta
+            cache.invalidate("u1")
+            return [1]
+
+        assert cache.all("u1", stale_loader) == {1}
+        assert not redis_client.exists(cache.key("u1"))
+        assert cache.all("u1", lambda: [1, 2]) == {1, 2}
+
+    def test_large_sets(self, cache):
+        """Conjuntos maiores que um lote do script são gravados inteiros."""
+        verse_ids = list(range(1, 2501))
+        cache.all("u1", lambda: verse_ids)
+        assert cache.all("u1", lambda: []) == set(verse_ids)
+
+    def test_redis_unavailable_uses_database(self):
+        """Sem Redis, as consultas vão direto ao banco."""
+        client = MagicMock()
+        client.smembers.side_effect = redis.ConnectionError("down")
+        client.get.side_effect = redis.ConnectionError("down")
+        client.pipeline.side_effect = redis.ConnectionError("down")
+        cache = FavoritesCache(client)
+
+        assert cache.all("u1", lambda: [1]) == {1}
+        assert cache.members("u1", [1, 2], lambda: [1]) == {1}
+        cache.invalidate("u1")
@@ -0,0 +1,97 @@
+"""
+Testes unitários para a busca tolerante a acentos e erros de digitação.
+"""
+import re
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.infrastructure.search import FUZZY_FUNCTION, ensure_trigram_index
+from app.services.search_service import VerseSearchService
+from app.services.verse_index import VerseDocument, VerseIndex, max_edits
+
+DOCUMENTS = [
+    VerseDocument(1, 10, 1, 19, 23, "Salmos", "Antigo",
+                  "O Senhor é o meu pastor; nada me faltará."),
+    VerseDocument(2, 20, 4, 46, 13, "1 Coríntios", "Novo",
+                  "O amor é paciente, o amor é bondoso."),
+    VerseDocument(3, 30, 7, 58, 11, "Hebreus", "Novo",
+                  "Pela fé Abraão obedeceu, quando chamado."),
+    VerseDocument(4, 40, 23, 19, 51, "Salmos", "Antigo",
+                  "Cria em mim um coração puro."),
+]
+
+
+@pytest.fixture
+def index() -> VerseIndex:
+    return VerseIndex.build(DOCUMENTS)
+
+
+@pytest.mark.unit
+class TestTypoTolerantIndex:
+    """Testes para as correções do índice em memória."""
+
+    def test_edit_budget(self):
+        """Palavras curtas não são corrigidas; longas toleram duas edições."""
+        assert [max_edits(word) for word in ("fe", "amor", "pacientes")] == [0, 1, 2]
+
+    def test_fuzzy_terms(self, index):
+        """Inserção, remoção, troca e transposição contam uma edição."""
+        for typo in ("pastr", "pastoor", "pastur", "patsor"):
+            assert [(index.terms[term_id], distance)
+                    for term_id, distance in index.fuzzy_terms(typo, 1)] == [("pastor", 1)]
+        assert index.fuzzy_terms("pstr", 1) == []
+
+    def test_accents_are_ignored(self, index):
+        """Sem acentos a palavra já está no vocabulário."""
+        assert [hit.id for hit in index.search("coracao").items] == [4]
+        assert index.search("coracao").suggestion is None
+
+    def test_typo_search_and_suggestion(self, index):
+        """A palavra errada é trocada pela correção e vira sugestão."""
+        response = index.search("pastro")
+        assert [hit.id for hit in response.items] == [1]
+        assert response.suggestion == "pastor"
+        assert index.search("amro paciente").suggestion == "amor paciente"
+
+    def test_fuzzy_off_keeps_suggestion(self, index):
+        """Sem correção automática, nada é encontrado mas a sugestão vem."""
+        response = index.search("pastro", fuzzy=False)
+        assert response.items == []
+        assert response.suggestion == "pastor"
+
+    def test_corrected_phrase(self, index):
+        """Em frases, a melhor correção entra na posição da palavra."""
+        assert [hit.id for hit in index.search('"amro é paciente"').items] == [2]
+
+
+@pytest.mark.unit
+class TestTrigramSearch:
+    """Testes para a busca aproximada no Postgres (pg_trgm)."""
+
+    def test_fuzzy_query(self, db):
+        """Limite local à transação e operador <% sobre o texto normalizado."""
+        db.execute.return_value.all.return_value = []
+
+        VerseSearchService(db).fuzzy_search("coracao", testament="old", limit=5)
+
+        threshold, query = [call.args[0] for call in db.execute.call_args_list]
+        threshold_sql = str(threshold.compile(dialect=postgresql.dialect()))
+        assert "set_config(" in threshold_sql
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert re.search(rf"{FUZZY_FUNCTION}\(%\(\w+\)s\) <%% {FUZZY_FUNCTION}\(bible_verses.text\)", sql)
+        assert "ORDER BY rank DESC, bible_verses.id" in sql
+        assert "bible_books.testament = " in sql
+
+    def test_ensure_trigram_index(self):
+        """Cria a extensão, a função IMMUTABLE e o índice GIN de trigramas."""
+        engine = MagicMock()
+        connection = engine.begin.return_value.__enter__.return_value
+
+        ensure_trigram_index(engine)
+
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert "CREATE EXTENSION IF NOT EXISTS pg_trgm" in statements[0]
+        assert "IMMUTABLE" in statements[1]
+        assert f"gin ({FUZZY_FUNCTION}(text) gin_trgm_ops)" in statements[2]
@@ -0,0 +1,92 @@
+"""
+Testes unitários para o reconhecimento e a resolução de referências bíblicas.
+"""
+import pytest
+
+from app.services.reference_parser import (
+    Reference,
+    ReferenceResolver,
+    book_abbreviation,
+    parse_references
+)
+
+
+def _spans(text):
+    return [reference[:5] for reference in parse_references(text)]
+
+
+@pytest.mark.unit
+class TestParseReferences:
+    """Testes para os formatos de referência reconhecidos."""
+
+    def test_chapter_verse_and_ranges(self):
+        """Capítulo inteiro, versículo e intervalo de versículos."""
+        assert _spans("Jo 3:16-18; Sl 23") == [(43, 3, 16, 3, 18), (19, 23, None, 23, None)]
+        assert _spans("Jo 3.16") == [(43, 3, 16, 3, 16)]
+        assert _spans("Sl 23-24") == [(19, 23, None, 24, None)]
+
+    def test_cross_chapter_and_lists(self):
+        """Intervalo entre capítulos, listas de versículos e de capítulos."""
+        assert _spans("Jo 3:16-4:2") == [(43, 3, 16, 4, 2)]
+        assert _spans("1 Coríntios 13.4,7") == [(46, 13, 4, 13, 4), (46, 13, 7, 13, 7)]
+        assert _spans("Jo 3:16,18-20; 4:1") == [
+            (43, 3, 16, 3, 16), (43, 3, 18, 3, 20), (43, 4, 1, 4, 1)]
+
+    def test_book_spellings(self):
+        """Nomes completos, abreviações, ordinais e acentos."""
+        assert _spans("I Co 13:4") == [(46, 13, 4, 13, 4)]
+        assert _spans("primeira coríntios 13:4") == [(46, 13, 4, 13, 4)]
+        assert _spans("Gênesis 1:1 e genesis 1:1") == [(1, 1, 1, 1, 1)]
+        assert _spans("Jó 1:1") == [(18, 1, 1, 1, 1)]
+        assert _spans("Jo 1:1") == [(43, 1, 1, 1, 1)]
+
+    def test_ignores_common_words_and_invalid_ranges(self):
+        """Abreviações que são palavras comuns exigem maiúscula; intervalos invertidos são ignorados."""
+        assert _spans("os 3 irmãos") == []
+        assert _spans("Os 3:1") == [(28, 3, 1, 3, 1)]
+        assert _spans("Jo 3:18-16") == []
+
+    def test_label_and_source(self):
+        """Forma canônica e trecho original de cada referência."""
+        reference = parse_references("Leia Jo 3:16-18 hoje")[0]
+        assert reference.label == "João 3:16-18"
+        assert reference.source == "Jo 3:16-18"
+        assert Reference(43, 3, 16, 4, 2, "").label == "João 3:16-4:2"
+        assert Reference(19, 23, None, 24, None, "").label == "Salmos 23-24"
+
+    def test_book_abbreviation(self):
+        """Abreviação pelo nome gravado no banco."""
+        assert book_abbreviation("João") == "Jo"
+        assert book_abbreviation("Livro desconhecido") == ""
+
+
+@pytest.mark.unit
+class TestReferenceResolver:
+    """Testes para a resolução contra o armazenamento de versículos."""
+
+    def test_resolves_ranges(self, verse_store):
+        """Intervalos viram os versículos do armazenamento, em ordem."""
+        resolver = ReferenceResolver(verse_store)
+        verses = resolver.verses(parse_references("Jo 3:17-18")[0])
+        assert [verse["id"] for verse in verses] == [43317, 43318]
+
+        chapter = resolver.verses(parse_references("Sl 23")[0])
+        assert [verse["number"] for verse in chapter] == [1, 2]
+
+    def test_cross_chapter_range(self, verse_store):
+        """Intervalo entre capítulos segue até o versículo final."""
+        resolver = ReferenceResolver(verse_store)
+        verses = resolver.verses(parse_references("Gn 1:2-2:1")[0])
+        assert [verse["id"] for verse in verses] == [10102, 10201]
+
+    def test_missing_book_or_chapter(self, verse_store):
+        """Livro ou capítulo inicial inexistente retorna None."""
+        resolver = ReferenceResolver(verse_store)
+        assert resolver.verses(parse_references("Ap 1:1")[0]) is None
+        assert resolver.verses(parse_references("Jo 9:1")[0]) is None
+
+    def test_truncates_long_passages(self, verse_store, monkeypatch):
+        """Passagens longas param em MAX_VERSES_PER_REFERENCE."""
+        monkeypatch.setattr("app.services.reference_parser.MAX_VERSES_PER_REFERENCE", 2)
+        resolver = ReferenceResolver(verse_store)
+        assert len(resolver.verses(parse_references("Jo 3")[0])) == 2
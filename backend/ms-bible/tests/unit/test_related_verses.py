@@ -0,0 +1,67 @@
+"""
+Testes unitários para os versículos relacionados (TF-IDF + LSA).
+"""
+import pytest
+
+from app.services.related_verses import RelatedVerses
+from app.services.verse_index import VerseDocument
+
+
+def _doc(verse_id, chapter_id, text):
+    return VerseDocument(verse_id, chapter_id, verse_id % 100, 1, chapter_id, "Livro", "Antigo", text)
+
+
+# Três temas, cada um em capítulos diferentes; 1 e 2 estão no mesmo capítulo
+DOCUMENTS = [
+    _doc(1, 10, "O Senhor é o meu pastor, nada me faltará"),
+    _doc(2, 10, "O pastor guia as ovelhas ao descanso"),
+    _doc(3, 20, "O bom pastor dá a vida pelas ovelhas"),
+    _doc(4, 30, "No princípio Deus criou os céus e a terra"),
+    _doc(5, 40, "Os céus e a terra passarão, criou tudo"),
+    _doc(6, 50, "O amor é paciente, o amor é bondoso"),
+    _doc(7, 60, "Deus é amor, e quem permanece no amor é paciente"),
+]
+
+
+@pytest.fixture
+def related() -> RelatedVerses:
+    return RelatedVerses.build(DOCUMENTS, top_k=3, components=4)
+
+
+@pytest.mark.unit
+class TestRelatedVerses:
+    """Testes para vizinhos pré-calculados e consultas por texto."""
+
+    def test_neighbors_share_the_theme(self, related):
+        """O vizinho mais próximo é o versículo do mesmo tema."""
+        assert related.related(4)[0][0] == 5
+        assert related.related(6)[0][0] == 7
+        assert related.related(3)[0][0] in (1, 2)
+
+    def test_same_chapter_is_skipped(self, related):
+        """Versículos do mesmo capítulo (e o próprio) não são vizinhos."""
+        for verse_id in (1, 2):
+            neighbors = [neighbor for neighbor, _ in related.related(verse_id)]
+            assert not {1, 2} & set(neighbors)
+            assert neighbors[0] == 3
+
+    def test_scores_are_sorted_and_limited(self, related):
+        """Notas em ordem decrescente, no máximo `limit` vizinhos."""
+        neighbors = related.related(6, limit=2)
+        assert len(neighbors) <= 2
+        scores = [score for _, score in neighbors]
+        assert scores == sorted(scores, reverse=True)
+        assert related.related(999) is None
+
+    def test_for_text(self, related):
+        """Texto livre é projetado no espaço LSA."""
+        assert related.for_text("pastor das ovelhas")[0][0] in (1, 2, 3)
+        assert related.for_text("palavras fora do vocabulário") == []
+
+    def test_save_and_load(self, related, tmp_path):
+        """O artefato .npz reproduz os mesmos vizinhos."""
+        path = str(tmp_path / "related.npz")
+        related.save(path)
+        loaded = RelatedVerses.load(path)
+        assert loaded.related(4) == related.related(4)
+        assert loaded.for_text("amor paciente") == related.for_text("amor paciente")
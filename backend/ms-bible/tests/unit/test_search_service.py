@@ -0,0 +1,81 @@
+"""
+Testes unitários para a busca textual de versículos do MS-Bible.
+"""
+import re
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services.search_service import (
+    VerseSearchService,
+    decode_search_cursor,
+    encode_search_cursor
+)
+
+
+def _row(verse_id, rank):
+    return SimpleNamespace(
+        id=verse_id, chapter_id=1, number=verse_id, text=f"texto {verse_id}",
+        book_id=43, chapter_number=3, book_name="João",
+        headline=f"<mark>texto</mark> {verse_id}", rank=rank)
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.unit
+class TestSearchQuery:
+    """Testes para a montagem da consulta de busca."""
+
+    def test_cursor_roundtrip(self):
+        """O cursor guarda relevância e id sem perda de precisão."""
+        assert decode_search_cursor(encode_search_cursor(0.0607927, 31102)) == (0.0607927, 31102)
+        with pytest.raises(ValueError):
+            decode_search_cursor("???")
+
+    def test_websearch_and_phrase_queries(self):
+        """Sem frase usa websearch_to_tsquery; com frase, phraseto_tsquery."""
+        assert "websearch_to_tsquery(CAST(" in _sql(VerseSearchService.build_query("amor"))
+        assert "phraseto_tsquery(CAST(" in _sql(VerseSearchService.build_query("amor", phrase=True))
+
+    def test_search_ranks_and_pages(self, db):
+        """Ordena por relevância e id e lê uma linha a mais para o cursor."""
+        db.execute.return_value.all.return_value = [_row(1, 0.9), _row(2, 0.5), _row(3, 0.5)]
+
+        page = VerseSearchService(db).search("amor", limit=2)
+
+        sql = _sql(db.execute.call_args.args[0])
+        assert "bible_verses.search_vector @@ websearch_to_tsquery" in sql
+        assert "ts_rank_cd(bible_verses.search_vector" in sql
+        assert "ts_headline(" in sql
+        assert [hit.id for hit in page.items] == [1, 2]
+        assert decode_search_cursor(page.next_cursor) == (0.5, 2)
+
+    def test_cursor_continues_after_position(self, db):
+        """A página seguinte começa depois de (relevância, id) do cursor."""
+        db.execute.return_value.all.return_value = []
+
+        VerseSearchService(db).search("amor", cursor=encode_search_cursor(0.5, 2))
+
+        sql = _sql(db.execute.call_args.args[0])
+        assert re.search(r"\.rank < CAST\(", sql)
+        assert re.search(r"\.id > ", sql)
+        # Com cursor, a busca aproximada não é tentada
+        assert db.execute.call_count == 1
+
+    def test_invalid_testament(self, db):
+        """Testamento desconhecido gera ValueError."""
+        with pytest.raises(ValueError):
+            VerseSearchService(db).search("amor", testament="middle")
+
+    def test_empty_first_page_falls_back_to_fuzzy(self, db):
+        """Sem resultados na primeira página, usa a busca por trigramas."""
+        db.execute.return_value.all.side_effect = [[], [_row(7, 0.6)]]
+
+        page = VerseSearchService(db).search("amorr")
+
+        assert [hit.id for hit in page.items] == [7]
+        fuzzy_sql = _sql(db.execute.call_args.args[0])
+        assert "word_similarity(" in fuzzy_sql and "<%" in fuzzy_sql
@@ -0,0 +1,131 @@
+"""
+Testes unitários para a tradução ativa e os artefatos gerados a partir dela.
+"""
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import related_verses, translations, verse_index, verse_store
+from app.services.related_verses import RelatedVerses
+from app.services.translations import (
+    NO_TRANSLATION,
+    TranslationService,
+    active_translation_code,
+    artifact_matches
+)
+from app.services.verse_index import VerseDocument, VerseIndex
+from app.services.verse_store import VerseStore, write_store
+
+DOCUMENTS = [
+    VerseDocument(1, 10, 1, 1, 1, "Gênesis", "Antigo", "No princípio criou Deus os céus e a terra"),
+    VerseDocument(2, 20, 1, 2, 1, "Êxodo", "Antigo", "Deus falou aos filhos na terra"),
+    VerseDocument(3, 30, 1, 43, 1, "João", "Novo", "No princípio era o Verbo, e o Verbo era Deus"),
+]
+
+
+@pytest.fixture
+def active(monkeypatch):
+    """Define a tradução ativa vista na inicialização dos artefatos."""
+    def set_active(code):
+        monkeypatch.setattr(translations, "current_translation", lambda: code)
+    return set_active
+
+
+@pytest.mark.unit
+class TestActiveTranslation:
+    """Testes para a leitura e a troca da tradução ativa."""
+
+    def test_active_translation_code(self, db):
+        """Código da tradução ativa; sem nenhuma ativa, NO_TRANSLATION."""
+        db.execute.return_value.scalar.return_value = "ARA"
+        assert active_translation_code(db) == "ARA"
+        sql = str(db.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "bible_translations.active IS true" in sql
+
+        db.execute.return_value.scalar.return_value = None
+        assert active_translation_code(db) == NO_TRANSLATION
+
+    def test_activate_switches_in_one_commit(self, db):
+        """Desativa a atual e ativa a nova na mesma transação."""
+        db.execute.return_value.scalar_one_or_none.return_value = MagicMock(id=7)
+
+        TranslationService(db).activate("NVI")
+
+        updates = [str(call.args[0].compile(dialect=postgresql.dialect()))
+                   for call in db.execute.call_args_list[1:]]
+        assert len(updates) == 2 and all(sql.startswith("UPDATE bible_translations") for sql in updates)
+        db.commit.assert_called_once()
+
+    def test_activate_unknown(self, db):
+        """Tradução inexistente gera LookupError sem commit."""
+        db.execute.return_value.scalar_one_or_none.return_value = None
+        with pytest.raises(LookupError):
+            TranslationService(db).activate("XYZ")
+        db.commit.assert_not_called()
+
+    def test_artifact_matches(self):
+        """Sem banco o artefato é aceito; com banco, só o da tradução ativa."""
+        assert artifact_matches("Índice", "ARA", "ARA")
+        assert artifact_matches("Índice", "ARA", None)
+        assert not artifact_matches("Índice", "ARA", "NVI")
+        assert not artifact_matches("Índice", "", "NVI")
+
+
+@pytest.mark.unit
+class TestArtifactTranslation:
+    """Testes para a tradução gravada e conferida em cada artefato."""
+
+    def test_verse_store(self, tmp_path, verse_rows, active, monkeypatch):
+        """O armazenamento de outra tradução não é aberto."""
+        path = str(tmp_path / "verse_store.bin")
+        write_store(path, *verse_rows, "ARA")
+        store = VerseStore(path)
+        assert store.translation == "ARA"
+        store.close()
+
+        monkeypatch.setattr(verse_store, "_store", None)
+        active("NVI")
+        assert verse_store.init_verse_store(path) is None
+
+        active("ARA")
+        opened = verse_store.init_verse_store(path)
+        assert opened is not None and opened.translation == "ARA"
+        opened.close()
+
+    def test_verse_index_rebuilds_from_database(self, tmp_path, active, monkeypatch):
+        """Índice de outra tradução é reconstruído do banco com a tradução ativa."""
+        path = str(tmp_path / "verse_index.npz")
+        VerseIndex.build(DOCUMENTS, "ARA").save(path)
+        assert VerseIndex.load(path).translation == "ARA"
+
+        session = MagicMock()
+        monkeypatch.setattr("app.infrastructure.database.SessionLocal", lambda: session)
+        monkeypatch.setattr(translations, "snapshot_translation", lambda db: "NVI")
+        monkeypatch.setattr(verse_index, "load_documents", lambda db: DOCUMENTS[:2])
+        monkeypatch.setattr(verse_index, "_index", None)
+        active("NVI")
+
+        index = verse_index.init_verse_index(path)
+        assert index.translation == "NVI" and len(index) == 2
+        session.close.assert_called_once()
+
+    def test_verse_index_artifact_of_active_translation(self, tmp_path, active, monkeypatch):
+        """Artefato da tradução ativa é carregado sem ir ao banco."""
+        path = str(tmp_path / "verse_index.npz")
+        VerseIndex.build(DOCUMENTS, "ARA").save(path)
+        monkeypatch.setattr(verse_index, "_index", None)
+        active("ARA")
+        assert len(verse_index.init_verse_index(path)) == 3
+
+    def test_related_verses(self, tmp_path, active, monkeypatch):
+        """Relacionados de outra tradução não são carregados."""
+        path = str(tmp_path / "related.npz")
+        RelatedVerses.build(DOCUMENTS, top_k=1, components=1, translation="ARA").save(path)
+        assert RelatedVerses.load(path).translation == "ARA"
+
+        monkeypatch.setattr(related_verses, "_related", None)
+        active("NVI")
+        assert related_verses.init_related_verses(path) is None
+        active("ARA")
+        assert related_verses.init_related_verses(path).translation == "ARA"
@@ -0,0 +1,100 @@
+"""
+Testes unitários para o índice invertido em memória da busca de versículos.
+"""
+import pytest
+
+from app.services.verse_index import VerseDocument, VerseIndex, parse_query, tokenize
+
+DOCUMENTS = [
+    VerseDocument(1, 10, 1, 1, 1, "Gênesis", "Antigo",
+                  "No princípio criou Deus os céus e a terra."),
+    VerseDocument(2, 10, 2, 1, 1, "Gênesis", "Antigo",
+                  "E a terra era sem forma e vazia."),
+    VerseDocument(3, 20, 16, 43, 3, "João", "Novo",
+                  "Porque Deus amou o mundo de tal maneira."),
+    VerseDocument(4, 21, 8, 62, 4, "1 João", "Novo",
+                  "Deus é amor."),
+    VerseDocument(5, 22, 4, 46, 13, "1 Coríntios", "Novo",
+                  "O amor é paciente, o amor é bondoso."),
+]
+
+
+@pytest.fixture
+def index() -> VerseIndex:
+    return VerseIndex.build(DOCUMENTS)
+
+
+def _ids(response):
+    return [hit.id for hit in response.items]
+
+
+@pytest.mark.unit
+class TestVerseIndex:
+    """Testes para consultas AND/OR, frases, prefixos e cursor."""
+
+    def test_tokenize_normalizes_and_stems(self):
+        """Tokens ficam sem acentos, em minúsculas e sem plural."""
+        assert tokenize("Céus CORAÇÕES") == ["ceu", "coracao"]
+
+    def test_parse_query(self):
+        """Espaço é AND, OR separa grupos, aspas são frase e * é prefixo."""
+        parsed = parse_query('terra OR "amor paciente" am*')
+        assert parsed.groups == [
+            [("term", "terra")],
+            [("phrase", ["amor", "paciente"]), ("prefix", "am")],
+        ]
+
+    def test_and_requires_all_terms(self, index):
+        """Palavras separadas por espaço precisam estar no mesmo versículo."""
+        assert set(_ids(index.search("deus terra"))) == {1}
+
+    def test_or_unites_groups(self, index):
+        """OR retorna versículos de qualquer um dos grupos."""
+        assert set(_ids(index.search("terra OR amor"))) == {1, 2, 4, 5}
+
+    def test_phrase_checks_consecutive_positions(self, index):
+        """Frases exigem as palavras em sequência."""
+        assert _ids(index.search('"amor é paciente"')) == [5]
+        assert _ids(index.search('"paciente amor"')) == []
+        assert _ids(index.search("deus amou", phrase=True)) == [3]
+
+    def test_prefix_expands_vocabulary(self, index):
+        """Prefixo inclui todos os termos que começam com ele."""
+        assert index.expand_prefix("am") == ["amor", "amou"]
+        assert set(_ids(index.search("am*"))) == {3, 4, 5}
+
+    def test_ranking_and_highlight(self, index):
+        """Mais ocorrências do termo pontuam mais e ficam marcadas."""
+        response = index.search("amor")
+        assert _ids(response) == [5, 4]
+        assert response.items[0].headline == (
+            "O <mark>amor</mark> é paciente, o <mark>amor</mark> é bondoso.")
+        assert response.items[0].book_name == "1 Coríntios"
+
+    def test_cursor_pages_without_repeats(self, index):
+        """As páginas seguem a ordem (relevância, id) sem repetir versículos."""
+        full = _ids(index.search("deus OR terra OR amor", limit=10))
+        seen, cursor = [], None
+        while True:
+            page = index.search("deus OR terra OR amor", limit=2, cursor=cursor)
+            seen.extend(_ids(page))
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        assert seen == full
+        assert len(full) == 5
+
+    def test_filters(self, index):
+        """Filtra por testamento e livro; testamento inválido gera ValueError."""
+        assert set(_ids(index.search("deus", testament="old"))) == {1}
+        assert set(_ids(index.search("deus", book_id=43))) == {3}
+        with pytest.raises(ValueError):
+            index.search("deus", testament="middle")
+
+    def test_save_and_load(self, index, tmp_path):
+        """O artefato .npz reproduz as mesmas respostas."""
+        path = str(tmp_path / "verse_index.npz")
+        index.save(path)
+        loaded = VerseIndex.load(path)
+        assert len(loaded) == len(index)
+        assert loaded.search("amor") == index.search("amor")
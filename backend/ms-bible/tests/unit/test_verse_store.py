@@ -0,0 +1,70 @@
+"""
+Testes unitários para o armazenamento de versículos mapeado em memória.
+"""
+import pytest
+
+from app.services.verse_store import VerseStore, write_store
+
+
+@pytest.mark.unit
+class TestVerseStore:
+    """Testes para gravação e leitura do arquivo do armazenamento."""
+
+    def test_write_counts(self, tmp_path):
+        """Gravação retorna as contagens e ignora linhas sem livro ou capítulo."""
+        counts = write_store(
+            str(tmp_path / "store.bin"),
+            [(1, "Gênesis", "Antigo")],
+            [(101, 1, 1), (999, 2, 1)],
+            [(10101, 101, 1, "Texto"), (99901, 999, 1, "Órfão")])
+        assert counts == {"books": 1, "chapters": 1, "verses": 1,
+                          "text_bytes": len("Texto".encode()) + len("Gênesis".encode())}
+        assert not (tmp_path / "store.bin.tmp").exists()
+
+    def test_books_in_id_order(self, verse_store):
+        """Livros ficam na ordem dos ids, com testamento e capítulos."""
+        books = verse_store.books()
+        assert [book["id"] for book in books] == [1, 19, 43]
+        assert books[0] == {
+            "id": 1, "name": "Gênesis", "testament": "old",
+            "abbreviation": books[0]["abbreviation"], "position": 1,
+            "chapters_count": 2,
+        }
+        assert books[2]["testament"] == "new"
+
+    def test_chapters(self, verse_store):
+        """Capítulos do livro em ordem; livro inexistente retorna None."""
+        assert [c["id"] for c in verse_store.chapters(1)] == [101, 102]
+        assert verse_store.chapters(1)[0]["verses_count"] == 2
+        assert verse_store.chapters(2) is None
+
+    def test_get_verse(self, verse_store):
+        """Versículo por id com dados do capítulo e do livro."""
+        verse = verse_store.get_verse(43316)
+        assert verse["text"] == "Porque Deus amou o mundo de tal maneira"
+        assert (verse["book_name"], verse["chapter_number"], verse["number"]) == ("João", 3, 16)
+        assert verse_store.get_verse(1) is None
+
+    def test_chapter_verses_slice(self, verse_store):
+        """Os textos do capítulo saem de uma única fatia, em ordem de número."""
+        chapter = verse_store.chapter_verses(101)
+        assert [v["number"] for v in chapter["verses"]] == [1, 2]
+        assert chapter["verses"][0]["text"] == "No princípio criou Deus os céus e a terra."
+        assert chapter["verses"][1]["text"] == "E a terra era sem forma e vazia"
+        assert verse_store.chapter_verse_ids(4301) == [43316, 43317, 43318]
+        assert verse_store.chapter_verses(5) is None
+
+    def test_rows_by_number(self, verse_store):
+        """Capítulo por número e intervalo de versículos dentro dele."""
+        book_row = verse_store.book_row(43)
+        chapter_row = verse_store.chapter_row_by_number(book_row, 3)
+        rows = verse_store.verse_rows_by_number(chapter_row, 17, 30)
+        assert [verse_store.verse(row)["id"] for row in rows] == [43317, 43318]
+        assert verse_store.chapter_row_by_number(book_row, 4) is None
+
+    def test_rejects_other_files(self, tmp_path):
+        """Arquivo sem o identificador do formato é recusado."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError):
+            VerseStore(str(path))
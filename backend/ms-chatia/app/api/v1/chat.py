@@ -4,7 +4,6 @@ from typing import List, Dict, Any, Optional
 import uuid
 import json
 import logging
-import httpx
 
 from app.domain.schemas.chat import (
     ChatMessageRequest,
@@ -21,6 +20,7 @@ from app.infrastructure.database import get_db
 from app.infrastructure.security import get_current_user_id, verify_service_api_key
 from app.infrastructure.redis import get_chat_limit, decrement_chat_limit, increment_chat_limit
 from app.infrastructure.openai import get_openai_service, OpenAIService
+from app.infrastructure.internal_client import internal_client
 from app.core.config import get_settings, Settings
 
 # Criar router para os endpoints de chat
@@ -207,17 +207,17 @@ async def process_ad_reward(
         # Notificar o ms-monetization sobre a recompensa processada (assíncrono)
         try:
             if settings.MS_MONETIZATION_URL:
-                async with httpx.AsyncClient(timeout=2.0) as client:
-                    await client.post(
-                        f"{settings.MS_MONETIZATION_URL}/api/v1/monetization/log-reward",
-                        json={
-                            "user_id": str(user_id),
-                            "reward_type": "chat_messages",
-                            "reward_amount": bonus_messages,
-                            "source": "ad_view"
-                        },
-                        headers={"Authorization": f"Bearer {settings.SERVICE_API_KEY}"}
-                    )
+                await internal_client.post(
+                    f"{settings.MS_MONETIZATION_URL}/api/v1/monetization/log-reward",
+                    json={
+                        "user_id": str(user_id),
+                        "reward_type": "chat_messages",
+                        "reward_amount": bonus_messages,
+                        "source": "ad_view"
+                    },
+                    headers={"Authorization": f"Bearer {settings.SERVICE_API_KEY}"},
+                    timeout=2.0
+                )
         except Exception as notification_error:
             # Não bloqueia a operação principal se a notificação falhar
             logger.warning(f"Erro ao notificar recompensa: {str(notification_error)}")
@@ -78,6 +78,8 @@ class Settings(BaseSettings):
     CHAT_LIMIT_KEY_TTL: int = 86400
     CHAT_BONUS_PER_AD: int = 5
     CHAT_HISTORY_MAX_ITEMS: int = 50
+    # Versículos relacionados enviados ao modelo como base da resposta (0 desliga)
+    CHAT_GROUNDING_VERSES: int = 3
 
     # OpenAI
     OPENAI_API_KEY: str = "your_api_key_here"
@@ -97,6 +99,15 @@ class Settings(BaseSettings):
     MS_BIBLE_URL: str = "http://ms-bible:8006"
     SERVICE_API_KEY: str = "internal-service-key-change-in-production"
 
+    # Cliente HTTP interno (pool compartilhado entre microsserviços)
+    INTERNAL_HTTP_TIMEOUT: float = 10.0
+    INTERNAL_HTTP_MAX_CONNECTIONS: int = 50
+    INTERNAL_HTTP_MAX_KEEPALIVE: int = 20
+    INTERNAL_HTTP_RETRIES: int = 2
+    INTERNAL_HTTP2: bool = False
+    # Maior deadline aceito no header X-Request-Deadline (segundos)
+    INTERNAL_HTTP_MAX_DEADLINE: float = 60.0
+
     # Monitoramento
     APM_SERVER_URL: str = "http://apm:8200"
     ENABLE_METRICS: bool = True
@@ -13,8 +13,9 @@ Features:
     - Certificados especiais
 """
 
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 import logging
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from .config import settings
 from .cache import cache
@@ -98,6 +99,10 @@ class GamificationManager:
             {"level": 5, "points": 5000, "name": "Sábio"}
         ]
 
+        # Limiares ordenados para resolver níveis com busca binária
+        self.levels = sorted(self.levels, key=lambda level: level["points"])
+        self._level_thresholds = [level["points"] for level in self.levels]
+
         logger.info("Gerenciador de gamificação inicializado")
 
     async def add_points(
@@ -195,26 +200,7 @@ class GamificationManager:
             # Busca pontos
             points = await self._get_user_points(user_id)
 
-            # Calcula nível
-            current_level = None
-            next_level = None
-
-            for i, level in enumerate(self.levels):
-                if points >= level["points"]:
-                    current_level = level
-                    if i < len(self.levels) - 1:
-                        next_level = self.levels[i + 1]
-
-            return {
-                "current": current_level,
-                "next": next_level,
-                "points": points,
-                "progress": self._calculate_progress(
-                    points,
-                    current_level,
-                    next_level
-                )
-            }
+            return self.level_for_points(points)
 
         except Exception as e:
             logger.error(f"Erro ao calcular nível: {str(e)}")
@@ -225,6 +211,47 @@ class GamificationManager:
                 "progress": 0
             }
 
+    def level_for_points(self, points: int) -> Dict:
+        """
+        Calcula o nível correspondente a uma pontuação.
+
+        Usa busca binária sobre os limiares pré-ordenados (O(log n)).
+
+        Args:
+            points: Pontos do usuário
+
+        Returns:
+            Dict: Dados do nível
+        """
+        index = max(bisect_right(self._level_thresholds, points) - 1, 0)
+        current_level = self.levels[index]
+        next_level = (
+            self.levels[index + 1] if index + 1 < len(self.levels) else None
+        )
+
+        return {
+            "current": current_level,
+            "next": next_level,
+            "points": points,
+            "progress": self._calculate_progress(
+                points,
+                current_level,
+                next_level
+            )
+        }
+
+    def levels_for_points(self, points: Iterable[int]) -> List[Dict]:
+        """
+        Calcula os níveis de várias pontuações já conhecidas.
+
+        Args:
+            points: Pontos de cada usuário
+
+        Returns:
+            List[Dict]: Dados do nível, na mesma ordem
+        """
+        return [self.level_for_points(value) for value in points]
+
     async def get_weekly_ranking(
         self,
         limit: int = 10
@@ -242,15 +269,20 @@ class GamificationManager:
             # Busca ranking
             ranking = await self._get_weekly_ranking(limit)
 
+            # Níveis calculados a partir dos pontos já retornados pelo ranking
+            levels = self.levels_for_points(
+                user["points"] for user in ranking
+            )
+
             # Formata resultado
             result = []
-            for i, user in enumerate(ranking, 1):
+            for i, (user, level) in enumerate(zip(ranking, levels), 1):
                 result.append({
                     "position": i,
                     "user_id": user["user_id"],
                     "user_name": user["user_name"],
                     "points": user["points"],
-                    "level": await self.get_level(user["user_id"])
+                    "level": level
                 })
 
             return result
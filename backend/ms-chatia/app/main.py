@@ -25,6 +25,10 @@ from app.core.config import get_settings
 from app.core.error_handlers import setup_error_handlers
 from app.core.logging import setup_logging
 from app.core.middleware import setup_middlewares
+from app.infrastructure.internal_client import (
+    internal_client, propagate_deadline, require_internal_caller
+)
+from app.services.bible_references import extract_bible_references
 
 # Configuração de logging
 logging.basicConfig(level=logging.INFO)
@@ -101,6 +105,9 @@ def create_app() -> FastAPI:
     # Configurar middlewares adicionais
     setup_middlewares(app)
 
+    # Propagar deadline recebido para chamadas a outros microsserviços
+    app.middleware("http")(propagate_deadline)
+
     # Incluir rotas da API
     app.include_router(api_router, prefix="/api/v1")
 
@@ -208,20 +215,6 @@ MOCK_HISTORY = []
 remaining_messages_mock = 5
 
 
-def extract_bible_references(text: str) -> List[str]:
-    """Extrai referências bíblicas do texto da resposta"""
-    # Implementação básica - deve ser melhorada com regex ou NLP
-    references = []
-    if "(" in text and ")" in text:
-        # Exemplo simples - extrair texto entre parênteses
-        start = text.find("(")
-        end = text.find(")")
-        if start > -1 and end > start:
-            ref = text[start+1:end].strip()
-            references.append(ref)
-    return references
-
-
 def generate_suggestions(message: str, response: str) -> List[str]:
     """Gera sugestões de próximas perguntas baseadas no contexto"""
     # Implementação básica - deve ser melhorada com IA
@@ -253,6 +246,7 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("MS-CHATIA finalizando")
+    await internal_client.close()
 
 
 @app.get("/health")
@@ -266,6 +260,12 @@ async def api_chat_health():
     return {"status": "healthy", "service": "ms-chatia"}
 
 
+@app.get("/api/chat/metrics/internal-http", dependencies=[Depends(require_internal_caller)])
+async def internal_http_metrics():
+    """Métricas de latência das chamadas a outros microsserviços, por destino (só chamadores internos)"""
+    return internal_client.get_metrics()
+
+
 @app.get("/api/chat/history", response_model=ChatHistoryResponse)
 async def get_history():
     """Retorna histórico de chat"""
@@ -332,7 +332,7 @@ async def chat_message(message: ChatMessageCreate):
             ai_response = response.choices[0].message.content
 
             # Extração de referências e geração de sugestões
-            verses = extract_bible_references(ai_response)
+            verses = await extract_bible_references(ai_response)
             suggestions = generate_suggestions(message.message, ai_response)
 
         except Exception as api_error:
@@ -0,0 +1,88 @@
+"""
+Extração de referências bíblicas das respostas da IA e busca de versículos
+relacionados à mensagem do usuário.
+
+O reconhecimento (nomes e abreviações pt-BR, intervalos e listas) e a
+resolução ficam no ms-bible: o texto inteiro é enviado em uma única chamada
+a `/verses:resolve`, em vez de uma chamada por referência. Os versículos
+relacionados vêm de `/verses:related`, que consulta vizinhos pré-calculados
+no ms-bible sem nenhuma geração.
+"""
+import logging
+from typing import Dict, List
+
+from app.core.config import settings
+from app.infrastructure.internal_client import internal_client
+
+logger = logging.getLogger(__name__)
+
+RESOLVE_TIMEOUT = 2.0
+
+# A busca é feita antes da chamada ao modelo: prazo curto para não atrasar o chat
+RELATED_TIMEOUT = 1.0
+
+
+async def extract_bible_references(text: str) -> List[str]:
+    """
+    Referências encontradas no texto, na forma canônica do ms-bible.
+
+    Args:
+        text: Texto da resposta
+
+    Returns:
+        Lista de referências existentes (ex: ["João 3:16-18", "Salmos 23"]);
+        vazia se o ms-bible estiver indisponível
+    """
+    if not text or not settings.MS_BIBLE_URL:
+        return []
+
+    try:
+        response = await internal_client.post(
+            f"{settings.MS_BIBLE_URL}/api/bible/verses:resolve",
+            json={"text": text, "include_text": False},
+            timeout=RESOLVE_TIMEOUT
+        )
+        response.raise_for_status()
+    except Exception as e:
+        # Não bloqueia a resposta do chat se a resolução falhar
+        logger.warning(f"Erro ao resolver referências bíblicas: {str(e)}")
+        return []
+
+    return [item["reference"] for item in response.json()["items"] if item["found"]]
+
+
+async def find_related_verses(text: str, limit: int = 3) -> List[Dict]:
+    """
+    Versículos mais relacionados ao texto, por similaridade de conteúdo.
+
+    Args:
+        text: Texto de referência (ex: mensagem do usuário)
+        limit: Quantidade máxima de versículos
+
+    Returns:
+        Lista de {"reference": "João 3:16", "text": ...}; vazia se o
+        ms-bible estiver indisponível
+    """
+    if not text or limit <= 0 or not settings.MS_BIBLE_URL:
+        return []
+
+    try:
+        response = await internal_client.post(
+            f"{settings.MS_BIBLE_URL}/api/bible/verses:related",
+            json={"text": text[:5000], "limit": min(limit, 20)},
+            timeout=RELATED_TIMEOUT
+        )
+        response.raise_for_status()
+    except Exception as e:
+        # Sem versículos de apoio o chat responde normalmente
+        logger.warning(f"Erro ao buscar versículos relacionados: {str(e)}")
+        return []
+
+    return [
+        {
+            "reference": f"{item['verse']['book_name']} "
+                         f"{item['verse']['chapter_number']}:{item['verse']['verse_number']}",
+            "text": item["verse"]["text"]
+        }
+        for item in response.json()["items"]
+    ]
@@ -11,6 +11,7 @@ from fastapi import HTTPException, status
 
 from app.core.config import get_settings
 from app.core.logging import get_logger, log_manager
+from app.services.bible_references import extract_bible_references, find_related_verses
 from app.schemas.chat import (
     ChatMessageResponse,
     StudyPlanRequest,
@@ -87,6 +88,13 @@ class OpenAIService:
                 if context.get("verse_id"):
                     system_prompt += "\nVocê está explicando um versículo específico."
 
+            # Versículos relacionados à mensagem, para fundamentar a resposta
+            grounding = await find_related_verses(message, settings.CHAT_GROUNDING_VERSES)
+            if grounding:
+                system_prompt += "\nVersículos relacionados à mensagem (use se forem pertinentes):"
+                for verse in grounding:
+                    system_prompt += f"\n- {verse['reference']}: {verse['text']}"
+
             # Monta mensagens
             messages = [
                 {"role": "system", "content": system_prompt}
@@ -383,7 +391,7 @@ class OpenAIService:
 
     # Métodos auxiliares
 
-    def extract_verses(self, content: str) -> List[str]:
+    async def extract_verses(self, content: str) -> List[str]:
         """
         Extrai referências bíblicas do texto.
 
@@ -393,8 +401,7 @@ class OpenAIService:
         Returns:
             Lista de referências (ex: ["João 3:16", "Salmos 23:1"])
         """
-        # TODO: Implementar extração de versículos
-        return []
+        return await extract_bible_references(content)
 
     def generate_suggestions(self, content: str) -> List[str]:
         """
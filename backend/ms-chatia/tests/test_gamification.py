@@ -0,0 +1,50 @@
+"""
+Testes para o cálculo de níveis do gerenciador de gamificação.
+"""
+import pytest
+from unittest.mock import AsyncMock
+
+from app.core.gamification import GamificationManager
+
+
+@pytest.fixture
+def manager():
+    return GamificationManager(levels=[
+        {"level": 3, "points": 1000, "name": "Discípulo"},
+        {"level": 1, "points": 0, "name": "Iniciante"},
+        {"level": 2, "points": 500, "name": "Aprendiz"},
+    ])
+
+
+def test_level_for_points_uses_thresholds(manager):
+    """O nível é o maior limiar menor ou igual aos pontos."""
+    assert manager.level_for_points(0)["current"]["level"] == 1
+    assert manager.level_for_points(499)["current"]["level"] == 1
+    assert manager.level_for_points(500)["current"]["level"] == 2
+    assert manager.level_for_points(5000)["current"]["level"] == 3
+    assert manager.level_for_points(5000)["next"] is None
+
+
+def test_level_for_negative_points_is_first_level(manager):
+    """Pontuações abaixo do primeiro limiar ficam no primeiro nível."""
+    assert manager.level_for_points(-10)["current"]["level"] == 1
+
+
+def test_levels_for_points_keeps_order(manager):
+    """Os níveis saem na mesma ordem das pontuações."""
+    levels = manager.levels_for_points([1200, 0, 700])
+    assert [level["current"]["level"] for level in levels] == [3, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_weekly_ranking_levels_from_ranking_points(manager):
+    """O ranking calcula os níveis com os pontos que já retornou."""
+    manager._get_weekly_ranking = AsyncMock(return_value=[
+        {"user_id": "a", "user_name": "Ana", "points": 1500},
+        {"user_id": "b", "user_name": "Bruno", "points": 600},
+    ])
+
+    ranking = await manager.get_weekly_ranking(limit=2)
+
+    assert [(row["position"], row["user_id"], row["level"]["current"]["level"])
+            for row in ranking] == [(1, "a", 3), (2, "b", 2)]
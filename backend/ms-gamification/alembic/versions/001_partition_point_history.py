@@ -0,0 +1,177 @@
+"""partition point_history by month
+
+Revision ID: 001
+Revises:
+Create Date: 2024-06-10 09:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.db.partitions import ensure_partitions, is_partitioned
+
+# revision identifiers, used by Alembic.
+revision = '001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def table_exists(table_name):
+    """Verifica se a tabela já existe no banco de dados"""
+    conn = op.get_bind()
+    return conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.tables WHERE table_name = :table"
+    ), {"table": table_name}).scalar() is not None
+
+
+def column_exists(table_name, column_name):
+    """Verifica se a coluna já existe na tabela"""
+    conn = op.get_bind()
+    return conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name}).scalar() is not None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Bancos criados pelo create_all dos modelos anteriores não têm a chave
+    # de idempotência no histórico nem o rollup diário
+    if not column_exists('point_history', 'idempotency_key'):
+        op.add_column('point_history', sa.Column(
+            'idempotency_key', sa.String(), nullable=True))
+
+    if not table_exists('user_points_daily'):
+        op.create_table(
+            'user_points_daily',
+            sa.Column('user_id', sa.String(), nullable=False),
+            sa.Column('category', sa.String(), nullable=False),
+            sa.Column('day', sa.Date(), nullable=False),
+            sa.Column('points', sa.Integer(), nullable=False),
+            sa.Column('events', sa.Integer(), nullable=False, server_default='0'),
+            sa.PrimaryKeyConstraint('user_id', 'category', 'day')
+        )
+        op.create_index('ix_user_points_daily_day_category',
+                        'user_points_daily', ['day', 'category'])
+        op.execute(
+            "INSERT INTO user_points_daily (user_id, category, day, points, events) "
+            "SELECT user_id, category, coalesce(created_at, now())::date, "
+            "       sum(amount), count(*) "
+            "FROM point_history GROUP BY 1, 2, 3"
+        )
+
+    # Contagem de transações no rollup diário (totais aproximados do histórico)
+    if not column_exists('user_points_daily', 'events'):
+        op.add_column('user_points_daily', sa.Column(
+            'events', sa.Integer(), nullable=False, server_default='0'))
+        op.execute(
+            "UPDATE user_points_daily d SET events = h.events "
+            "FROM (SELECT user_id, category, created_at::date AS day, count(*) AS events "
+            "      FROM point_history GROUP BY 1, 2, 3) h "
+            "WHERE d.user_id = h.user_id AND d.category = h.category AND d.day = h.day"
+        )
+
+    # Chaves de idempotência fora da tabela particionada
+    if not table_exists('point_event_keys'):
+        op.create_table(
+            'point_event_keys',
+            sa.Column('idempotency_key', sa.String(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('idempotency_key')
+        )
+        op.create_index('ix_point_event_keys_created_at',
+                        'point_event_keys', ['created_at'])
+
+    if is_partitioned(conn):
+        # Banco criado pelo create_all já com a tabela particionada
+        ensure_partitions(conn, settings.POINT_HISTORY_PARTITIONS_AHEAD)
+        return
+
+    op.rename_table('point_history', 'point_history_legacy')
+    for index in ('point_history_pkey', 'ix_point_history_user_id',
+                  'ix_point_history_category'):
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_legacy")
+
+    op.create_table(
+        'point_history',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('related_entity_id', sa.String(), nullable=True),
+        sa.Column('idempotency_key', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)'
+    )
+
+    # Uma partição por mês desde a transação mais antiga
+    first = conn.execute(sa.text(
+        "SELECT min(created_at) FROM point_history_legacy")).scalar()
+    ensure_partitions(
+        conn,
+        settings.POINT_HISTORY_PARTITIONS_AHEAD,
+        since=first.date() if first else date.today()
+    )
+
+    # Índices criados na tabela pai são propagados para cada partição
+    op.execute(
+        "CREATE INDEX ix_point_history_user_created "
+        "ON point_history (user_id, created_at DESC, id DESC)")
+    op.create_index('ix_point_history_category', 'point_history', ['category'])
+
+    op.execute(
+        "INSERT INTO point_history "
+        "(id, user_id, category, amount, action, description, "
+        " related_entity_id, idempotency_key, created_at) "
+        "SELECT id, user_id, category, amount, action, description, "
+        "       related_entity_id, idempotency_key, coalesce(created_at, now()) "
+        "FROM point_history_legacy"
+    )
+    op.execute(
+        "INSERT INTO point_event_keys (idempotency_key, created_at) "
+        "SELECT idempotency_key, coalesce(created_at, now()) FROM point_history_legacy "
+        "WHERE idempotency_key IS NOT NULL "
+        "ON CONFLICT (idempotency_key) DO NOTHING"
+    )
+    op.drop_table('point_history_legacy')
+
+
+def downgrade() -> None:
+    # Volta para uma tabela simples (inclui partições desanexadas apenas se
+    # forem reanexadas antes)
+    op.rename_table('point_history', 'point_history_partitioned')
+    for index in ('point_history_pkey', 'ix_point_history_category'):
+        op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_partitioned")
+    op.create_table(
+        'point_history',
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', sa.String(), nullable=False),
+        sa.Column('category', sa.String(), nullable=False),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('action', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('related_entity_id', sa.String(), nullable=True),
+        sa.Column('idempotency_key', sa.String(), nullable=True, unique=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute(
+        "INSERT INTO point_history SELECT id, user_id, category, amount, action, "
+        "description, related_entity_id, idempotency_key, created_at "
+        "FROM point_history_partitioned"
+    )
+    op.drop_table('point_history_partitioned')
+    op.create_index('ix_point_history_user_id', 'point_history', ['user_id'])
+    op.create_index('ix_point_history_category', 'point_history', ['category'])
+    op.drop_index('ix_point_event_keys_created_at', table_name='point_event_keys')
+    op.drop_table('point_event_keys')
+    op.drop_column('user_points_daily', 'events')
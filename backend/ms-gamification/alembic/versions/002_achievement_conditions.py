@@ -0,0 +1,73 @@
+"""achievement conditions and unique user achievements
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-06-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002'
+down_revision = '001'
+branch_labels = None
+depends_on = None
+
+
+def column_exists(table_name, column_name):
+    """Verifica se a coluna já existe na tabela"""
+    conn = op.get_bind()
+    return conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name}).scalar() is not None
+
+
+def constraint_exists(constraint_name):
+    """Verifica se a constraint já existe no banco de dados"""
+    conn = op.get_bind()
+    return conn.execute(sa.text(
+        "SELECT 1 FROM pg_constraint WHERE conname = :name"
+    ), {"name": constraint_name}).scalar() is not None
+
+
+def upgrade() -> None:
+    # Condição avaliada pelo motor de regras; conquistas existentes eram
+    # todas de pontos, com o limiar em points_required
+    if not column_exists('achievements', 'condition_type'):
+        op.add_column('achievements', sa.Column(
+            'condition_type', sa.String(), nullable=False, server_default='points'))
+        op.create_index('ix_achievements_condition_type',
+                        'achievements', ['condition_type'])
+    if not column_exists('achievements', 'condition_value'):
+        op.add_column('achievements', sa.Column(
+            'condition_value', sa.Integer(), nullable=False, server_default='0'))
+        op.execute(
+            "UPDATE achievements SET condition_value = coalesce(points_required, 0) "
+            "WHERE condition_type = 'points'"
+        )
+
+    if not constraint_exists('uq_user_achievements_user_achievement'):
+        # Mantém uma linha por (usuário, conquista): a desbloqueada há mais
+        # tempo ou, se nenhuma foi desbloqueada, a de maior progresso
+        op.execute(
+            "DELETE FROM user_achievements u USING ("
+            "  SELECT id, row_number() OVER ("
+            "    PARTITION BY user_id, achievement_id"
+            "    ORDER BY unlocked_at ASC NULLS LAST, progress DESC,"
+            "             current_points DESC, created_at ASC, id"
+            "  ) AS position FROM user_achievements"
+            ") d WHERE u.id = d.id AND d.position > 1"
+        )
+        op.create_unique_constraint(
+            'uq_user_achievements_user_achievement',
+            'user_achievements', ['user_id', 'achievement_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_user_achievements_user_achievement',
+                       'user_achievements', type_='unique')
+    op.drop_column('achievements', 'condition_value')
+    op.drop_index('ix_achievements_condition_type', table_name='achievements')
+    op.drop_column('achievements', 'condition_type')
@@ -0,0 +1,59 @@
+"""unique user points per category
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-06-24 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def constraint_exists(constraint_name):
+    """Verifica se a constraint já existe no banco de dados"""
+    conn = op.get_bind()
+    return conn.execute(sa.text(
+        "SELECT 1 FROM pg_constraint WHERE conname = :name"
+    ), {"name": constraint_name}).scalar() is not None
+
+
+def upgrade() -> None:
+    if constraint_exists('uq_user_points_user_category'):
+        return
+
+    # Sem créditos concorrentes enquanto as linhas são unificadas
+    op.execute("LOCK TABLE user_points IN SHARE ROW EXCLUSIVE MODE")
+
+    # Linhas repetidas de (usuário, categoria) são somadas na mais antiga
+    op.execute(
+        "WITH ranked AS ("
+        "  SELECT id,"
+        "         row_number() OVER w AS position,"
+        "         count(*) OVER w AS copies,"
+        "         sum(amount) OVER w AS total,"
+        "         max(updated_at) OVER w AS last_update"
+        "  FROM user_points"
+        "  WINDOW w AS (PARTITION BY user_id, category"
+        "               ORDER BY created_at ASC NULLS LAST, id"
+        "               ROWS BETWEEN UNBOUNDED PRECEDING AND UNBOUNDED FOLLOWING)"
+        "), merged AS ("
+        "  UPDATE user_points u SET amount = r.total, updated_at = r.last_update"
+        "  FROM ranked r WHERE u.id = r.id AND r.position = 1 AND r.copies > 1"
+        ") "
+        "DELETE FROM user_points u USING ranked r "
+        "WHERE u.id = r.id AND r.position > 1"
+    )
+
+    op.create_unique_constraint(
+        'uq_user_points_user_category', 'user_points', ['user_id', 'category'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_user_points_user_category',
+                       'user_points', type_='unique')
@@ -0,0 +1,54 @@
+"""pending achievement notifications
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-07-01 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def column_exists(table_name, column_name):
+    """Verifica se a coluna já existe na tabela"""
+    conn = op.get_bind()
+    return conn.execute(sa.text(
+        "SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = :table AND column_name = :column"
+    ), {"table": table_name, "column": column_name}).scalar() is not None
+
+
+def index_exists(index_name):
+    """Verifica se o índice já existe no banco de dados"""
+    conn = op.get_bind()
+    return conn.execute(sa.text(
+        "SELECT 1 FROM pg_indexes WHERE indexname = :name"
+    ), {"name": index_name}).scalar() is not None
+
+
+def upgrade() -> None:
+    if not column_exists('user_achievements', 'notified'):
+        op.add_column('user_achievements', sa.Column(
+            'notified', sa.Integer(), nullable=False, server_default='0'))
+        # Desbloqueios anteriores já aparecem na lista de conquistas do
+        # usuário; só os novos geram notificação
+        op.execute(
+            "UPDATE user_achievements SET notified = 1 WHERE unlocked_at IS NOT NULL")
+
+    # Apenas desbloqueios ainda não notificados
+    if not index_exists('ix_user_achievements_unnotified'):
+        op.create_index(
+            'ix_user_achievements_unnotified', 'user_achievements', ['user_id'],
+            postgresql_where=sa.text("unlocked_at IS NOT NULL AND notified = 0"))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_achievements_unnotified',
+                  table_name='user_achievements')
+    op.drop_column('user_achievements', 'notified')
@@ -2,10 +2,12 @@ import logging
 import jwt
 from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional, Dict, Any
 
 from app.core.config import settings
+from app.db.async_session import get_read_db, get_write_db
 from app.db.session import get_db
 from app.services.points_service import PointsService
 from app.services.achievement_service import AchievementService
@@ -109,7 +111,7 @@ async def get_current_active_user(
     return current_user
 
 
-def get_points_service(db: Session = Depends(get_db)) -> PointsService:
+def get_points_service(db: AsyncSession = Depends(get_write_db)) -> PointsService:
     """
     Cria e retorna uma instância do serviço de pontos.
 
@@ -122,7 +124,7 @@ def get_points_service(db: Session = Depends(get_db)) -> PointsService:
     return PointsService(db)
 
 
-def get_achievement_service(db: Session = Depends(get_db)) -> AchievementService:
+def get_achievement_service(db: AsyncSession = Depends(get_write_db)) -> AchievementService:
     """
     Cria e retorna uma instância do serviço de conquistas.
 
@@ -135,7 +137,7 @@ def get_achievement_service(db: Session = Depends(get_db)) -> AchievementService
     return AchievementService(db)
 
 
-def get_leaderboard_service(db: Session = Depends(get_db)) -> LeaderboardService:
+def get_leaderboard_service(db: AsyncSession = Depends(get_read_db)) -> LeaderboardService:
     """
     Cria e retorna uma instância do serviço de leaderboard.
 
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, status
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db, get_current_user, get_current_active_user
+from app.dependencies import get_write_db, get_read_db, get_current_user, get_current_active_user
 from app.schemas.gamification import (
     AchievementResponse,
     AchievementListResponse,
@@ -23,7 +23,7 @@ async def get_achievements(
     difficulty: Optional[str] = Query(
         None, description="Filtrar por dificuldade"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Lista todas as conquistas disponíveis no sistema.
@@ -42,7 +42,7 @@ async def get_achievements(
 @router.get("/user", response_model=UserAchievementResponse)
 async def get_user_achievements(
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Retorna as conquistas do usuário atual, incluindo:
@@ -58,7 +58,7 @@ async def get_user_achievements(
 async def get_achievement_detail(
     achievement_id: str = Path(..., description="ID da conquista"),
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Retorna detalhes de uma conquista específica.
@@ -84,7 +84,7 @@ async def get_achievement_detail(
 @router.get("/categories", response_model=List[str])
 async def get_achievement_categories(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna a lista de categorias de conquistas disponíveis.
@@ -97,7 +97,7 @@ async def get_achievement_categories(
 async def check_achievement(
     achievement_id: str = Path(..., description="ID da conquista a verificar"),
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Verifica se o usuário completou os requisitos para uma conquista específica.
@@ -116,7 +116,7 @@ async def check_achievement(
 async def get_other_user_achievements(
     user_id: str = Path(..., description="ID do usuário"),
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Retorna as conquistas de outro usuário.
@@ -0,0 +1,89 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.dependencies import (
+    get_read_db,
+    get_write_db,
+    get_current_active_user,
+    get_current_service
+)
+from app.schemas.gamification import (
+    StreakResponse,
+    ActivityCalendarResponse,
+    ActivityBulkRequest,
+    ActivityBulkResponse
+)
+from app.services.activity_calendar import ActivityCalendar
+from app.services.points_service import PointsService
+
+router = APIRouter()
+
+
+@router.get("/streak", response_model=StreakResponse)
+async def get_streak(
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Retorna a sequência atual e a maior sequência de dias ativos do usuário.
+    """
+    activity = ActivityCalendar()
+    await activity.restore(db, current_user["id"])
+    return await activity.get_streak(current_user["id"])
+
+
+@router.get("/calendar", response_model=ActivityCalendarResponse)
+async def get_activity_calendar(
+    year: Optional[int] = Query(None, ge=2020, le=2100, description="Ano (padrão: atual)"),
+    month: Optional[int] = Query(None, ge=1, le=12, description="Mês (padrão: atual)"),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Retorna os dias do mês em que o usuário estudou, conversou ou refletiu.
+    """
+    today = datetime.utcnow().date()
+    year = year or today.year
+    month = month or today.month
+
+    activity = ActivityCalendar()
+    await activity.restore(db, current_user["id"])
+    active_days = await activity.get_month(current_user["id"], year, month)
+
+    return ActivityCalendarResponse(
+        year=year,
+        month=month,
+        active_days=active_days,
+        total_active_days=len(active_days)
+    )
+
+
+@router.post("/record", response_model=ActivityBulkResponse)
+async def record_activity(
+    activity_data: ActivityBulkRequest,
+    current_service: dict = Depends(get_current_service),
+    db: AsyncSession = Depends(get_write_db)
+):
+    """
+    Registra atividades que não geram pontos (estudo, conversa, reflexão).
+
+    Uso interno entre microsserviços. Os dias entram no calendário e na
+    sequência do usuário, e as conquistas de sequência são avaliadas;
+    créditos de pontos já registram o dia por conta própria.
+    """
+    now = datetime.utcnow()
+    activities = [
+        (event.user_id, (event.occurred_at or now).date())
+        for event in activity_data.events
+    ]
+
+    points_service = PointsService(db)
+    await points_service.record_activity(activities)
+
+    return ActivityBulkResponse(
+        received=len(activities),
+        users=len({user_id for user_id, _ in activities})
+    )
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1 import points, achievements, leaderboard
+from app.api.v1 import points, achievements, leaderboard, notifications, activity
 
 api_router = APIRouter()
 
@@ -23,3 +23,17 @@ api_router.include_router(
     prefix="/leaderboard",
     tags=["leaderboard"]
 )
+
+# Incluir rotas de notificações de conquistas
+api_router.include_router(
+    notifications.router,
+    prefix="/notifications",
+    tags=["notifications"]
+)
+
+# Incluir rotas de calendário de atividade
+api_router.include_router(
+    activity.router,
+    prefix="/activity",
+    tags=["activity"]
+)
@@ -1,9 +1,9 @@
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
-from ...dependencies import get_db, get_current_user
+from ...dependencies import get_write_db, get_current_user
 from ...services import GamificationService
 from ...schemas import (
     UserPoint,
@@ -26,13 +26,13 @@ async def health_check():
 @router.get("/points", response_model=UserPoint)
 async def get_points(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Obter pontos do usuário atual"""
     try:
         user_id = current_user.get("sub")
         gamification_service = GamificationService(db)
-        return gamification_service.get_user_points(user_id)
+        return await gamification_service.get_user_points(user_id)
     except Exception as e:
         logger.error(
             f"Erro ao obter pontos do usuário {current_user.get('sub')}: {str(e)}")
@@ -46,13 +46,13 @@ async def get_points(
 async def add_points(
     request: AddPointsRequest,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Adicionar pontos ao usuário atual"""
     try:
         user_id = current_user.get("sub")
         gamification_service = GamificationService(db)
-        return gamification_service.add_points(user_id, request.amount, request.reason)
+        return await gamification_service.add_points(user_id, request.amount, request.reason)
     except HTTPException as he:
         # Repassar exceções HTTP já formatadas
         raise he
@@ -68,13 +68,13 @@ async def add_points(
 @router.get("/achievements", response_model=List[AchievementResponse])
 async def get_achievements(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Obter todas as conquistas do usuário atual"""
     try:
         user_id = current_user.get("sub")
         gamification_service = GamificationService(db)
-        return gamification_service.get_user_achievements(user_id)
+        return await gamification_service.get_user_achievements(user_id)
     except Exception as e:
         logger.error(
             f"Erro ao obter conquistas do usuário {current_user.get('sub')}: {str(e)}")
@@ -87,16 +87,16 @@ async def get_achievements(
 @router.get("/check-achievements", response_model=CheckAchievementsResponse)
 async def check_achievements(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Verificar se há novas conquistas disponíveis para o usuário atual"""
     try:
         user_id = current_user.get("sub")
         gamification_service = GamificationService(db)
-        new_achievements = gamification_service.check_new_achievements(user_id)
+        new_achievements = await gamification_service.check_new_achievements(user_id)
 
         total_achievements = len(
-            gamification_service.get_user_achievements(user_id))
+            await gamification_service.get_user_achievements(user_id))
 
         return CheckAchievementsResponse(
             new_achievements=new_achievements,
@@ -114,13 +114,13 @@ async def check_achievements(
 @router.get("/notifications", response_model=List[AchievementResponse])
 async def get_notifications(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """Obter notificações de novas conquistas"""
     try:
         user_id = current_user.get("sub")
         gamification_service = GamificationService(db)
-        return gamification_service.get_new_notifications(user_id)
+        return await gamification_service.get_new_notifications(user_id)
     except Exception as e:
         logger.error(
             f"Erro ao obter notificações para usuário {current_user.get('sub')}: {str(e)}")
@@ -135,7 +135,7 @@ async def unlock_by_condition(
     condition_type: str,
     value: int = 1,
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Desbloquear conquistas por condição específica
@@ -152,7 +152,7 @@ async def unlock_by_condition(
     try:
         user_id = current_user.get("sub")
         gamification_service = GamificationService(db)
-        return gamification_service.unlock_achievement_by_condition(user_id, condition_type, value)
+        return await gamification_service.unlock_achievement_by_condition(user_id, condition_type, value)
     except Exception as e:
         logger.error(
             f"Erro ao desbloquear conquistas por condição para usuário {current_user.get('sub')}: {str(e)}")
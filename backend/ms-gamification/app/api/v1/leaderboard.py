@@ -1,18 +1,126 @@
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db, get_current_user, get_current_active_user
+from app.core.config import settings
+
+from app.dependencies import get_read_db, get_current_user, get_current_active_user
 from app.schemas.gamification import (
     LeaderboardResponse,
     LeaderboardEntryResponse,
+    LeaderboardSnapshotResponse,
     UserRankingResponse
 )
 from app.services.leaderboard_service import LeaderboardService
+from app.services.leaderboard_snapshots import LeaderboardSnapshot, LeaderboardSnapshots
+from app.services.leaderboard_store import PERIODS
+from app.services.points_service import POINT_CATEGORIES
 
 router = APIRouter()
 
 
+def _snapshot_response(
+    request: Request,
+    snapshot: LeaderboardSnapshot,
+    cache_control: str
+) -> Response:
+    """
+    Responde com o corpo pré-serializado do snapshot.
+
+    O ETag forte identifica versão e página; um If-None-Match com o mesmo
+    valor recebe 304 sem corpo.
+    """
+    etag = f'"{snapshot.version}-{snapshot.page}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": cache_control,
+        "X-Leaderboard-Version": snapshot.version
+    }
+
+    if_none_match = request.headers.get("if-none-match", "")
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if etag in candidates or "*" in candidates:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+def _validate_period(time_period: str) -> None:
+    if time_period not in PERIODS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Período inválido. Use: {', '.join(PERIODS)}"
+        )
+
+
+def _validate_category(category: Optional[str]) -> None:
+    if category is not None and category not in POINT_CATEGORIES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Categoria inválida. Use: {', '.join(POINT_CATEGORIES)}"
+        )
+
+
+@router.get("/snapshot", response_model=LeaderboardSnapshotResponse)
+async def get_leaderboard_snapshot(
+    request: Request,
+    page: int = Query(0, ge=0, description="Página do snapshot (a partir de 0)"),
+    category: Optional[str] = Query(None, description="Filtrar por categoria"),
+    time_period: str = Query(
+        "all_time", description="Período de tempo (daily, weekly, monthly, all_time)")
+):
+    """
+    Retorna a página atual do ranking publicado.
+
+    O conteúdo é o mesmo para todos os usuários e pode ser cacheado por
+    proxies por alguns segundos; a posição do usuário vem de /ranking.
+    Envie If-None-Match com o ETag recebido para obter 304 quando o
+    ranking não mudou.
+    """
+    _validate_period(time_period)
+    _validate_category(category)
+    snapshot = await LeaderboardSnapshots().get_page(time_period, category, page)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Página fora do ranking publicado"
+        )
+
+    interval = settings.LEADERBOARD_SNAPSHOT_INTERVAL
+    return _snapshot_response(
+        request, snapshot,
+        f"public, max-age={interval}, stale-while-revalidate={interval}"
+    )
+
+
+@router.get("/snapshot/{version}", response_model=LeaderboardSnapshotResponse)
+async def get_leaderboard_snapshot_version(
+    version: str,
+    request: Request,
+    page: int = Query(0, ge=0, description="Página do snapshot (a partir de 0)"),
+    category: Optional[str] = Query(None, description="Filtrar por categoria"),
+    time_period: str = Query(
+        "all_time", description="Período de tempo (daily, weekly, monthly, all_time)")
+):
+    """
+    Retorna uma página de uma versão específica do ranking publicado.
+
+    O corpo de uma versão nunca muda, então a resposta é cacheável
+    indefinidamente. Versões expiradas retornam 404.
+    """
+    _validate_period(time_period)
+    _validate_category(category)
+    snapshot = await LeaderboardSnapshots().get_page(time_period, category, page, version)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Versão do ranking não encontrada ou expirada"
+        )
+
+    return _snapshot_response(
+        request, snapshot, "public, max-age=31536000, immutable")
+
+
 @router.get("/", response_model=LeaderboardResponse)
 async def get_global_leaderboard(
     skip: int = Query(0, ge=0, description="Quantos itens pular"),
@@ -22,7 +130,7 @@ async def get_global_leaderboard(
     time_period: str = Query(
         "all_time", description="Período de tempo (daily, weekly, monthly, all_time)"),
     current_user: Optional[dict] = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna o ranking global de pontos dos usuários.
@@ -54,11 +162,12 @@ async def get_global_leaderboard(
 
 @router.get("/ranking", response_model=UserRankingResponse)
 async def get_user_ranking(
+    response: Response,
     category: Optional[str] = Query(None, description="Filtrar por categoria"),
     time_period: str = Query(
         "all_time", description="Período de tempo (daily, weekly, monthly, all_time)"),
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna a posição do usuário atual no ranking global.
@@ -67,7 +176,11 @@ async def get_user_ranking(
     - Posição no ranking
     - Total de pontos
     - Distância para o próximo e anterior no ranking
+
+    Complementa o snapshot compartilhado de /snapshot e nunca é cacheado
+    por proxies.
     """
+    response.headers["Cache-Control"] = "private, no-store"
     leaderboard_service = LeaderboardService(db)
     return await leaderboard_service.get_user_ranking(
         user_id=current_user["id"],
@@ -82,7 +195,7 @@ async def get_friends_leaderboard(
     time_period: str = Query(
         "all_time", description="Período de tempo (daily, weekly, monthly, all_time)"),
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna o ranking apenas entre amigos do usuário.
@@ -100,7 +213,7 @@ async def get_friends_leaderboard(
 @router.get("/categories", response_model=List[str])
 async def get_leaderboard_categories(
     current_user: Optional[dict] = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna a lista de categorias disponíveis para o ranking.
@@ -112,7 +225,7 @@ async def get_leaderboard_categories(
 @router.get("/periods", response_model=List[str])
 async def get_time_periods(
     current_user: Optional[dict] = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna a lista de períodos de tempo disponíveis para o ranking.
@@ -0,0 +1,70 @@
+from typing import Dict, List
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.dependencies import get_write_db, get_read_db, get_current_active_user
+from app.schemas.gamification import AchievementResponse
+from app.services.notification_service import NotificationService
+
+router = APIRouter()
+
+
+@router.get("/", response_model=List[AchievementResponse])
+async def get_notifications(
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_write_db)
+):
+    """
+    Retorna as conquistas desbloqueadas desde a última consulta e as marca
+    como notificadas.
+
+    Sem notificações pendentes, responde a partir do Redis sem acessar o banco.
+    """
+    notification_service = NotificationService(db)
+    return await notification_service.fetch_unread(current_user["id"])
+
+
+@router.get("/status", response_model=Dict[str, bool])
+async def get_notifications_status(
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Indica se há conquistas não notificadas, sem marcá-las.
+    """
+    notification_service = NotificationService(db)
+    return {"has_unread": await notification_service.has_unread(current_user["id"])}
+
+
+@router.get("/poll", response_model=List[AchievementResponse])
+async def poll_notifications(
+    timeout: int = Query(settings.NOTIFICATIONS_POLL_TIMEOUT, ge=1, le=60,
+                         description="Espera máxima em segundos"),
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_write_db)
+):
+    """
+    Long-poll: responde assim que houver um desbloqueio ou com lista vazia
+    ao fim do tempo de espera.
+    """
+    notification_service = NotificationService(db)
+    return await notification_service.wait_for_unread(current_user["id"], timeout)
+
+
+@router.get("/stream")
+async def stream_notifications(
+    current_user: dict = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_write_db)
+):
+    """
+    Feed SSE (text/event-stream) com cada conquista desbloqueada pelo usuário.
+    """
+    notification_service = NotificationService(db)
+    return StreamingResponse(
+        notification_service.stream(current_user["id"]),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
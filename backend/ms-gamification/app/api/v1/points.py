@@ -1,13 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, Path, Body, status
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.dependencies import get_db, get_current_user, get_current_active_user
+from app.core.config import settings
+from app.dependencies import get_write_db, get_read_db, get_current_user, get_current_active_user, get_current_service
 from app.schemas.gamification import (
     UserPointsResponse,
     PointsHistoryResponse,
     PointsAddRequest,
     PointsSubtractRequest,
+    PointsBulkRequest,
+    PointsBulkResponse,
     UserPointsDetail
 )
 from app.services.points_service import PointsService
@@ -18,7 +21,7 @@ router = APIRouter()
 @router.get("/", response_model=UserPointsResponse)
 async def get_user_points(
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Retorna os pontos do usuário atual, incluindo total e detalhes por categoria.
@@ -29,32 +32,40 @@ async def get_user_points(
 
 @router.get("/history", response_model=PointsHistoryResponse)
 async def get_points_history(
-    skip: int = Query(0, ge=0, description="Quantos itens pular"),
     limit: int = Query(
         10, ge=1, le=100, description="Limite de itens por página"),
     category: Optional[str] = Query(None, description="Filtrar por categoria"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor retornado em next_cursor pela página anterior"),
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna o histórico de transações de pontos do usuário.
 
-    Pode ser filtrado por categoria e paginado.
+    Pode ser filtrado por categoria e é paginado por cursor: a próxima página
+    é obtida repassando `next_cursor`. O total é aproximado.
     """
     points_service = PointsService(db)
-    return await points_service.get_points_history(
-        user_id=current_user["id"],
-        skip=skip,
-        limit=limit,
-        category=category
-    )
+    try:
+        return await points_service.get_points_history(
+            user_id=current_user["id"],
+            limit=limit,
+            category=category,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
 
 @router.post("/add", response_model=UserPointsDetail, status_code=status.HTTP_200_OK)
 async def add_points(
     points_data: PointsAddRequest,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Adiciona pontos ao usuário atual.
@@ -76,11 +87,40 @@ async def add_points(
     )
 
 
+@router.post("/bulk", response_model=PointsBulkResponse, status_code=status.HTTP_200_OK)
+async def add_points_bulk(
+    bulk_data: PointsBulkRequest,
+    current_service: dict = Depends(get_current_service),
+    db: AsyncSession = Depends(get_write_db)
+):
+    """
+    Adiciona pontos para vários usuários em uma única transação.
+
+    Uso interno entre microsserviços. Cada evento deve ter uma chave de
+    idempotência única no serviço de origem; eventos já recebidos são
+    ignorados e contados como duplicados.
+    """
+    if len(bulk_data.events) > settings.POINTS_BULK_MAX_EVENTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Máximo de {settings.POINTS_BULK_MAX_EVENTS} eventos por lote"
+        )
+
+    points_service = PointsService(db)
+    try:
+        return await points_service.add_points_bulk(bulk_data.events)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
 @router.post("/subtract", response_model=UserPointsDetail, status_code=status.HTTP_200_OK)
 async def subtract_points(
     points_data: PointsSubtractRequest,
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Remove pontos do usuário atual.
@@ -100,7 +140,7 @@ async def subtract_points(
 @router.get("/categories", response_model=List[str])
 async def get_point_categories(
     current_user: dict = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Retorna a lista de categorias de pontos disponíveis.
@@ -113,7 +153,7 @@ async def get_point_categories(
 async def get_other_user_points(
     user_id: str = Path(..., description="ID do usuário"),
     current_user: dict = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Retorna os pontos de outro usuário.
@@ -39,6 +39,25 @@ class Settings(BaseSettings):
         # Retornar uma string em vez de um objeto PostgresDsn
         return f"postgresql://{values.get('POSTGRES_USER')}:{values.get('POSTGRES_PASSWORD')}@{values.get('POSTGRES_SERVER')}:{values.get('POSTGRES_PORT')}/{values.get('POSTGRES_DB')}"
 
+    # Pools assíncronos (asyncpg): escritas (créditos de pontos, conquistas) e
+    # leituras (rankings, consultas) usam engines separadas. READ_DATABASE_URL
+    # permite apontar as leituras para uma réplica.
+    READ_DATABASE_URL: Optional[str] = os.getenv("READ_DATABASE_URL")
+    DB_WRITE_POOL_SIZE: int = int(os.getenv("DB_WRITE_POOL_SIZE", "10"))
+    DB_WRITE_MAX_OVERFLOW: int = int(os.getenv("DB_WRITE_MAX_OVERFLOW", "10"))
+    DB_READ_POOL_SIZE: int = int(os.getenv("DB_READ_POOL_SIZE", "5"))
+    DB_READ_MAX_OVERFLOW: int = int(os.getenv("DB_READ_MAX_OVERFLOW", "5"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "10"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+
+    # Statement timeouts (ms) por classe de consulta
+    DB_TIMEOUT_WRITE_MS: int = int(os.getenv("DB_TIMEOUT_WRITE_MS", "2000"))
+    DB_TIMEOUT_READ_MS: int = int(os.getenv("DB_TIMEOUT_READ_MS", "5000"))
+    DB_TIMEOUT_AGGREGATE_MS: int = int(
+        os.getenv("DB_TIMEOUT_AGGREGATE_MS", "15000"))
+    DB_TIMEOUT_MAINTENANCE_MS: int = int(
+        os.getenv("DB_TIMEOUT_MAINTENANCE_MS", "0"))
+
     # Configurações de autenticação
     AUTH_SERVICE_URL: str = os.getenv(
         "AUTH_SERVICE_URL", "http://ms-auth:8001")
@@ -56,6 +75,45 @@ class Settings(BaseSettings):
     REDIS_PASSWORD: str = os.getenv("REDIS_PASSWORD", "")
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
 
+    # Rankings em sorted sets: dias mantidos após o fim de cada período
+    LEADERBOARD_RETENTION_DAYS: int = int(
+        os.getenv("LEADERBOARD_RETENTION_DAYS", "7"))
+
+    # Snapshots publicados do ranking: intervalo máximo entre publicações (s),
+    # páginas materializadas e tempo em que versões antigas seguem disponíveis
+    LEADERBOARD_SNAPSHOT_INTERVAL: int = int(
+        os.getenv("LEADERBOARD_SNAPSHOT_INTERVAL", "15"))
+    LEADERBOARD_SNAPSHOT_PAGE_SIZE: int = int(
+        os.getenv("LEADERBOARD_SNAPSHOT_PAGE_SIZE", "50"))
+    LEADERBOARD_SNAPSHOT_PAGES: int = int(
+        os.getenv("LEADERBOARD_SNAPSHOT_PAGES", "4"))
+    LEADERBOARD_SNAPSHOT_TTL: int = int(
+        os.getenv("LEADERBOARD_SNAPSHOT_TTL", "600"))
+
+    # Segundos até recompilar o catálogo de conquistas em cada processo
+    ACHIEVEMENT_RULES_TTL: int = int(os.getenv("ACHIEVEMENT_RULES_TTL", "300"))
+
+    # Histórico de pontos particionado por mês: meses mantidos anexados à
+    # tabela e partições criadas com antecedência
+    POINT_HISTORY_RETENTION_MONTHS: int = int(
+        os.getenv("POINT_HISTORY_RETENTION_MONTHS", "24"))
+    POINT_HISTORY_PARTITIONS_AHEAD: int = int(
+        os.getenv("POINT_HISTORY_PARTITIONS_AHEAD", "3"))
+
+    # Ingestão de pontos em lote (endpoint /points/bulk e Redis stream)
+    POINTS_BULK_MAX_EVENTS: int = int(
+        os.getenv("POINTS_BULK_MAX_EVENTS", "1000"))
+    POINTS_STREAM: str = os.getenv("POINTS_STREAM", "gamification:point-events")
+    POINTS_STREAM_GROUP: str = os.getenv(
+        "POINTS_STREAM_GROUP", "ms-gamification")
+
+    # Notificações de conquistas: espera máxima do long-poll e intervalo
+    # de heartbeat do SSE (segundos)
+    NOTIFICATIONS_POLL_TIMEOUT: int = int(
+        os.getenv("NOTIFICATIONS_POLL_TIMEOUT", "25"))
+    NOTIFICATIONS_HEARTBEAT: int = int(
+        os.getenv("NOTIFICATIONS_HEARTBEAT", "15"))
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,124 @@
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine
+)
+
+from app.core.config import settings
+from app.db.session import DATABASE_URL
+
+# Classes de consulta e seus statement timeouts (ms, 0 = sem limite).
+# O timeout padrão de cada engine vale para a conexão; `set_statement_timeout`
+# ajusta o limite de uma transação específica (SET LOCAL).
+QUERY_TIMEOUTS = {
+    "write": settings.DB_TIMEOUT_WRITE_MS,
+    "read": settings.DB_TIMEOUT_READ_MS,
+    "aggregate": settings.DB_TIMEOUT_AGGREGATE_MS,
+    "maintenance": settings.DB_TIMEOUT_MAINTENANCE_MS,
+}
+
+
+def async_url(url: str) -> str:
+    """Converte uma URL postgresql:// para o driver asyncpg."""
+    for prefix in ("postgresql+psycopg2://", "postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+def _create_engine(
+    url: str,
+    pool_size: int,
+    max_overflow: int,
+    timeout_ms: int,
+    application_name: str
+) -> AsyncEngine:
+    return create_async_engine(
+        async_url(url),
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=True,
+        connect_args={
+            "server_settings": {
+                "statement_timeout": str(timeout_ms),
+                "application_name": application_name,
+            }
+        }
+    )
+
+
+# Engine de escrita: créditos de pontos, desbloqueios, notificações
+write_engine = _create_engine(
+    DATABASE_URL,
+    settings.DB_WRITE_POOL_SIZE,
+    settings.DB_WRITE_MAX_OVERFLOW,
+    QUERY_TIMEOUTS["write"],
+    "ms-gamification-write"
+)
+
+# Engine de leitura: rankings e consultas (réplica, se configurada)
+read_engine = _create_engine(
+    settings.READ_DATABASE_URL or DATABASE_URL,
+    settings.DB_READ_POOL_SIZE,
+    settings.DB_READ_MAX_OVERFLOW,
+    QUERY_TIMEOUTS["read"],
+    "ms-gamification-read"
+)
+
+WriteSessionLocal = async_sessionmaker(
+    write_engine, expire_on_commit=False, autoflush=False)
+ReadSessionLocal = async_sessionmaker(
+    read_engine, expire_on_commit=False, autoflush=False)
+
+
+async def set_statement_timeout(
+    db: AsyncSession,
+    query_class: str,
+    timeout_ms: Optional[int] = None
+) -> None:
+    """
+    Define o statement timeout da transação atual.
+
+    Args:
+        db: Sessão assíncrona
+        query_class: Classe da consulta (write, read, aggregate, maintenance)
+        timeout_ms: Limite explícito em ms (padrão: o da classe)
+    """
+    if timeout_ms is None:
+        timeout_ms = QUERY_TIMEOUTS[query_class]
+    # SET não aceita parâmetros; o valor é sempre um inteiro
+    await db.execute(text(f"SET LOCAL statement_timeout = {int(timeout_ms)}"))
+
+
+async def get_write_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Obtém uma sessão assíncrona do pool de escrita.
+
+    Yields:
+        db: Sessão do banco de dados
+    """
+    async with WriteSessionLocal() as db:
+        yield db
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Obtém uma sessão assíncrona do pool de leitura.
+
+    Yields:
+        db: Sessão do banco de dados
+    """
+    async with ReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_engines() -> None:
+    """Fecha as conexões dos pools assíncronos."""
+    await write_engine.dispose()
+    await read_engine.dispose()
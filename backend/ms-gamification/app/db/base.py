@@ -4,5 +4,8 @@ from app.db.session import Base
 # Importar todos os modelos que devem ser registrados no SQLAlchemy
 from app.models.user_point import UserPoint
 from app.models.point_history import PointHistory
+from app.models.point_event_key import PointEventKey
 from app.models.achievement import Achievement
 from app.models.user_achievement import UserAchievement
+from app.models.user_points_daily import UserPointsDaily
+from app.models.user_activity import UserActivity
@@ -0,0 +1,158 @@
+"""
+Particionamento mensal de point_history.
+
+Cada mês tem uma partição `point_history_AAAA_MM` com o intervalo
+[primeiro dia do mês, primeiro dia do mês seguinte) e uma partição padrão
+recebe transações fora dos meses criados. As funções recebem uma conexão
+síncrona e são usadas pela migração, pela inicialização do serviço e pelo
+script de arquivamento.
+"""
+import logging
+import re
+from datetime import date
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "point_history"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(day: date) -> date:
+    """Primeiro dia do mês que contém a data."""
+    return date(day.year, day.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Primeiro dia do mês deslocado em `months` meses."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Nome da partição do mês (point_history_AAAA_MM)."""
+    return f"{PARENT_TABLE}_{month.year:04d}_{month.month:02d}"
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Verifica se point_history já é uma tabela particionada."""
+    relkind = connection.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = :name "
+             "AND relnamespace = 'public'::regnamespace"),
+        {"name": PARENT_TABLE}
+    ).scalar()
+    return relkind == "p"
+
+
+def list_partitions(connection: Connection) -> List[Tuple[str, date]]:
+    """
+    Partições mensais anexadas, em ordem cronológica.
+
+    Returns:
+        Pares (nome da partição, primeiro dia do mês)
+    """
+    names = connection.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :name"
+    ), {"name": PARENT_TABLE}).scalars().all()
+
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions.append((name, date(int(match[1]), int(match[2]), 1)))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(connection: Connection, month: date) -> str:
+    """Cria a partição do mês, se ainda não existir."""
+    name = partition_name(month)
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') "
+        f"TO ('{add_months(month, 1).isoformat()}')"
+    ))
+    return name
+
+
+def ensure_partitions(
+    connection: Connection,
+    months_ahead: int,
+    since: Optional[date] = None,
+    today: Optional[date] = None
+) -> List[str]:
+    """
+    Garante as partições do mês inicial até `months_ahead` meses à frente.
+
+    Meses futuros são criados com antecedência para que a partição padrão
+    receba apenas transações retroativas a meses já arquivados (criar uma
+    partição exige verificar as linhas da partição padrão).
+
+    Args:
+        connection: Conexão síncrona
+        months_ahead: Meses futuros a criar além do atual
+        since: Primeiro mês a garantir (padrão: mês atual)
+        today: Data de referência (padrão: hoje)
+
+    Returns:
+        Nomes das partições garantidas
+    """
+    current = month_start(today or date.today())
+    month = month_start(since) if since else current
+    last = add_months(current, months_ahead)
+
+    names = []
+    while month <= last:
+        names.append(create_partition(connection, month))
+        month = add_months(month, 1)
+
+    connection.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+        f"PARTITION OF {PARENT_TABLE} DEFAULT"
+    ))
+    return names
+
+
+def detach_partitions(
+    connection: Connection,
+    before: date,
+    drop: bool = False,
+    lock_timeout_ms: int = 5000
+) -> List[str]:
+    """
+    Desanexa as partições de meses anteriores a `before`.
+
+    As partições desanexadas continuam como tabelas independentes (para
+    exportação ou consulta) a menos que `drop` seja informado. A operação
+    altera apenas metadados; o lock na tabela pai é limitado por
+    lock_timeout para não bloquear gravações por muito tempo.
+
+    Args:
+        connection: Conexão síncrona
+        before: Primeiro mês mantido
+        drop: Remove as tabelas após desanexar
+        lock_timeout_ms: Espera máxima pelo lock da tabela pai
+
+    Returns:
+        Nomes das partições desanexadas
+    """
+    cutoff = month_start(before)
+    detached = []
+    for name, month in list_partitions(connection):
+        if month >= cutoff:
+            break
+        connection.execute(text(f"SET LOCAL lock_timeout = {int(lock_timeout_ms)}"))
+        connection.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        if drop:
+            connection.execute(text(f"DROP TABLE {name}"))
+        detached.append(name)
+        logger.info(
+            f"Partição {name} {'removida' if drop else 'desanexada'}")
+    return detached
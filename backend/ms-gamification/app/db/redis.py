@@ -0,0 +1,35 @@
+import redis.asyncio
+
+from app.core.config import settings
+
+# Clientes assíncronos: as rotas e serviços rodam no event loop do FastAPI,
+# e um cliente bloqueante travaria todas as requisições durante cada comando
+redis_client = redis.asyncio.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    password=settings.REDIS_PASSWORD or None,
+    db=settings.REDIS_DB,
+    decode_responses=True
+)
+
+# Cliente sem decodificação para valores binários (bitmaps)
+binary_redis_client = redis.asyncio.Redis(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    password=settings.REDIS_PASSWORD or None,
+    db=settings.REDIS_DB
+)
+
+
+def get_redis() -> redis.asyncio.Redis:
+    return redis_client
+
+
+def get_binary_redis() -> redis.asyncio.Redis:
+    return binary_redis_client
+
+
+async def close_redis() -> None:
+    """Fecha as conexões dos clientes Redis (shutdown da aplicação)."""
+    await redis_client.aclose()
+    await binary_redis_client.aclose()
@@ -1,27 +1,14 @@
-from typing import Generator, Optional, Dict
+from typing import Optional, Dict
 from fastapi import Depends, HTTPException, status, Cookie
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
 
-from app.models.db import SessionLocal
 from app.core.config import settings
-
-
-def get_db() -> Generator:
-    """
-    Retorna uma sessão de banco de dados.
-    A sessão será fechada após o uso.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Sessões assíncronas: pool de escrita (créditos, conquistas) e de leitura (rankings)
+from app.db.async_session import get_read_db, get_write_db
 
 
 async def get_current_user(
-    access_token: Optional[str] = Cookie(None, alias="access_token"),
-    db: Session = Depends(get_db)
+    access_token: Optional[str] = Cookie(None, alias="access_token")
 ) -> Dict:
     """
     Dependência para obter o usuário atual a partir do token JWT.
@@ -65,3 +52,16 @@ async def get_current_active_user(current_user: Dict = Depends(get_current_user)
             detail="Inactive user"
         )
     return current_user
+
+
+async def get_current_service(current_user: Dict = Depends(get_current_user)) -> Dict:
+    """
+    Dependência para rotas internas chamadas por outros microsserviços.
+    Exige token com papel de serviço (ou administrador).
+    """
+    if current_user.get("role") not in ("service", "admin"):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Service credentials required"
+        )
+    return current_user
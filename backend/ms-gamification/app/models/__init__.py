@@ -1,12 +1,18 @@
 from .user_point import UserPoint, Base
 from .point_history import PointHistory
+from .point_event_key import PointEventKey
 from .achievement import Achievement
 from .user_achievement import UserAchievement
+from .user_points_daily import UserPointsDaily
+from .user_activity import UserActivity
 
 __all__ = [
     "UserPoint",
     "PointHistory",
+    "PointEventKey",
     "Achievement",
     "UserAchievement",
+    "UserPointsDaily",
+    "UserActivity",
     "Base"
 ]
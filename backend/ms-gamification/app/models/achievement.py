@@ -31,6 +31,14 @@ class Achievement(Base):
     # Pontos necessários para desbloquear a conquista
     points_required = Column(Integer, nullable=False, default=0)
 
+    # Condição avaliada pelo motor de regras (points, study_completed,
+    # chat_used, reflection_saved, days_streak, etc)
+    condition_type = Column(String, nullable=False,
+                            default="points", index=True)
+
+    # Valor mínimo da condição (para condições diferentes de points)
+    condition_value = Column(Integer, nullable=False, default=0)
+
     # Critérios adicionais em formato JSON (opcional)
     criteria = Column(JSONB, nullable=True)
 
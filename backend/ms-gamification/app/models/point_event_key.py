@@ -0,0 +1,32 @@
+from datetime import datetime
+
+from sqlalchemy import Column, String, DateTime, Index
+
+from app.db.session import Base
+
+
+class PointEventKey(Base):
+    """
+    Chaves de idempotência dos eventos de pontos já aplicados.
+
+    Mantida fora de point_history porque a tabela particionada não aceita um
+    índice único só em idempotency_key. O INSERT ... ON CONFLICT DO NOTHING
+    nesta tabela decide quais eventos de um lote são novos (ver
+    PointsService.apply_point_events). Chaves mais antigas que a retenção do
+    histórico são removidas junto com as partições arquivadas.
+    """
+
+    __tablename__ = "point_event_keys"
+
+    idempotency_key = Column(String, primary_key=True)
+
+    # Momento da transação de pontos correspondente
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Limpeza por data na rotina de arquivamento
+        Index("ix_point_event_keys_created_at", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<PointEventKey(idempotency_key={self.idempotency_key}, created_at={self.created_at})>"
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, DateTime, Text
+from sqlalchemy import Column, String, Integer, DateTime, Text, Index
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 
@@ -7,12 +7,18 @@ from app.db.session import Base
 
 
 class PointHistory(Base):
-    """Modelo para armazenar o histórico de transações de pontos"""
+    """
+    Modelo para armazenar o histórico de transações de pontos.
+
+    A tabela é particionada por mês em created_at (ver app/db/partitions.py):
+    a chave primária inclui created_at, como exige o Postgres, e a retenção
+    é feita desanexando partições antigas em vez de DELETE em massa.
+    """
 
     __tablename__ = "point_history"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(String, nullable=False, index=True)
+    user_id = Column(String, nullable=False)
 
     # Categoria de pontos (estudo_diario, chat_ia, reflexao, etc)
     category = Column(String, nullable=False, index=True)
@@ -29,8 +35,20 @@ class PointHistory(Base):
     # ID da entidade relacionada (estudo_id, chat_id, etc)
     related_entity_id = Column(String, nullable=True)
 
-    # Data e hora da transação
-    created_at = Column(DateTime, default=datetime.utcnow)
+    # Chave de idempotência enviada pelo serviço de origem. A unicidade é
+    # garantida por point_event_keys: em tabela particionada um índice único
+    # teria de incluir created_at
+    idempotency_key = Column(String, nullable=True)
+
+    # Data e hora da transação (chave de particionamento)
+    created_at = Column(DateTime, primary_key=True, default=datetime.utcnow)
+
+    __table_args__ = (
+        # Histórico do usuário em ordem decrescente (paginação por cursor)
+        Index("ix_point_history_user_created", "user_id",
+              created_at.desc(), id.desc()),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     def __repr__(self):
         return f"<PointHistory(user_id={self.user_id}, category={self.category}, amount={self.amount}, action={self.action})>"
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Float
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Float, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 
@@ -27,6 +27,9 @@ class UserAchievement(Base):
     # Data em que a conquista foi desbloqueada (null se não foi desbloqueada ainda)
     unlocked_at = Column(DateTime, nullable=True)
 
+    # Desbloqueio já notificado ao usuário (0 = pendente, 1 = notificado)
+    notified = Column(Integer, nullable=False, default=0, server_default="0")
+
     # Controle de timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow,
@@ -34,6 +37,11 @@ class UserAchievement(Base):
 
     # Chave única composta para evitar duplicação de conquista por usuário
     __table_args__ = (
+        UniqueConstraint("user_id", "achievement_id",
+                         name="uq_user_achievements_user_achievement"),
+        # Apenas desbloqueios ainda não notificados
+        Index("ix_user_achievements_unnotified", "user_id",
+              postgresql_where=(unlocked_at.isnot(None) & (notified == 0))),
         {"sqlite_autoincrement": True},
     )
 
@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from sqlalchemy import Column, String, Integer, Date, DateTime, LargeBinary
+
+from app.db.session import Base
+
+
+class UserActivity(Base):
+    """
+    Calendário de atividade do usuário persistido a partir do Redis.
+
+    O bitmap tem um bit por dia (offset em dias desde ACTIVITY_EPOCH, bit mais
+    significativo primeiro, o mesmo layout do SETBIT do Redis). É a cópia
+    durável usada para restaurar o Redis (ver app/services/activity_calendar.py).
+    """
+
+    __tablename__ = "user_activity"
+
+    user_id = Column(String, primary_key=True)
+
+    # Bitmap de dias ativos
+    bitmap = Column(LargeBinary, nullable=False, default=b"")
+
+    # Sequência atual, maior sequência e último dia ativo (offset em dias)
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_active_day = Column(Date, nullable=True)
+
+    updated_at = Column(DateTime, default=datetime.utcnow,
+                        onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<UserActivity(user_id={self.user_id}, current_streak={self.current_streak}, longest_streak={self.longest_streak})>"
@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Integer, DateTime
+from sqlalchemy import Column, String, Integer, DateTime, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 
@@ -27,6 +27,8 @@ class UserPoint(Base):
 
     # Chave única composta para evitar duplicação de categoria por usuário
     __table_args__ = (
+        UniqueConstraint("user_id", "category",
+                         name="uq_user_points_user_category"),
         {"sqlite_autoincrement": True},
     )
 
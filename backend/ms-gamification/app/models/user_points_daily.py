@@ -0,0 +1,38 @@
+from sqlalchemy import Column, String, Integer, Date, Index
+
+from app.db.session import Base
+
+
+class UserPointsDaily(Base):
+    """
+    Rollup diário de pontos por usuário e categoria.
+
+    Mantido incrementalmente a cada flush que insere registros em
+    point_history (ver app/services/rollup_service.py). Rankings e estatísticas
+    semanais/mensais somam no máximo 31 linhas por usuário em vez de varrer
+    todo o histórico.
+    """
+
+    __tablename__ = "user_points_daily"
+
+    user_id = Column(String, primary_key=True)
+
+    # Categoria de pontos (estudo_diario, chat_ia, reflexao, etc)
+    category = Column(String, primary_key=True)
+
+    # Dia (UTC) das transações agregadas
+    day = Column(Date, primary_key=True)
+
+    # Soma dos pontos das transações do dia (pode ser negativa)
+    points = Column(Integer, nullable=False, default=0)
+
+    # Número de transações do dia (total aproximado do histórico paginado)
+    events = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # Rankings por período filtram por dia e agrupam por usuário
+        Index("ix_user_points_daily_day_category", "day", "category"),
+    )
+
+    def __repr__(self):
+        return f"<UserPointsDaily(user_id={self.user_id}, category={self.category}, day={self.day}, points={self.points})>"
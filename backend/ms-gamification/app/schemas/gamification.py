@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from uuid import UUID
 
@@ -169,7 +169,7 @@ class PointHistoryItem(BaseModel):
     amount: int = Field(...,
                         description="Quantidade de pontos (positivo ou negativo)")
     category: str = Field(..., description="Categoria dos pontos")
-    description: str = Field(..., description="Descrição da ação")
+    description: Optional[str] = Field(None, description="Descrição da ação")
     action_source: str = Field(...,
                                description="Fonte da ação que gerou os pontos")
     created_at: datetime = Field(..., description="Data e hora da transação")
@@ -209,9 +209,11 @@ class PointsHistoryResponse(BaseModel):
     """Resposta com o histórico de transações de pontos"""
     items: List[PointHistoryItem] = Field(
         ..., description="Lista de transações")
-    total: int = Field(..., description="Total de transações")
-    page: int = Field(..., description="Página atual")
-    page_size: int = Field(..., description="Tamanho da página")
+    total: int = Field(...,
+                       description="Total aproximado de transações no período de retenção")
+    limit: int = Field(..., description="Tamanho da página")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor da próxima página (None na última)")
 
 
 class PointsAddRequest(BaseModel):
@@ -233,6 +235,38 @@ class PointsSubtractRequest(BaseModel):
     action_source: str = Field(..., description="Fonte da ação")
 
 
+class PointEvent(BaseModel):
+    """Evento de crédito de pontos recebido em lote"""
+    user_id: str = Field(..., description="ID do usuário")
+    category: str = Field(..., description="Categoria dos pontos")
+    amount: int = Field(..., gt=0,
+                        description="Quantidade de pontos a adicionar")
+    action_source: str = Field(...,
+                               description="Fonte da ação que gerou os pontos")
+    idempotency_key: str = Field(..., min_length=1, max_length=200,
+                                 description="Chave única do evento no serviço de origem")
+    description: Optional[str] = Field(None, description="Descrição da ação")
+    related_entity_id: Optional[str] = Field(
+        None, description="ID da entidade relacionada")
+    created_at: Optional[datetime] = Field(
+        None, description="Momento do evento (padrão: recebimento)")
+
+
+class PointsBulkRequest(BaseModel):
+    """Requisição para adicionar pontos em lote"""
+    events: List[PointEvent] = Field(..., min_length=1,
+                                     description="Eventos de pontos")
+
+
+class PointsBulkResponse(BaseModel):
+    """Resultado da ingestão de um lote de pontos"""
+    received: int = Field(..., description="Eventos recebidos")
+    applied: int = Field(..., description="Eventos aplicados")
+    duplicates: int = Field(...,
+                            description="Eventos ignorados por idempotência")
+    users: int = Field(..., description="Usuários afetados")
+
+
 # Schemas para conquistas
 
 class AchievementProgressDetail(BaseModel):
@@ -408,6 +442,8 @@ class AchievementBase(BaseModel):
     category: str
     difficulty: str
     points_required: int
+    condition_type: str = "points"
+    condition_value: int = 0
     criteria: Optional[Dict[str, Any]] = None
     image_url: Optional[str] = None
     reward_points: int
@@ -426,6 +462,8 @@ class AchievementUpdate(BaseModel):
     category: Optional[str] = None
     difficulty: Optional[str] = None
     points_required: Optional[int] = None
+    condition_type: Optional[str] = None
+    condition_value: Optional[int] = None
     criteria: Optional[Dict[str, Any]] = None
     image_url: Optional[str] = None
     reward_points: Optional[int] = None
@@ -514,6 +552,14 @@ class LeaderboardResponse(BaseModel):
     category: Optional[str] = None
 
 
+class LeaderboardSnapshotResponse(LeaderboardResponse):
+    """Página de um snapshot publicado do ranking (igual para todos os usuários)"""
+    version: str
+    page: int
+    pages: int
+    generated_at: datetime
+
+
 class UserRankingResponse(BaseModel):
     """Schema para resposta de ranking do usuário"""
     user_id: str
@@ -554,3 +600,47 @@ class UserAchievementDetail(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class StreakResponse(BaseModel):
+    """Sequência de dias ativos do usuário"""
+    current_streak: int = Field(..., description="Dias ativos consecutivos até hoje")
+    longest_streak: int = Field(..., description="Maior sequência de dias ativos")
+    last_active_day: Optional[date] = Field(
+        None, description="Último dia com atividade")
+    active_today: bool = Field(..., description="Usuário já teve atividade hoje")
+
+
+class ActivityType(str, Enum):
+    """Atividades que contam para o calendário sem gerar pontos"""
+    STUDY = "study"
+    CHAT = "chat"
+    REFLECTION = "reflection"
+
+
+class ActivityEvent(BaseModel):
+    """Atividade de um usuário registrada por outro microsserviço"""
+    user_id: str = Field(..., description="ID do usuário")
+    activity_type: ActivityType = Field(..., description="Tipo da atividade")
+    occurred_at: Optional[datetime] = Field(
+        None, description="Momento da atividade (padrão: recebimento)")
+
+
+class ActivityBulkRequest(BaseModel):
+    """Requisição para registrar atividades em lote"""
+    events: List[ActivityEvent] = Field(..., min_length=1,
+                                        description="Atividades")
+
+
+class ActivityBulkResponse(BaseModel):
+    """Resultado do registro de atividades"""
+    received: int = Field(..., description="Atividades recebidas")
+    users: int = Field(..., description="Usuários afetados")
+
+
+class ActivityCalendarResponse(BaseModel):
+    """Dias ativos do usuário em um mês"""
+    year: int
+    month: int
+    active_days: List[int] = Field(..., description="Dias do mês com atividade")
+    total_active_days: int = Field(..., description="Total de dias ativos no mês")
@@ -0,0 +1,394 @@
+import asyncio
+import logging
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import and_, case, event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.db.async_session import set_statement_timeout
+from app.models.achievement import Achievement
+from app.models.user_achievement import UserAchievement
+from app.schemas.gamification import AchievementResponse
+from app.services.notification_service import publish_unlocks
+
+logger = logging.getLogger(__name__)
+
+# Condição avaliada com os pontos acumulados do usuário
+POINTS_CONDITION = "points"
+
+_UNIQUE_CONSTRAINT = "uq_user_achievements_user_achievement"
+
+# Evento de conquista: (user_id, condition_type, valor atual, valor anterior, escopo)
+ConditionEvent = Tuple[str, str, int, Optional[int], Optional[str]]
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+    """Conquista compilada: limiar da condição e dados para resposta"""
+
+    id: UUID
+    condition_type: str
+    scope: Optional[str]
+    threshold: int
+    achievement: AchievementResponse
+
+
+def _compile_rule(achievement: Achievement) -> AchievementRule:
+    """
+    Converte uma conquista do catálogo em regra.
+
+    Conquistas do tipo `points` usam `points_required` como limiar e podem ser
+    restritas a uma categoria de pontos com `criteria["points_category"]`;
+    as demais condições usam `condition_value`.
+    """
+    condition_type = achievement.condition_type or POINTS_CONDITION
+    if condition_type == POINTS_CONDITION:
+        threshold = achievement.points_required or 0
+        scope = (achievement.criteria or {}).get("points_category")
+    else:
+        threshold = achievement.condition_value or 0
+        scope = None
+
+    return AchievementRule(
+        id=achievement.id,
+        condition_type=condition_type,
+        scope=scope,
+        threshold=threshold,
+        achievement=AchievementResponse.model_validate(achievement)
+    )
+
+
+class AchievementRules:
+    """
+    Catálogo de conquistas compilado em índices por condição.
+
+    Para cada (condition_type, escopo) as regras ficam ordenadas pelo limiar,
+    então encontrar as conquistas atingidas por um valor é uma busca binária
+    (O(log k)) seguida de um recorte da lista.
+    """
+
+    def __init__(self, achievements: Iterable[Achievement]):
+        grouped: Dict[Tuple[str, Optional[str]], List[AchievementRule]] = {}
+        self.by_id: Dict[UUID, AchievementRule] = {}
+
+        for achievement in achievements:
+            rule = _compile_rule(achievement)
+            grouped.setdefault((rule.condition_type, rule.scope), []).append(rule)
+            self.by_id[rule.id] = rule
+
+        self._rules: Dict[Tuple[str, Optional[str]], List[AchievementRule]] = {}
+        self._thresholds: Dict[Tuple[str, Optional[str]], List[int]] = {}
+        for key, rules in grouped.items():
+            rules.sort(key=lambda rule: rule.threshold)
+            self._rules[key] = rules
+            self._thresholds[key] = [rule.threshold for rule in rules]
+
+        self.compiled_at = time.monotonic()
+
+    def reached(
+        self,
+        condition_type: str,
+        value: int,
+        previous: Optional[int] = None,
+        scope: Optional[str] = None
+    ) -> List[AchievementRule]:
+        """
+        Regras cujo limiar foi atingido pelo valor.
+
+        Args:
+            condition_type: Tipo da condição
+            value: Valor atual da condição
+            previous: Valor antes do evento; quando informado, retorna apenas
+                os limiares cruzados pelo evento (previous < limiar <= value)
+            scope: Escopo da condição (categoria de pontos) ou None
+
+        Returns:
+            Regras atingidas em ordem crescente de limiar
+        """
+        key = (condition_type, scope)
+        thresholds = self._thresholds.get(key)
+        if not thresholds:
+            return []
+
+        stop = bisect_right(thresholds, value)
+        start = bisect_right(thresholds, previous) if previous is not None else 0
+        return self._rules[key][start:stop]
+
+    def get(self, achievement_id: Any) -> Optional[AchievementRule]:
+        """Regra de uma conquista pelo ID"""
+        if not isinstance(achievement_id, UUID):
+            try:
+                achievement_id = UUID(str(achievement_id))
+            except ValueError:
+                return None
+        return self.by_id.get(achievement_id)
+
+
+_rules: Optional[AchievementRules] = None
+_rules_lock = asyncio.Lock()
+
+
+def _is_fresh(rules: Optional[AchievementRules]) -> bool:
+    return (
+        rules is not None
+        and time.monotonic() - rules.compiled_at <= settings.ACHIEVEMENT_RULES_TTL
+    )
+
+
+async def get_rules(db: AsyncSession) -> AchievementRules:
+    """
+    Retorna o catálogo compilado, carregando-o do banco se necessário.
+
+    O catálogo é compilado uma vez por processo e recompilado quando invalidado
+    por uma alteração em `achievements` ou após ACHIEVEMENT_RULES_TTL segundos
+    (para refletir alterações feitas por outros processos). Requisições
+    concorrentes esperam a mesma compilação em vez de repetir a consulta.
+    """
+    global _rules
+
+    rules = _rules
+    if not _is_fresh(rules):
+        async with _rules_lock:
+            rules = _rules
+            if not _is_fresh(rules):
+                result = await db.scalars(select(Achievement))
+                rules = AchievementRules(result.all())
+                _rules = rules
+                logger.info(
+                    f"Catálogo de conquistas compilado: {len(rules.by_id)} regras")
+
+    return rules
+
+
+def invalidate_rules() -> None:
+    """Descarta o catálogo compilado; a próxima avaliação o recompila."""
+    global _rules
+    _rules = None
+
+
+@event.listens_for(Achievement, "after_insert")
+@event.listens_for(Achievement, "after_update")
+@event.listens_for(Achievement, "after_delete")
+def _mark_catalog_changed(mapper, connection, target) -> None:
+    session = Session.object_session(target)
+    if session is not None:
+        session.info["achievements_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    if session.info.pop("achievements_changed", False):
+        invalidate_rules()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    session.info.pop("achievements_changed", None)
+
+
+class AchievementEngine:
+    """
+    Avalia eventos de pontos e atividades contra o catálogo compilado.
+
+    Cada evento custa uma busca binária no índice da sua condição; o banco só é
+    acessado quando algum limiar é atingido, e todos os desbloqueios de um lote
+    de eventos são gravados com um único INSERT ... ON CONFLICT.
+    """
+
+    def __init__(self, db: AsyncSession, rules: Optional[AchievementRules] = None):
+        self.db = db
+        self._rules = rules
+
+    async def get_rules(self) -> AchievementRules:
+        return self._rules or await get_rules(self.db)
+
+    async def evaluate(
+        self,
+        user_id: str,
+        condition_type: str,
+        value: int,
+        previous: Optional[int] = None,
+        scope: Optional[str] = None
+    ) -> List[AchievementRule]:
+        """
+        Avalia um evento de um usuário e desbloqueia as conquistas atingidas.
+
+        Args:
+            user_id: ID do usuário
+            condition_type: Tipo da condição (points, study_completed, etc)
+            value: Valor atual da condição
+            previous: Valor antes do evento (None reavalia todos os limiares)
+            scope: Escopo da condição (categoria de pontos) ou None
+
+        Returns:
+            Regras desbloqueadas agora
+        """
+        unlocked = await self.evaluate_many(
+            [(user_id, condition_type, value, previous, scope)])
+        return unlocked.get(user_id, [])
+
+    async def evaluate_many(
+        self,
+        events: Iterable[ConditionEvent]
+    ) -> Dict[str, List[AchievementRule]]:
+        """
+        Avalia um lote de eventos e grava todos os desbloqueios de uma vez.
+
+        Args:
+            events: Tuplas (user_id, condition_type, value, previous, scope)
+
+        Returns:
+            Regras desbloqueadas agora, por usuário
+        """
+        rules = await self.get_rules()
+        candidates: Dict[Tuple[str, UUID], Tuple[AchievementRule, int]] = {}
+
+        for user_id, condition_type, value, previous, scope in events:
+            for rule in rules.reached(condition_type, value, previous, scope):
+                key = (user_id, rule.id)
+                current = candidates.get(key)
+                if current is None or value > current[1]:
+                    candidates[key] = (rule, value)
+
+        if not candidates:
+            return {}
+
+        return await self._unlock(candidates)
+
+    async def _unlock(
+        self,
+        candidates: Dict[Tuple[str, UUID], Tuple[AchievementRule, int]]
+    ) -> Dict[str, List[AchievementRule]]:
+        """
+        Desbloqueia as conquistas com uma única instrução.
+
+        Registros em progresso são completados; conquistas já desbloqueadas não
+        são alteradas e, por isso, não aparecem no RETURNING.
+        """
+        now = datetime.utcnow()
+        stmt = insert(UserAchievement).values([
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "achievement_id": achievement_id,
+                "progress": 100,
+                "current_points": value,
+                "unlocked_at": now,
+                "created_at": now,
+                "updated_at": now
+            }
+            for (user_id, achievement_id), (_, value) in candidates.items()
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint=_UNIQUE_CONSTRAINT,
+            set_={
+                "progress": 100,
+                "current_points": stmt.excluded.current_points,
+                "unlocked_at": stmt.excluded.unlocked_at,
+                "updated_at": stmt.excluded.updated_at
+            },
+            where=UserAchievement.unlocked_at.is_(None)
+        ).returning(UserAchievement.user_id, UserAchievement.achievement_id)
+
+        await set_statement_timeout(self.db, "write")
+        rows = (await self.db.execute(stmt)).all()
+        await self.db.commit()
+
+        unlocked: Dict[str, List[AchievementRule]] = {}
+        for user_id, achievement_id in rows:
+            rule = candidates[(user_id, achievement_id)][0]
+            unlocked.setdefault(user_id, []).append(rule)
+            logger.info(
+                f"Usuário {user_id} desbloqueou conquista: {rule.achievement.code}")
+
+        await publish_unlocks({
+            user_id: [rule.achievement for rule in rules]
+            for user_id, rules in unlocked.items()
+        })
+
+        return unlocked
+
+    async def add_progress(
+        self,
+        user_id: str,
+        achievement_id: str,
+        points: int
+    ) -> Dict[str, Any]:
+        """
+        Soma pontos ao progresso de uma conquista com um único upsert.
+
+        Args:
+            user_id: ID do usuário
+            achievement_id: ID da conquista
+            points: Pontos a adicionar ao progresso
+
+        Returns:
+            Dicionário com progresso atualizado e status de desbloqueio
+
+        Raises:
+            ValueError: Se a conquista não for encontrada
+        """
+        rule = (await self.get_rules()).get(achievement_id)
+        if rule is None:
+            raise ValueError(f"Conquista não encontrada: {achievement_id}")
+
+        threshold = rule.threshold
+        now = datetime.utcnow()
+
+        def percentage(current):
+            if threshold <= 0:
+                return 0
+            return func.least(current * 100.0 / threshold, 100)
+
+        stmt = insert(UserAchievement).values(
+            id=uuid4(),
+            user_id=user_id,
+            achievement_id=rule.id,
+            current_points=points,
+            progress=min(points * 100.0 / threshold, 100) if threshold > 0 else 0,
+            unlocked_at=now if points >= threshold else None,
+            created_at=now,
+            updated_at=now
+        )
+        locked = UserAchievement.unlocked_at.is_(None)
+        current = UserAchievement.current_points + stmt.excluded.current_points
+        stmt = stmt.on_conflict_do_update(
+            constraint=_UNIQUE_CONSTRAINT,
+            set_={
+                "current_points": case(
+                    (locked, current), else_=UserAchievement.current_points),
+                "progress": case(
+                    (locked, percentage(current)), else_=UserAchievement.progress),
+                "unlocked_at": case(
+                    (and_(locked, current >= threshold), now),
+                    else_=UserAchievement.unlocked_at),
+                "updated_at": now
+            }
+        ).returning(UserAchievement.current_points, UserAchievement.unlocked_at)
+
+        await set_statement_timeout(self.db, "write")
+        current_points, unlocked_at = (await self.db.execute(stmt)).one()
+        await self.db.commit()
+
+        is_unlocked = unlocked_at is not None
+        newly_unlocked = is_unlocked and unlocked_at == now
+        if newly_unlocked:
+            await publish_unlocks({user_id: [rule.achievement]})
+        percentage_value = int(current_points * 100 / threshold) if threshold > 0 else 0
+
+        return {
+            "is_unlocked": is_unlocked,
+            "newly_unlocked": newly_unlocked,
+            "current_points": current_points,
+            "required_points": threshold,
+            "percentage": 100 if is_unlocked else min(percentage_value, 100)
+        }
@@ -1,12 +1,13 @@
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from uuid import uuid4
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
-from sqlalchemy import and_, desc, asc
+from sqlalchemy import and_, desc, asc, select
 
 from app.models.achievement import Achievement
 from app.models.user_achievement import UserAchievement
+from app.services.achievement_engine import AchievementEngine
 from app.schemas.gamification import (
     AchievementResponse,
     AchievementListResponse,
@@ -19,7 +20,7 @@ from app.schemas.gamification import (
 class AchievementService:
     """Serviço para gerenciamento de conquistas e progresso dos usuários"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
         # Categorias válidas de conquistas
@@ -61,17 +62,18 @@ class AchievementService:
             Lista paginada de conquistas
         """
         # Construir a query base
-        query = self.db.query(Achievement)
+        query = select(Achievement)
 
         # Aplicar filtros
         if category:
-            query = query.filter(Achievement.category == category)
+            query = query.where(Achievement.category == category)
 
         if difficulty:
-            query = query.filter(Achievement.difficulty == difficulty)
+            query = query.where(Achievement.difficulty == difficulty)
 
         # Obter o total para paginação
-        total = query.count()
+        total = await self.db.scalar(
+            select(func.count()).select_from(query.subquery()))
 
         # Aplicar ordenação e paginação
         query = query.order_by(
@@ -80,7 +82,7 @@ class AchievementService:
         ).offset(skip).limit(limit)
 
         # Executar a consulta
-        achievements = query.all()
+        achievements = (await self.db.scalars(query)).all()
 
         # Criar a resposta
         items = [
@@ -118,9 +120,9 @@ class AchievementService:
         Raises:
             ValueError: Se a conquista não for encontrada
         """
-        achievement = self.db.query(Achievement).filter(
+        achievement = await self.db.scalar(select(Achievement).where(
             Achievement.id == achievement_id
-        ).first()
+        ))
 
         if not achievement:
             raise ValueError(f"Conquista não encontrada: {achievement_id}")
@@ -149,20 +151,20 @@ class AchievementService:
             Resposta com conquistas do usuário
         """
         # Buscar conquistas que o usuário já desbloqueou
-        unlocked_query = self.db.query(
+        unlocked_query = (await self.db.execute(select(
             Achievement, UserAchievement
         ).join(
             UserAchievement,
             Achievement.id == UserAchievement.achievement_id
-        ).filter(
+        ).where(
             UserAchievement.user_id == user_id,
             UserAchievement.is_unlocked == True
         ).order_by(
             desc(UserAchievement.unlocked_at)
-        ).all()
+        ))).all()
 
         # Buscar todas as conquistas para calcular o progresso
-        all_achievements = self.db.query(Achievement).all()
+        all_achievements = (await self.db.scalars(select(Achievement))).all()
 
         # Mapear conquistas desbloqueadas para rápido acesso
         unlocked_map = {item[0].id: item[1] for item in unlocked_query}
@@ -238,9 +240,9 @@ class AchievementService:
             Dicionário com informações de progresso
         """
         # Buscar a conquista
-        achievement = self.db.query(Achievement).filter(
+        achievement = await self.db.scalar(select(Achievement).where(
             Achievement.id == achievement_id
-        ).first()
+        ))
 
         if not achievement:
             return {
@@ -250,12 +252,12 @@ class AchievementService:
             }
 
         # Verificar se já existe um registro de progresso
-        user_achievement = self.db.query(UserAchievement).filter(
+        user_achievement = await self.db.scalar(select(UserAchievement).where(
             and_(
                 UserAchievement.user_id == user_id,
                 UserAchievement.achievement_id == achievement_id
             )
-        ).first()
+        ))
 
         # Se não existir, criar um novo com progresso zero
         if not user_achievement:
@@ -270,7 +272,7 @@ class AchievementService:
                 unlocked_at=None
             )
             self.db.add(user_achievement)
-            self.db.commit()
+            await self.db.commit()
 
         # Calcular porcentagem
         percentage = int((user_achievement.current_points / achievement.points_required * 100)
@@ -299,76 +301,13 @@ class AchievementService:
 
         Returns:
             Dicionário com progresso atualizado e status de desbloqueio
-        """
-        # Buscar a conquista
-        achievement = self.db.query(Achievement).filter(
-            Achievement.id == achievement_id
-        ).first()
-
-        if not achievement:
-            raise ValueError(f"Conquista não encontrada: {achievement_id}")
-
-        # Buscar o progresso atual
-        user_achievement = self.db.query(UserAchievement).filter(
-            and_(
-                UserAchievement.user_id == user_id,
-                UserAchievement.achievement_id == achievement_id
-            )
-        ).first()
-
-        # Se não existir, criar um novo
-        if not user_achievement:
-            user_achievement = UserAchievement(
-                id=str(uuid4()),
-                user_id=user_id,
-                achievement_id=achievement_id,
-                current_points=0,
-                is_unlocked=False,
-                created_at=datetime.utcnow(),
-                updated_at=datetime.utcnow(),
-                unlocked_at=None
-            )
-            self.db.add(user_achievement)
-
-        # Verificar se já está desbloqueada
-        newly_unlocked = False
-        if user_achievement.is_unlocked:
-            # Já desbloqueada, não precisa atualizar
-            return {
-                "is_unlocked": True,
-                "newly_unlocked": False,
-                "current_points": user_achievement.current_points,
-                "required_points": achievement.points_required,
-                "percentage": 100
-            }
-
-        # Atualizar pontos
-        user_achievement.current_points += points_to_add
-        user_achievement.updated_at = datetime.utcnow()
-
-        # Verificar se desbloqueou
-        if user_achievement.current_points >= achievement.points_required:
-            user_achievement.is_unlocked = True
-            user_achievement.unlocked_at = datetime.utcnow()
-            newly_unlocked = True
-
-            # Atualizar contagem de usuários que desbloquearam
-            achievement.unlocked_users += 1
-
-        # Calcular porcentagem
-        percentage = int((user_achievement.current_points / achievement.points_required * 100)
-                         if achievement.points_required > 0 else 0)
-        percentage = min(percentage, 100)  # Limitar a 100%
-
-        self.db.commit()
 
-        return {
-            "is_unlocked": user_achievement.is_unlocked,
-            "newly_unlocked": newly_unlocked,
-            "current_points": user_achievement.current_points,
-            "required_points": achievement.points_required,
-            "percentage": percentage
-        }
+        Raises:
+            ValueError: Se a conquista não for encontrada
+        """
+        # Um único upsert soma o progresso e desbloqueia ao atingir o limiar
+        return await AchievementEngine(self.db).add_progress(
+            user_id, achievement_id, points_to_add)
 
     async def check_achievement(
         self,
@@ -389,9 +328,9 @@ class AchievementService:
             Detalhes da conquista com status atualizado
         """
         # Buscar a conquista
-        achievement = self.db.query(Achievement).filter(
+        achievement = await self.db.scalar(select(Achievement).where(
             Achievement.id == achievement_id
-        ).first()
+        ))
 
         if not achievement:
             raise ValueError(f"Conquista não encontrada: {achievement_id}")
@@ -0,0 +1,347 @@
+import calendar
+import logging
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+import redis.asyncio
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.redis import get_binary_redis
+from app.models.user_activity import UserActivity
+
+logger = logging.getLogger(__name__)
+
+# Dia correspondente ao bit 0 dos bitmaps de atividade
+ACTIVITY_EPOCH = date(2020, 1, 1)
+
+# Condição do motor de conquistas alimentada pela sequência de dias
+STREAK_CONDITION = "days_streak"
+
+# Marca o dia no bitmap e atualiza a sequência atual/maior. Um dia novo após
+# o último dia ativo custa O(1); um dia anterior (evento atrasado ou
+# reprocessado) mede a sequência que o contém percorrendo o bitmap em volta
+# dele, unindo as sequências vizinhas quando preenche um intervalo.
+# Retorna {sequência atual, maior sequência, 1 se a sequência atual aumentou}.
+_RECORD_SCRIPT = """
+local day = tonumber(ARGV[1])
+local was_set = redis.call('SETBIT', KEYS[1], day, 1)
+
+local last = tonumber(redis.call('HGET', KEYS[2], 'last_day') or '-1')
+local current = tonumber(redis.call('HGET', KEYS[2], 'current') or '0')
+local longest = tonumber(redis.call('HGET', KEYS[2], 'longest') or '0')
+
+if day > last then
+    if day == last + 1 then
+        current = current + 1
+    else
+        current = 1
+    end
+    if current > longest then
+        longest = current
+    end
+    redis.call('HSET', KEYS[2], 'last_day', day, 'current', current, 'longest', longest)
+    return {current, longest, 1}
+end
+
+if was_set == 1 then
+    return {current, longest, 0}
+end
+
+-- Dia anterior ao último dia ativo: sequência que passa pelo dia
+local first = day
+while first > 0 and redis.call('GETBIT', KEYS[1], first - 1) == 1 do
+    first = first - 1
+end
+local stop = day
+while stop < last and redis.call('GETBIT', KEYS[1], stop + 1) == 1 do
+    stop = stop + 1
+end
+local run = stop - first + 1
+
+local changed = 0
+if stop == last and run > current then
+    current = run
+    changed = 1
+end
+if run > longest then
+    longest = run
+end
+
+redis.call('HSET', KEYS[2], 'current', current, 'longest', longest)
+return {current, longest, changed}
+"""
+
+
+def day_offset(day: date) -> int:
+    """Offset do dia no bitmap (dias desde ACTIVITY_EPOCH)."""
+    return (day - ACTIVITY_EPOCH).days
+
+
+def offset_day(offset: int) -> date:
+    """Dia correspondente a um offset do bitmap."""
+    return ACTIVITY_EPOCH + timedelta(days=offset)
+
+
+def active_offsets(bitmap: bytes, start: int = 0, stop: Optional[int] = None) -> List[int]:
+    """
+    Offsets com bit ligado no intervalo [start, stop) de um bitmap.
+
+    O layout é o do Redis: o bit 0 é o mais significativo do primeiro byte.
+    """
+    stop = len(bitmap) * 8 if stop is None else min(stop, len(bitmap) * 8)
+    offsets = []
+    for byte_index in range(start // 8, (stop + 7) // 8):
+        byte = bitmap[byte_index]
+        if not byte:
+            continue
+        for bit in range(8):
+            offset = byte_index * 8 + bit
+            if start <= offset < stop and byte & (0x80 >> bit):
+                offsets.append(offset)
+    return offsets
+
+
+def streaks_from_bitmap(bitmap: bytes) -> Tuple[int, int, int]:
+    """
+    Recalcula as sequências percorrendo o bitmap.
+
+    Returns:
+        Tupla (sequência terminada no último dia ativo, maior sequência,
+        offset do último dia ativo ou -1)
+    """
+    current = longest = 0
+    last = -1
+    for offset in active_offsets(bitmap):
+        current = current + 1 if offset == last + 1 else 1
+        longest = max(longest, current)
+        last = offset
+    return current, longest, last
+
+
+class ActivityCalendar:
+    """
+    Calendário de atividade por usuário em bitmaps do Redis.
+
+    Cada usuário tem um bitmap com um bit por dia (`activity:bitmap:{user}`) e
+    um hash com a sequência atual, a maior sequência e o último dia ativo
+    (`activity:streak:{user}`), atualizados juntos por um script Lua a cada
+    atividade. Consultas de sequência leem apenas o hash (O(1)) e o
+    calendário de um mês lê no máximo 5 bytes do bitmap com GETRANGE.
+
+    O Postgres (`user_activity`) guarda uma cópia durável do bitmap, gravada
+    por `save` e usada por `restore` quando a chave não existe no Redis.
+    """
+
+    def __init__(self, client: Optional[redis.asyncio.Redis] = None):
+        self.redis = client or get_binary_redis()
+        self._record = self.redis.register_script(_RECORD_SCRIPT)
+
+    @staticmethod
+    def bitmap_key(user_id: str) -> str:
+        return f"activity:bitmap:{user_id}"
+
+    @staticmethod
+    def streak_key(user_id: str) -> str:
+        return f"activity:streak:{user_id}"
+
+    async def record(self, user_id: str, day: Optional[date] = None) -> Tuple[int, bool]:
+        """
+        Registra atividade do usuário em um dia.
+
+        Args:
+            user_id: ID do usuário
+            day: Dia da atividade (padrão: hoje, UTC)
+
+        Returns:
+            Tupla (sequência atual, se a sequência aumentou)
+        """
+        recorded = await self.record_many([(user_id, day or datetime.utcnow().date())])
+        return recorded[user_id]
+
+    async def record_many(
+        self,
+        activities: Iterable[Tuple[str, date]]
+    ) -> Dict[str, Tuple[int, bool]]:
+        """
+        Registra várias atividades com um único round trip ao Redis.
+
+        Args:
+            activities: Pares (user_id, dia)
+
+        Returns:
+            Por usuário, a sequência atual e se ela aumentou no lote
+        """
+        # Um registro por usuário e dia, em ordem cronológica
+        unique = sorted({(user_id, day_offset(day)) for user_id, day in activities},
+                        key=lambda item: item[1])
+        if not unique:
+            return {}
+
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id, offset in unique:
+            await self._record(
+                keys=[self.bitmap_key(user_id), self.streak_key(user_id)],
+                args=[offset],
+                client=pipe
+            )
+
+        result: Dict[str, Tuple[int, bool]] = {}
+        for (user_id, _), (current, _, changed) in zip(unique, await pipe.execute()):
+            grew = result.get(user_id, (0, False))[1] or bool(changed)
+            result[user_id] = (current, grew)
+        return result
+
+    async def get_streak(self, user_id: str, today: Optional[date] = None) -> Dict[str, object]:
+        """
+        Sequência atual e maior sequência do usuário.
+
+        A sequência atual só conta se o último dia ativo for hoje ou ontem.
+
+        Args:
+            user_id: ID do usuário
+            today: Dia de referência (padrão: hoje, UTC)
+
+        Returns:
+            Dicionário com current_streak, longest_streak, last_active_day e
+            active_today
+        """
+        today_offset = day_offset(today or datetime.utcnow().date())
+        last, current, longest = await self.redis.hmget(
+            self.streak_key(user_id), "last_day", "current", "longest")
+
+        last = int(last) if last is not None else -1
+        current = int(current or 0) if last >= today_offset - 1 else 0
+
+        return {
+            "current_streak": current,
+            "longest_streak": int(longest or 0),
+            "last_active_day": offset_day(last) if last >= 0 else None,
+            "active_today": last == today_offset
+        }
+
+    async def get_month(self, user_id: str, year: int, month: int) -> List[int]:
+        """
+        Dias do mês em que o usuário teve atividade.
+
+        Args:
+            user_id: ID do usuário
+            year: Ano
+            month: Mês (1-12)
+
+        Returns:
+            Lista com os dias do mês ativos
+        """
+        first = date(year, month, 1)
+        start = day_offset(first)
+        stop = start + calendar.monthrange(year, month)[1]
+        if stop <= 0:
+            return []
+        start = max(start, 0)
+
+        chunk = await self.redis.getrange(
+            self.bitmap_key(user_id), start // 8, (stop - 1) // 8)
+        base = (start // 8) * 8
+        return [
+            offset_day(base + offset).day
+            for offset in active_offsets(chunk, start - base, stop - base)
+        ]
+
+    async def save(self, db: AsyncSession, user_ids: Iterable[str]) -> int:
+        """
+        Persiste bitmaps e sequências do Redis no Postgres (upsert em lote).
+
+        Returns:
+            Número de usuários gravados
+        """
+        user_ids = list(user_ids)
+        if not user_ids:
+            return 0
+
+        pipe = self.redis.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipe.get(self.bitmap_key(user_id))
+            pipe.hmget(self.streak_key(user_id), "last_day", "current", "longest")
+        values = await pipe.execute()
+
+        now = datetime.utcnow()
+        rows = []
+        for i, user_id in enumerate(user_ids):
+            bitmap, (last, current, longest) = values[2 * i], values[2 * i + 1]
+            if bitmap is None:
+                continue
+            rows.append({
+                "user_id": user_id,
+                "bitmap": bitmap,
+                "current_streak": int(current or 0),
+                "longest_streak": int(longest or 0),
+                "last_active_day": offset_day(int(last)) if last is not None else None,
+                "updated_at": now
+            })
+
+        if not rows:
+            return 0
+
+        stmt = insert(UserActivity).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserActivity.user_id],
+            set_={
+                "bitmap": stmt.excluded.bitmap,
+                "current_streak": stmt.excluded.current_streak,
+                "longest_streak": stmt.excluded.longest_streak,
+                "last_active_day": stmt.excluded.last_active_day,
+                "updated_at": stmt.excluded.updated_at
+            }
+        )
+        await db.execute(stmt)
+        await db.commit()
+        return len(rows)
+
+    async def restore(self, db: AsyncSession, user_id: str) -> bool:
+        """
+        Carrega o bitmap do Postgres para o Redis se a chave não existir.
+
+        As sequências são recalculadas a partir do bitmap.
+
+        Returns:
+            True se o usuário foi restaurado
+        """
+        if await self.redis.exists(self.bitmap_key(user_id)):
+            return False
+
+        activity = await db.scalar(
+            select(UserActivity).where(UserActivity.user_id == user_id))
+        if activity is None or not activity.bitmap:
+            return False
+
+        current, longest, last = streaks_from_bitmap(activity.bitmap)
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.set(self.bitmap_key(user_id), activity.bitmap, nx=True)
+        pipe.hset(self.streak_key(user_id), mapping={
+            "last_day": last, "current": current, "longest": longest})
+        await pipe.execute()
+        return True
+
+    async def repair(self, user_id: str) -> Tuple[int, int]:
+        """
+        Recalcula o hash de sequências a partir do bitmap.
+
+        Necessário apenas quando o hash diverge do bitmap (chave do hash
+        perdida ou bits gravados fora do script de registro).
+
+        Returns:
+            Tupla (sequência atual, maior sequência)
+        """
+        bitmap = await self.redis.get(self.bitmap_key(user_id)) or b""
+        current, longest, last = streaks_from_bitmap(bitmap)
+        if last >= 0:
+            await self.redis.hset(self.streak_key(user_id), mapping={
+                "last_day": last, "current": current, "longest": longest})
+        return current, longest
+
+    async def iter_user_ids(self) -> AsyncIterator[str]:
+        """Usuários com bitmap de atividade no Redis."""
+        prefix = self.bitmap_key("")
+        async for key in self.redis.scan_iter(match=f"{prefix}*", count=1000):
+            yield key.decode()[len(prefix):]
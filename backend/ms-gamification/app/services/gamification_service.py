@@ -1,32 +1,35 @@
 from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 import logging
 
 from ..models import UserPoint, PointHistory, Achievement, UserAchievement
 from ..schemas import UserPointCreate, PointHistoryCreate, AddPointsResponse, AchievementResponse
+from .achievement_engine import AchievementEngine, POINTS_CONDITION
+from .notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
 
 
 class GamificationService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
+        self.achievements = AchievementEngine(db)
 
     # Métodos para Points
-    def get_user_points(self, user_id: str) -> UserPoint:
+    async def get_user_points(self, user_id: str) -> UserPoint:
         """Obtém os pontos do usuário, criando um registro se não existir"""
-        user_points = self.db.query(UserPoint).filter(
-            UserPoint.user_id == user_id).first()
+        user_points = await self.db.scalar(select(UserPoint).where(
+            UserPoint.user_id == user_id))
         if not user_points:
             user_points = UserPoint(user_id=user_id, total_points=0)
             self.db.add(user_points)
-            self.db.commit()
-            self.db.refresh(user_points)
+            await self.db.commit()
+            await self.db.refresh(user_points)
         return user_points
 
-    def add_points(self, user_id: str, amount: int, reason: str) -> AddPointsResponse:
+    async def add_points(self, user_id: str, amount: int, reason: str) -> AddPointsResponse:
         """Adiciona pontos ao usuário e verifica se novas conquistas foram desbloqueadas"""
         # Verificação de valores negativos ou zero
         if amount <= 0:
@@ -37,7 +40,7 @@ class GamificationService:
 
         try:
             # Obtém ou cria registro de pontos do usuário
-            user_points = self.get_user_points(user_id)
+            user_points = await self.get_user_points(user_id)
 
             # Adiciona ao total de pontos
             user_points.total_points += amount
@@ -51,11 +54,11 @@ class GamificationService:
             self.db.add(point_history)
 
             # Salva alterações
-            self.db.commit()
-            self.db.refresh(user_points)
+            await self.db.commit()
+            await self.db.refresh(user_points)
 
             # Verifica novas conquistas (executado em segundo plano)
-            self.check_new_achievements(user_id)
+            await self.check_new_achievements(user_id)
 
             return AddPointsResponse(
                 total_points=user_points.total_points,
@@ -63,7 +66,7 @@ class GamificationService:
                 message=f"{amount} pontos adicionados com sucesso"
             )
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(
                 f"Erro ao adicionar pontos para usuário {user_id}: {str(e)}")
             raise HTTPException(
@@ -71,16 +74,17 @@ class GamificationService:
                 detail="Erro ao adicionar pontos"
             )
 
-    def get_point_history(self, user_id: str) -> List[PointHistory]:
+    async def get_point_history(self, user_id: str) -> List[PointHistory]:
         """Obtém o histórico de pontos do usuário"""
-        return self.db.query(PointHistory).filter(
+        result = await self.db.scalars(select(PointHistory).where(
             PointHistory.user_id == user_id
-        ).order_by(PointHistory.created_at.desc()).all()
+        ).order_by(PointHistory.created_at.desc()))
+        return result.all()
 
     # Métodos para Achievements
-    def get_user_achievements(self, user_id: str) -> List[AchievementResponse]:
+    async def get_user_achievements(self, user_id: str) -> List[AchievementResponse]:
         """Obtém todas as conquistas do usuário"""
-        results = self.db.query(
+        results = (await self.db.execute(select(
             Achievement.id,
             Achievement.badge_name,
             Achievement.description,
@@ -90,11 +94,11 @@ class GamificationService:
         ).join(
             UserAchievement,
             UserAchievement.achievement_id == Achievement.id
-        ).filter(
+        ).where(
             UserAchievement.user_id == user_id
         ).order_by(
             UserAchievement.earned_at.desc()
-        ).all()
+        ))).all()
 
         achievements = []
         for result in results:
@@ -111,110 +115,37 @@ class GamificationService:
 
         return achievements
 
-    def check_new_achievements(self, user_id: str) -> List[AchievementResponse]:
+    async def check_new_achievements(self, user_id: str) -> List[AchievementResponse]:
         """Verifica se o usuário desbloqueou novas conquistas"""
         try:
-            # Obter pontos atuais e conquistas do usuário
-            user_points = self.get_user_points(user_id)
-            user_achievement_ids = [
-                ua.achievement_id for ua in self.db.query(UserAchievement.achievement_id).filter(
-                    UserAchievement.user_id == user_id
-                ).all()
-            ]
+            # Pontos atuais do usuário em todas as categorias
+            total_points = await self.db.scalar(select(func.sum(UserPoint.amount)).where(
+                UserPoint.user_id == user_id
+            )) or 0
 
-            # Buscar conquistas que o usuário ainda não tem e que podem ser desbloqueadas
-            unlockable_achievements = self.db.query(Achievement).filter(
-                Achievement.id.notin_(user_achievement_ids),
-                Achievement.condition_type == 'points',
-                Achievement.points_required <= user_points.total_points
-            ).all()
+            # Avaliar todos os limiares atingidos; os já desbloqueados são ignorados
+            unlocked = await self.achievements.evaluate(
+                user_id, POINTS_CONDITION, total_points)
 
-            # Desbloquear novas conquistas
-            new_achievements = []
-            for achievement in unlockable_achievements:
-                user_achievement = UserAchievement(
-                    user_id=user_id,
-                    achievement_id=achievement.id,
-                    notified=0
-                )
-                self.db.add(user_achievement)
-                new_achievements.append(
-                    AchievementResponse(
-                        id=achievement.id,
-                        badge_name=achievement.badge_name,
-                        description=achievement.description,
-                        category=achievement.category,
-                        icon_url=achievement.icon_url,
-                        earned_at=func.now()
-                    )
-                )
-
-                logger.info(
-                    f"Usuário {user_id} desbloqueou conquista: {achievement.badge_name}")
-
-            if new_achievements:
-                self.db.commit()
-
-            return new_achievements
+            return [rule.achievement for rule in unlocked]
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(
                 f"Erro ao verificar conquistas para usuário {user_id}: {str(e)}")
             return []
 
-    def get_new_notifications(self, user_id: str) -> List[AchievementResponse]:
+    async def get_new_notifications(self, user_id: str) -> List[AchievementResponse]:
         """Obtém as novas conquistas que ainda não foram notificadas ao usuário"""
         try:
-            # Buscar conquistas não notificadas
-            results = self.db.query(
-                Achievement.id,
-                Achievement.badge_name,
-                Achievement.description,
-                Achievement.category,
-                Achievement.icon_url,
-                UserAchievement.earned_at,
-                UserAchievement.id.label("user_achievement_id")
-            ).join(
-                Achievement,
-                UserAchievement.achievement_id == Achievement.id
-            ).filter(
-                UserAchievement.user_id == user_id,
-                UserAchievement.notified == 0
-            ).all()
-
-            # Montar lista de respostas
-            notifications = []
-            for result in results:
-                notifications.append(
-                    AchievementResponse(
-                        id=result.id,
-                        badge_name=result.badge_name,
-                        description=result.description,
-                        category=result.category,
-                        icon_url=result.icon_url,
-                        earned_at=result.earned_at
-                    )
-                )
-
-                # Marcar como notificada
-                user_achievement = self.db.query(UserAchievement).filter(
-                    UserAchievement.id == result.user_achievement_id
-                ).first()
-
-                if user_achievement:
-                    user_achievement.notified = 1
-
-            if notifications:
-                self.db.commit()
-
-            return notifications
+            # Leitura e marcação em um único UPDATE ... RETURNING
+            return await NotificationService(self.db).fetch_unread(user_id)
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(
                 f"Erro ao buscar notificações para usuário {user_id}: {str(e)}")
             return []
 
-    def unlock_achievement_by_condition(
+    async def unlock_achievement_by_condition(
         self, user_id: str, condition_type: str, value: int = 1
     ) -> List[AchievementResponse]:
         """
@@ -226,49 +157,15 @@ class GamificationService:
         etc.
         """
         try:
-            # Obter IDs de conquistas que o usuário já possui
-            user_achievement_ids = [
-                ua.achievement_id for ua in self.db.query(UserAchievement.achievement_id).filter(
-                    UserAchievement.user_id == user_id
-                ).all()
-            ]
-
-            # Buscar conquistas que podem ser desbloqueadas
-            unlockable_achievements = self.db.query(Achievement).filter(
-                Achievement.id.notin_(user_achievement_ids),
-                Achievement.condition_type == condition_type,
-                Achievement.condition_value <= value
-            ).all()
-
-            # Desbloquear novas conquistas
-            new_achievements = []
-            for achievement in unlockable_achievements:
-                user_achievement = UserAchievement(
-                    user_id=user_id,
-                    achievement_id=achievement.id,
-                    notified=0
-                )
-                self.db.add(user_achievement)
-                new_achievements.append(
-                    AchievementResponse(
-                        id=achievement.id,
-                        badge_name=achievement.badge_name,
-                        description=achievement.description,
-                        category=achievement.category,
-                        icon_url=achievement.icon_url,
-                        earned_at=func.now()
-                    )
-                )
+            unlocked = await self.achievements.evaluate(user_id, condition_type, value)
 
+            for rule in unlocked:
                 logger.info(
-                    f"Usuário {user_id} desbloqueou conquista por condição {condition_type}: {achievement.badge_name}")
-
-            if new_achievements:
-                self.db.commit()
+                    f"Usuário {user_id} desbloqueou conquista por condição {condition_type}: {rule.achievement.name}")
 
-            return new_achievements
+            return [rule.achievement for rule in unlocked]
         except Exception as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.error(
                 f"Erro ao desbloquear conquistas por condição para usuário {user_id}: {str(e)}")
             return []
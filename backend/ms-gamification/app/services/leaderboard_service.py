@@ -1,23 +1,33 @@
+import logging
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any, Tuple
-from sqlalchemy.orm import Session
+import redis
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
-from sqlalchemy import and_, desc, asc, case
+from sqlalchemy import and_, desc, asc, case, distinct, select
+from sqlalchemy.sql import Select
 
+from app.db.async_session import set_statement_timeout
 from app.models.user_point import UserPoint
-from app.models.point_history import PointHistory
+from app.models.user_points_daily import UserPointsDaily
+from app.services.leaderboard_store import LeaderboardStore
+from app.services.rank_service import RankService
 from app.schemas.gamification import (
     LeaderboardResponse,
     LeaderboardEntryResponse,
     UserRankingResponse
 )
 
+logger = logging.getLogger(__name__)
+
 
 class LeaderboardService:
     """Serviço para gerenciamento de rankings e leaderboards"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, store: Optional[LeaderboardStore] = None):
         self.db = db
+        self.store = store or LeaderboardStore()
+        self.ranks = RankService(db, self.store)
 
         # Períodos válidos para o leaderboard
         self._valid_periods = ["daily", "weekly", "monthly", "all_time"]
@@ -48,16 +58,24 @@ class LeaderboardService:
         # Determinar o momento inicial com base no período
         from_date = self._get_period_start_date(time_period)
 
-        # Obter dados do ranking
-        if time_period == "all_time" and category is None:
-            # Caso mais simples: total de pontos global
-            ranking_data = await self._get_all_time_total_ranking(skip, limit)
-        elif time_period == "all_time" and category is not None:
-            # Total de pontos de uma categoria específica
-            ranking_data = await self._get_all_time_category_ranking(category, skip, limit)
-        else:
-            # Ranking por período específico
-            ranking_data = await self._get_period_ranking(time_period, category, from_date, skip, limit)
+        # Obter dados do ranking (sorted sets no Redis)
+        try:
+            ranking_data = await self._get_ranking_from_store(time_period, category, skip, limit)
+        except redis.RedisError as e:
+            logger.warning(
+                f"Redis indisponível para o ranking, consultando o banco: {str(e)}")
+
+            # Agregações sobre todos os usuários: limite maior que o de leitura
+            await set_statement_timeout(self.db, "aggregate")
+            if time_period == "all_time" and category is None:
+                # Caso mais simples: total de pontos global
+                ranking_data = await self._get_all_time_total_ranking(skip, limit)
+            elif time_period == "all_time" and category is not None:
+                # Total de pontos de uma categoria específica
+                ranking_data = await self._get_all_time_category_ranking(category, skip, limit)
+            else:
+                # Ranking por período específico
+                ranking_data = await self._get_period_ranking(time_period, category, from_date, skip, limit)
 
         # Extrair dados e total
         entries, total = ranking_data
@@ -93,6 +111,127 @@ class LeaderboardService:
         if time_period not in self._valid_periods:
             time_period = "all_time"
 
+        # Posição, pontos e vizinhos imediatos em uma consulta ao sorted set
+        try:
+            ranking = await self.ranks.get_rank(
+                user_id, time_period, category, window=1)
+        except redis.RedisError as e:
+            logger.warning(
+                f"Redis indisponível para a posição no ranking, consultando o banco: {str(e)}")
+            await set_statement_timeout(self.db, "aggregate")
+            return await self._get_user_ranking_from_db(user_id, category, time_period)
+
+        user_points = ranking["points"]
+        user_above = ranking["above"][-1] if ranking["above"] else None
+        user_below = ranking["below"][0] if ranking["below"] else None
+
+        # Montar a resposta
+        return UserRankingResponse(
+            user_id=user_id,
+            rank=ranking["rank"],
+            points=user_points,
+            category=category,
+            period=time_period,
+            total_participants=ranking["total"],
+            points_to_advance=user_above["points"] - user_points if user_above else 0,
+            points_advantage=user_points - user_below["points"] if user_below else 0,
+            next_user=user_above["user_id"] if user_above else None,
+            previous_user=user_below["user_id"] if user_below else None
+        )
+
+    async def get_friends_leaderboard(
+        self,
+        user_id: str,
+        category: Optional[str] = None,
+        time_period: str = "all_time"
+    ) -> LeaderboardResponse:
+        """
+        Obtém o ranking apenas entre amigos do usuário.
+
+        Args:
+            user_id: ID do usuário
+            category: Filtrar por categoria específica (se None, usa pontos totais)
+            time_period: Período de tempo a considerar
+
+        Returns:
+            Ranking com o usuário e seus amigos
+        """
+        # TODO: Implementar integração com serviço de amizades
+
+        # Por enquanto, implementação simplificada que retorna os 5 usuários
+        # acima e os 5 abaixo do usuário no ranking
+        if time_period not in self._valid_periods:
+            time_period = "all_time"
+
+        try:
+            ranking = await self.ranks.get_rank(
+                user_id, time_period, category, window=5)
+        except redis.RedisError as e:
+            logger.warning(
+                f"Redis indisponível para o ranking de amigos, consultando o banco: {str(e)}")
+            await set_statement_timeout(self.db, "aggregate")
+            return await self._get_friends_leaderboard_from_db(user_id, category, time_period)
+
+        all_entries = [
+            LeaderboardEntryResponse(
+                rank=0,
+                user_id=neighbour["user_id"],
+                points=neighbour["points"],
+                is_current_user=False
+            ) for neighbour in ranking["above"]
+        ]
+        all_entries.append(LeaderboardEntryResponse(
+            rank=0,
+            user_id=user_id,
+            points=ranking["points"],
+            is_current_user=True
+        ))
+        all_entries.extend(
+            LeaderboardEntryResponse(
+                rank=0,
+                user_id=neighbour["user_id"],
+                points=neighbour["points"],
+                is_current_user=False
+            ) for neighbour in ranking["below"]
+        )
+
+        # Reajustar ranking
+        for i, entry in enumerate(all_entries, 1):
+            entry.rank = i
+
+        return LeaderboardResponse(
+            entries=all_entries,
+            total=len(all_entries),
+            skip=0,
+            limit=len(all_entries),
+            period=time_period,
+            category=category
+        )
+
+    async def get_leaderboard_categories(self) -> List[str]:
+        """
+        Retorna a lista de categorias disponíveis para o ranking.
+
+        Returns:
+            Lista de categorias
+        """
+        # Consultar categorias únicas no banco de dados
+        query = select(UserPoint.category).distinct()
+        categories = [row[0] for row in (await self.db.execute(query)).all()]
+
+        return categories
+
+    async def _get_user_ranking_from_db(
+        self,
+        user_id: str,
+        category: Optional[str],
+        time_period: str
+    ) -> UserRankingResponse:
+        """
+        Calcula a posição do usuário com consultas agregadas no banco.
+
+        Usado apenas quando o Redis está indisponível.
+        """
         # Determinar o momento inicial com base no período
         from_date = self._get_period_start_date(time_period)
 
@@ -131,25 +270,17 @@ class LeaderboardService:
             previous_user=user_below["user_id"] if user_below else None
         )
 
-    async def get_friends_leaderboard(
+    async def _get_friends_leaderboard_from_db(
         self,
         user_id: str,
-        category: Optional[str] = None,
-        time_period: str = "all_time"
+        category: Optional[str],
+        time_period: str
     ) -> LeaderboardResponse:
         """
-        Obtém o ranking apenas entre amigos do usuário.
-
-        Args:
-            user_id: ID do usuário
-            category: Filtrar por categoria específica (se None, usa pontos totais)
-            time_period: Período de tempo a considerar
+        Monta o ranking de amigos com consultas agregadas no banco.
 
-        Returns:
-            Ranking com o usuário e seus amigos
+        Usado apenas quando o Redis está indisponível.
         """
-        # TODO: Implementar integração com serviço de amizades
-
         # Por enquanto, implementação simplificada que retorna os 10 usuários com pontuação próxima
         user_points = await self._get_user_points_for_period(
             user_id,
@@ -201,18 +332,10 @@ class LeaderboardService:
             category=category
         )
 
-    async def get_leaderboard_categories(self) -> List[str]:
-        """
-        Retorna a lista de categorias disponíveis para o ranking.
-
-        Returns:
-            Lista de categorias
-        """
-        # Consultar categorias únicas no banco de dados
-        query = self.db.query(UserPoint.category).distinct()
-        categories = [row[0] for row in query.all()]
-
-        return categories
+    async def _count(self, query: Select) -> int:
+        """Conta as linhas de uma consulta (sem a ordenação)."""
+        return await self.db.scalar(
+            select(func.count()).select_from(query.order_by(None).subquery()))
 
     def _get_period_start_date(self, period: str) -> Optional[datetime]:
         """
@@ -245,6 +368,38 @@ class LeaderboardService:
         # Fallback para all_time
         return None
 
+    async def _get_ranking_from_store(
+        self,
+        period: str,
+        category: Optional[str],
+        skip: int,
+        limit: int
+    ) -> Tuple[List[LeaderboardEntryResponse], int]:
+        """
+        Obtém uma página do ranking a partir dos sorted sets do Redis.
+
+        Args:
+            period: Período (daily, weekly, monthly, all_time)
+            category: Categoria de pontos ou None para total
+            skip: Quantos registros pular
+            limit: Limite de registros
+
+        Returns:
+            Tupla com lista de entradas do ranking e total de usuários
+        """
+        members, total = await self.store.get_page(period, category, skip, limit)
+
+        entries = [
+            LeaderboardEntryResponse(
+                rank=i,
+                user_id=user_id,
+                points=points,
+                is_current_user=False  # Será atualizado depois se necessário
+            ) for i, (user_id, points) in enumerate(members, skip + 1)
+        ]
+
+        return entries, total
+
     async def _get_all_time_total_ranking(
         self,
         skip: int,
@@ -261,7 +416,7 @@ class LeaderboardService:
             Tupla com lista de entradas do ranking e total de usuários
         """
         # Subconsulta para somar pontos por usuário
-        subquery = self.db.query(
+        subquery = select(
             UserPoint.user_id,
             func.sum(UserPoint.amount).label("total_points")
         ).group_by(
@@ -269,7 +424,7 @@ class LeaderboardService:
         ).subquery()
 
         # Consulta principal para obter os usuários ordenados por pontos
-        query = self.db.query(
+        query = select(
             subquery.c.user_id,
             subquery.c.total_points
         ).order_by(
@@ -277,13 +432,13 @@ class LeaderboardService:
         )
 
         # Contar total para paginação
-        total = query.count()
+        total = await self._count(query)
 
         # Aplicar paginação
         query = query.offset(skip).limit(limit)
 
         # Executar a consulta
-        results = query.all()
+        results = (await self.db.execute(query)).all()
 
         # Criar as entradas do ranking
         entries = []
@@ -315,23 +470,23 @@ class LeaderboardService:
             Tupla com lista de entradas do ranking e total de usuários
         """
         # Consulta para obter os usuários ordenados por pontos na categoria
-        query = self.db.query(
+        query = select(
             UserPoint.user_id,
             UserPoint.amount
-        ).filter(
+        ).where(
             UserPoint.category == category
         ).order_by(
             desc(UserPoint.amount)
         )
 
         # Contar total para paginação
-        total = query.count()
+        total = await self._count(query)
 
         # Aplicar paginação
         query = query.offset(skip).limit(limit)
 
         # Executar a consulta
-        results = query.all()
+        results = (await self.db.execute(query)).all()
 
         # Criar as entradas do ranking
         entries = []
@@ -366,25 +521,25 @@ class LeaderboardService:
         Returns:
             Tupla com lista de entradas do ranking e total de usuários
         """
-        # Construir consulta base no histórico de pontos
-        base_query = self.db.query(
-            PointHistory.user_id,
-            func.sum(PointHistory.amount).label("period_points")
-        ).filter(
-            PointHistory.created_at >= from_date
+        # Construir consulta base no rollup diário de pontos
+        base_query = select(
+            UserPointsDaily.user_id,
+            func.sum(UserPointsDaily.points).label("period_points")
+        ).where(
+            UserPointsDaily.day >= from_date.date()
         )
 
         # Adicionar filtro de categoria se necessário
         if category:
-            base_query = base_query.filter(PointHistory.category == category)
+            base_query = base_query.where(UserPointsDaily.category == category)
 
         # Agrupar por usuário e ordenar
         subquery = base_query.group_by(
-            PointHistory.user_id
+            UserPointsDaily.user_id
         ).subquery()
 
         # Consulta principal para ordenar por pontos
-        query = self.db.query(
+        query = select(
             subquery.c.user_id,
             subquery.c.period_points
         ).order_by(
@@ -392,13 +547,13 @@ class LeaderboardService:
         )
 
         # Contar total para paginação
-        total = query.count()
+        total = await self._count(query)
 
         # Aplicar paginação
         query = query.offset(skip).limit(limit)
 
         # Executar a consulta
-        results = query.all()
+        results = (await self.db.execute(query)).all()
 
         # Criar as entradas do ranking
         entries = []
@@ -433,39 +588,39 @@ class LeaderboardService:
             # Todos os tempos
             if category:
                 # Categoria específica
-                point = self.db.query(UserPoint).filter(
+                point = await self.db.scalar(select(UserPoint).where(
                     and_(
                         UserPoint.user_id == user_id,
                         UserPoint.category == category
                     )
-                ).first()
+                ))
 
                 return point.amount if point else 0
             else:
                 # Total de todas as categorias
-                points = self.db.query(
+                points = await self.db.scalar(select(
                     func.sum(UserPoint.amount)
-                ).filter(
+                ).where(
                     UserPoint.user_id == user_id
-                ).scalar()
+                ))
 
                 return points or 0
         else:
             # Período específico
-            query = self.db.query(
-                func.sum(PointHistory.amount)
-            ).filter(
+            query = select(
+                func.sum(UserPointsDaily.points)
+            ).where(
                 and_(
-                    PointHistory.user_id == user_id,
-                    PointHistory.created_at >= from_date
+                    UserPointsDaily.user_id == user_id,
+                    UserPointsDaily.day >= from_date.date()
                 )
             )
 
             # Adicionar filtro de categoria se necessário
             if category:
-                query = query.filter(PointHistory.category == category)
+                query = query.where(UserPointsDaily.category == category)
 
-            points = query.scalar()
+            points = await self.db.scalar(query)
             return points or 0
 
     async def _count_users_ahead(
@@ -491,47 +646,47 @@ class LeaderboardService:
             # Todos os tempos
             if category:
                 # Categoria específica
-                return self.db.query(UserPoint).filter(
+                return await self._count(select(UserPoint).where(
                     and_(
                         UserPoint.category == category,
                         UserPoint.amount > user_points
                     )
-                ).count()
+                ))
             else:
                 # Total de todas as categorias
-                subquery = self.db.query(
+                subquery = select(
                     UserPoint.user_id,
                     func.sum(UserPoint.amount).label("total_points")
                 ).group_by(
                     UserPoint.user_id
                 ).subquery()
 
-                return self.db.query(subquery).filter(
+                return await self._count(select(subquery).where(
                     subquery.c.total_points > user_points
-                ).count()
+                ))
         else:
             # Período específico
-            base_query = self.db.query(
-                PointHistory.user_id,
-                func.sum(PointHistory.amount).label("period_points")
-            ).filter(
-                PointHistory.created_at >= from_date
+            base_query = select(
+                UserPointsDaily.user_id,
+                func.sum(UserPointsDaily.points).label("period_points")
+            ).where(
+                UserPointsDaily.day >= from_date.date()
             )
 
             # Adicionar filtro de categoria se necessário
             if category:
-                base_query = base_query.filter(
-                    PointHistory.category == category)
+                base_query = base_query.where(
+                    UserPointsDaily.category == category)
 
             # Agrupar por usuário
             subquery = base_query.group_by(
-                PointHistory.user_id
+                UserPointsDaily.user_id
             ).subquery()
 
             # Contar usuários com mais pontos
-            return self.db.query(subquery).filter(
+            return await self._count(select(subquery).where(
                 subquery.c.period_points > user_points
-            ).count()
+            ))
 
     async def _get_user_at_position(
         self,
@@ -557,24 +712,24 @@ class LeaderboardService:
             # Todos os tempos
             if category:
                 # Categoria específica
-                query = self.db.query(
+                query = select(
                     UserPoint.user_id,
                     UserPoint.amount
-                ).filter(
+                ).where(
                     UserPoint.category == category
                 ).order_by(
                     desc(UserPoint.amount)
                 )
             else:
                 # Total de todas as categorias
-                subquery = self.db.query(
+                subquery = select(
                     UserPoint.user_id,
                     func.sum(UserPoint.amount).label("total_points")
                 ).group_by(
                     UserPoint.user_id
                 ).subquery()
 
-                query = self.db.query(
+                query = select(
                     subquery.c.user_id,
                     subquery.c.total_points
                 ).order_by(
@@ -582,25 +737,25 @@ class LeaderboardService:
                 )
         else:
             # Período específico
-            base_query = self.db.query(
-                PointHistory.user_id,
-                func.sum(PointHistory.amount).label("period_points")
-            ).filter(
-                PointHistory.created_at >= from_date
+            base_query = select(
+                UserPointsDaily.user_id,
+                func.sum(UserPointsDaily.points).label("period_points")
+            ).where(
+                UserPointsDaily.day >= from_date.date()
             )
 
             # Adicionar filtro de categoria se necessário
             if category:
-                base_query = base_query.filter(
-                    PointHistory.category == category)
+                base_query = base_query.where(
+                    UserPointsDaily.category == category)
 
             # Agrupar por usuário
             subquery = base_query.group_by(
-                PointHistory.user_id
+                UserPointsDaily.user_id
             ).subquery()
 
             # Ordenar por pontos
-            query = self.db.query(
+            query = select(
                 subquery.c.user_id,
                 subquery.c.period_points
             ).order_by(
@@ -611,7 +766,7 @@ class LeaderboardService:
         query = query.offset(position - 1).limit(1)
 
         # Executar a consulta
-        result = query.first()
+        result = (await self.db.execute(query)).first()
 
         if not result:
             return None
@@ -640,23 +795,26 @@ class LeaderboardService:
             # Todos os tempos
             if category:
                 # Categoria específica
-                return self.db.query(UserPoint).filter(
+                return await self.db.scalar(select(
+                    func.count(distinct(UserPoint.user_id))
+                ).where(
                     UserPoint.category == category
-                ).distinct(UserPoint.user_id).count()
+                ))
             else:
                 # Total de todas as categorias
-                return self.db.query(UserPoint.user_id).distinct().count()
+                return await self.db.scalar(select(
+                    func.count(distinct(UserPoint.user_id))))
         else:
             # Período específico
-            query = self.db.query(PointHistory.user_id).filter(
-                PointHistory.created_at >= from_date
+            query = select(UserPointsDaily.user_id).where(
+                UserPointsDaily.day >= from_date.date()
             )
 
             # Adicionar filtro de categoria se necessário
             if category:
-                query = query.filter(PointHistory.category == category)
+                query = query.where(UserPointsDaily.category == category)
 
-            return query.distinct().count()
+            return await self._count(query.distinct())
 
     async def _get_users_around_points(
         self,
@@ -685,85 +843,85 @@ class LeaderboardService:
             # Todos os tempos
             if category:
                 # Categoria específica
-                query = self.db.query(
+                query = select(
                     UserPoint.user_id,
                     UserPoint.amount
-                ).filter(
+                ).where(
                     UserPoint.category == category
                 )
 
                 # Comparação baseada em higher
                 if higher:
-                    query = query.filter(UserPoint.amount > points)
+                    query = query.where(UserPoint.amount > points)
                     query = query.order_by(asc(UserPoint.amount))
                 else:
-                    query = query.filter(UserPoint.amount < points)
+                    query = query.where(UserPoint.amount < points)
                     query = query.order_by(desc(UserPoint.amount))
             else:
                 # Total de todas as categorias
-                subquery = self.db.query(
+                subquery = select(
                     UserPoint.user_id,
                     func.sum(UserPoint.amount).label("total_points")
                 ).group_by(
                     UserPoint.user_id
                 ).subquery()
 
-                query = self.db.query(
+                query = select(
                     subquery.c.user_id,
                     subquery.c.total_points
                 )
 
                 # Comparação baseada em higher
                 if higher:
-                    query = query.filter(subquery.c.total_points > points)
+                    query = query.where(subquery.c.total_points > points)
                     query = query.order_by(asc(subquery.c.total_points))
                 else:
-                    query = query.filter(subquery.c.total_points < points)
+                    query = query.where(subquery.c.total_points < points)
                     query = query.order_by(desc(subquery.c.total_points))
         else:
             # Período específico
-            base_query = self.db.query(
-                PointHistory.user_id,
-                func.sum(PointHistory.amount).label("period_points")
-            ).filter(
-                PointHistory.created_at >= from_date
+            base_query = select(
+                UserPointsDaily.user_id,
+                func.sum(UserPointsDaily.points).label("period_points")
+            ).where(
+                UserPointsDaily.day >= from_date.date()
             )
 
             # Adicionar filtro de categoria se necessário
             if category:
-                base_query = base_query.filter(
-                    PointHistory.category == category)
+                base_query = base_query.where(
+                    UserPointsDaily.category == category)
 
             # Agrupar por usuário
             subquery = base_query.group_by(
-                PointHistory.user_id
+                UserPointsDaily.user_id
             ).subquery()
 
-            query = self.db.query(
+            query = select(
                 subquery.c.user_id,
                 subquery.c.period_points
             )
 
             # Comparação baseada em higher
             if higher:
-                query = query.filter(subquery.c.period_points > points)
+                query = query.where(subquery.c.period_points > points)
                 query = query.order_by(asc(subquery.c.period_points))
             else:
-                query = query.filter(subquery.c.period_points < points)
+                query = query.where(subquery.c.period_points < points)
                 query = query.order_by(desc(subquery.c.period_points))
 
         # Excluir usuário específico se necessário
         if exclude_user_id:
             if category:
-                query = query.filter(UserPoint.user_id != exclude_user_id)
+                query = query.where(UserPoint.user_id != exclude_user_id)
             else:
-                query = query.filter(subquery.c.user_id != exclude_user_id)
+                query = query.where(subquery.c.user_id != exclude_user_id)
 
         # Aplicar limite
         query = query.limit(limit)
 
         # Executar a consulta
-        results = query.all()
+        results = (await self.db.execute(query)).all()
 
         # Criar entradas (rank será ajustado depois)
         entries = []
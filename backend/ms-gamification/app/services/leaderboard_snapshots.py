@@ -0,0 +1,252 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime
+from typing import AsyncIterator, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+from app.services.leaderboard_store import (
+    LeaderboardStore,
+    PERIODS,
+    TOTAL_CATEGORY,
+    period_bucket
+)
+
+logger = logging.getLogger(__name__)
+
+# Tempo máximo (s) que uma publicação pode segurar o lock
+_PUBLISH_LOCK_SECONDS = 5
+
+
+class LeaderboardSnapshot(NamedTuple):
+    """Página publicada de um ranking: corpo JSON pronto para envio."""
+    version: str
+    page: int
+    body: str
+
+
+class LeaderboardSnapshots:
+    """
+    Snapshots imutáveis e versionados das primeiras páginas do ranking.
+
+    A cada publicação as primeiras LEADERBOARD_SNAPSHOT_PAGES páginas de um
+    período/categoria são serializadas uma única vez e gravadas no Redis. A
+    versão é um hash do conteúdo, então publicar um ranking que não mudou
+    mantém a versão (e os ETags) e um ranking alterado ganha chaves novas:
+    o corpo de uma versão nunca muda e pode ser cacheado por qualquer
+    intermediário.
+
+    O ponteiro `leaderboard:snapshot:{period}:{category}:current` indica a
+    versão atual e quando ela foi confirmada; versões antigas expiram após
+    LEADERBOARD_SNAPSHOT_TTL segundos. Os dados do usuário (posição, pontos)
+    não fazem parte do snapshot e são servidos à parte por /ranking.
+    """
+
+    def __init__(self, store: Optional[LeaderboardStore] = None):
+        self.store = store or LeaderboardStore()
+        self.redis = self.store.redis
+        self.page_size = settings.LEADERBOARD_SNAPSHOT_PAGE_SIZE
+        self.pages = settings.LEADERBOARD_SNAPSHOT_PAGES
+        self.interval = settings.LEADERBOARD_SNAPSHOT_INTERVAL
+        self.ttl = settings.LEADERBOARD_SNAPSHOT_TTL
+
+    @staticmethod
+    def _prefix(period: str, category: Optional[str]) -> str:
+        return f"leaderboard:snapshot:{period}:{category or TOTAL_CATEGORY}"
+
+    def pointer_key(self, period: str, category: Optional[str]) -> str:
+        return f"{self._prefix(period, category)}:current"
+
+    def page_key(
+        self,
+        period: str,
+        category: Optional[str],
+        version: str,
+        page: int
+    ) -> str:
+        return f"{self._prefix(period, category)}:{version}:{page}"
+
+    async def publish(
+        self,
+        period: str,
+        category: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> str:
+        """
+        Publica o snapshot atual do ranking.
+
+        Se o conteúdo não mudou desde a última publicação e todas as páginas
+        da versão ainda existem, apenas renova o ponteiro e a expiração delas;
+        páginas que expiraram (publicador parado) são regravadas.
+
+        Args:
+            period: Período (daily, weekly, monthly, all_time)
+            category: Categoria ou None para o total
+            now: Momento da publicação (padrão: agora)
+
+        Returns:
+            Versão publicada
+        """
+        now = now or datetime.utcnow()
+        key = self.store.key(period, category, now)
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zrevrange(key, 0, self.page_size * self.pages - 1, withscores=True)
+        pipe.zcard(key)
+        members, total = await pipe.execute()
+
+        entries = [
+            {"rank": rank, "user_id": user_id, "points": int(score),
+             "is_current_user": False}
+            for rank, (user_id, score) in enumerate(members, start=1)
+        ]
+        version = self._version(period, category, now, entries, total)
+
+        pointer = self.pointer_key(period, category)
+        current = await self._read_pointer(pointer)
+        page_keys = [self.page_key(period, category, version, page)
+                     for page in range(self.pages)]
+
+        unchanged = (
+            current is not None and current[0] == version
+            and await self.redis.exists(*page_keys) == len(page_keys)
+        )
+
+        pipe = self.redis.pipeline(transaction=True)
+        if unchanged:
+            for page_key in page_keys:
+                pipe.expire(page_key, self.ttl)
+        else:
+            for page, body in enumerate(self._bodies(
+                    period, category, version, now, entries, total)):
+                pipe.set(page_keys[page], body, ex=self.ttl)
+        pipe.set(pointer, json.dumps(
+            {"version": version, "published_at": time.time()}), ex=self.ttl)
+        await pipe.execute()
+
+        if not unchanged:
+            logger.debug(f"Snapshot {pointer} publicado: versão {version}")
+        return version
+
+    async def current_version(self, period: str, category: Optional[str] = None) -> str:
+        """
+        Versão atual do snapshot, republicando se estiver vencida.
+
+        Apenas uma requisição por vez republica (lock com SET NX); as demais
+        continuam servindo a versão anterior enquanto ela existir.
+        """
+        pointer = self.pointer_key(period, category)
+        current = await self._read_pointer(pointer)
+        if current and time.time() - current[1] < self.interval:
+            return current[0]
+
+        if await self.redis.set(f"{pointer}:lock", 1, nx=True, ex=_PUBLISH_LOCK_SECONDS):
+            try:
+                return await self.publish(period, category)
+            finally:
+                await self.redis.delete(f"{pointer}:lock")
+
+        return current[0] if current else await self.publish(period, category)
+
+    async def get_page(
+        self,
+        period: str,
+        category: Optional[str] = None,
+        page: int = 0,
+        version: Optional[str] = None
+    ) -> Optional[LeaderboardSnapshot]:
+        """
+        Obtém uma página publicada do ranking.
+
+        Args:
+            period: Período (daily, weekly, monthly, all_time)
+            category: Categoria ou None para o total
+            page: Página (a partir de 0)
+            version: Versão específica ou None para a atual
+
+        Returns:
+            Snapshot da página ou None se a versão expirou ou a página não
+            faz parte do snapshot
+        """
+        if page >= self.pages:
+            return None
+
+        if version is not None:
+            body = await self.redis.get(self.page_key(period, category, version, page))
+            return LeaderboardSnapshot(version, page, body) if body else None
+
+        version = await self.current_version(period, category)
+        body = await self.redis.get(self.page_key(period, category, version, page))
+        if body is None:
+            # Páginas expiraram antes do ponteiro (publicador parado)
+            version = await self.publish(period, category)
+            body = await self.redis.get(self.page_key(period, category, version, page))
+        return LeaderboardSnapshot(version, page, body) if body else None
+
+    async def iter_categories(self, period: str) -> AsyncIterator[Optional[str]]:
+        """Total e categorias com ranking no bucket atual do período."""
+        yield None
+        prefix = f"leaderboard:{period}:{period_bucket(period, datetime.utcnow())}:"
+        async for key in self.redis.scan_iter(match=f"{prefix}*"):
+            category = key[len(prefix):]
+            if category != TOTAL_CATEGORY and not category.endswith(":rebuild"):
+                yield category
+
+    async def publish_all(self, periods: Iterable[str] = PERIODS) -> List[Tuple[str, Optional[str], str]]:
+        """
+        Publica os snapshots de todos os períodos e categorias.
+
+        Returns:
+            Tuplas (período, categoria, versão)
+        """
+        published = []
+        for period in periods:
+            async for category in self.iter_categories(period):
+                published.append((period, category, await self.publish(period, category)))
+        return published
+
+    async def _read_pointer(self, pointer: str) -> Optional[Tuple[str, float]]:
+        raw = await self.redis.get(pointer)
+        if not raw:
+            return None
+        data = json.loads(raw)
+        return data["version"], float(data["published_at"])
+
+    @staticmethod
+    def _version(
+        period: str,
+        category: Optional[str],
+        now: datetime,
+        entries: list,
+        total: int
+    ) -> str:
+        content = json.dumps(
+            [period, category, period_bucket(period, now), total, entries],
+            separators=(",", ":"))
+        return hashlib.sha256(content.encode()).hexdigest()[:20]
+
+    def _bodies(
+        self,
+        period: str,
+        category: Optional[str],
+        version: str,
+        now: datetime,
+        entries: list,
+        total: int
+    ) -> Iterable[str]:
+        """Serializa cada página uma única vez, no formato da API."""
+        for page in range(self.pages):
+            skip = page * self.page_size
+            yield json.dumps({
+                "entries": entries[skip:skip + self.page_size],
+                "total": total,
+                "skip": skip,
+                "limit": self.page_size,
+                "period": period,
+                "category": category,
+                "version": version,
+                "page": page,
+                "pages": self.pages,
+                "generated_at": now.isoformat()
+            }, separators=(",", ":"))
@@ -0,0 +1,276 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import redis.asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.db.async_session import set_statement_timeout
+from app.db.redis import get_redis
+from app.models.user_point import UserPoint
+from app.models.user_points_daily import UserPointsDaily
+
+logger = logging.getLogger(__name__)
+
+# Períodos mantidos em sorted sets
+PERIODS = ("daily", "weekly", "monthly", "all_time")
+
+# Sufixo usado para o ranking de pontos totais (todas as categorias)
+TOTAL_CATEGORY = "total"
+
+
+def period_start(period: str, at: datetime) -> Optional[datetime]:
+    """
+    Determina o início do período que contém a data informada.
+
+    Args:
+        period: Período (daily, weekly, monthly, all_time)
+        at: Data de referência
+
+    Returns:
+        Data de início ou None para all_time
+    """
+    if period == "daily":
+        return datetime(at.year, at.month, at.day)
+    if period == "weekly":
+        monday = at - timedelta(days=at.weekday())
+        return datetime(monday.year, monday.month, monday.day)
+    if period == "monthly":
+        return datetime(at.year, at.month, 1)
+    return None
+
+
+def period_end(period: str, at: datetime) -> Optional[datetime]:
+    """Retorna o início do período seguinte ao que contém a data (exclusivo)."""
+    start = period_start(period, at)
+    if start is None:
+        return None
+    if period == "daily":
+        return start + timedelta(days=1)
+    if period == "weekly":
+        return start + timedelta(days=7)
+    if start.month == 12:
+        return datetime(start.year + 1, 1, 1)
+    return datetime(start.year, start.month + 1, 1)
+
+
+def period_bucket(period: str, at: datetime) -> str:
+    """
+    Identificador do bucket do período (dia, semana ISO ou mês).
+
+    Exemplos: 2024-05-17, 2024-W20, 2024-05, all
+    """
+    if period == "daily":
+        return at.strftime("%Y-%m-%d")
+    if period == "weekly":
+        iso_year, iso_week, _ = at.isocalendar()
+        return f"{iso_year}-W{iso_week:02d}"
+    if period == "monthly":
+        return at.strftime("%Y-%m")
+    return "all"
+
+
+class LeaderboardStore:
+    """
+    Rankings mantidos em sorted sets do Redis.
+
+    Cada combinação de período (bucket do dia, semana ISO, mês ou todos os
+    tempos) e categoria tem seu próprio sorted set, atualizado com ZINCRBY a
+    cada transação de pontos. As leituras de página viram ZREVRANGE e o total
+    de participantes vira ZCARD, independente do tamanho do histórico.
+    """
+
+    def __init__(self, client: Optional[redis.asyncio.Redis] = None):
+        self.redis = client or get_redis()
+        self.retention = timedelta(days=settings.LEADERBOARD_RETENTION_DAYS)
+
+    def key(
+        self,
+        period: str,
+        category: Optional[str] = None,
+        at: Optional[datetime] = None
+    ) -> str:
+        """
+        Monta a chave do sorted set para um período e categoria.
+
+        Args:
+            period: Período (daily, weekly, monthly, all_time)
+            category: Categoria ou None para o total
+            at: Data de referência (padrão: agora)
+
+        Returns:
+            Chave no formato leaderboard:{period}:{bucket}:{category}
+        """
+        bucket = period_bucket(period, at or datetime.utcnow())
+        return f"leaderboard:{period}:{bucket}:{category or TOTAL_CATEGORY}"
+
+    def _expire_at(self, period: str, at: datetime) -> Optional[datetime]:
+        end = period_end(period, at)
+        return end + self.retention if end else None
+
+    async def record(
+        self,
+        user_id: str,
+        category: str,
+        amount: int,
+        at: Optional[datetime] = None
+    ) -> None:
+        """
+        Aplica uma transação de pontos em todos os rankings afetados.
+
+        Args:
+            user_id: ID do usuário
+            category: Categoria dos pontos
+            amount: Pontos (negativo para subtração)
+            at: Momento da transação (padrão: agora)
+        """
+        await self.record_many([(user_id, category, amount, at or datetime.utcnow())])
+
+    async def record_many(
+        self,
+        events: Iterable[Tuple[str, str, int, datetime]]
+    ) -> None:
+        """
+        Aplica várias transações com um único round trip ao Redis.
+
+        Args:
+            events: Tuplas (user_id, category, amount, at)
+        """
+        increments: Dict[Tuple[str, str], int] = {}
+        expirations: Dict[str, datetime] = {}
+
+        for user_id, category, amount, at in events:
+            for period in PERIODS:
+                expire_at = self._expire_at(period, at)
+                for cat in (category, None):
+                    key = self.key(period, cat, at)
+                    increments[(key, user_id)] = increments.get(
+                        (key, user_id), 0) + amount
+                    if expire_at:
+                        expirations[key] = expire_at
+
+        if not increments:
+            return
+
+        pipe = self.redis.pipeline(transaction=False)
+        for (key, user_id), amount in increments.items():
+            pipe.zincrby(key, amount, user_id)
+        for key, expire_at in expirations.items():
+            pipe.expireat(key, expire_at)
+        await pipe.execute()
+
+    async def get_page(
+        self,
+        period: str,
+        category: Optional[str],
+        skip: int,
+        limit: int
+    ) -> Tuple[List[Tuple[str, int]], int]:
+        """
+        Obtém uma página do ranking e o total de participantes.
+
+        Args:
+            period: Período (daily, weekly, monthly, all_time)
+            category: Categoria ou None para o total
+            skip: Quantos registros pular
+            limit: Limite de registros
+
+        Returns:
+            Tupla com lista de (user_id, pontos) e total de usuários
+        """
+        key = self.key(period, category)
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zrevrange(key, skip, skip + limit - 1, withscores=True)
+        pipe.zcard(key)
+        members, total = await pipe.execute()
+
+        return [(user_id, int(score)) for user_id, score in members], total
+
+    async def rebuild(
+        self,
+        db: AsyncSession,
+        periods: Iterable[str] = PERIODS
+    ) -> Dict[str, int]:
+        """
+        Reconstrói os rankings atuais a partir do Postgres.
+
+        Os dados são gravados em chaves temporárias e trocados com RENAME,
+        então as leituras nunca veem um ranking parcialmente reconstruído.
+
+        Args:
+            db: Sessão assíncrona do banco de dados
+            periods: Períodos a reconstruir
+
+        Returns:
+            Número de membros gravados por chave
+        """
+        now = datetime.utcnow()
+        written: Dict[str, int] = {}
+
+        for period in periods:
+            from_date = period_start(period, now)
+
+            if from_date is None:
+                query = select(
+                    UserPoint.user_id,
+                    UserPoint.category,
+                    func.sum(UserPoint.amount)
+                ).group_by(UserPoint.user_id, UserPoint.category)
+            else:
+                query = select(
+                    UserPointsDaily.user_id,
+                    UserPointsDaily.category,
+                    func.sum(UserPointsDaily.points)
+                ).where(
+                    UserPointsDaily.day >= from_date.date()
+                ).group_by(UserPointsDaily.user_id, UserPointsDaily.category)
+
+            await set_statement_timeout(db, "aggregate")
+            rows = (await db.execute(query)).all()
+
+            # Agrupar pontuações por chave (categoria e total)
+            scores: Dict[str, Dict[str, int]] = {}
+            for user_id, category, points in rows:
+                for cat in (category, None):
+                    members = scores.setdefault(self.key(period, cat, now), {})
+                    members[user_id] = members.get(user_id, 0) + int(points or 0)
+
+            # Remover chaves que não têm mais participantes
+            pattern = f"leaderboard:{period}:{period_bucket(period, now)}:*"
+            async for key in self.redis.scan_iter(match=pattern):
+                if key not in scores and not key.endswith(":rebuild"):
+                    await self.redis.delete(key)
+
+            expire_at = self._expire_at(period, now)
+            for key, members in scores.items():
+                await self._replace(key, members, expire_at)
+                written[key] = len(members)
+
+            logger.info(
+                f"Ranking {period} reconstruído: {len(scores)} chaves")
+
+        return written
+
+    async def _replace(
+        self,
+        key: str,
+        members: Dict[str, int],
+        expire_at: Optional[datetime],
+        chunk_size: int = 10000
+    ) -> None:
+        """Grava um sorted set em uma chave temporária e troca atomicamente."""
+        tmp_key = f"{key}:rebuild"
+        await self.redis.delete(tmp_key)
+
+        items = list(members.items())
+        for i in range(0, len(items), chunk_size):
+            await self.redis.zadd(tmp_key, dict(items[i:i + chunk_size]))
+
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.rename(tmp_key, key)
+        if expire_at:
+            pipe.expireat(key, expire_at)
+        await pipe.execute()
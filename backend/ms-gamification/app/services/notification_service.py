@@ -0,0 +1,224 @@
+import json
+import logging
+import time
+from typing import AsyncIterator, Dict, List, Optional
+
+import redis.asyncio
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.redis import get_redis
+from app.models.achievement import Achievement
+from app.models.user_achievement import UserAchievement
+from app.schemas.gamification import AchievementResponse
+
+logger = logging.getLogger(__name__)
+
+
+def unread_key(user_id: str) -> str:
+    """Flag de notificações pendentes do usuário ("1" pendente, "0" em dia)."""
+    return f"achievements:unread:{user_id}"
+
+
+def unlock_channel(user_id: str) -> str:
+    """Canal pub/sub com os desbloqueios do usuário."""
+    return f"achievements:unlocked:{user_id}"
+
+
+async def publish_unlocks(
+    unlocked: Dict[str, List[AchievementResponse]],
+    client: Optional[redis.asyncio.Redis] = None
+) -> None:
+    """
+    Marca os usuários com notificações pendentes e avisa os ouvintes.
+
+    Deve ser chamado após o commit dos desbloqueios. Falhas no Redis apenas
+    atrasam a notificação: sem a flag, a próxima consulta verifica o banco.
+
+    Args:
+        unlocked: Conquistas desbloqueadas por usuário
+        client: Cliente Redis (padrão: cliente compartilhado)
+    """
+    if not unlocked:
+        return
+
+    client = client or get_redis()
+    try:
+        pipe = client.pipeline(transaction=False)
+        for user_id, achievements in unlocked.items():
+            pipe.set(unread_key(user_id), "1")
+            pipe.publish(unlock_channel(user_id), json.dumps(
+                [achievement.model_dump(mode="json") for achievement in achievements]))
+        await pipe.execute()
+    except redis.RedisError as e:
+        logger.error(f"Erro ao publicar desbloqueios de conquistas: {str(e)}")
+
+
+def _sse_event(achievement: AchievementResponse) -> str:
+    return (
+        f"event: achievement\n"
+        f"id: {achievement.id}\n"
+        f"data: {achievement.model_dump_json()}\n\n"
+    )
+
+
+class NotificationService:
+    """
+    Notificações de conquistas desbloqueadas.
+
+    Uma flag por usuário no Redis indica se há desbloqueios não notificados,
+    então a consulta habitual ("há algo novo?") não acessa o banco. Quando há,
+    as conquistas são lidas e marcadas como notificadas em um único
+    UPDATE ... RETURNING. Desbloqueios publicados pelo motor de regras
+    alimentam o long-poll e o feed SSE.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        client: Optional[redis.asyncio.Redis] = None
+    ):
+        self.db = db
+        self.redis = client or get_redis()
+
+    async def has_unread(self, user_id: str) -> bool:
+        """
+        Verifica se o usuário tem conquistas não notificadas.
+
+        A flag do Redis responde sem acessar o banco. Sem flag (chave expirada,
+        Redis reiniciado), o banco é consultado e a flag é recriada com SET NX
+        para não sobrescrever um desbloqueio concorrente. A transação da
+        consulta é encerrada logo em seguida: o long-poll e o SSE esperam por
+        desbloqueios sem prender uma conexão do pool.
+        """
+        try:
+            flag = await self.redis.get(unread_key(user_id))
+            if flag is not None:
+                return flag == "1"
+        except redis.RedisError as e:
+            logger.error(f"Erro ao ler flag de notificações: {str(e)}")
+
+        exists = await self.db.scalar(select(UserAchievement.id).where(
+            UserAchievement.user_id == user_id,
+            UserAchievement.unlocked_at.isnot(None),
+            UserAchievement.notified == 0
+        ).limit(1)) is not None
+        await self.db.rollback()
+
+        try:
+            await self.redis.set(unread_key(user_id), "1" if exists else "0", nx=True)
+        except redis.RedisError as e:
+            logger.error(f"Erro ao gravar flag de notificações: {str(e)}")
+
+        return exists
+
+    async def fetch_unread(self, user_id: str) -> List[AchievementResponse]:
+        """
+        Obtém e marca como notificadas as conquistas pendentes do usuário.
+
+        Args:
+            user_id: ID do usuário
+
+        Returns:
+            Conquistas desbloqueadas desde a última notificação
+        """
+        if not await self.has_unread(user_id):
+            return []
+
+        # Zerar a flag antes do UPDATE: um desbloqueio concorrente que não for
+        # retornado aqui volta a marcá-la após o seu commit
+        try:
+            await self.redis.set(unread_key(user_id), "0")
+        except redis.RedisError as e:
+            logger.error(f"Erro ao gravar flag de notificações: {str(e)}")
+
+        stmt = update(UserAchievement).where(
+            UserAchievement.achievement_id == Achievement.id,
+            UserAchievement.user_id == user_id,
+            UserAchievement.unlocked_at.isnot(None),
+            UserAchievement.notified == 0
+        ).values(
+            notified=1
+        ).returning(
+            *Achievement.__table__.columns,
+            UserAchievement.unlocked_at
+        ).execution_options(synchronize_session=False)
+
+        rows = (await self.db.execute(stmt)).all()
+        await self.db.commit()
+
+        rows = sorted(rows, key=lambda row: row.unlocked_at)
+        return [AchievementResponse.model_validate(dict(row._mapping)) for row in rows]
+
+    async def wait_for_unread(
+        self,
+        user_id: str,
+        timeout: float = settings.NOTIFICATIONS_POLL_TIMEOUT
+    ) -> List[AchievementResponse]:
+        """
+        Long-poll: retorna as notificações pendentes ou espera por desbloqueios.
+
+        Args:
+            user_id: ID do usuário
+            timeout: Espera máxima em segundos
+
+        Returns:
+            Conquistas notificadas (lista vazia se o tempo esgotar)
+        """
+        notifications = await self.fetch_unread(user_id)
+        if notifications:
+            return notifications
+
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(unlock_channel(user_id))
+        try:
+            # Desbloqueios entre a primeira leitura e a inscrição no canal
+            if await self.has_unread(user_id):
+                return await self.fetch_unread(user_id)
+
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return []
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=remaining)
+                if message is not None:
+                    return await self.fetch_unread(user_id)
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def stream(
+        self,
+        user_id: str,
+        heartbeat: float = settings.NOTIFICATIONS_HEARTBEAT
+    ) -> AsyncIterator[str]:
+        """
+        Feed SSE de desbloqueios do usuário.
+
+        Envia as notificações pendentes ao conectar e cada novo desbloqueio
+        publicado pelo motor de regras; comentários de heartbeat mantêm a
+        conexão aberta em proxies.
+
+        Yields:
+            Eventos no formato text/event-stream
+        """
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(unlock_channel(user_id))
+        try:
+            for achievement in await self.fetch_unread(user_id):
+                yield _sse_event(achievement)
+
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=heartbeat)
+                if message is None:
+                    yield ": heartbeat\n\n"
+                    continue
+                for achievement in await self.fetch_unread(user_id):
+                    yield _sse_event(achievement)
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
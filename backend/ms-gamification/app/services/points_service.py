@@ -1,39 +1,84 @@
-from datetime import datetime
-from typing import List, Dict, Optional, Tuple
-from uuid import uuid4
-from sqlalchemy.orm import Session
+import base64
+import logging
+from datetime import date, datetime
+from typing import Iterable, List, Dict, Optional, Tuple
+from uuid import UUID, uuid4
+import redis
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import func
-from sqlalchemy import and_, desc, asc
+from sqlalchemy import and_, desc, asc, select, tuple_
 
+from app.core.config import settings
+from app.db.async_session import set_statement_timeout
+from app.db.partitions import add_months, month_start
 from app.models.user_point import UserPoint
+from app.models.point_event_key import PointEventKey
 from app.models.point_history import PointHistory
+from app.services.achievement_engine import AchievementEngine, POINTS_CONDITION
+from app.services.activity_calendar import ActivityCalendar, STREAK_CONDITION
+from app.services.leaderboard_store import LeaderboardStore
+from app.services.rollup_service import RollupService, upsert_daily_points
 from app.schemas.gamification import (
     UserPointsResponse,
     UserPointsDetail,
+    PointCategoryDetail,
     PointsHistoryResponse,
-    PointHistoryItem
+    PointHistoryItem,
+    PointEvent,
+    PointsBulkResponse
 )
 
+logger = logging.getLogger(__name__)
+
+# Categorias válidas de pontos (também as dos rankings por categoria)
+POINT_CATEGORIES = (
+    "oracao",
+    "estudo",
+    "compartilhamento",
+    "quiz",
+    "presenca",
+    "comentario",
+    "reflexao",
+    "interacao",
+    "contribuicao",
+    "geral"
+)
+
+
+def encode_history_cursor(created_at: datetime, history_id: UUID) -> str:
+    """Cursor opaco da posição (created_at, id) no histórico."""
+    raw = f"{created_at.isoformat()}|{history_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Decodifica um cursor do histórico.
+
+    Raises:
+        ValueError: Se o cursor for inválido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, history_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(history_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor de histórico inválido") from e
+
 
 class PointsService:
     """Serviço para gerenciamento de pontos dos usuários"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, leaderboards: Optional[LeaderboardStore] = None):
         self.db = db
+        self.leaderboards = leaderboards or LeaderboardStore()
+        self.achievements = AchievementEngine(db)
+        self.activity = ActivityCalendar()
 
         # Categorias válidas de pontos
-        self._valid_categories = [
-            "oracao",
-            "estudo",
-            "compartilhamento",
-            "quiz",
-            "presenca",
-            "comentario",
-            "reflexao",
-            "interacao",
-            "contribuicao",
-            "geral"
-        ]
+        self._valid_categories = list(POINT_CATEGORIES)
 
         # Fontes de ação válidas para alterar pontos
         self._valid_action_sources = [
@@ -57,9 +102,10 @@ class PointsService:
             Objeto com informações de pontos do usuário
         """
         # Obter os pontos por categoria
-        points_by_category = self.db.query(UserPoint).filter(
+        result = await self.db.scalars(select(UserPoint).where(
             UserPoint.user_id == user_id
-        ).all()
+        ))
+        points_by_category = result.all()
 
         # Se não encontrar, retornar zero em todas categorias
         if not points_by_category:
@@ -76,7 +122,7 @@ class PointsService:
                 self.db.add(point)
                 points_by_category.append(point)
 
-            self.db.commit()
+            await self.db.commit()
 
         # Calcular pontuação total
         total_points = sum(point.amount for point in points_by_category)
@@ -99,58 +145,83 @@ class PointsService:
     async def get_points_history(
         self,
         user_id: str,
-        skip: int = 0,
         limit: int = 10,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> PointsHistoryResponse:
         """
         Obtém o histórico de transações de pontos do usuário.
 
+        A paginação é por cursor (keyset) sobre o índice
+        (user_id, created_at DESC, id DESC): cada página lê apenas `limit`
+        linhas a partir da posição anterior, e o filtro em created_at permite
+        ao Postgres ignorar as partições mais recentes que o cursor. O total
+        vem do rollup diário e é aproximado.
+
         Args:
             user_id: ID do usuário
-            skip: Quantos registros pular (para paginação)
             limit: Limite de registros a retornar
             category: Filtrar por categoria específica
+            cursor: Cursor retornado pela página anterior
 
         Returns:
             Histórico de pontos paginado
+
+        Raises:
+            ValueError: Se o cursor for inválido
         """
         # Construir a query base
-        query = self.db.query(PointHistory).filter(
+        query = select(PointHistory).where(
             PointHistory.user_id == user_id
         )
 
         # Adicionar filtro de categoria se fornecido
         if category:
-            query = query.filter(PointHistory.category == category)
-
-        # Obter o total para paginação
-        total = query.count()
+            query = query.where(PointHistory.category == category)
+
+        # Continuar após a última transação da página anterior
+        if cursor:
+            cursor_at, cursor_id = decode_history_cursor(cursor)
+            query = query.where(
+                PointHistory.created_at <= cursor_at,
+                tuple_(PointHistory.created_at, PointHistory.id) < tuple_(cursor_at, cursor_id)
+            )
 
-        # Aplicar ordenação e paginação
+        # Uma linha a mais indica se há próxima página
         query = query.order_by(
-            desc(PointHistory.created_at)).offset(skip).limit(limit)
-
-        # Executar a consulta
-        history_items = query.all()
+            desc(PointHistory.created_at), desc(PointHistory.id)).limit(limit + 1)
+        history_items = (await self.db.scalars(query)).all()
+
+        next_cursor = None
+        if len(history_items) > limit:
+            history_items = history_items[:limit]
+            last = history_items[-1]
+            next_cursor = encode_history_cursor(last.created_at, last.id)
+
+        # Total aproximado dentro da retenção do histórico
+        retention_start = add_months(
+            month_start(datetime.utcnow().date()),
+            -settings.POINT_HISTORY_RETENTION_MONTHS)
+        total = await RollupService(self.db).count_events(
+            user_id, retention_start, category)
 
         # Montar resposta
         history = [
             PointHistoryItem(
-                id=item.id,
+                id=str(item.id),
                 amount=item.amount,
                 category=item.category,
                 description=item.description,
                 created_at=item.created_at,
-                action_source=item.action_source
+                action_source=item.action
             ) for item in history_items
         ]
 
         return PointsHistoryResponse(
             items=history,
             total=total,
-            skip=skip,
-            limit=limit
+            limit=limit,
+            next_cursor=next_cursor
         )
 
     async def add_points(
@@ -190,12 +261,12 @@ class PointsService:
                 f"Fonte de ação inválida. Fontes válidas: {', '.join(self._valid_action_sources)}")
 
         # Buscar o registro de pontos do usuário para a categoria
-        user_point = self.db.query(UserPoint).filter(
+        user_point = await self.db.scalar(select(UserPoint).where(
             and_(
                 UserPoint.user_id == user_id,
                 UserPoint.category == category
             )
-        ).first()
+        ))
 
         # Se não existir, criar um novo
         if not user_point:
@@ -219,22 +290,25 @@ class PointsService:
             amount=amount,
             category=category,
             description=description,
-            action_source=action_source,
+            action=action_source,
             created_at=datetime.utcnow()
         )
 
         self.db.add(history_entry)
-        self.db.commit()
-        self.db.refresh(user_point)
+        await set_statement_timeout(self.db, "write")
+        await self.db.commit()
+        await self.db.refresh(user_point)
 
-        # Verificar conquistas
-        await self._check_point_achievements(user_id, category, user_point.amount)
+        # Atualizar rankings
+        await self._update_leaderboards(
+            user_id, category, amount, history_entry.created_at)
 
-        return UserPointsDetail(
-            category=user_point.category,
-            amount=user_point.amount,
-            updated_at=user_point.updated_at
-        )
+        # Marcar o dia como ativo e verificar conquistas
+        await self.record_activity([(user_id, history_entry.created_at.date())])
+        await self._check_point_achievements(
+            user_id, category, user_point.amount, amount)
+
+        return await self._points_detail(user_id)
 
     async def subtract_points(
         self,
@@ -273,12 +347,12 @@ class PointsService:
                 f"Fonte de ação inválida. Fontes válidas: {', '.join(self._valid_action_sources)}")
 
         # Buscar o registro de pontos do usuário para a categoria
-        user_point = self.db.query(UserPoint).filter(
+        user_point = await self.db.scalar(select(UserPoint).where(
             and_(
                 UserPoint.user_id == user_id,
                 UserPoint.category == category
             )
-        ).first()
+        ))
 
         # Se não existir ou não tiver pontos suficientes, erro
         if not user_point or user_point.amount < amount:
@@ -295,18 +369,156 @@ class PointsService:
             amount=-amount,  # Valor negativo para indicar subtração
             category=category,
             description=description,
-            action_source=action_source,
+            action=action_source,
             created_at=datetime.utcnow()
         )
 
         self.db.add(history_entry)
-        self.db.commit()
-        self.db.refresh(user_point)
+        await set_statement_timeout(self.db, "write")
+        await self.db.commit()
+        await self.db.refresh(user_point)
 
-        return UserPointsDetail(
-            category=user_point.category,
-            amount=user_point.amount,
-            updated_at=user_point.updated_at
+        # Atualizar rankings
+        await self._update_leaderboards(
+            user_id, category, -amount, history_entry.created_at)
+
+        return await self._points_detail(user_id)
+
+    async def add_points_bulk(self, events: List[PointEvent]) -> PointsBulkResponse:
+        """
+        Adiciona pontos de vários eventos em uma única transação.
+
+        Args:
+            events: Eventos de pontos com chave de idempotência
+
+        Returns:
+            Resumo com eventos aplicados e duplicados
+
+        Raises:
+            ValueError: Se algum evento tiver categoria ou fonte inválida
+        """
+        return await self.apply_point_events(events)
+
+    async def apply_point_events(self, events: List[PointEvent]) -> PointsBulkResponse:
+        """
+        Aplica um lote de eventos de pontos.
+
+        As chaves de idempotência são gravadas em point_event_keys com um único
+        INSERT ... ON CONFLICT DO NOTHING; apenas os eventos com chave nova vão
+        para o histórico e são somados em user_points (upsert de várias linhas)
+        e no rollup diário, na mesma transação. Rankings e conquistas são
+        atualizados uma vez por lote.
+
+        Args:
+            events: Eventos de pontos com chave de idempotência
+
+        Returns:
+            Resumo com eventos aplicados e duplicados
+
+        Raises:
+            ValueError: Se algum evento tiver categoria ou fonte inválida
+        """
+        for event in events:
+            if event.category not in self._valid_categories:
+                raise ValueError(
+                    f"Categoria inválida no evento {event.idempotency_key}: {event.category}")
+            if event.action_source not in self._valid_action_sources:
+                raise ValueError(
+                    f"Fonte de ação inválida no evento {event.idempotency_key}: {event.action_source}")
+
+        # Eventos repetidos dentro do próprio lote
+        unique: Dict[str, PointEvent] = {}
+        for event in events:
+            unique.setdefault(event.idempotency_key, event)
+
+        now = datetime.utcnow()
+        applied = []
+        new_keys = []
+        await set_statement_timeout(self.db, "write")
+        if unique:
+            # Registrar as chaves; as que já existiam são eventos duplicados
+            stmt = insert(PointEventKey).values([
+                {"idempotency_key": key, "created_at": event.created_at or now}
+                for key, event in unique.items()
+            ]).on_conflict_do_nothing(
+                index_elements=[PointEventKey.idempotency_key]
+            ).returning(PointEventKey.idempotency_key)
+            new_keys = (await self.db.scalars(stmt)).all()
+
+        if new_keys:
+            stmt = insert(PointHistory).values([
+                {
+                    "id": uuid4(),
+                    "user_id": unique[key].user_id,
+                    "category": unique[key].category,
+                    "amount": unique[key].amount,
+                    "action": unique[key].action_source,
+                    "description": unique[key].description,
+                    "related_entity_id": unique[key].related_entity_id,
+                    "idempotency_key": key,
+                    "created_at": unique[key].created_at or now
+                }
+                for key in new_keys
+            ]).returning(
+                PointHistory.user_id,
+                PointHistory.category,
+                PointHistory.amount,
+                PointHistory.created_at
+            )
+            applied = (await self.db.execute(stmt)).all()
+
+        deltas: Dict[Tuple[str, str], int] = {}
+        daily: Dict[Tuple[str, str, date], Tuple[int, int]] = {}
+        for user_id, category, amount, created_at in applied:
+            deltas[(user_id, category)] = deltas.get((user_id, category), 0) + amount
+            day_key = (user_id, category, created_at.date())
+            points, count = daily.get(day_key, (0, 0))
+            daily[day_key] = (points + amount, count + 1)
+
+        category_totals: Dict[Tuple[str, str], int] = {}
+        if deltas:
+            stmt = insert(UserPoint).values([
+                {
+                    "id": uuid4(),
+                    "user_id": user_id,
+                    "category": category,
+                    "amount": amount,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for (user_id, category), amount in deltas.items()
+            ])
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_user_points_user_category",
+                set_={
+                    "amount": UserPoint.amount + stmt.excluded.amount,
+                    "updated_at": stmt.excluded.updated_at
+                }
+            ).returning(UserPoint.user_id, UserPoint.category, UserPoint.amount)
+
+            for user_id, category, amount in (await self.db.execute(stmt)).all():
+                category_totals[(user_id, category)] = amount
+
+            await self.db.run_sync(upsert_daily_points, daily)
+
+        await self.db.commit()
+
+        if applied:
+            try:
+                await self.leaderboards.record_many(applied)
+            except redis.RedisError as e:
+                logger.error(
+                    f"Erro ao atualizar rankings para lote de {len(applied)} eventos: {str(e)}")
+
+            await self.record_activity(
+                (user_id, created_at.date()) for user_id, _, _, created_at in applied)
+            await self._check_bulk_achievements(category_totals, deltas)
+
+        return PointsBulkResponse(
+            received=len(events),
+            applied=len(applied),
+            duplicates=len(events) - len(applied),
+            users=len({user_id for user_id, _ in deltas})
         )
 
     async def get_point_categories(self) -> List[str]:
@@ -318,23 +530,158 @@ class PointsService:
         """
         return self._valid_categories
 
-    async def _check_point_achievements(self, user_id: str, category: str, amount: int) -> None:
+    async def _points_detail(self, user_id: str) -> UserPointsDetail:
+        """
+        Monta os pontos atuais do usuário por categoria.
+
+        Args:
+            user_id: ID do usuário
+
+        Returns:
+            Total, pontos por categoria e última atualização
+        """
+        points = (await self.db.scalars(select(UserPoint).where(
+            UserPoint.user_id == user_id
+        ))).all()
+        total = sum(point.amount for point in points)
+
+        return UserPointsDetail(
+            user_id=user_id,
+            total_points=total,
+            categories=[
+                PointCategoryDetail(
+                    category=point.category,
+                    points=point.amount,
+                    percentage=round(point.amount * 100 / total, 2) if total else 0.0
+                ) for point in points
+            ],
+            last_updated=max(
+                (point.updated_at for point in points if point.updated_at),
+                default=datetime.utcnow()
+            )
+        )
+
+    async def _update_leaderboards(
+        self,
+        user_id: str,
+        category: str,
+        amount: int,
+        created_at: datetime
+    ) -> None:
+        """
+        Aplica a transação nos rankings do Redis.
+
+        Falhas no Redis não desfazem a transação de pontos; o ranking pode ser
+        reconstruído a partir do Postgres com scripts/rebuild_leaderboards.py.
+        """
+        try:
+            await self.leaderboards.record(user_id, category, amount, created_at)
+        except redis.RedisError as e:
+            logger.error(
+                f"Erro ao atualizar rankings para user_id={user_id}: {str(e)}")
+
+    async def record_activity(self, activities: Iterable[Tuple[str, date]]) -> None:
+        """
+        Marca os dias ativos no calendário e avalia conquistas de sequência.
+
+        Chamado a cada crédito de pontos e pela rota /activity/record, que
+        recebe de outros microsserviços as atividades sem pontos (estudo,
+        conversa com a IA, reflexão).
+
+        Args:
+            activities: Pares (user_id, dia da atividade)
+        """
+        try:
+            streaks = await self.activity.record_many(activities)
+        except redis.RedisError as e:
+            logger.error(f"Erro ao registrar atividade: {str(e)}")
+            return
+
+        events = [
+            (user_id, STREAK_CONDITION, current, current - 1, None)
+            for user_id, (current, grew) in streaks.items() if grew
+        ]
+        if not events:
+            return
+
+        try:
+            await self.achievements.evaluate_many(events)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(
+                f"Erro ao verificar conquistas de sequência: {str(e)}")
+
+    async def _check_bulk_achievements(
+        self,
+        category_totals: Dict[Tuple[str, str], int],
+        deltas: Dict[Tuple[str, str], int]
+    ) -> None:
+        """
+        Avalia as conquistas de pontos de um lote com uma única gravação.
+
+        Args:
+            category_totals: Total atual por (usuário, categoria)
+            deltas: Pontos adicionados no lote por (usuário, categoria)
+        """
+        try:
+            user_ids = {user_id for user_id, _ in deltas}
+            user_deltas: Dict[str, int] = {}
+            for (user_id, _), amount in deltas.items():
+                user_deltas[user_id] = user_deltas.get(user_id, 0) + amount
+
+            totals = (await self.db.execute(select(
+                UserPoint.user_id, func.sum(UserPoint.amount)
+            ).where(
+                UserPoint.user_id.in_(user_ids)
+            ).group_by(UserPoint.user_id))).all()
+
+            events = [
+                (user_id, POINTS_CONDITION, total, total - user_deltas[user_id], None)
+                for user_id, total in totals
+            ]
+            events.extend(
+                (user_id, POINTS_CONDITION, total,
+                 total - deltas[(user_id, category)], category)
+                for (user_id, category), total in category_totals.items()
+            )
+
+            await self.achievements.evaluate_many(events)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(
+                f"Erro ao verificar conquistas do lote de pontos: {str(e)}")
+
+    async def _check_point_achievements(
+        self,
+        user_id: str,
+        category: str,
+        category_total: int,
+        amount: int
+    ) -> None:
         """
-        Verifica e atualiza conquistas relacionadas a pontos.
+        Verifica e desbloqueia conquistas relacionadas a pontos.
 
-        Esta função é chamada internamente após ganho de pontos
-        para verificar se o usuário alcançou alguma nova conquista.
+        Esta função é chamada internamente após ganho de pontos. Apenas os
+        limiares cruzados por esta transação são avaliados, tanto no total
+        de pontos quanto na categoria.
 
         Args:
             user_id: ID do usuário
             category: Categoria dos pontos
-            amount: Quantidade total atual
+            category_total: Quantidade atual na categoria
+            amount: Pontos adicionados nesta transação
         """
-        # Esta é uma implementação inicial simplificada
-        # Em uma versão mais completa, verificaria conquistas no banco de dados
-        # Para simplificar, estamos apenas logando a verificação por enquanto
-        print(
-            f"Verificando conquistas para user_id={user_id}, categoria={category}, total={amount}")
-
-        # TODO: Implementar integração com o serviço de conquistas
-        pass
+        try:
+            total = await self.db.scalar(select(func.sum(UserPoint.amount)).where(
+                UserPoint.user_id == user_id
+            )) or 0
+
+            await self.achievements.evaluate_many([
+                (user_id, POINTS_CONDITION, total, total - amount, None),
+                (user_id, POINTS_CONDITION, category_total,
+                 category_total - amount, category)
+            ])
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.error(
+                f"Erro ao verificar conquistas para user_id={user_id}: {str(e)}")
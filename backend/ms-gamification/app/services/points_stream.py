@@ -0,0 +1,175 @@
+import logging
+import socket
+from typing import Dict, List, Optional, Tuple
+
+import redis.asyncio
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.db.redis import get_redis
+from app.db.async_session import WriteSessionLocal
+from app.schemas.gamification import PointEvent
+from app.services.points_service import PointsService
+
+logger = logging.getLogger(__name__)
+
+
+class PointsStreamConsumer:
+    """
+    Consome eventos de pontos de um Redis stream em lotes.
+
+    Outros microsserviços publicam eventos com XADD (campos do `PointEvent`,
+    ou um campo `event` com o JSON completo). Cada leitura do grupo de
+    consumidores vira uma chamada a `PointsService.apply_point_events`, e as
+    mensagens só recebem XACK após o commit; em caso de falha elas ficam
+    pendentes e são reprocessadas no próximo início do consumidor. A chave de
+    idempotência garante que o reprocessamento não credita pontos duas vezes.
+
+    Mensagens inválidas são copiadas para `{stream}:dead` e confirmadas.
+
+    O consumidor roda em um processo próprio; as leituras do stream usam o
+    cliente assíncrono e XREADGROUP BLOCK apenas suspende a corrotina.
+    """
+
+    def __init__(
+        self,
+        client: Optional[redis.asyncio.Redis] = None,
+        stream: str = settings.POINTS_STREAM,
+        group: str = settings.POINTS_STREAM_GROUP,
+        consumer: Optional[str] = None,
+        batch_size: int = 500,
+        block_ms: int = 5000
+    ):
+        self.redis = client or get_redis()
+        self.stream = stream
+        self.group = group
+        self.consumer = consumer or socket.gethostname()
+        self.batch_size = min(batch_size, settings.POINTS_BULK_MAX_EVENTS)
+        self.block_ms = block_ms
+        self.dead_letter = f"{stream}:dead"
+
+    async def ensure_group(self) -> None:
+        """Cria o grupo de consumidores (e o stream) se ainda não existirem."""
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def run(self, max_batches: Optional[int] = None) -> None:
+        """
+        Processa lotes até ser interrompido.
+
+        Args:
+            max_batches: Encerra após este número de lotes (None = sem limite)
+        """
+        await self.ensure_group()
+
+        # Primeiro as mensagens pendentes deste consumidor, depois as novas
+        pending = True
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            messages = await self._read("0" if pending else ">")
+            if pending and not messages:
+                pending = False
+                continue
+            if messages:
+                await self.process(messages)
+                batches += 1
+
+    async def _read(self, last_id: str) -> List[Tuple[str, Dict[str, str]]]:
+        response = await self.redis.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: last_id},
+            count=self.batch_size,
+            block=None if last_id == "0" else self.block_ms
+        )
+        if not response:
+            return []
+        return response[0][1]
+
+    async def process(self, messages: List[Tuple[str, Dict[str, str]]]) -> None:
+        """
+        Aplica um lote de mensagens e confirma as processadas.
+
+        Args:
+            messages: Pares (message_id, campos) lidos do stream
+        """
+        events: List[PointEvent] = []
+        event_ids: List[str] = []
+        dead: List[Tuple[str, Dict[str, str], str]] = []
+
+        for message_id, fields in messages:
+            try:
+                events.append(self._parse(fields))
+                event_ids.append(message_id)
+            except (ValidationError, ValueError) as e:
+                dead.append((message_id, fields, str(e)))
+
+        if events:
+            db = WriteSessionLocal()
+            try:
+                result = await PointsService(db).apply_point_events(events)
+                logger.info(
+                    f"Lote do stream {self.stream}: {result.applied} aplicados, "
+                    f"{result.duplicates} duplicados")
+            except ValueError:
+                # Um evento inválido invalida o lote; reaplica um a um para isolá-lo
+                await db.rollback()
+                await self._apply_individually(db, events, event_ids, dead)
+            except SQLAlchemyError:
+                await db.rollback()
+                logger.exception(
+                    f"Erro ao aplicar lote do stream {self.stream}; mensagens ficam pendentes")
+                return
+            finally:
+                await db.close()
+
+        pipe = self.redis.pipeline(transaction=False)
+        for message_id, fields, error in dead:
+            logger.warning(f"Evento de pontos inválido {message_id}: {error}")
+            pipe.xadd(self.dead_letter, {**fields, "error": error, "source_id": message_id})
+        pipe.xack(self.stream, self.group, *[m[0] for m in messages])
+        await pipe.execute()
+
+    async def _apply_individually(
+        self,
+        db,
+        events: List[PointEvent],
+        event_ids: List[str],
+        dead: List[Tuple[str, Dict[str, str], str]]
+    ) -> None:
+        service = PointsService(db)
+        for message_id, event in zip(event_ids, events):
+            try:
+                await service.apply_point_events([event])
+            except ValueError as e:
+                await db.rollback()
+                fields = {
+                    key: str(value)
+                    for key, value in event.model_dump(mode="json").items()
+                    if value is not None
+                }
+                dead.append((message_id, fields, str(e)))
+
+    @staticmethod
+    def _parse(fields: Dict[str, str]) -> PointEvent:
+        if "event" in fields:
+            return PointEvent.model_validate_json(fields["event"])
+        return PointEvent.model_validate(fields)
+
+
+async def publish_point_event(
+    event: PointEvent,
+    client: Optional[redis.asyncio.Redis] = None
+) -> str:
+    """
+    Publica um evento de pontos no stream de ingestão.
+
+    Returns:
+        ID da mensagem no stream
+    """
+    client = client or get_redis()
+    return await client.xadd(settings.POINTS_STREAM, {"event": event.model_dump_json()})
@@ -0,0 +1,178 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.db.async_session import set_statement_timeout
+from app.models.user_point import UserPoint
+from app.models.user_points_daily import UserPointsDaily
+from app.services.leaderboard_store import LeaderboardStore, period_start
+
+logger = logging.getLogger(__name__)
+
+# Executado atomicamente no Redis: posição, pontuação, total e a janela de
+# vizinhos em uma única ida ao servidor. Todas as operações são O(log n + K).
+_RANK_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local member = ARGV[1]
+local k = tonumber(ARGV[2])
+
+local total = redis.call('ZCARD', key)
+local score = redis.call('ZSCORE', key, member)
+local index = redis.call('ZREVRANK', key, member)
+
+local ahead
+if score then
+    ahead = redis.call('ZCOUNT', key, '(' .. score, '+inf')
+else
+    score = '0'
+    ahead = redis.call('ZCOUNT', key, '(0', '+inf')
+end
+
+local start, stop
+if index then
+    start = math.max(index - k, 0)
+    stop = index + k
+else
+    index = -1
+    start = math.max(ahead - k, 0)
+    stop = ahead + k - 1
+end
+
+local window = {}
+if stop >= start then
+    window = redis.call('ZREVRANGE', key, start, stop, 'WITHSCORES')
+end
+
+return {index, score, total, ahead, start, window}
+"""
+
+
+class RankService:
+    """
+    Posição do usuário e vizinhos no ranking a partir dos sorted sets.
+
+    Uma consulta responde posição, pontuação, total de participantes e os K
+    usuários acima e abaixo com um único script Lua (ZREVRANK, ZCOUNT e
+    ZREVRANGE em torno da posição), independente do número de usuários.
+
+    Consistência com o histórico de pontos: o Postgres é a fonte da verdade e
+    o Redis é atualizado após o commit. As consultas leem apenas o Redis; as
+    divergências são corrigidas por `reconcile` (scripts/reconcile_leaderboards.py),
+    que lê o banco de escrita. A consulta não corrige o sorted set: a leitura
+    pode vir de uma réplica atrasada e um ZADD concorrente com o ZINCRBY de um
+    crédito descartaria pontos.
+    """
+
+    def __init__(self, db: AsyncSession, store: Optional[LeaderboardStore] = None):
+        self.db = db
+        self.store = store or LeaderboardStore()
+        self._script = self.store.redis.register_script(_RANK_WINDOW_SCRIPT)
+
+    async def get_rank(
+        self,
+        user_id: str,
+        period: str = "all_time",
+        category: Optional[str] = None,
+        window: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Obtém a posição do usuário e seus vizinhos no ranking.
+
+        Args:
+            user_id: ID do usuário
+            period: Período (daily, weekly, monthly, all_time)
+            category: Categoria ou None para o total
+            window: Quantidade de vizinhos acima e abaixo
+
+        Returns:
+            Dicionário com rank, points, total, above e below. `above` está em
+            ordem decrescente de pontos terminando no vizinho imediato, e
+            `below` começa no vizinho imediato.
+        """
+        return await self._run(self.store.key(period, category), user_id, window)
+
+    async def _run(self, key: str, user_id: str, window: int) -> Dict[str, Any]:
+        index, score, total, ahead, start, members = await self._script(
+            keys=[key], args=[user_id, window])
+
+        neighbours = [
+            {"user_id": members[i], "points": int(float(members[i + 1])),
+             "position": start + i // 2 + 1}
+            for i in range(0, len(members), 2)
+        ]
+
+        if index >= 0:
+            above = [n for n in neighbours if n["position"] <= index]
+            below = [n for n in neighbours if n["position"] > index + 1]
+        else:
+            above = [n for n in neighbours if n["position"] <= ahead]
+            below = [n for n in neighbours if n["position"] > ahead]
+
+        return {
+            "user_id": user_id,
+            "rank": ahead + 1,
+            "points": int(float(score)),
+            "total": total,
+            "above": above,
+            "below": below
+        }
+
+    async def reconcile(self, period: str = "all_time") -> Dict[str, int]:
+        """
+        Compara todos os rankings do período com o banco e corrige divergências.
+
+        Returns:
+            Número de usuários corrigidos por chave
+        """
+        store = self.store
+        from_date = period_start(period, datetime.utcnow())
+
+        if from_date is None:
+            query = select(
+                UserPoint.user_id, UserPoint.category, func.sum(UserPoint.amount)
+            ).group_by(UserPoint.user_id, UserPoint.category)
+        else:
+            query = select(
+                UserPointsDaily.user_id, UserPointsDaily.category, func.sum(UserPointsDaily.points)
+            ).where(
+                UserPointsDaily.day >= from_date.date()
+            ).group_by(UserPointsDaily.user_id, UserPointsDaily.category)
+
+        await set_statement_timeout(self.db, "aggregate")
+        rows = (await self.db.execute(query)).all()
+
+        expected: Dict[str, Dict[str, int]] = {}
+        for user_id, category, points in rows:
+            for cat in (category, None):
+                members = expected.setdefault(store.key(period, cat), {})
+                members[user_id] = members.get(user_id, 0) + int(points or 0)
+
+        fixed: Dict[str, int] = {}
+        for key, members in expected.items():
+            actual = {
+                user_id: int(score)
+                async for user_id, score in store.redis.zscan_iter(key)
+            }
+            drift = {
+                user_id: points for user_id, points in members.items()
+                if actual.get(user_id) != points
+            }
+            stale = [user_id for user_id in actual if user_id not in members]
+
+            pipe = store.redis.pipeline(transaction=False)
+            if drift:
+                pipe.zadd(key, drift)
+            if stale:
+                pipe.zrem(key, *stale)
+            await pipe.execute()
+
+            if drift or stale:
+                fixed[key] = len(drift) + len(stale)
+                logger.warning(
+                    f"Ranking {key} reconciliado: {fixed[key]} usuários corrigidos")
+
+        return fixed
@@ -0,0 +1,215 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import cast, Date, event, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.db.async_session import set_statement_timeout
+from app.models.point_history import PointHistory
+from app.models.user_points_daily import UserPointsDaily
+
+logger = logging.getLogger(__name__)
+
+
+def upsert_daily_points(
+    session: Session,
+    rows: Dict[Tuple[str, str, date], Tuple[int, int]]
+) -> None:
+    """
+    Soma pontos e transações nas linhas diárias com um único INSERT ... ON CONFLICT.
+
+    `rows` mapeia (user_id, categoria, dia) para (pontos, transações).
+
+    Recebe a sessão síncrona: é chamada pelo listener de flush e, a partir de
+    uma AsyncSession, via `await db.run_sync(upsert_daily_points, rows)`.
+    """
+    stmt = insert(UserPointsDaily).values([
+        {"user_id": user_id, "category": category, "day": day,
+         "points": points, "events": events}
+        for (user_id, category, day), (points, events) in rows.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserPointsDaily.user_id,
+                        UserPointsDaily.category, UserPointsDaily.day],
+        set_={
+            "points": UserPointsDaily.points + stmt.excluded.points,
+            "events": UserPointsDaily.events + stmt.excluded.events
+        }
+    )
+    session.connection().execute(stmt)
+
+
+@event.listens_for(Session, "after_flush")
+def _rollup_point_history(session: Session, flush_context) -> None:
+    """
+    Mantém user_points_daily a partir dos registros de point_history do flush.
+
+    Todas as transações inseridas no mesmo flush são agregadas por
+    (usuário, categoria, dia) e gravadas em uma única instrução, dentro da
+    mesma transação do histórico.
+    """
+    rows: Dict[Tuple[str, str, date], Tuple[int, int]] = {}
+    for obj in session.new:
+        if isinstance(obj, PointHistory):
+            day = (obj.created_at or datetime.utcnow()).date()
+            key = (obj.user_id, obj.category, day)
+            points, events = rows.get(key, (0, 0))
+            rows[key] = (points + obj.amount, events + 1)
+
+    if rows:
+        upsert_daily_points(session, rows)
+
+
+class RollupService:
+    """Consultas e manutenção do rollup diário de pontos"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_period_points(
+        self,
+        user_id: str,
+        from_date: date,
+        category: Optional[str] = None
+    ) -> int:
+        """
+        Soma os pontos do usuário a partir de uma data.
+
+        Args:
+            user_id: ID do usuário
+            from_date: Primeiro dia do período
+            category: Categoria específica ou None para total
+
+        Returns:
+            Total de pontos no período
+        """
+        query = select(func.sum(UserPointsDaily.points)).where(
+            UserPointsDaily.user_id == user_id,
+            UserPointsDaily.day >= from_date
+        )
+        if category:
+            query = query.where(UserPointsDaily.category == category)
+
+        return int(await self.db.scalar(query) or 0)
+
+    async def count_events(
+        self,
+        user_id: str,
+        from_date: Optional[date] = None,
+        category: Optional[str] = None
+    ) -> int:
+        """
+        Número de transações do usuário segundo o rollup.
+
+        Soma no máximo uma linha por dia e categoria, em vez de contar o
+        histórico; o valor pode diferir do histórico enquanto um backfill ou
+        um arquivamento de partições estiver em andamento.
+
+        Args:
+            user_id: ID do usuário
+            from_date: Primeiro dia considerado (None para todo o rollup)
+            category: Categoria específica ou None para total
+
+        Returns:
+            Total aproximado de transações
+        """
+        query = select(func.sum(UserPointsDaily.events)).where(
+            UserPointsDaily.user_id == user_id)
+        if from_date:
+            query = query.where(UserPointsDaily.day >= from_date)
+        if category:
+            query = query.where(UserPointsDaily.category == category)
+
+        return int(await self.db.scalar(query) or 0)
+
+    async def get_daily_points(
+        self,
+        user_id: str,
+        from_date: date,
+        to_date: Optional[date] = None
+    ) -> Dict[date, int]:
+        """
+        Pontos do usuário por dia (todas as categorias) em um intervalo.
+
+        Returns:
+            Dicionário dia -> pontos (dias sem atividade são omitidos)
+        """
+        query = select(
+            UserPointsDaily.day,
+            func.sum(UserPointsDaily.points)
+        ).where(
+            UserPointsDaily.user_id == user_id,
+            UserPointsDaily.day >= from_date
+        )
+        if to_date:
+            query = query.where(UserPointsDaily.day <= to_date)
+
+        result = await self.db.execute(query.group_by(UserPointsDaily.day))
+        return {day: int(points) for day, points in result.all()}
+
+    async def backfill(
+        self,
+        since: Optional[date] = None,
+        chunk_days: int = 31
+    ) -> int:
+        """
+        Recalcula o rollup a partir do histórico de pontos.
+
+        Processa o histórico em janelas de `chunk_days` dias, cada uma com um
+        INSERT ... SELECT idempotente (os valores são substituídos, não somados),
+        e faz commit ao final de cada janela.
+
+        Args:
+            since: Primeiro dia a recalcular (padrão: início do histórico)
+            chunk_days: Tamanho de cada janela em dias
+
+        Returns:
+            Número de janelas processadas
+        """
+        if since is None:
+            first = await self.db.scalar(select(func.min(PointHistory.created_at)))
+            if first is None:
+                return 0
+            since = first.date()
+
+        today = datetime.utcnow().date()
+        start = since
+        windows = 0
+
+        while start <= today:
+            end = start + timedelta(days=chunk_days)
+            day = cast(PointHistory.created_at, Date)
+
+            source = select(
+                PointHistory.user_id,
+                PointHistory.category,
+                day,
+                func.sum(PointHistory.amount),
+                func.count()
+            ).where(
+                PointHistory.created_at >= start,
+                PointHistory.created_at < end
+            ).group_by(PointHistory.user_id, PointHistory.category, day)
+
+            stmt = insert(UserPointsDaily).from_select(
+                ["user_id", "category", "day", "points", "events"], source)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[UserPointsDaily.user_id,
+                                UserPointsDaily.category, UserPointsDaily.day],
+                set_={"points": stmt.excluded.points,
+                      "events": stmt.excluded.events}
+            )
+
+            await set_statement_timeout(self.db, "maintenance")
+            await self.db.execute(stmt)
+            await self.db.commit()
+            windows += 1
+            logger.info(f"Rollup diário recalculado de {start} até {end}")
+
+            start = end
+
+        return windows
@@ -10,12 +10,17 @@ from fastapi import FastAPI, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.config import settings
 from app.api.v1.api import api_router
-from app.db.session import engine, SessionLocal
+from app.db.async_session import dispose_engines, read_engine, write_engine
+from app.db.partitions import ensure_partitions, is_partitioned
+from app.db.redis import close_redis
+from app.db.session import engine
 from app.db.base import Base
+from app.services import rollup_service  # noqa: F401 - mantém user_points_daily a cada flush
 
 # Configuração de logging
 logging.basicConfig(
@@ -27,6 +32,15 @@ logger = logging.getLogger("ms-gamification")
 # Criar tabelas no banco de dados
 Base.metadata.create_all(bind=engine)
 
+# Garantir as partições mensais do histórico de pontos (bancos anteriores ao
+# particionamento precisam da migração: alembic upgrade head)
+with engine.begin() as connection:
+    if is_partitioned(connection):
+        ensure_partitions(connection, settings.POINT_HISTORY_PARTITIONS_AHEAD)
+    else:
+        logger.warning(
+            "point_history não é particionada; execute 'alembic upgrade head'")
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="API para gerenciamento de gamificação do FaleComJesus",
@@ -51,6 +65,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    # Fecha as conexões dos pools assíncronos de leitura e escrita
+    await dispose_engines()
+    await close_redis()
+
 # Middleware para logging de requisições
 
 
@@ -132,9 +153,9 @@ async def db_health_check() -> Dict[str, Any]:
     Endpoint para verificar a saúde da conexão com o banco de dados
     """
     try:
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
+        for pool in (write_engine, read_engine):
+            async with pool.connect() as connection:
+                await connection.execute(text("SELECT 1"))
         return {
             "status": "healthy",
             "database": "connected",
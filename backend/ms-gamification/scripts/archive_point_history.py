@@ -0,0 +1,85 @@
+"""
+Arquiva o histórico de pontos: desanexa as partições mensais mais antigas que a
+retenção, remove as chaves de idempotência do mesmo período e cria as
+partições dos próximos meses.
+
+As partições desanexadas continuam no banco como tabelas point_history_AAAA_MM
+(para exportação com pg_dump) a menos que --drop seja informado. Rankings e
+totais não mudam: user_points e user_points_daily não dependem do histórico.
+
+Uso (a partir da raiz do ms-gamification):
+    python -m scripts.archive_point_history
+    python -m scripts.archive_point_history --retention-months 12 --drop
+    python -m scripts.archive_point_history --dry-run
+"""
+import argparse
+import sys
+from datetime import date
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.partitions import (
+    add_months,
+    detach_partitions,
+    ensure_partitions,
+    is_partitioned,
+    list_partitions,
+    month_start
+)
+from app.db.session import engine
+
+
+def archive_point_history(retention_months, months_ahead, drop, dry_run):
+    """Desanexa partições antigas e garante as partições futuras"""
+    cutoff = add_months(month_start(date.today()), -retention_months)
+
+    try:
+        with engine.begin() as connection:
+            if not is_partitioned(connection):
+                print("point_history não é particionada; execute 'alembic upgrade head'")
+                sys.exit(1)
+
+            if dry_run:
+                for name, month in list_partitions(connection):
+                    if month < cutoff:
+                        print(f"{name} seria {'removida' if drop else 'desanexada'}")
+                return
+
+            detached = detach_partitions(connection, cutoff, drop)
+
+        with engine.begin() as connection:
+            connection.execute(text(
+                f"SET LOCAL statement_timeout = {settings.DB_TIMEOUT_MAINTENANCE_MS}"))
+            keys = connection.execute(
+                text("DELETE FROM point_event_keys WHERE created_at < :cutoff"),
+                {"cutoff": cutoff}
+            ).rowcount
+
+        with engine.begin() as connection:
+            created = ensure_partitions(connection, months_ahead)
+
+        print(f"{len(detached)} partições anteriores a {cutoff} arquivadas")
+        print(f"{keys} chaves de idempotência removidas")
+        print(f"Partições garantidas até {created[-1]}")
+    except Exception as e:
+        print(f"Erro ao arquivar histórico de pontos: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--retention-months", type=int,
+                        default=settings.POINT_HISTORY_RETENTION_MONTHS,
+                        help="Meses mantidos na tabela (padrão: POINT_HISTORY_RETENTION_MONTHS)")
+    parser.add_argument("--months-ahead", type=int,
+                        default=settings.POINT_HISTORY_PARTITIONS_AHEAD,
+                        help="Partições futuras a criar (padrão: POINT_HISTORY_PARTITIONS_AHEAD)")
+    parser.add_argument("--drop", action="store_true",
+                        help="Remove as partições em vez de apenas desanexá-las")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Apenas lista as partições que seriam arquivadas")
+    args = parser.parse_args()
+
+    archive_point_history(args.retention_months, args.months_ahead,
+                          args.drop, args.dry_run)
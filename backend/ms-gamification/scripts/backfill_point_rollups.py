@@ -0,0 +1,41 @@
+"""
+Recalcula a tabela user_points_daily a partir do histórico de pontos.
+
+Uso (a partir da raiz do ms-gamification):
+    python -m scripts.backfill_point_rollups
+    python -m scripts.backfill_point_rollups --since 2024-01-01
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date
+
+from app.db.async_session import WriteSessionLocal, dispose_engines
+from app.services.rollup_service import RollupService
+
+
+async def backfill_point_rollups(since, chunk_days):
+    """Preenche o rollup diário a partir de uma data (ou de todo o histórico)"""
+    db = WriteSessionLocal()
+    try:
+        windows = await RollupService(db).backfill(since, chunk_days)
+        print(f"{windows} janelas de {chunk_days} dias processadas")
+        print("Rollup diário recalculado com sucesso!")
+    except Exception as e:
+        await db.rollback()
+        print(f"Erro ao recalcular rollup diário: {str(e)}")
+        sys.exit(1)
+    finally:
+        await db.close()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--since", type=date.fromisoformat,
+                        help="Primeiro dia a recalcular (AAAA-MM-DD)")
+    parser.add_argument("--chunk-days", type=int, default=31,
+                        help="Dias processados por transação (padrão: 31)")
+    args = parser.parse_args()
+
+    asyncio.run(backfill_point_rollups(args.since, args.chunk_days))
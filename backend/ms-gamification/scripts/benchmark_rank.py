@@ -0,0 +1,75 @@
+"""
+Benchmark da consulta de posição e vizinhos (RankService) no Redis.
+
+Popula um sorted set temporário com N usuários, executa consultas de posição
+com janela de K vizinhos para usuários aleatórios e imprime as latências.
+Não acessa o Postgres. A chave temporária é removida ao final.
+
+Uso (a partir da raiz do ms-gamification):
+    python -m scripts.benchmark_rank --users 1000000 --queries 5000 --window 5
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+from app.db.redis import get_redis
+from app.services.leaderboard_store import LeaderboardStore
+from app.services.rank_service import RankService
+
+
+class BenchmarkStore(LeaderboardStore):
+    """Direciona todas as chaves para um sorted set temporário"""
+
+    def __init__(self, key: str):
+        super().__init__(get_redis())
+        self._key = key
+
+    def key(self, period, category=None, at=None):
+        return self._key
+
+
+async def populate(store: BenchmarkStore, users: int, chunk_size: int = 50000) -> None:
+    for start in range(0, users, chunk_size):
+        stop = min(start + chunk_size, users)
+        await store.redis.zadd(store._key, {
+            f"user-{i}": random.randint(0, 100000) for i in range(start, stop)
+        })
+
+
+async def run(users: int, queries: int, window: int) -> None:
+    key = f"leaderboard:benchmark:{uuid.uuid4()}"
+    store = BenchmarkStore(key)
+    service = RankService(db=None, store=store)
+
+    try:
+        started = time.perf_counter()
+        await populate(store, users)
+        print(f"{users} usuários carregados em {time.perf_counter() - started:.1f}s")
+
+        latencies = []
+        for _ in range(queries):
+            user_id = f"user-{random.randrange(users)}"
+            t0 = time.perf_counter()
+            await service.get_rank(user_id, window=window)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+        latencies.sort()
+        print(f"consultas: {queries} | janela: {window}")
+        print(f"p50: {statistics.median(latencies):.3f}ms")
+        print(f"p99: {latencies[int(len(latencies) * 0.99) - 1]:.3f}ms")
+        print(f"máx: {latencies[-1]:.3f}ms")
+    finally:
+        await store.redis.delete(key)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--window", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(run(args.users, args.queries, args.window))
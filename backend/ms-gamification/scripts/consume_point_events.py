@@ -0,0 +1,43 @@
+"""
+Consome eventos de pontos do Redis stream de ingestão em lotes.
+
+Uso (a partir da raiz do ms-gamification):
+    python -m scripts.consume_point_events
+    python -m scripts.consume_point_events --batch-size 1000 --consumer worker-2
+"""
+import argparse
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.services.points_stream import PointsStreamConsumer
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stream", default=settings.POINTS_STREAM,
+                        help="Nome do stream (padrão: POINTS_STREAM)")
+    parser.add_argument("--group", default=settings.POINTS_STREAM_GROUP,
+                        help="Grupo de consumidores (padrão: POINTS_STREAM_GROUP)")
+    parser.add_argument("--consumer", default=None,
+                        help="Nome deste consumidor (padrão: hostname)")
+    parser.add_argument("--batch-size", type=int, default=500,
+                        help="Mensagens por lote (padrão: 500)")
+    parser.add_argument("--block-ms", type=int, default=5000,
+                        help="Espera máxima por novas mensagens em ms (padrão: 5000)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    consumer = PointsStreamConsumer(
+        stream=args.stream,
+        group=args.group,
+        consumer=args.consumer,
+        batch_size=args.batch_size,
+        block_ms=args.block_ms
+    )
+    print(f"Consumindo {args.stream} (grupo {args.group})...")
+    try:
+        asyncio.run(consumer.run())
+    except KeyboardInterrupt:
+        print("Consumidor encerrado")
@@ -0,0 +1,57 @@
+"""
+Publica os snapshots do ranking (primeiras páginas de cada período e
+categoria) no Redis.
+
+As rotas /leaderboard/snapshot republicam sob demanda quando o snapshot
+vence; rodar este script em loop mantém as versões sempre prontas, de modo
+que nenhuma requisição paga pela serialização.
+
+Uso (a partir da raiz do ms-gamification):
+    python -m scripts.publish_leaderboard_snapshots --once
+    python -m scripts.publish_leaderboard_snapshots --interval 10
+    python -m scripts.publish_leaderboard_snapshots --period daily --period weekly
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.config import settings
+from app.services.leaderboard_snapshots import LeaderboardSnapshots
+from app.services.leaderboard_store import PERIODS
+
+
+async def publish_leaderboard_snapshots(periods, interval, once):
+    """Publica os snapshots a cada `interval` segundos"""
+    snapshots = LeaderboardSnapshots()
+    versions = {}
+    try:
+        while True:
+            for period, category, version in await snapshots.publish_all(periods):
+                key = (period, category)
+                if versions.get(key) != version:
+                    print(f"{period}/{category or 'total'}: versão {version}")
+                    versions[key] = version
+            if once:
+                break
+            await asyncio.sleep(interval)
+    except Exception as e:
+        print(f"Erro ao publicar snapshots do ranking: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--period", action="append", choices=PERIODS,
+                        help="Período a publicar (padrão: todos)")
+    parser.add_argument("--interval", type=int,
+                        default=settings.LEADERBOARD_SNAPSHOT_INTERVAL,
+                        help="Segundos entre publicações (padrão: LEADERBOARD_SNAPSHOT_INTERVAL)")
+    parser.add_argument("--once", action="store_true",
+                        help="Publica uma vez e encerra")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(publish_leaderboard_snapshots(
+            args.period or PERIODS, args.interval, args.once))
+    except KeyboardInterrupt:
+        pass
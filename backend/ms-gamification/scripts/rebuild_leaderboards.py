@@ -0,0 +1,38 @@
+"""
+Reconstrói os rankings do Redis a partir do Postgres.
+
+Uso (a partir da raiz do ms-gamification):
+    python -m scripts.rebuild_leaderboards
+    python -m scripts.rebuild_leaderboards --period weekly --period monthly
+"""
+import argparse
+import asyncio
+import sys
+
+from app.db.async_session import WriteSessionLocal, dispose_engines
+from app.services.leaderboard_store import LeaderboardStore, PERIODS
+
+
+async def rebuild_leaderboards(periods):
+    """Reconstrói os sorted sets dos períodos informados"""
+    db = WriteSessionLocal()
+    try:
+        written = await LeaderboardStore().rebuild(db, periods)
+        for key, members in sorted(written.items()):
+            print(f"{key}: {members} usuários")
+        print("Rankings reconstruídos com sucesso!")
+    except Exception as e:
+        print(f"Erro ao reconstruir rankings: {str(e)}")
+        sys.exit(1)
+    finally:
+        await db.close()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--period", action="append", choices=PERIODS,
+                        help="Período a reconstruir (padrão: todos)")
+    args = parser.parse_args()
+
+    asyncio.run(rebuild_leaderboards(args.period or PERIODS))
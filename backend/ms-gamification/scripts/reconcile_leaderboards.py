@@ -0,0 +1,41 @@
+"""
+Confere os rankings do Redis com o histórico de pontos do Postgres e corrige
+divergências (por exemplo, quando o Redis falhou após o commit de pontos).
+
+Uso (a partir da raiz do ms-gamification):
+    python -m scripts.reconcile_leaderboards
+    python -m scripts.reconcile_leaderboards --period daily
+"""
+import argparse
+import asyncio
+import sys
+
+from app.db.async_session import WriteSessionLocal, dispose_engines
+from app.services.leaderboard_store import PERIODS
+from app.services.rank_service import RankService
+
+
+async def reconcile_leaderboards(periods):
+    """Reconcilia os rankings dos períodos informados"""
+    db = WriteSessionLocal()
+    try:
+        service = RankService(db)
+        for period in periods:
+            fixed = await service.reconcile(period)
+            total = sum(fixed.values())
+            print(f"{period}: {total} usuários corrigidos em {len(fixed)} chaves")
+    except Exception as e:
+        print(f"Erro ao reconciliar rankings: {str(e)}")
+        sys.exit(1)
+    finally:
+        await db.close()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--period", action="append", choices=PERIODS,
+                        help="Período a reconciliar (padrão: todos)")
+    args = parser.parse_args()
+
+    asyncio.run(reconcile_leaderboards(args.period or PERIODS))
@@ -0,0 +1,49 @@
+"""
+Persiste no Postgres os calendários de atividade mantidos no Redis.
+
+Uso (a partir da raiz do ms-gamification):
+    python -m scripts.sync_activity_bitmaps
+    python -m scripts.sync_activity_bitmaps --repair
+"""
+import argparse
+import asyncio
+import sys
+
+from app.db.async_session import WriteSessionLocal, dispose_engines
+from app.services.activity_calendar import ActivityCalendar
+
+
+async def sync_activity_bitmaps(repair, chunk_size):
+    """Grava os bitmaps em user_activity, opcionalmente recalculando as sequências"""
+    db = WriteSessionLocal()
+    activity = ActivityCalendar()
+    try:
+        chunk = []
+        saved = 0
+        async for user_id in activity.iter_user_ids():
+            if repair:
+                await activity.repair(user_id)
+            chunk.append(user_id)
+            if len(chunk) >= chunk_size:
+                saved += await activity.save(db, chunk)
+                chunk = []
+        saved += await activity.save(db, chunk)
+        print(f"{saved} calendários de atividade gravados")
+    except Exception as e:
+        await db.rollback()
+        print(f"Erro ao gravar calendários de atividade: {str(e)}")
+        sys.exit(1)
+    finally:
+        await db.close()
+        await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repair", action="store_true",
+                        help="Recalcula as sequências a partir dos bitmaps")
+    parser.add_argument("--chunk-size", type=int, default=1000,
+                        help="Usuários gravados por transação (padrão: 1000)")
+    args = parser.parse_args()
+
+    asyncio.run(sync_activity_bitmaps(args.repair, args.chunk_size))
@@ -0,0 +1,57 @@
+"""
+Configurações globais para testes do MS-Gamification.
+Este arquivo contém fixtures compartilhadas entre testes unitários e de integração.
+
+Os testes usam o fakeredis no lugar do Redis e uma sessão assíncrona
+simulada no lugar do Postgres; nenhum serviço externo é necessário.
+"""
+import os
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+import fakeredis
+import pytest
+
+# Adicionar o diretório raiz ao PYTHONPATH
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+# Define variáveis de ambiente para testes
+os.environ["ENVIRONMENT"] = "test"
+os.environ["JWT_SECRET_KEY"] = "test_secret_key"
+
+
+@pytest.fixture
+def redis_server() -> fakeredis.FakeServer:
+    """Servidor Redis em memória compartilhado pelos clientes do teste."""
+    return fakeredis.FakeServer()
+
+
+@pytest.fixture
+def redis_client(redis_server) -> fakeredis.FakeAsyncRedis:
+    """Cliente Redis assíncrono com decodificação (equivalente a get_redis)."""
+    return fakeredis.FakeAsyncRedis(server=redis_server, decode_responses=True)
+
+
+@pytest.fixture
+def binary_redis(redis_server) -> fakeredis.FakeAsyncRedis:
+    """Cliente Redis assíncrono sem decodificação (equivalente a get_binary_redis)."""
+    return fakeredis.FakeAsyncRedis(server=redis_server)
+
+
+@pytest.fixture
+def db() -> MagicMock:
+    """
+    Sessão assíncrona simulada.
+
+    Os objetos passados a `add` ficam em `db.added`; os métodos assíncronos
+    são AsyncMock e podem ter o retorno ajustado em cada teste.
+    """
+    session = MagicMock()
+    session.added = []
+    session.add = MagicMock(side_effect=session.added.append)
+    for name in ("execute", "scalar", "scalars", "commit", "rollback",
+                 "refresh", "flush", "run_sync", "close"):
+        setattr(session, name, AsyncMock())
+    return session
@@ -0,0 +1,60 @@
+"""
+Testes de integração para as rotas de atividade do MS-Gamification.
+"""
+from datetime import date
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1 import activity
+from app.dependencies import get_current_service, get_write_db
+from app.services import activity_calendar
+from app.services.achievement_engine import AchievementEngine
+from app.services.activity_calendar import ActivityCalendar
+
+
+@pytest.fixture
+async def client(db, binary_redis, monkeypatch) -> httpx.AsyncClient:
+    monkeypatch.setattr(activity_calendar, "get_binary_redis", lambda: binary_redis)
+    monkeypatch.setattr(AchievementEngine, "evaluate_many", AsyncMock())
+
+    app = FastAPI()
+    app.include_router(activity.router, prefix="/activity")
+    app.dependency_overrides[get_current_service] = lambda: {"id": "ms-study", "role": "service"}
+    app.dependency_overrides[get_write_db] = lambda: db
+    # Cliente ASGI no mesmo event loop do teste e do cliente Redis assíncrono
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.integration
+class TestRecordActivity:
+    """Testes para o registro de atividades sem pontos."""
+
+    async def test_record_marks_days_and_streak(self, client, binary_redis):
+        """Atividades entram no calendário e na sequência do usuário."""
+        response = await client.post("/activity/record", json={"events": [
+            {"user_id": "u1", "activity_type": "study", "occurred_at": "2024-05-16T10:00:00"},
+            {"user_id": "u1", "activity_type": "chat", "occurred_at": "2024-05-17T08:00:00"},
+            {"user_id": "u2", "activity_type": "reflection", "occurred_at": "2024-05-17T09:00:00"},
+        ]})
+
+        assert response.status_code == 200
+        assert response.json() == {"received": 3, "users": 2}
+
+        calendar = ActivityCalendar(binary_redis)
+        assert await calendar.get_month("u1", 2024, 5) == [16, 17]
+        streak = await calendar.get_streak("u1", today=date(2024, 5, 17))
+        assert streak["current_streak"] == 2
+        AchievementEngine.evaluate_many.assert_awaited_once()
+
+    async def test_unknown_activity_type_is_rejected(self, client):
+        """Tipos de atividade desconhecidos são recusados."""
+        response = await client.post("/activity/record", json={"events": [
+            {"user_id": "u1", "activity_type": "shopping"}
+        ]})
+
+        assert response.status_code == 422
@@ -0,0 +1,133 @@
+"""
+Testes de integração das migrações do Alembic contra um Postgres real.
+
+O banco começa com o esquema criado pelo create_all dos modelos anteriores
+à série de migrações e recebe `alembic upgrade head`. Requer
+TEST_DATABASE_URL apontando para um banco descartável; sem ela os testes
+são ignorados.
+"""
+import os
+import subprocess
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+ROOT = Path(__file__).parent.parent.parent
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL não definida")
+
+
+def baseline_metadata() -> sa.MetaData:
+    """Tabelas como o create_all dos modelos anteriores as criava."""
+    metadata = sa.MetaData()
+    sa.Table(
+        "user_points", metadata,
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", sa.String, nullable=False, index=True),
+        sa.Column("category", sa.String, nullable=False, index=True),
+        sa.Column("amount", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    sa.Table(
+        "point_history", metadata,
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", sa.String, nullable=False, index=True),
+        sa.Column("category", sa.String, nullable=False, index=True),
+        sa.Column("amount", sa.Integer, nullable=False),
+        sa.Column("action", sa.String, nullable=False),
+        sa.Column("description", sa.Text),
+        sa.Column("related_entity_id", sa.String),
+        sa.Column("created_at", sa.DateTime),
+    )
+    sa.Table(
+        "achievements", metadata,
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("code", sa.String, nullable=False, unique=True, index=True),
+        sa.Column("name", sa.String, nullable=False),
+        sa.Column("description", sa.Text, nullable=False),
+        sa.Column("category", sa.String, nullable=False, index=True),
+        sa.Column("difficulty", sa.String, nullable=False, index=True),
+        sa.Column("points_required", sa.Integer, nullable=False),
+        sa.Column("criteria", JSONB),
+        sa.Column("image_url", sa.String),
+        sa.Column("reward_points", sa.Integer, nullable=False),
+        sa.Column("is_hidden", sa.Boolean, nullable=False),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    sa.Table(
+        "user_achievements", metadata,
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", sa.String, nullable=False, index=True),
+        sa.Column("achievement_id", UUID(as_uuid=True),
+                  sa.ForeignKey("achievements.id"), nullable=False),
+        sa.Column("progress", sa.Float, nullable=False),
+        sa.Column("current_points", sa.Integer, nullable=False),
+        sa.Column("unlocked_at", sa.DateTime),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("updated_at", sa.DateTime),
+    )
+    return metadata
+
+
+@pytest.fixture
+def baseline_engine():
+    engine = sa.create_engine(TEST_DATABASE_URL)
+    with engine.begin() as conn:
+        conn.execute(sa.text("DROP SCHEMA public CASCADE"))
+        conn.execute(sa.text("CREATE SCHEMA public"))
+    metadata = baseline_metadata()
+    metadata.create_all(engine)
+    history = metadata.tables["point_history"]
+    with engine.begin() as conn:
+        conn.execute(history.insert(), [
+            {"id": uuid.uuid4(), "user_id": "user-1", "category": "estudo_diario",
+             "amount": amount, "action": "completar_estudo",
+             "created_at": datetime(2024, 5, 1, 10, minute)}
+            for minute, amount in enumerate((10, 20))
+        ])
+    yield engine
+    engine.dispose()
+
+
+def upgrade_head():
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", "head"],
+        cwd=ROOT, env={**os.environ, "DATABASE_URL": TEST_DATABASE_URL},
+        capture_output=True, text=True)
+
+
+@pytest.mark.integration
+class TestUpgradeFromBaseline:
+    """Testes de `alembic upgrade head` sobre o esquema dos modelos anteriores."""
+
+    def test_upgrade_head(self, baseline_engine):
+        """Testa a série completa de migrações e a cópia do histórico."""
+        result = upgrade_head()
+        assert result.returncode == 0, result.stderr
+
+        inspector = sa.inspect(baseline_engine)
+        columns = {c["name"] for c in inspector.get_columns("point_history")}
+        assert "idempotency_key" in columns
+        with baseline_engine.connect() as conn:
+            assert conn.execute(sa.text(
+                "SELECT relkind FROM pg_class WHERE relname = 'point_history'"
+            )).scalar() == "p"
+            assert conn.execute(sa.text(
+                "SELECT count(*) FROM point_history")).scalar() == 2
+            assert conn.execute(sa.text(
+                "SELECT points, events FROM user_points_daily "
+                "WHERE user_id = 'user-1' AND day = '2024-05-01'")).one() == (30, 2)
+
+    def test_upgrade_is_idempotent(self, baseline_engine):
+        """Testa se rodar a série de novo não falha."""
+        assert upgrade_head().returncode == 0
+        assert upgrade_head().returncode == 0
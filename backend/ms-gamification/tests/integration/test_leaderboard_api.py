@@ -0,0 +1,43 @@
+"""
+Testes de integração para as rotas de snapshot do ranking do MS-Gamification.
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.v1 import leaderboard
+from app.services import leaderboard_store
+
+
+@pytest.fixture
+async def client(redis_client, monkeypatch) -> httpx.AsyncClient:
+    monkeypatch.setattr(leaderboard_store, "get_redis", lambda: redis_client)
+
+    app = FastAPI()
+    app.include_router(leaderboard.router, prefix="/leaderboard")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.integration
+class TestLeaderboardSnapshotRoutes:
+    """Testes para a validação dos parâmetros das rotas de snapshot."""
+
+    async def test_known_category_is_published(self, client, redis_client):
+        """Categorias de pontos conhecidas servem o snapshot publicado."""
+        key = leaderboard_store.LeaderboardStore(redis_client).key("all_time", "estudo")
+        await redis_client.zadd(key, {"u1": 10})
+
+        response = await client.get("/leaderboard/snapshot", params={"category": "estudo"})
+
+        assert response.status_code == 200
+        assert response.json()["entries"][0]["user_id"] == "u1"
+
+    @pytest.mark.parametrize("path", ["/leaderboard/snapshot", "/leaderboard/snapshot/v1"])
+    async def test_unknown_category_is_rejected(self, client, redis_client, path):
+        """Categorias desconhecidas recebem 400 sem publicar chaves novas."""
+        response = await client.get(path, params={"category": "inexistente"})
+
+        assert response.status_code == 400
+        assert await redis_client.keys("leaderboard:snapshot:*") == []
@@ -0,0 +1,93 @@
+"""
+Testes unitários para o motor de regras de conquistas do MS-Gamification.
+"""
+import uuid
+from datetime import datetime
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.models.achievement import Achievement
+from app.services import achievement_engine
+from app.services.achievement_engine import AchievementEngine, AchievementRules
+
+
+def _achievement(code, points_required=0, condition_type="points",
+                 condition_value=0, criteria=None):
+    now = datetime(2024, 1, 1)
+    return Achievement(
+        id=uuid.uuid4(), code=code, name=code, description=code,
+        category="estudo", difficulty="facil", points_required=points_required,
+        condition_type=condition_type, condition_value=condition_value,
+        criteria=criteria, reward_points=0, is_hidden=False,
+        created_at=now, updated_at=now
+    )
+
+
+@pytest.fixture
+def rules() -> AchievementRules:
+    return AchievementRules([
+        _achievement("p100", points_required=100),
+        _achievement("p10", points_required=10),
+        _achievement("p50", points_required=50),
+        _achievement("quiz20", points_required=20,
+                     criteria={"points_category": "quiz"}),
+        _achievement("streak7", condition_type="days_streak", condition_value=7),
+    ])
+
+
+@pytest.mark.unit
+class TestAchievementRules:
+    """Testes para o catálogo compilado."""
+
+    def test_reached_returns_thresholds_in_order(self, rules):
+        """Sem valor anterior, retorna todos os limiares atingidos."""
+        reached = rules.reached("points", 60)
+        assert [rule.achievement.code for rule in reached] == ["p10", "p50"]
+
+    def test_reached_only_crossed_thresholds(self, rules):
+        """Com valor anterior, retorna apenas os limiares cruzados pelo evento."""
+        assert [r.achievement.code for r in rules.reached("points", 100, 50)] == ["p100"]
+        assert rules.reached("points", 49, 10) == []
+
+    def test_scope_and_condition_type(self, rules):
+        """Categoria de pontos e outras condições têm índices próprios."""
+        assert [r.achievement.code for r in rules.reached("points", 25, 0, "quiz")] == ["quiz20"]
+        assert [r.achievement.code for r in rules.reached("days_streak", 7, 6)] == ["streak7"]
+        assert rules.reached("chat_used", 100) == []
+
+    def test_get_accepts_string_ids(self, rules):
+        """A regra pode ser buscada pelo ID em texto."""
+        rule = rules.reached("points", 10)[0]
+        assert rules.get(str(rule.id)) is rule
+        assert rules.get("not-a-uuid") is None
+
+
+@pytest.mark.unit
+class TestAchievementEngine:
+    """Testes para a avaliação de eventos."""
+
+    async def test_evaluate_many_unlocks_in_one_statement(self, rules, db, monkeypatch):
+        """Todos os desbloqueios do lote vão em uma instrução; já desbloqueadas ficam de fora."""
+        published = []
+        monkeypatch.setattr(achievement_engine, "publish_unlocks", AsyncMock(side_effect=published.append))
+        p10 = rules.reached("points", 10)[0]
+        db.execute.return_value.all = lambda: [("u1", p10.id)]
+
+        engine = AchievementEngine(db, rules)
+        unlocked = await engine.evaluate_many([
+            ("u1", "points", 60, 0, None),
+            ("u2", "points", 5, 0, None),
+        ])
+
+        # SET LOCAL + um único INSERT ... ON CONFLICT
+        assert db.execute.await_count == 2
+        assert unlocked == {"u1": [p10]}
+        assert published == [{"u1": [p10.achievement]}]
+
+    async def test_no_threshold_reached_skips_database(self, rules, db):
+        """Evento sem limiar atingido não acessa o banco."""
+        engine = AchievementEngine(db, rules)
+
+        assert await engine.evaluate_many([("u1", "points", 9, 0, None)]) == {}
+        db.execute.assert_not_awaited()
@@ -0,0 +1,104 @@
+"""
+Testes unitários para o calendário de atividade do MS-Gamification.
+"""
+from datetime import date
+
+import pytest
+
+from app.services.activity_calendar import (
+    ActivityCalendar,
+    active_offsets,
+    day_offset,
+    streaks_from_bitmap
+)
+
+
+@pytest.mark.unit
+class TestBitmapHelpers:
+    """Testes para a leitura dos bitmaps no layout do Redis."""
+
+    def test_active_offsets_msb_first(self):
+        """O bit 0 é o mais significativo do primeiro byte."""
+        assert active_offsets(bytes([0b10100000, 0b00000001])) == [0, 2, 15]
+        assert active_offsets(bytes([0xFF]), start=3, stop=5) == [3, 4]
+
+    def test_streaks_from_bitmap(self):
+        """Recalcula a sequência final e a maior sequência."""
+        # dias 0-2, 4-5
+        assert streaks_from_bitmap(bytes([0b11101100])) == (2, 3, 5)
+        assert streaks_from_bitmap(b"") == (0, 0, -1)
+
+
+@pytest.mark.unit
+class TestActivityCalendar:
+    """Testes para o registro de atividade e sequências."""
+
+    async def test_consecutive_days_grow_streak(self, binary_redis):
+        """Dias consecutivos aumentam a sequência; um intervalo a reinicia."""
+        calendar = ActivityCalendar(binary_redis)
+
+        assert await calendar.record("u1", date(2024, 5, 1)) == (1, True)
+        assert await calendar.record("u1", date(2024, 5, 2)) == (2, True)
+        assert await calendar.record("u1", date(2024, 5, 2)) == (2, False)
+        assert await calendar.record("u1", date(2024, 5, 5)) == (1, True)
+
+        streak = await calendar.get_streak("u1", today=date(2024, 5, 6))
+        assert streak["current_streak"] == 1
+        assert streak["longest_streak"] == 2
+        assert streak["active_today"] is False
+
+    async def test_streak_expires_after_a_missed_day(self, binary_redis):
+        """A sequência atual zera se o último dia ativo foi antes de ontem."""
+        calendar = ActivityCalendar(binary_redis)
+        await calendar.record("u1", date(2024, 5, 1))
+
+        streak = await calendar.get_streak("u1", today=date(2024, 5, 3))
+        assert streak["current_streak"] == 0
+
+    async def test_record_many_in_one_batch(self, binary_redis):
+        """Várias atividades de um lote são aplicadas em ordem cronológica."""
+        calendar = ActivityCalendar(binary_redis)
+
+        result = await calendar.record_many([
+            ("u1", date(2024, 5, 3)), ("u1", date(2024, 5, 2)), ("u2", date(2024, 5, 2)),
+        ])
+
+        assert result == {"u1": (2, True), "u2": (1, True)}
+        assert await calendar.get_month("u1", 2024, 5) == [2, 3]
+        assert await binary_redis.getbit(calendar.bitmap_key("u2"), day_offset(date(2024, 5, 2))) == 1
+
+    async def test_late_day_filling_gap_joins_streaks(self, binary_redis):
+        """Um dia atrasado que preenche o intervalo une as duas sequências."""
+        calendar = ActivityCalendar(binary_redis)
+        for day in (1, 2, 4, 5):
+            await calendar.record("u1", date(2024, 5, day))
+
+        assert await calendar.record("u1", date(2024, 5, 3)) == (5, True)
+
+        streak = await calendar.get_streak("u1", today=date(2024, 5, 5))
+        assert streak["current_streak"] == 5
+        assert streak["longest_streak"] == 5
+        assert streak["last_active_day"] == date(2024, 5, 5)
+
+    async def test_late_day_before_current_streak_updates_longest(self, binary_redis):
+        """Um dia atrasado longe do último dia ativo só altera a maior sequência."""
+        calendar = ActivityCalendar(binary_redis)
+        for day in (1, 2, 10):
+            await calendar.record("u1", date(2024, 5, day))
+
+        assert await calendar.record("u1", date(2024, 5, 3)) == (1, False)
+        assert await calendar.record("u1", date(2024, 5, 3)) == (1, False)
+
+        streak = await calendar.get_streak("u1", today=date(2024, 5, 10))
+        assert streak["current_streak"] == 1
+        assert streak["longest_streak"] == 3
+
+    async def test_late_day_matches_bitmap_recount(self, binary_redis):
+        """As sequências após dias fora de ordem batem com a recontagem do bitmap."""
+        calendar = ActivityCalendar(binary_redis)
+        for day in (7, 1, 3, 8, 2, 6, 4, 5):
+            await calendar.record("u1", date(2024, 5, day))
+
+        streak = await calendar.get_streak("u1", today=date(2024, 5, 8))
+        assert (streak["current_streak"], streak["longest_streak"]) == (8, 8)
+        assert await calendar.repair("u1") == (8, 8)
@@ -0,0 +1,46 @@
+"""
+Testes unitários para a camada de acesso assíncrono do MS-Gamification.
+"""
+import pytest
+
+from app.db.async_session import (
+    QUERY_TIMEOUTS,
+    async_url,
+    read_engine,
+    set_statement_timeout,
+    write_engine
+)
+
+
+@pytest.mark.unit
+class TestAsyncEngines:
+    """Testes para engines e statement timeouts."""
+
+    @pytest.mark.parametrize("url", [
+        "postgresql://u:p@db:5432/g",
+        "postgresql+psycopg2://u:p@db:5432/g",
+        "postgres://u:p@db:5432/g",
+    ])
+    def test_async_url_uses_asyncpg(self, url):
+        """URLs síncronas são convertidas para o driver asyncpg."""
+        assert async_url(url) == "postgresql+asyncpg://u:p@db:5432/g"
+
+    def test_async_url_keeps_other_drivers(self):
+        """URLs já assíncronas (ou de outro banco) não são alteradas."""
+        assert async_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+    def test_read_and_write_pools_are_separate(self):
+        """Leituras e escritas usam pools distintos."""
+        assert read_engine is not write_engine
+        assert write_engine.url.drivername == "postgresql+asyncpg"
+
+    async def test_statement_timeout_per_query_class(self, db):
+        """O timeout da classe é aplicado com SET LOCAL."""
+        await set_statement_timeout(db, "aggregate")
+        await set_statement_timeout(db, "read", timeout_ms=250)
+
+        statements = [str(call.args[0]) for call in db.execute.await_args_list]
+        assert statements == [
+            f"SET LOCAL statement_timeout = {QUERY_TIMEOUTS['aggregate']}",
+            "SET LOCAL statement_timeout = 250",
+        ]
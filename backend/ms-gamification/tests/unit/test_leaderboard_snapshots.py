@@ -0,0 +1,75 @@
+"""
+Testes unitários para os snapshots publicados do ranking do MS-Gamification.
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from app.services.leaderboard_snapshots import LeaderboardSnapshots
+from app.services.leaderboard_store import LeaderboardStore
+
+NOW = datetime(2024, 5, 17, 12)
+
+
+@pytest.fixture
+def snapshots(redis_client) -> LeaderboardSnapshots:
+    snapshots = LeaderboardSnapshots(LeaderboardStore(redis_client))
+    snapshots.page_size = 2
+    snapshots.pages = 2
+    return snapshots
+
+
+@pytest.fixture
+async def ranking(redis_client, snapshots):
+    key = snapshots.store.key("all_time")
+    await redis_client.zadd(key, {"a": 50, "b": 40, "c": 30})
+    return key
+
+
+@pytest.mark.unit
+class TestLeaderboardSnapshots:
+    """Testes para publicação e leitura das páginas do ranking."""
+
+    async def test_publish_serializes_pages(self, snapshots, ranking, redis_client):
+        """Cada página é gravada uma vez no formato da API."""
+        version = await snapshots.publish("all_time", now=NOW)
+
+        first = json.loads(await redis_client.get(snapshots.page_key("all_time", None, version, 0)))
+        second = json.loads(await redis_client.get(snapshots.page_key("all_time", None, version, 1)))
+        assert [e["user_id"] for e in first["entries"]] == ["a", "b"]
+        assert [e["rank"] for e in second["entries"]] == [3]
+        assert first["total"] == 3 and first["version"] == version
+
+    async def test_version_follows_content(self, snapshots, ranking, redis_client):
+        """Ranking inalterado mantém a versão; alterado ganha versão nova."""
+        first = await snapshots.publish("all_time", now=NOW)
+        assert await snapshots.publish("all_time", now=NOW) == first
+
+        await redis_client.zincrby(ranking, 20, "c")
+        assert await snapshots.publish("all_time", now=NOW) != first
+
+    async def test_unchanged_publish_restores_expired_pages(self, snapshots, ranking, redis_client):
+        """Páginas expiradas de uma versão inalterada são regravadas."""
+        version = await snapshots.publish("all_time", now=NOW)
+        await redis_client.delete(snapshots.page_key("all_time", None, version, 0))
+
+        assert await snapshots.publish("all_time", now=NOW) == version
+        assert await redis_client.get(snapshots.page_key("all_time", None, version, 0)) is not None
+
+    async def test_get_page_recovers_when_pages_expired(self, snapshots, ranking, redis_client):
+        """Com o ponteiro válido e as páginas expiradas, a leitura republica."""
+        version = await snapshots.publish("all_time")
+        for page in range(snapshots.pages):
+            await redis_client.delete(snapshots.page_key("all_time", None, version, page))
+
+        snapshot = await snapshots.get_page("all_time", page=1)
+
+        assert snapshot is not None
+        assert snapshot.version == version
+        assert json.loads(snapshot.body)["entries"][0]["user_id"] == "c"
+
+    async def test_get_page_outside_snapshot(self, snapshots, ranking):
+        """Páginas além das publicadas e versões desconhecidas não existem."""
+        assert await snapshots.get_page("all_time", page=5) is None
+        assert await snapshots.get_page("all_time", page=0, version="unknown") is None
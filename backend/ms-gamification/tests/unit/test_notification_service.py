@@ -0,0 +1,91 @@
+"""
+Testes unitários para as notificações de conquistas do MS-Gamification.
+"""
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.schemas.gamification import AchievementResponse
+from app.services.notification_service import (
+    NotificationService,
+    publish_unlocks,
+    unread_key
+)
+
+
+def _achievement_row(code, unlocked_at):
+    now = datetime(2024, 1, 1)
+    mapping = {
+        "id": uuid.uuid4(), "code": code, "name": code, "description": code,
+        "category": "estudo", "difficulty": "facil", "points_required": 10,
+        "condition_type": "points", "condition_value": 0, "criteria": None,
+        "image_url": None, "reward_points": 0, "is_hidden": False,
+        "created_at": now, "updated_at": now, "unlocked_at": unlocked_at
+    }
+    return MagicMock(_mapping=mapping, unlocked_at=unlocked_at)
+
+
+@pytest.fixture
+def service(db, redis_client) -> NotificationService:
+    return NotificationService(db, client=redis_client)
+
+
+@pytest.mark.unit
+class TestHasUnread:
+    """Testes para a verificação de notificações pendentes."""
+
+    async def test_flag_answers_without_database(self, service, db, redis_client):
+        """Com a flag no Redis, o banco não é consultado."""
+        await redis_client.set(unread_key("u1"), "0")
+
+        assert await service.has_unread("u1") is False
+        db.scalar.assert_not_awaited()
+
+    async def test_missing_flag_checks_database_and_ends_transaction(self, service, db, redis_client):
+        """Sem flag, consulta o banco, encerra a transação e recria a flag."""
+        db.scalar.return_value = uuid.uuid4()
+
+        assert await service.has_unread("u1") is True
+        db.rollback.assert_awaited_once()
+        assert await redis_client.get(unread_key("u1")) == "1"
+
+    async def test_restored_flag_does_not_overwrite_unlock(self, service, db, redis_client):
+        """A flag recriada não sobrescreve um desbloqueio concorrente."""
+        async def unlock_during_query(*args):
+            await redis_client.set(unread_key("u1"), "1")
+            return None
+        db.scalar.side_effect = unlock_during_query
+
+        assert await service.has_unread("u1") is False
+        assert await redis_client.get(unread_key("u1")) == "1"
+
+
+@pytest.mark.unit
+class TestFetchUnread:
+    """Testes para leitura e confirmação das notificações."""
+
+    async def test_fetch_marks_notified_in_one_statement(self, service, db, redis_client):
+        """Retorna as pendentes em ordem de desbloqueio e zera a flag."""
+        await redis_client.set(unread_key("u1"), "1")
+        db.execute.return_value.all = lambda: [
+            _achievement_row("b", datetime(2024, 1, 3)),
+            _achievement_row("a", datetime(2024, 1, 2)),
+        ]
+
+        notifications = await service.fetch_unread("u1")
+
+        assert [n.code for n in notifications] == ["a", "b"]
+        db.execute.assert_awaited_once()
+        db.commit.assert_awaited_once()
+        assert await redis_client.get(unread_key("u1")) == "0"
+
+    async def test_publish_sets_flag(self, redis_client):
+        """Desbloqueios publicados marcam a flag do usuário."""
+        achievement = AchievementResponse.model_validate(
+            dict(_achievement_row("a", None)._mapping))
+
+        await publish_unlocks({"u1": [achievement]}, client=redis_client)
+
+        assert await redis_client.get(unread_key("u1")) == "1"
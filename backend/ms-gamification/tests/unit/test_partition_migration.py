@@ -0,0 +1,126 @@
+"""
+Testes unitários das migrações do Alembic.
+
+A migração 001 roda aqui sobre um esquema simulado, igual ao criado pelo
+create_all dos modelos anteriores à série de migrações; o teste contra um
+Postgres real fica em tests/integration/test_alembic_upgrade.py.
+"""
+import importlib.util
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+VERSIONS = Path(__file__).parent.parent.parent / "alembic" / "versions"
+
+# Tabelas e colunas criadas pelo create_all dos modelos anteriores
+BASELINE_SCHEMA = {
+    "user_points": {"id", "user_id", "category", "amount", "created_at", "updated_at"},
+    "point_history": {"id", "user_id", "category", "amount", "action", "description",
+                      "related_entity_id", "created_at"},
+}
+
+
+def load_migration(name):
+    spec = importlib.util.spec_from_file_location(name, VERSIONS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class SchemaOp:
+    """`alembic.op` que registra as operações e acompanha tabelas e colunas."""
+
+    def __init__(self, schema):
+        self.schema = {table: set(columns) for table, columns in schema.items()}
+        self.calls = []
+        self.bind = MagicMock()
+        self.bind.execute.return_value.scalar.return_value = None
+
+    def get_bind(self):
+        return self.bind
+
+    def add_column(self, table, column):
+        assert table in self.schema, f"add_column em tabela inexistente: {table}"
+        self.schema[table].add(column.name)
+        self.calls.append(("add_column", table, column.name))
+
+    def create_table(self, table, *elements, **kwargs):
+        self.schema[table] = {e.name for e in elements if hasattr(e, "type")}
+        self.calls.append(("create_table", table))
+
+    def rename_table(self, old, new):
+        self.schema[new] = self.schema.pop(old)
+        self.calls.append(("rename_table", old, new))
+
+    def drop_table(self, table):
+        del self.schema[table]
+        self.calls.append(("drop_table", table))
+
+    def create_index(self, name, *args, **kwargs):
+        self.calls.append(("create_index", name))
+
+    def execute(self, sql):
+        if "FROM point_history_legacy" in sql:
+            for column in ("idempotency_key", "created_at"):
+                assert column in self.schema["point_history_legacy"], column
+        self.calls.append(("execute", sql))
+
+
+@pytest.fixture
+def migrate(monkeypatch):
+    """Roda o upgrade da migração 001 sobre um esquema; retorna o SchemaOp."""
+    def run(schema):
+        module = load_migration("001_partition_point_history")
+        schema_op = SchemaOp(schema)
+        monkeypatch.setattr(module, "op", schema_op)
+        monkeypatch.setattr(module, "table_exists", lambda table: table in schema_op.schema)
+        monkeypatch.setattr(module, "column_exists",
+                            lambda table, column: column in schema_op.schema.get(table, ()))
+        monkeypatch.setattr(module, "is_partitioned", lambda conn: False)
+        monkeypatch.setattr(module, "ensure_partitions", MagicMock())
+        module.upgrade()
+        return schema_op
+
+    return run
+
+
+@pytest.mark.unit
+class TestPartitionMigration:
+    """Testes da migração 001 sobre o esquema dos modelos anteriores."""
+
+    def test_upgrade_from_baseline_schema(self, migrate):
+        """Testa se a chave de idempotência e o rollup existem antes da cópia."""
+        schema_op = migrate(BASELINE_SCHEMA)
+
+        assert "idempotency_key" in schema_op.schema["point_history"]
+        assert "events" in schema_op.schema["user_points_daily"]
+        assert "point_history_legacy" not in schema_op.schema
+        names = [call[:2] for call in schema_op.calls]
+        assert names.index(("add_column", "point_history")) < names.index(
+            ("rename_table", "point_history"))
+        assert names.index(("create_table", "user_points_daily")) < names.index(
+            ("rename_table", "point_history"))
+
+    def test_new_rollup_is_backfilled(self, migrate):
+        """Testa se o rollup criado pela migração é preenchido com o histórico."""
+        schema_op = migrate(BASELINE_SCHEMA)
+
+        statements = [call[1] for call in schema_op.calls if call[0] == "execute"]
+        backfill = next(s for s in statements if s.startswith("INSERT INTO user_points_daily"))
+        assert "FROM point_history GROUP BY" in backfill
+        # A tabela criada já tem a coluna events: não há ADD COLUMN nem UPDATE
+        assert ("add_column", "user_points_daily", "events") not in schema_op.calls
+        assert not any(s.startswith("UPDATE user_points_daily") for s in statements)
+
+    def test_existing_rollup_gets_events(self, migrate):
+        """Testa o rollup anterior à contagem de transações."""
+        schema_op = migrate({
+            **BASELINE_SCHEMA,
+            "point_history": BASELINE_SCHEMA["point_history"] | {"idempotency_key"},
+            "user_points_daily": {"user_id", "category", "day", "points"},
+        })
+
+        assert ("add_column", "user_points_daily", "events") in schema_op.calls
+        assert ("add_column", "point_history", "idempotency_key") not in schema_op.calls
+        assert ("create_table", "user_points_daily") not in schema_op.calls
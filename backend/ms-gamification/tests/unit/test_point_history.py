@@ -0,0 +1,87 @@
+"""
+Testes unitários para o histórico de pontos particionado do MS-Gamification.
+"""
+import uuid
+from datetime import date, datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.partitions import add_months, ensure_partitions, month_start, partition_name
+from app.models.point_history import PointHistory
+from app.services.points_service import (
+    PointsService,
+    decode_history_cursor,
+    encode_history_cursor
+)
+
+
+@pytest.mark.unit
+class TestPartitions:
+    """Testes para o cálculo das partições mensais."""
+
+    def test_month_arithmetic(self):
+        """Meses deslocados atravessam a virada do ano."""
+        assert month_start(date(2024, 5, 17)) == date(2024, 5, 1)
+        assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+        assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+        assert partition_name(date(2024, 3, 1)) == "point_history_2024_03"
+
+    def test_ensure_partitions_creates_months_ahead_and_default(self):
+        """Cria do mês inicial até os meses futuros, mais a partição padrão."""
+        connection = MagicMock()
+
+        names = ensure_partitions(connection, 2, since=date(2024, 4, 20),
+                                  today=date(2024, 5, 2))
+
+        assert names == ["point_history_2024_04", "point_history_2024_05",
+                         "point_history_2024_06", "point_history_2024_07"]
+        statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+        assert "FOR VALUES FROM ('2024-07-01') TO ('2024-08-01')" in statements[3]
+        assert statements[-1].endswith("PARTITION OF point_history DEFAULT")
+
+
+@pytest.mark.unit
+class TestHistoryPagination:
+    """Testes para a paginação por cursor do histórico."""
+
+    def test_cursor_roundtrip(self):
+        """O cursor guarda a posição (created_at, id)."""
+        at, history_id = datetime(2024, 5, 17, 10, 30, 5, 123), uuid.uuid4()
+        assert decode_history_cursor(encode_history_cursor(at, history_id)) == (at, history_id)
+
+    def test_invalid_cursor(self):
+        """Cursor inválido gera ValueError."""
+        with pytest.raises(ValueError):
+            decode_history_cursor("not-a-cursor")
+
+    async def test_page_and_next_cursor(self, db):
+        """Lê uma linha a mais para saber se há próxima página."""
+        start = datetime(2024, 5, 17, 12)
+        rows = [
+            PointHistory(id=uuid.uuid4(), user_id="u1", category="estudo", amount=i,
+                         action="ms-study", created_at=start - timedelta(minutes=i))
+            for i in range(3)
+        ]
+        db.scalars.return_value = MagicMock(all=MagicMock(return_value=rows))
+        db.scalar.return_value = 40
+
+        page = await PointsService(db).get_points_history("u1", limit=2)
+
+        assert [item.amount for item in page.items] == [0, 1]
+        assert page.total == 40
+        assert decode_history_cursor(page.next_cursor) == (rows[1].created_at, rows[1].id)
+
+    async def test_cursor_filters_by_position(self, db):
+        """A página seguinte continua após a posição do cursor."""
+        db.scalars.return_value = MagicMock(all=MagicMock(return_value=[]))
+        db.scalar.return_value = 0
+        cursor = encode_history_cursor(datetime(2024, 5, 17, 12), uuid.uuid4())
+
+        page = await PointsService(db).get_points_history("u1", limit=2, cursor=cursor)
+
+        sql = str(db.scalars.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "(point_history.created_at, point_history.id) < (" in sql
+        assert "ORDER BY point_history.created_at DESC, point_history.id DESC" in sql
+        assert page.next_cursor is None
@@ -0,0 +1,104 @@
+"""
+Testes unitários para a ingestão de pontos em lote do MS-Gamification.
+"""
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.schemas.gamification import PointEvent
+from app.services.activity_calendar import ActivityCalendar
+from app.services.leaderboard_store import LeaderboardStore
+from app.services.points_service import PointsService
+from app.services.points_stream import PointsStreamConsumer
+
+AT = datetime(2024, 5, 17, 12)
+
+
+def _result(rows):
+    return MagicMock(all=MagicMock(return_value=rows))
+
+
+def _event(key, user_id="u1", category="estudo", amount=10, source="ms-study"):
+    return PointEvent(user_id=user_id, category=category, amount=amount,
+                      action_source=source, idempotency_key=key, created_at=AT)
+
+
+@pytest.fixture
+def service(db, redis_client, binary_redis) -> PointsService:
+    service = PointsService(db, leaderboards=LeaderboardStore(redis_client))
+    service.activity = ActivityCalendar(binary_redis)
+    service.achievements.evaluate_many = AsyncMock()
+    return service
+
+
+@pytest.mark.unit
+class TestApplyPointEvents:
+    """Testes para aplicação de lotes de eventos de pontos."""
+
+    async def test_applies_only_new_keys(self, service, db, redis_client):
+        """Chaves repetidas no lote ou já recebidas contam como duplicadas."""
+        # k1 e k2 são novas; k3 já havia sido recebida
+        db.scalars.return_value = _result(["k1", "k2"])
+        db.execute.side_effect = [
+            MagicMock(),  # SET LOCAL statement_timeout
+            _result([("u1", "estudo", 10, AT), ("u1", "estudo", 5, AT)]),
+            _result([("u1", "estudo", 15)]),
+            _result([("u1", 15)]),
+        ]
+
+        result = await service.apply_point_events([
+            _event("k1"), _event("k2", amount=5), _event("k1"),
+            _event("k3", user_id="u2", category="quiz", amount=7),
+        ])
+
+        assert (result.received, result.applied, result.duplicates, result.users) == (4, 2, 2, 1)
+
+        history = db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect())
+        assert history.params["action_m0"] == "ms-study"
+        assert history.params["idempotency_key_m0"] == "k1"
+        upsert = str(db.execute.await_args_list[2].args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT ON CONSTRAINT uq_user_points_user_category DO UPDATE" in upsert
+
+        daily = db.run_sync.await_args.args[1]
+        assert daily == {("u1", "estudo", AT.date()): (15, 2)}
+        db.commit.assert_awaited_once()
+
+        store = service.leaderboards
+        assert await redis_client.zscore(store.key("all_time", "estudo", AT), "u1") == 15
+
+    async def test_all_duplicates_skip_writes(self, service, db, redis_client):
+        """Lote só com chaves já recebidas não grava histórico nem rankings."""
+        db.scalars.return_value = _result([])
+
+        result = await service.apply_point_events([_event("k1")])
+
+        assert (result.applied, result.duplicates) == (0, 1)
+        assert db.execute.await_count == 1  # apenas o SET LOCAL
+        assert await redis_client.keys("leaderboard:*") == []
+
+    async def test_invalid_category_rejects_batch(self, service, db):
+        """Um evento com categoria inválida recusa o lote inteiro."""
+        with pytest.raises(ValueError):
+            await service.apply_point_events([_event("k1"), _event("k2", category="x")])
+        db.commit.assert_not_awaited()
+
+
+@pytest.mark.unit
+class TestPointsStreamConsumer:
+    """Testes para o consumidor do stream de eventos de pontos."""
+
+    async def test_invalid_messages_go_to_dead_letter(self, redis_client):
+        """Mensagens inválidas são copiadas para o dead letter e confirmadas."""
+        consumer = PointsStreamConsumer(redis_client, stream="points", group="g", consumer="c")
+        await consumer.ensure_group()
+        await redis_client.xadd("points", {"user_id": "u1"})
+
+        messages = await consumer._read(">")
+        await consumer.process(messages)
+
+        dead = await redis_client.xrange("points:dead")
+        assert len(dead) == 1
+        assert dead[0][1]["source_id"] == messages[0][0]
+        assert (await redis_client.xpending("points", "g"))["pending"] == 0
@@ -0,0 +1,74 @@
+"""
+Testes unitários para o PointsService do MS-Gamification.
+"""
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.point_history import PointHistory
+from app.models.user_point import UserPoint
+from app.services.activity_calendar import ActivityCalendar
+from app.services.leaderboard_store import LeaderboardStore
+from app.services.points_service import PointsService
+
+
+@pytest.fixture
+def service(db, redis_client, binary_redis) -> PointsService:
+    service = PointsService(db, leaderboards=LeaderboardStore(redis_client))
+    service.activity = ActivityCalendar(binary_redis)
+    service.achievements.evaluate_many = AsyncMock()
+    return service
+
+
+def _points_result(*points):
+    """Resultado de `db.scalars` com os pontos do usuário por categoria."""
+    return MagicMock(all=MagicMock(return_value=list(points)))
+
+
+@pytest.mark.unit
+class TestAddPoints:
+    """Testes para crédito e débito de pontos."""
+
+    async def test_add_points_records_history_and_ranking(self, service, db, redis_client):
+        """Crédito grava o histórico com a fonte da ação e soma no ranking."""
+        db.scalar.side_effect = [None, 10]
+        db.scalars.return_value = _points_result(
+            UserPoint(user_id="user-1", category="estudo", amount=10))
+
+        detail = await service.add_points(
+            "user-1", 10, "estudo", "Leitura concluída", "ms-study")
+
+        history = [obj for obj in db.added if isinstance(obj, PointHistory)]
+        assert len(history) == 1
+        assert history[0].action == "ms-study"
+        assert history[0].amount == 10
+        assert detail.total_points == 10
+        assert detail.categories[0].category == "estudo"
+        db.commit.assert_awaited()
+
+        store = service.leaderboards
+        assert await redis_client.zscore(store.key("all_time", "estudo"), "user-1") == 10
+        assert await redis_client.zscore(store.key("daily"), "user-1") == 10
+
+    async def test_subtract_points_records_negative_history(self, service, db, redis_client):
+        """Débito grava valor negativo no histórico e desconta do ranking."""
+        store = service.leaderboards
+        await redis_client.zadd(store.key("all_time", "quiz"), {"user-1": 30})
+        user_point = UserPoint(user_id="user-1", category="quiz", amount=30)
+        db.scalar.side_effect = [user_point]
+        db.scalars.return_value = _points_result(user_point)
+
+        detail = await service.subtract_points(
+            "user-1", 5, "quiz", "Ajuste", "ms-admin")
+
+        history = [obj for obj in db.added if isinstance(obj, PointHistory)]
+        assert history[0].action == "ms-admin"
+        assert history[0].amount == -5
+        assert detail.total_points == 25
+        assert await redis_client.zscore(store.key("all_time", "quiz"), "user-1") == 25
+
+    async def test_add_points_rejects_invalid_source(self, service, db):
+        """Fonte de ação desconhecida é recusada antes de gravar."""
+        with pytest.raises(ValueError):
+            await service.add_points("user-1", 10, "estudo", "x", "ms-unknown")
+        db.commit.assert_not_awaited()
@@ -0,0 +1,71 @@
+"""
+Testes unitários para o RankService do MS-Gamification.
+"""
+import pytest
+
+from app.services.leaderboard_store import LeaderboardStore
+from app.services.rank_service import RankService
+
+
+@pytest.fixture
+def store(redis_client) -> LeaderboardStore:
+    return LeaderboardStore(redis_client)
+
+
+@pytest.fixture
+def service(db, store) -> RankService:
+    return RankService(db, store)
+
+
+@pytest.mark.unit
+class TestGetRank:
+    """Testes para posição e vizinhos no ranking."""
+
+    async def test_rank_and_neighbours(self, service, store, redis_client):
+        """Retorna posição, pontos e os vizinhos imediatos."""
+        await redis_client.zadd(store.key("all_time"), {"a": 50, "b": 40, "c": 30, "d": 20})
+
+        ranking = await service.get_rank("b", window=1)
+
+        assert ranking["rank"] == 2
+        assert ranking["points"] == 40
+        assert ranking["total"] == 4
+        assert [n["user_id"] for n in ranking["above"]] == ["a"]
+        assert [n["user_id"] for n in ranking["below"]] == ["c"]
+
+    async def test_user_without_points(self, service, store, redis_client):
+        """Usuário fora do ranking fica depois de todos com pontos positivos."""
+        await redis_client.zadd(store.key("all_time"), {"a": 50, "b": 40})
+
+        ranking = await service.get_rank("z", window=1)
+
+        assert ranking["rank"] == 3
+        assert ranking["points"] == 0
+        assert [n["user_id"] for n in ranking["above"]] == ["b"]
+
+    async def test_read_does_not_touch_database_or_sorted_set(self, service, store, redis_client, db):
+        """A leitura não consulta o banco nem regrava a pontuação."""
+        await redis_client.zadd(store.key("all_time"), {"a": 50})
+
+        await service.get_rank("a")
+
+        db.scalar.assert_not_awaited()
+        db.execute.assert_not_awaited()
+        assert await redis_client.zscore(store.key("all_time"), "a") == 50
+
+
+@pytest.mark.unit
+class TestReconcile:
+    """Testes para a correção dos rankings a partir do banco."""
+
+    async def test_reconcile_fixes_drift_and_stale_members(self, service, store, redis_client, db):
+        """Corrige pontuações divergentes e remove usuários sem pontos."""
+        await redis_client.zadd(store.key("all_time", "estudo"), {"a": 5, "old": 9})
+        db.execute.return_value.all = lambda: [("a", "estudo", 12)]
+
+        fixed = await service.reconcile("all_time")
+
+        assert fixed[store.key("all_time", "estudo")] == 2
+        assert await redis_client.zscore(store.key("all_time", "estudo"), "a") == 12
+        assert await redis_client.zscore(store.key("all_time", "estudo"), "old") is None
+        assert await redis_client.zscore(store.key("all_time"), "a") == 12
@@ -0,0 +1,73 @@
+"""
+Testes unitários para o rollup diário de pontos do MS-Gamification.
+"""
+from datetime import date, datetime
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.point_history import PointHistory
+from app.services.rollup_service import _rollup_point_history, upsert_daily_points
+
+
+def _history(user_id, category, amount, created_at):
+    return PointHistory(user_id=user_id, category=category, amount=amount,
+                        action="ms-study", created_at=created_at)
+
+
+def _executed(session):
+    """Instrução executada pela sessão, compilada para o Postgres."""
+    stmt = session.connection.return_value.execute.call_args.args[0]
+    return stmt.compile(dialect=postgresql.dialect())
+
+
+@pytest.mark.unit
+class TestDailyRollup:
+    """Testes para a agregação do histórico em user_points_daily."""
+
+    def test_flush_aggregates_history_per_user_category_day(self):
+        """Transações do mesmo flush viram uma linha por (usuário, categoria, dia)."""
+        session = MagicMock()
+        session.new = [
+            _history("u1", "estudo", 10, datetime(2024, 5, 17, 9)),
+            _history("u1", "estudo", 5, datetime(2024, 5, 17, 22)),
+            _history("u1", "estudo", 3, datetime(2024, 5, 18, 1)),
+            _history("u2", "quiz", 7, datetime(2024, 5, 17, 12)),
+            object(),
+        ]
+
+        _rollup_point_history(session, None)
+
+        compiled = _executed(session)
+        assert "ON CONFLICT (user_id, category, day) DO UPDATE" in str(compiled)
+        params = compiled.params
+        rows = {
+            (params[f"user_id_m{i}"], params[f"category_m{i}"], params[f"day_m{i}"]):
+                (params[f"points_m{i}"], params[f"events_m{i}"])
+            for i in range(3)
+        }
+        assert rows == {
+            ("u1", "estudo", date(2024, 5, 17)): (15, 2),
+            ("u1", "estudo", date(2024, 5, 18)): (3, 1),
+            ("u2", "quiz", date(2024, 5, 17)): (7, 1),
+        }
+
+    def test_flush_without_history_does_nothing(self):
+        """Flush sem histórico de pontos não grava no rollup."""
+        session = MagicMock()
+        session.new = [object()]
+
+        _rollup_point_history(session, None)
+
+        session.connection.assert_not_called()
+
+    def test_upsert_adds_to_existing_rows(self):
+        """O conflito soma pontos e transações na linha existente."""
+        session = MagicMock()
+
+        upsert_daily_points(session, {("u1", "geral", date(2024, 1, 1)): (4, 2)})
+
+        sql = str(_executed(session))
+        assert "points = (user_points_daily.points + excluded.points)" in sql
+        assert "events = (user_points_daily.events + excluded.events)" in sql
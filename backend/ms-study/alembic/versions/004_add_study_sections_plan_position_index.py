@@ -0,0 +1,39 @@
+"""add study_sections (study_plan_id, position) index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = 'idx_study_sections_plan_position'
+
+
+def upgrade() -> None:
+    # A listagem de progresso conta as seções de cada plano e busca a seção
+    # atual em uma única consulta; o índice composto atende os dois acessos
+    try:
+        conn = op.get_bind()
+        index_exists = conn.execute(sa.text(
+            f"SELECT 1 FROM pg_indexes WHERE indexname = '{INDEX_NAME}'")).scalar() is not None
+        if not index_exists:
+            op.create_index(INDEX_NAME, 'study_sections',
+                            ['study_plan_id', 'position'])
+            print(f"Índice {INDEX_NAME} criado com sucesso")
+    except Exception as e:
+        print(f"Erro ao criar o índice {INDEX_NAME}: {e}")
+
+
+def downgrade() -> None:
+    try:
+        op.drop_index(INDEX_NAME, table_name='study_sections')
+    except:
+        pass
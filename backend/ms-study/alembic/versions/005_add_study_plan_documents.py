@@ -0,0 +1,50 @@
+"""add pre-assembled plan document to study_plans
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def column_exists(table_name, column_name):
+    """Verifica se a coluna já existe na tabela"""
+    try:
+        conn = op.get_bind()
+        result = conn.execute(sa.text(
+            f"SELECT 1 FROM information_schema.columns WHERE table_name = '{table_name}' AND column_name = '{column_name}'"))
+        return result.scalar() is not None
+    except:
+        return False
+
+
+def upgrade() -> None:
+    # Documento pré-montado do plano (plano, seções e conteúdos); planos
+    # existentes ficam com documento nulo e são montados na primeira leitura
+    try:
+        if not column_exists('study_plans', 'document'):
+            op.add_column('study_plans', sa.Column(
+                'document', postgresql.JSONB(), nullable=True))
+        if not column_exists('study_plans', 'document_version'):
+            op.add_column('study_plans', sa.Column(
+                'document_version', sa.Integer(), nullable=False, server_default='0'))
+        print("Colunas de documento do plano criadas com sucesso")
+    except Exception as e:
+        print(f"Erro ao adicionar colunas de documento em study_plans: {e}")
+
+
+def downgrade() -> None:
+    try:
+        op.drop_column('study_plans', 'document_version')
+        op.drop_column('study_plans', 'document')
+    except:
+        pass
@@ -180,7 +180,8 @@ def get_certificate_service(
         get_study_plan_repository),
     user_study_progress_repository: UserStudyProgressRepository = Depends(
         get_user_study_progress_repository),
-    user_service: UserService = Depends(get_user_service)
+    user_service: UserService = Depends(get_user_service),
+    db: Session = Depends(get_db)
 ) -> CertificateService:
     """
     Retorna uma instância de CertificateService.
@@ -189,5 +190,6 @@ def get_certificate_service(
         certificate_repository,
         study_plan_repository,
         user_study_progress_repository,
-        user_service
+        user_service,
+        db
     )
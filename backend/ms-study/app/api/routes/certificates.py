@@ -1,5 +1,6 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, Query, Path, HTTPException, status, Response
+from fastapi import APIRouter, Depends, Query, Path, HTTPException, status
+from fastapi.responses import FileResponse, JSONResponse
 from sqlalchemy.orm import Session
 
 from app.database.db import get_db
@@ -23,7 +24,7 @@ async def get_user_certificates(
 
     Requer autenticação.
     """
-    certificate_service = CertificateService(db)
+    certificate_service = CertificateService.from_db(db)
 
     # Obter certificados do usuário
     certificates, total = await certificate_service.get_user_certificates(
@@ -54,7 +55,7 @@ async def create_certificate(
 
     Requer autenticação.
     """
-    certificate_service = CertificateService(db)
+    certificate_service = CertificateService.from_db(db)
 
     # Verificar permissões (apenas o próprio usuário ou admin)
     if certificate_data.user_id != current_user["id"] and current_user["role"] != "admin":
@@ -77,7 +78,7 @@ async def get_certificate(
 
     Requer autenticação. Apenas o próprio usuário pode acessar seus certificados.
     """
-    certificate_service = CertificateService(db)
+    certificate_service = CertificateService.from_db(db)
 
     # Buscar o certificado
     certificate = await certificate_service.get_certificate_detail(certificate_id)
@@ -105,14 +106,16 @@ async def get_certificate_pdf(
     db: Session = Depends(get_db)
 ):
     """
-    Gera e retorna o PDF do certificado.
+    Retorna o PDF do certificado.
 
+    Se o PDF ainda não estiver pronto, enfileira a renderização e responde
+    202 com a situação; acompanhe em /{certificate_id}/pdf/status.
     Requer autenticação. Apenas o próprio usuário pode acessar seus certificados.
     """
-    certificate_service = CertificateService(db)
+    certificate_service = CertificateService.from_db(db)
 
     # Buscar o certificado
-    certificate = await certificate_service.get_certificate_detail(certificate_id)
+    certificate = await certificate_service.get_certificate_by_id(certificate_id)
 
     if not certificate:
         raise HTTPException(
@@ -127,27 +130,71 @@ async def get_certificate_pdf(
             detail="Não autorizado a acessar este certificado"
         )
 
-    # Gerar o PDF do certificado
+    # PDF pronto no armazenamento ou renderização enfileirada
     try:
-        pdf_binary = await certificate_service.generate_certificate_pdf(certificate_id)
-
-        # Incrementar o contador de downloads
-        await certificate_service.increment_download_count(certificate_id)
-
-        # Retornar o PDF como download
-        return Response(
-            content=pdf_binary,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f'attachment; filename="certificado-{certificate_id}.pdf"'
-            }
-        )
+        pdf_path, render_status = await certificate_service.request_certificate_pdf(certificate_id)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erro ao gerar o PDF do certificado: {str(e)}"
         )
 
+    if not pdf_path:
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content=render_status
+        )
+
+    # Incrementar o contador de downloads
+    await certificate_service.increment_download_count(certificate_id)
+
+    # Retornar o PDF como download
+    return FileResponse(
+        pdf_path,
+        media_type="application/pdf",
+        filename=f"certificado-{certificate_id}.pdf"
+    )
+
+
+@router.get("/{certificate_id}/pdf/status")
+async def get_certificate_pdf_status(
+    certificate_id: str = Path(..., description="ID do certificado"),
+    current_user: dict = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Retorna a situação da renderização do PDF do certificado
+    (queued, done ou failed).
+
+    Requer autenticação. Apenas o próprio usuário pode acessar seus certificados.
+    """
+    certificate_service = CertificateService.from_db(db)
+
+    # Buscar o certificado
+    certificate = await certificate_service.get_certificate_by_id(certificate_id)
+
+    if not certificate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Certificado não encontrado"
+        )
+
+    # Verificar permissões (apenas o próprio usuário ou admin)
+    if certificate.user_id != current_user["id"] and current_user["role"] != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Não autorizado a acessar este certificado"
+        )
+
+    render_status = certificate_service.get_certificate_pdf_status(certificate_id)
+    if not render_status:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="PDF do certificado ainda não solicitado"
+        )
+
+    return render_status
+
 
 @router.get("/plan/{plan_id}", response_model=Optional[CertificateDetail])
 async def get_certificate_by_plan(
@@ -161,7 +208,7 @@ async def get_certificate_by_plan(
     Útil para verificar se o usuário já tem certificado para um plano.
     Requer autenticação.
     """
-    certificate_service = CertificateService(db)
+    certificate_service = CertificateService.from_db(db)
 
     # Buscar certificado para este plano e usuário
     certificate = await certificate_service.get_certificate_by_plan_and_user(
@@ -183,7 +230,7 @@ async def delete_certificate(
 
     Requer autenticação. Apenas o próprio usuário ou admin pode excluir certificados.
     """
-    certificate_service = CertificateService(db)
+    certificate_service = CertificateService.from_db(db)
 
     # Buscar o certificado existente
     existing_certificate = await certificate_service.get_certificate_by_id(certificate_id)
@@ -9,6 +9,7 @@ from app.schemas.study_plan import (
     StudyPlanUpdate,
     StudyPlanInDB,
     StudyPlanSimple,
+    StudyPlanDocument,
     StudyPlanListResponse
 )
 from app.services.study_plan_service import StudyPlanService
@@ -92,9 +93,13 @@ async def create_study_plan(
     return await study_plan_service.create_plan(study_plan)
 
 
-@router.get("/{plan_id}", response_model=StudyPlanInDB)
+@router.get("/{plan_id}", response_model=StudyPlanDocument)
 async def get_study_plan(
     plan_id: str = Path(..., description="ID do plano de estudo"),
+    section_offset: int = Query(
+        0, ge=0, description="Quantas seções pular"),
+    section_limit: Optional[int] = Query(
+        None, ge=1, le=100, description="Limite de seções (todas se omitido)"),
     current_user: Optional[dict] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -102,9 +107,12 @@ async def get_study_plan(
     Retorna um plano de estudo específico pelo ID.
 
     Se o plano for privado, apenas o dono ou admin pode acessá-lo.
+    Para planos muito longos, as seções podem ser paginadas com
+    section_offset/section_limit (sections_count traz o total).
     """
     study_plan_service = StudyPlanService(db)
-    study_plan = await study_plan_service.get_plan_by_id(plan_id)
+    study_plan = await study_plan_service.get_plan_by_id(
+        plan_id, section_offset=section_offset, section_limit=section_limit)
 
     if not study_plan:
         raise HTTPException(
@@ -11,6 +11,7 @@ from jwt.exceptions import PyJWTError
 import httpx
 
 from app.core.config import get_settings
+from app.core.internal_client import internal_client
 from app.infrastructure.database import get_db
 from app.domain.study.service import StudyService
 
@@ -75,21 +76,21 @@ async def get_current_user(authorization: str = Header(None)) -> Optional[dict]:
 
         # Verify token with auth service
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.post(
-                    f"{settings.MS_AUTH_URL}/api/v1/auth/verify-token",
-                    json={"token": token}
-                )
+            response = await internal_client.post(
+                f"{settings.MS_AUTH_URL}/api/v1/auth/verify-token",
+                json={"token": token},
+                timeout=5.0
+            )
 
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Token inválido ou expirado",
-                        headers={"WWW-Authenticate": "Bearer"},
-                    )
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token inválido ou expirado",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
 
-                user_data = response.json()
-                return user_data
+            user_data = response.json()
+            return user_data
         except httpx.RequestError as e:
             logger.error(f"Error calling auth service: {str(e)}")
             raise HTTPException(
@@ -2,7 +2,6 @@ from typing import List, Dict, Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
 from sqlalchemy.orm import Session
 import logging
-import httpx
 from fastapi.concurrency import run_in_threadpool
 
 from app.api.v1.dependencies import get_study_service, get_current_active_user, verify_service_api_key
@@ -13,6 +12,7 @@ from app.domain.study.schemas import (
 )
 from app.domain.study.service import StudyService
 from app.core.config import get_settings
+from app.core.internal_client import internal_client
 
 settings = get_settings()
 logger = logging.getLogger("study_router")
@@ -33,23 +33,23 @@ async def get_user_details(user_id: str) -> Dict[str, str]:
     Obtém os detalhes do usuário a partir do MS-Auth
     """
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(
-                f"{settings.MS_AUTH_URL}/api/v1/auth/users/{user_id}",
-                headers={"Authorization": f"Bearer {settings.SERVICE_API_KEY}"}
-            )
+        response = await internal_client.get(
+            f"{settings.MS_AUTH_URL}/api/v1/auth/users/{user_id}",
+            headers={"Authorization": f"Bearer {settings.SERVICE_API_KEY}"},
+            timeout=5.0
+        )
 
-            if response.status_code == 200:
-                user_data = response.json()
-                return {
-                    "id": user_data.get("id", user_id),
-                    "name": user_data.get("name", "Usuário"),
-                    "email": user_data.get("email", "")
-                }
-            else:
-                logger.warning(
-                    f"Could not get user details from ms-auth: {response.status_code}")
-                return {"id": user_id, "name": "Usuário", "email": ""}
+        if response.status_code == 200:
+            user_data = response.json()
+            return {
+                "id": user_data.get("id", user_id),
+                "name": user_data.get("name", "Usuário"),
+                "email": user_data.get("email", "")
+            }
+        else:
+            logger.warning(
+                f"Could not get user details from ms-auth: {response.status_code}")
+            return {"id": user_id, "name": "Usuário", "email": ""}
     except Exception as e:
         logger.error(f"Error getting user details: {str(e)}")
         return {"id": user_id, "name": "Usuário", "email": ""}
@@ -30,6 +30,9 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_PASSWORD: Optional[str] = None
 
+    # Documento pré-montado dos planos de estudo no Redis (segundos)
+    PLAN_DOCUMENT_CACHE_TTL: int = 86400
+
     # Authentication settings
     SECRET_KEY: str = "your-secret-key"
     ALGORITHM: str = "HS256"
@@ -42,6 +45,15 @@ class Settings(BaseSettings):
     # Service API Key for inter-service communication
     SERVICE_API_KEY: str = "your-service-api-key"
 
+    # Cliente HTTP interno (pool compartilhado entre microsserviços)
+    INTERNAL_HTTP_TIMEOUT: float = 10.0
+    INTERNAL_HTTP_MAX_CONNECTIONS: int = 50
+    INTERNAL_HTTP_MAX_KEEPALIVE: int = 20
+    INTERNAL_HTTP_RETRIES: int = 2
+    INTERNAL_HTTP2: bool = False
+    # Maior deadline aceito no header X-Request-Deadline (segundos)
+    INTERNAL_HTTP_MAX_DEADLINE: float = 60.0
+
     # CORS settings como uma string simples
     CORS_ORIGINS: List[str] = ["*"]
 
@@ -92,6 +104,17 @@ class Settings(BaseSettings):
 
     # Configuração para armazenamento de certificados
     CERTIFICATES_STORAGE_PATH: str = "/app/storage/certificates"
+    # Processos que renderizam os PDFs dos certificados
+    CERTIFICATE_RENDER_WORKERS: int = 2
+    # Tempo de vida da situação da renderização no Redis (segundos)
+    CERTIFICATE_RENDER_STATUS_TTL: int = 86400
+    # Tempo máximo de uma renderização, contado do início dela no processo
+    # do pool; ao esgotar, o job falha
+    CERTIFICATE_RENDER_TIMEOUT: int = 300
+    # Validade da trava de um job; renovada enquanto o processo que a gravou
+    # mantém o job, ela expira logo se o processo morrer e o job "queued" sem
+    # trava passa a ser informado como interrompido
+    CERTIFICATE_RENDER_LOCK_TTL: int = 30
     CERTIFICATE_PUBLIC_URL: str = os.getenv(
         "CERTIFICATE_PUBLIC_URL", "https://falecomjesus.com/certificates")
 
@@ -0,0 +1,330 @@
+"""
+Cliente HTTP compartilhado para chamadas entre microsserviços.
+
+Mantém um pool de conexões keep-alive por serviço de destino (origem
+scheme://host:porta), criado uma vez por processo no startup e fechado no
+shutdown, em vez de abrir um `httpx.AsyncClient()` a cada chamada.
+
+Recursos:
+    - Pool keep-alive por destino
+    - HTTP/2 opcional (requer o pacote `h2`)
+    - Propagação de deadline via header `X-Request-Deadline`, aceito apenas
+      de chamadores internos (header `X-Internal-Key` com a chave de serviço)
+    - Retries com backoff e jitter para métodos idempotentes
+    - Métricas de latência por destino
+"""
+
+import asyncio
+import contextvars
+import hmac
+import logging
+import math
+import random
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+from fastapi import HTTPException, Request, status
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_HEADER = "X-Request-Deadline"
+INTERNAL_KEY_HEADER = "X-Internal-Key"
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+# Deadline absoluto (epoch em segundos) da requisição em andamento
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "internal_request_deadline", default=None
+)
+
+
+def get_deadline() -> Optional[float]:
+    """Retorna o deadline absoluto da requisição atual, se houver."""
+    return _deadline.get()
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """
+    Define um deadline para as chamadas internas feitas dentro do bloco.
+
+    Se já existir um deadline mais curto (propagado pelo chamador), ele é mantido.
+    """
+    target = time.time() + seconds
+    current = _deadline.get()
+    if current is not None:
+        target = min(target, current)
+    token = _deadline.set(target)
+    try:
+        yield target
+    finally:
+        _deadline.reset(token)
+
+
+async def propagate_deadline(request, call_next):
+    """
+    Middleware HTTP que lê o deadline recebido do chamador e o torna
+    disponível para as chamadas internas feitas durante a requisição.
+
+    O header só é aceito de chamadores internos; ver
+    `InternalClient.accept_deadline`.
+    """
+    value = internal_client.accept_deadline(request.headers)
+    token = _deadline.set(value) if value is not None else None
+    try:
+        return await call_next(request)
+    finally:
+        if token is not None:
+            _deadline.reset(token)
+
+
+async def require_internal_caller(request: Request) -> None:
+    """Dependência que restringe a rota a chamadores internos."""
+    if not internal_client.is_internal(request.headers):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Acesso restrito a serviços internos",
+        )
+
+
+class TargetMetrics:
+    """Métricas de latência acumuladas para um serviço de destino."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, elapsed_ms: float, error: bool) -> None:
+        self.requests += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        if error:
+            self.errors += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else 0.0,
+            "max_ms": round(self.max_ms, 2),
+        }
+
+
+class InternalClient:
+    """
+    Cliente HTTP interno com um `httpx.AsyncClient` por destino.
+
+    Args:
+        timeout: Timeout padrão em segundos
+        max_connections: Máximo de conexões por destino
+        max_keepalive: Máximo de conexões ociosas mantidas por destino
+        http2: Habilita HTTP/2 quando o pacote `h2` está instalado
+        retries: Número de novas tentativas para chamadas idempotentes
+        backoff: Base em segundos do backoff exponencial
+        service_key: Chave compartilhada entre os serviços, enviada no header
+            `X-Internal-Key`; sem ela nenhum chamador é tratado como interno
+        max_deadline: Maior deadline aceito de um chamador, em segundos a
+            partir de agora
+    """
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections: int = 50,
+        max_keepalive: int = 20,
+        http2: bool = False,
+        retries: int = 2,
+        backoff: float = 0.1,
+        service_key: Optional[str] = None,
+        max_deadline: float = 60.0,
+    ):
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive,
+        )
+        self.http2 = http2 and self._h2_available()
+        self.retries = retries
+        self.backoff = backoff
+        self.service_key = service_key
+        self.max_deadline = max_deadline
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._metrics: Dict[str, TargetMetrics] = {}
+
+    @staticmethod
+    def _h2_available() -> bool:
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("Pacote 'h2' não instalado; usando HTTP/1.1")
+            return False
+
+    def is_internal(self, headers) -> bool:
+        """Indica se a requisição traz a chave de serviço correta."""
+        key = headers.get(INTERNAL_KEY_HEADER)
+        if not self.service_key or not key:
+            return False
+        return hmac.compare_digest(key.encode(), self.service_key.encode())
+
+    def accept_deadline(self, headers) -> Optional[float]:
+        """
+        Valida o deadline recebido de um chamador.
+
+        Só é aceito de chamadores internos. Valores não numéricos, infinitos
+        ou já vencidos são descartados, e o deadline é limitado a
+        `max_deadline` segundos a partir de agora.
+
+        Returns:
+            Deadline absoluto (epoch em segundos) ou None se não for aceito
+        """
+        raw = headers.get(DEADLINE_HEADER)
+        if not raw or not self.is_internal(headers):
+            return None
+        try:
+            value = float(raw)
+        except ValueError:
+            value = math.nan
+        now = time.time()
+        if not math.isfinite(value) or value <= now:
+            logger.warning(f"Header {DEADLINE_HEADER} inválido: {raw}")
+            return None
+        return min(value, now + self.max_deadline)
+
+    def _client_for(self, target: str) -> httpx.AsyncClient:
+        client = self._clients.get(target)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                base_url=target,
+                timeout=self.timeout,
+                limits=self.limits,
+                http2=self.http2,
+            )
+            self._clients[target] = client
+            self._metrics.setdefault(target, TargetMetrics())
+        return client
+
+    def _remaining(self, timeout: Optional[float]) -> float:
+        timeout = self.timeout if timeout is None else timeout
+        current = _deadline.get()
+        if current is None:
+            return timeout
+        remaining = current - time.time()
+        if remaining <= 0:
+            raise httpx.TimeoutException("Deadline da requisição expirado")
+        return min(timeout, remaining)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Executa uma requisição usando o pool do serviço de destino.
+
+        Args:
+            method: Método HTTP
+            url: URL absoluta do serviço de destino
+            timeout: Timeout desta chamada (limitado pelo deadline atual)
+            idempotent: Força/desabilita retries; por padrão segue o método
+            **kwargs: Repassados para `httpx.AsyncClient.request`
+
+        Returns:
+            Resposta HTTP
+        """
+        method = method.upper()
+        parsed = httpx.URL(url)
+        target = f"{parsed.scheme}://{parsed.netloc.decode('ascii')}"
+        path = parsed.raw_path.decode("ascii")
+        client = self._client_for(target)
+        metrics = self._metrics[target]
+
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = 1 + (self.retries if idempotent else 0)
+
+        for attempt in range(attempts):
+            request_timeout = self._remaining(timeout)
+            headers = dict(kwargs.pop("headers", None) or {})
+            current = _deadline.get()
+            headers[DEADLINE_HEADER] = str(
+                current if current is not None else time.time() + request_timeout
+            )
+            if self.service_key:
+                headers[INTERNAL_KEY_HEADER] = self.service_key
+            kwargs["headers"] = headers
+
+            start = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, path, timeout=request_timeout, **kwargs
+                )
+            except httpx.TransportError:
+                metrics.observe((time.perf_counter() - start) * 1000, error=True)
+                if attempt + 1 >= attempts:
+                    raise
+            else:
+                failed = response.status_code in RETRY_STATUS_CODES
+                metrics.observe((time.perf_counter() - start) * 1000, error=failed)
+                if not failed or attempt + 1 >= attempts:
+                    return response
+
+            metrics.retries += 1
+            delay = random.uniform(0, self.backoff * (2 ** attempt))
+            current = _deadline.get()
+            if current is not None and time.time() + delay >= current:
+                raise httpx.TimeoutException("Deadline da requisição expirado")
+            await asyncio.sleep(delay)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def patch(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("PATCH", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Retorna as métricas de latência por serviço de destino."""
+        return {target: m.to_dict() for target, m in self._metrics.items()}
+
+    async def close(self) -> None:
+        """Fecha todos os pools de conexão."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+internal_client = InternalClient(
+    timeout=settings.INTERNAL_HTTP_TIMEOUT,
+    max_connections=settings.INTERNAL_HTTP_MAX_CONNECTIONS,
+    max_keepalive=settings.INTERNAL_HTTP_MAX_KEEPALIVE,
+    http2=settings.INTERNAL_HTTP2,
+    retries=settings.INTERNAL_HTTP_RETRIES,
+    service_key=settings.SERVICE_API_KEY,
+    max_deadline=settings.INTERNAL_HTTP_MAX_DEADLINE,
+)
+
+
+def get_internal_client() -> InternalClient:
+    return internal_client
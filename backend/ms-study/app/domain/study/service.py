@@ -8,6 +8,7 @@ import uuid
 import asyncio
 
 from app.core.config import get_settings
+from app.core.internal_client import internal_client
 from app.domain.study.models import StudyPlan, StudySection, StudyContent, UserStudyProgress, UserReflection, UserPreferences
 from app.domain.study.schemas import (
     UserPreferences as UserPreferencesSchema,
@@ -132,38 +133,38 @@ class StudyService:
 
             # Enviar as preferências para o MS-ChatIA para gerar o plano personalizado
             try:
-                async with httpx.AsyncClient(timeout=45.0) as client:
-                    response = await client.post(
-                        f"{settings.MS_CHATIA_URL}/api/v1/chat/generate-study-plan",
-                        json={
-                            "user_id": preferences.user_id,
-                            "name": preferences.name,
-                            "email": preferences.email,
-                            "objectives": preferences.objectives,
-                            "bible_experience_level": preferences.bible_experience_level,
-                            "content_preferences": preferences.content_preferences,
-                            "preferred_time": preferences.preferred_time
-                        },
-                        headers={
-                            "Authorization": f"Bearer {settings.SERVICE_API_KEY}"
-                        }
-                    )
-
-                    if response.status_code != 200:
-                        logger.error(
-                            f"Erro ao chamar MS-ChatIA: {response.status_code}")
-                        logger.error(f"Resposta: {response.text}")
-                        return None
-
-                    result = response.json()
-                    plan_data = result.get("plan")
-
-                    if not plan_data:
-                        logger.error("Plano não encontrado na resposta")
-                        return None
-
-                    # Processar o plano e salvar no banco de dados
-                    return self._create_plan_from_data(plan_data, preferences.user_id)
+                response = await internal_client.post(
+                    f"{settings.MS_CHATIA_URL}/api/v1/chat/generate-study-plan",
+                    json={
+                        "user_id": preferences.user_id,
+                        "name": preferences.name,
+                        "email": preferences.email,
+                        "objectives": preferences.objectives,
+                        "bible_experience_level": preferences.bible_experience_level,
+                        "content_preferences": preferences.content_preferences,
+                        "preferred_time": preferences.preferred_time
+                    },
+                    headers={
+                        "Authorization": f"Bearer {settings.SERVICE_API_KEY}"
+                    },
+                    timeout=45.0
+                )
+
+                if response.status_code != 200:
+                    logger.error(
+                        f"Erro ao chamar MS-ChatIA: {response.status_code}")
+                    logger.error(f"Resposta: {response.text}")
+                    return None
+
+                result = response.json()
+                plan_data = result.get("plan")
+
+                if not plan_data:
+                    logger.error("Plano não encontrado na resposta")
+                    return None
+
+                # Processar o plano e salvar no banco de dados
+                return self._create_plan_from_data(plan_data, preferences.user_id)
 
             except httpx.RequestError as e:
                 logger.error(f"Erro de requisição para MS-ChatIA: {str(e)}")
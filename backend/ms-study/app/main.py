@@ -7,6 +7,8 @@ import time
 from app.core.config import get_settings
 from app.api.v1.routes import api_router
 from app.infrastructure.database import init_db
+from app.core.internal_client import internal_client, propagate_deadline
+from app.services.certificate_renderer import init_certificate_renderer, shutdown_certificate_renderer
 
 # Configure logging
 logging.basicConfig(
@@ -69,6 +71,9 @@ async def log_requests(request: Request, call_next):
             content={"detail": "Internal server error"}
         )
 
+# Propagar deadline recebido para as chamadas a outros microsserviços
+app.middleware("http")(propagate_deadline)
+
 # Include API router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -90,8 +95,19 @@ async def startup_event():
     """Initialize services on startup."""
     logger.info("Initializing database")
     init_db()
+    # Processos de renderização dos certificados (carregam template e fontes)
+    init_certificate_renderer()
     logger.info(f"Application {settings.APP_NAME} started")
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release services on shutdown."""
+    await internal_client.close()
+    logger.info("Pools do cliente HTTP interno fechados")
+    shutdown_certificate_renderer()
+    logger.info("Pool de renderização de certificados encerrado")
+
 # Run app with uvicorn
 if __name__ == "__main__":
     import uvicorn
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from uuid import uuid4
 
@@ -28,6 +29,10 @@ class StudyPlan(Base):
     created_by_ia = Column(Boolean, default=False)  # se foi gerado por IA
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Documento pré-montado (plano, seções e conteúdos), ver PlanDocumentService;
+    # adiado para não pesar nas listagens
+    document = deferred(Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True))
+    document_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relacionamentos
     sections = relationship(
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from uuid import uuid4
@@ -25,6 +25,11 @@ class StudySection(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Seções de um plano em ordem e contagem por plano (listagem de progresso)
+    __table_args__ = (
+        Index("idx_study_sections_plan_position", "study_plan_id", "position"),
+    )
+
     # Relacionamentos
     study_plan = relationship("StudyPlan", back_populates="sections")
     contents = relationship(
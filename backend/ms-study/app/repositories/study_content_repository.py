@@ -1,18 +1,51 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update, delete
 import logging
 
 from app.models.study_content import StudyContent
+from app.models.study_section import StudySection
+from app.services.plan_document_service import PlanDocumentService, discard_documents
 from app.schemas.study_content import StudyContentCreate, StudyContentUpdate
 
 logger = logging.getLogger(__name__)
 
 
 class StudyContentRepository:
+    """
+    Acesso aos conteúdos das seções de estudo.
+
+    Toda escrita descarta o documento pré-montado dos planos afetados na
+    mesma transação e apaga a cópia do Redis depois do commit.
+    """
+
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.documents = PlanDocumentService(db)
+
+    async def _plan_ids(self, section_ids: Iterable[str]) -> Set[str]:
+        result = await self.db.execute(
+            select(StudySection.study_plan_id).where(
+                StudySection.id.in_([str(section_id) for section_id in section_ids]))
+        )
+        return set(result.scalars().all())
+
+    async def _content_plan_ids(self, content_id: str) -> Set[str]:
+        result = await self.db.execute(
+            select(StudySection.study_plan_id)
+            .join(StudyContent, StudyContent.section_id == StudySection.id)
+            .where(StudyContent.id == content_id)
+        )
+        return set(result.scalars().all())
+
+    async def _commit(self, plan_ids: Set[str]) -> None:
+        """Descarta os documentos dos planos, faz commit e invalida o Redis."""
+        if plan_ids:
+            await self.db.execute(discard_documents(plan_ids))
+        await self.db.commit()
+        for plan_id in plan_ids:
+            self.documents.invalidate(plan_id)
 
     async def create(self, study_content_create: StudyContentCreate) -> StudyContent:
         """
@@ -26,7 +59,7 @@ class StudyContentRepository:
         """
         study_content = StudyContent(**study_content_create.dict())
         self.db.add(study_content)
-        await self.db.commit()
+        await self._commit(await self._plan_ids([study_content.section_id]))
         await self.db.refresh(study_content)
         return study_content
 
@@ -43,7 +76,8 @@ class StudyContentRepository:
         study_contents = [StudyContent(**content.dict())
                           for content in study_contents_create]
         self.db.add_all(study_contents)
-        await self.db.commit()
+        await self._commit(await self._plan_ids(
+            {content.section_id for content in study_contents}))
 
         for content in study_contents:
             await self.db.refresh(content)
@@ -94,13 +128,14 @@ class StudyContentRepository:
             O conteúdo atualizado ou None se não for encontrado
         """
         update_data = content_update.dict(exclude_unset=True)
+        plan_ids = await self._content_plan_ids(content_id)
 
         await self.db.execute(
             update(StudyContent)
             .where(StudyContent.id == content_id)
             .values(**update_data)
         )
-        await self.db.commit()
+        await self._commit(plan_ids)
 
         return await self.get_by_id(content_id)
 
@@ -114,10 +149,11 @@ class StudyContentRepository:
         Returns:
             True se o conteúdo foi excluído, False caso contrário
         """
+        plan_ids = await self._content_plan_ids(content_id)
         result = await self.db.execute(
             delete(StudyContent).where(StudyContent.id == content_id)
         )
-        await self.db.commit()
+        await self._commit(plan_ids)
 
         return result.rowcount > 0
 
@@ -134,6 +170,6 @@ class StudyContentRepository:
         result = await self.db.execute(
             delete(StudyContent).where(StudyContent.section_id == section_id)
         )
-        await self.db.commit()
+        await self._commit(await self._plan_ids([section_id]))
 
         return result.rowcount
@@ -1,18 +1,43 @@
-from typing import List, Optional
+from typing import Iterable, List, Optional, Set
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy import update, delete
 import logging
 
 from app.models.study_section import StudySection
+from app.services.plan_document_service import PlanDocumentService, discard_documents
 from app.schemas.study_section import StudySectionCreate, StudySectionUpdate
 
 logger = logging.getLogger(__name__)
 
 
 class StudySectionRepository:
+    """
+    Acesso às seções de estudo.
+
+    Toda escrita descarta o documento pré-montado dos planos afetados na
+    mesma transação e apaga a cópia do Redis depois do commit.
+    """
+
     def __init__(self, db: AsyncSession):
         self.db = db
+        self.documents = PlanDocumentService(db)
+
+    async def _plan_ids(self, section_ids: Iterable[str]) -> Set[str]:
+        result = await self.db.execute(
+            select(StudySection.study_plan_id).where(
+                StudySection.id.in_([str(section_id) for section_id in section_ids]))
+        )
+        return set(result.scalars().all())
+
+    async def _commit(self, plan_ids: Set[str]) -> None:
+        """Descarta os documentos dos planos, faz commit e invalida o Redis."""
+        plan_ids = {str(plan_id) for plan_id in plan_ids}
+        if plan_ids:
+            await self.db.execute(discard_documents(plan_ids))
+        await self.db.commit()
+        for plan_id in plan_ids:
+            self.documents.invalidate(plan_id)
 
     async def create(self, study_section_create: StudySectionCreate) -> StudySection:
         """
@@ -26,7 +51,7 @@ class StudySectionRepository:
         """
         study_section = StudySection(**study_section_create.dict())
         self.db.add(study_section)
-        await self.db.commit()
+        await self._commit({study_section.study_plan_id})
         await self.db.refresh(study_section)
         return study_section
 
@@ -43,7 +68,7 @@ class StudySectionRepository:
         study_sections = [StudySection(**section.dict())
                           for section in study_sections_create]
         self.db.add_all(study_sections)
-        await self.db.commit()
+        await self._commit({section.study_plan_id for section in study_sections})
 
         for section in study_sections:
             await self.db.refresh(section)
@@ -94,13 +119,14 @@ class StudySectionRepository:
             A seção atualizada ou None se não for encontrada
         """
         update_data = section_update.dict(exclude_unset=True)
+        plan_ids = await self._plan_ids([section_id])
 
         await self.db.execute(
             update(StudySection)
             .where(StudySection.id == section_id)
             .values(**update_data)
         )
-        await self.db.commit()
+        await self._commit(plan_ids)
 
         return await self.get_by_id(section_id)
 
@@ -114,10 +140,11 @@ class StudySectionRepository:
         Returns:
             True se a seção foi excluída, False caso contrário
         """
+        plan_ids = await self._plan_ids([section_id])
         result = await self.db.execute(
             delete(StudySection).where(StudySection.id == section_id)
         )
-        await self.db.commit()
+        await self._commit(plan_ids)
 
         return result.rowcount > 0
 
@@ -134,6 +161,6 @@ class StudySectionRepository:
         result = await self.db.execute(
             delete(StudySection).where(StudySection.study_plan_id == plan_id)
         )
-        await self.db.commit()
+        await self._commit({plan_id})
 
         return result.rowcount
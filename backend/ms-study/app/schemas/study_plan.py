@@ -113,6 +113,15 @@ class StudyPlanInDB(StudyPlanBase):
     class Config:
         orm_mode = True
 
+# Schema do documento pré-montado do plano (leitura por chave)
+
+
+class StudyPlanDocument(StudyPlanInDB):
+    version: int = Field(0, description="Versão do documento do plano")
+    sections_count: int = Field(0, description="Total de seções do plano")
+    section_offset: int = Field(
+        0, description="Posição da primeira seção retornada")
+
 # Schema para visualização simplificada do plano
 
 
@@ -0,0 +1,508 @@
+"""
+Renderização dos certificados em PDF fora do event loop.
+
+O WeasyPrint consome CPU por centenas de milissegundos a segundos por
+certificado; chamado dentro de um `async def`, bloqueava todas as
+requisições do processo. A renderização roda em um pool de processos
+(`CERTIFICATE_RENDER_WORKERS`):
+
+- cada processo carrega uma vez o template Jinja, o CSS da página e a
+  configuração de fontes, guarda em cache os recursos externos do template
+  (folha e arquivos das fontes, buscados uma única vez) e renderiza um
+  certificado de aquecimento ao iniciar;
+- `enqueue` registra o job e retorna na hora; a situação de cada
+  certificado (queued, done, failed) fica no Redis, visível para todos os
+  processos do serviço;
+- o job é travado no Redis com SET NX EX (`CERTIFICATE_RENDER_LOCK_TTL`):
+  só um processo do serviço renderiza cada certificado. Uma thread do
+  processo renova a trava enquanto o job espera no pool e enquanto
+  renderiza; se o processo morrer, a trava expira e a situação "queued" sem
+  trava passa a ser informada como interrompida, sem esperar o TTL da
+  situação;
+- a renderização tem limite de `CERTIFICATE_RENDER_TIMEOUT` segundos,
+  contados do início dela no processo do pool (a espera na fila não conta).
+  O processo do pool interrompe a renderização com SIGALRM; se ela não
+  voltar (presa em código nativo), o serviço desiste do job e deixa de
+  renovar a trava;
+- se um processo do pool morrer, o pool fica quebrado (BrokenProcessPool)
+  e é recriado no próximo envio;
+- o arquivo é gravado em um temporário no mesmo diretório e movido com
+  `os.replace`: quem lê o armazenamento nunca encontra um PDF pela metade.
+
+Sem o WeasyPrint instalado, o worker grava o certificado em texto.
+"""
+import contextlib
+import functools
+import logging
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import redis
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from app.core.config import settings
+from app.db.redis import get_redis
+
+logger = logging.getLogger(__name__)
+
+try:
+    from weasyprint import CSS, HTML, default_url_fetcher
+    from weasyprint.text.fonts import FontConfiguration
+    WEASYPRINT_AVAILABLE = True
+except ImportError:
+    WEASYPRINT_AVAILABLE = False
+
+TEMPLATE_DIR = str(Path(__file__).parent.parent / "templates")
+TEMPLATE_NAME = "certificate.html"
+
+# Situação da renderização de um certificado
+STATUS_QUEUED = "queued"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+# Libera a trava do job só se ela ainda for deste processo
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Renova a validade da trava do job só se ela ainda for deste processo
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+PAGE_CSS = """
+    @page {
+        size: A4 landscape;
+        margin: 0;
+    }
+    body {
+        margin: 0;
+        padding: 0;
+    }
+"""
+
+TEXT_TEMPLATE = """
+=======================================
+          CERTIFICADO
+=======================================
+
+Certificamos que
+
+{user_name}
+
+concluiu com sucesso o plano de estudos
+
+"{plan_title}"
+
+em {completion_date}
+
+Código de verificação: {certificate_code}
+=======================================
+"""
+
+
+@dataclass(frozen=True)
+class RenderJob:
+    """Dados de um certificado a renderizar (enviados ao processo do pool)."""
+    certificate_id: str
+    user_name: str
+    plan_title: str
+    completion_date: str  # dd/mm/aaaa
+    certificate_code: str
+
+
+_WARMUP_JOB = RenderJob(
+    certificate_id="warmup",
+    user_name="Maria da Silva",
+    plan_title="Plano de aquecimento",
+    completion_date="01/01/2024",
+    certificate_code="FCJ-WARMUP"
+)
+
+
+def certificate_path(storage_path: str, certificate_id: str) -> str:
+    """Caminho do certificado no armazenamento (PDF ou texto)."""
+    extension = "pdf" if WEASYPRINT_AVAILABLE else "txt"
+    return os.path.join(storage_path, f"{certificate_id}.{extension}")
+
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Grava o arquivo via temporário no mesmo diretório + os.replace."""
+    fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path) or ".", prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+# Processo do pool
+
+# Template, CSS e fontes carregados uma vez por processo em _init_worker
+_worker: Dict[str, Any] = {}
+
+
+@functools.lru_cache(maxsize=64)
+def _fetch(url: str) -> Dict[str, Any]:
+    result = default_url_fetcher(url)
+    if "file_obj" in result:
+        file_obj = result.pop("file_obj")
+        result["string"] = file_obj.read()
+        file_obj.close()
+    return result
+
+
+def _cached_url_fetcher(url: str) -> Dict[str, Any]:
+    """Recursos do template (fontes, imagens) buscados uma vez por processo."""
+    return dict(_fetch(url))
+
+
+def _init_worker(
+    template_dir: str,
+    storage_path: str,
+    timeout: Optional[float] = None
+) -> None:
+    environment = Environment(
+        loader=FileSystemLoader(template_dir),
+        autoescape=select_autoescape(["html"])
+    )
+    _worker["template"] = environment.get_template(TEMPLATE_NAME)
+    _worker["template_dir"] = template_dir
+    _worker["storage_path"] = storage_path
+    _worker["timeout"] = timeout
+    os.makedirs(storage_path, exist_ok=True)
+
+    if WEASYPRINT_AVAILABLE:
+        font_config = FontConfiguration()
+        _worker["font_config"] = font_config
+        _worker["stylesheets"] = [CSS(string=PAGE_CSS, font_config=font_config)]
+        # Aquecimento: carrega as fontes e os recursos externos do template
+        try:
+            _render_pdf(_WARMUP_JOB)
+        except Exception as e:
+            logger.warning(f"Erro no aquecimento do renderizador de certificados: {str(e)}")
+
+
+def _render_pdf(job: RenderJob) -> bytes:
+    html = _worker["template"].render(**asdict(job))
+    return HTML(
+        string=html,
+        base_url=_worker["template_dir"],
+        url_fetcher=_cached_url_fetcher
+    ).write_pdf(
+        stylesheets=_worker["stylesheets"],
+        font_config=_worker["font_config"]
+    )
+
+
+@contextlib.contextmanager
+def _time_limit(seconds: Optional[float]):
+    """
+    Interrompe o bloco com TimeoutError após `seconds` (SIGALRM).
+
+    Só vale na thread principal de um processo com SIGALRM, caso dos
+    processos do pool; fora deles o bloco roda sem limite.
+    """
+    if (not seconds or not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    def expired(signum, frame):
+        raise TimeoutError(f"Renderização excedeu {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, expired)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _render(job: RenderJob) -> str:
+    """Renderiza e grava o certificado; retorna o caminho do arquivo."""
+    with _time_limit(_worker.get("timeout")):
+        if WEASYPRINT_AVAILABLE:
+            data = _render_pdf(job)
+        else:
+            data = TEXT_TEMPLATE.format(**asdict(job)).encode("utf-8")
+        path = certificate_path(_worker["storage_path"], job.certificate_id)
+        write_atomic(path, data)
+    return path
+
+
+def _ping() -> bool:
+    return True
+
+
+# Processo do serviço
+
+
+class CertificateRenderer:
+    """
+    Pool de processos de renderização e situação dos jobs no Redis.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.CERTIFICATE_RENDER_WORKERS,
+        storage_path: str = settings.CERTIFICATES_STORAGE_PATH,
+        redis_client: redis.Redis = None
+    ):
+        self.workers = workers
+        self.storage_path = storage_path
+        self.redis = redis_client or get_redis()
+        self._release = self.redis.register_script(_RELEASE_SCRIPT)
+        self._renew = self.redis.register_script(_RENEW_SCRIPT)
+        # Dono das travas gravadas por este processo
+        self._token = uuid.uuid4().hex
+        self.lock_ttl = settings.CERTIFICATE_RENDER_LOCK_TTL
+        self.timeout = settings.CERTIFICATE_RENDER_TIMEOUT
+        self.executor = self._new_executor()
+        self._pending: Dict[str, Future] = {}
+        # Início observado de cada renderização (time.monotonic)
+        self._started: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._keepalive = threading.Thread(
+            target=self._keep_locks, name="certificate-render-locks", daemon=True)
+        self._keepalive.start()
+        os.makedirs(storage_path, exist_ok=True)
+
+    @staticmethod
+    def key(certificate_id: str) -> str:
+        return f"study:certificate-render:{certificate_id}"
+
+    @staticmethod
+    def lock_key(certificate_id: str) -> str:
+        return f"study:certificate-render:{certificate_id}:lock"
+
+    def _new_executor(self) -> Executor:
+        # spawn: os processos não herdam conexões nem threads do servidor
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(TEMPLATE_DIR, self.storage_path, self.timeout)
+        )
+
+    def _submit(self, fn, *args) -> Future:
+        """Envia ao pool, recriando-o se estiver quebrado (chamar com _lock)."""
+        try:
+            return self.executor.submit(fn, *args)
+        except BrokenProcessPool:
+            logger.warning("Pool de renderização de certificados quebrado; recriando os processos")
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = self._new_executor()
+            return self.executor.submit(fn, *args)
+
+    def warm_up(self) -> None:
+        """Inicia os processos do pool (carregam template e fontes ao iniciar)."""
+        with self._lock:
+            for _ in range(self.workers):
+                self._submit(_ping)
+
+    def path(self, certificate_id: str) -> Optional[str]:
+        """Caminho do certificado já renderizado ou None."""
+        path = certificate_path(self.storage_path, certificate_id)
+        return path if os.path.exists(path) else None
+
+    def _set_status(self, certificate_id: str, status: str, error: str = "") -> None:
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hset(self.key(certificate_id), mapping={"status": status, "error": error})
+            pipe.expire(self.key(certificate_id), settings.CERTIFICATE_RENDER_STATUS_TTL)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao gravar situação do certificado no cache: {str(e)}")
+
+    def _acquire(self, certificate_id: str) -> bool:
+        """Trava o job para este processo; False se outro já o renderiza."""
+        try:
+            return bool(self.redis.set(
+                self.lock_key(certificate_id), self._token,
+                nx=True, ex=self.lock_ttl))
+        except redis.RedisError as e:
+            # Sem Redis, a deduplicação fica restrita a este processo
+            logger.warning(f"Erro ao travar renderização do certificado no cache: {str(e)}")
+            return True
+
+    def _release_lock(self, certificate_id: str) -> None:
+        try:
+            self._release(keys=[self.lock_key(certificate_id)], args=[self._token])
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao liberar renderização do certificado no cache: {str(e)}")
+
+    def _keep_locks(self) -> None:
+        """Renova as travas dos jobs deste processo até o shutdown."""
+        while not self._stopping.wait(self.lock_ttl / 3):
+            self.renew_locks()
+
+    def renew_locks(self) -> None:
+        """
+        Renova a trava de cada job pendente e desiste dos que passaram do
+        tempo máximo de renderização sem terminar.
+        """
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for certificate_id, future in self._pending.items():
+                if future.running():
+                    # Observado depois do início real: o limite do processo
+                    # do pool esgota antes deste
+                    started = self._started.setdefault(certificate_id, now)
+                    if now - started > self.timeout:
+                        expired.append((certificate_id, future))
+            for certificate_id, _ in expired:
+                self._pending.pop(certificate_id)
+                self._started.pop(certificate_id, None)
+            pending = list(self._pending)
+
+        for certificate_id, future in expired:
+            logger.error(
+                f"Renderização do certificado {certificate_id} excedeu "
+                f"{self.timeout}s; job abandonado")
+            self._set_status(certificate_id, STATUS_FAILED, "Tempo de renderização esgotado")
+            self._release_lock(certificate_id)
+
+        for certificate_id in pending:
+            try:
+                if not self._renew(keys=[self.lock_key(certificate_id)],
+                                   args=[self._token, self.lock_ttl]):
+                    logger.warning(
+                        f"Trava da renderização do certificado {certificate_id} perdida")
+            except redis.RedisError as e:
+                logger.warning(f"Erro ao renovar renderização do certificado no cache: {str(e)}")
+
+    def status(self, certificate_id: str) -> Optional[Dict[str, str]]:
+        """
+        Situação da renderização do certificado.
+
+        Returns:
+            {"status": ..., "error": ...} ou None se nunca foi enfileirado
+        """
+        if self.path(certificate_id):
+            return {"status": STATUS_DONE, "error": ""}
+        if certificate_id in self._pending:
+            return {"status": STATUS_QUEUED, "error": ""}
+        try:
+            pipe = self.redis.pipeline()
+            pipe.hgetall(self.key(certificate_id))
+            pipe.exists(self.lock_key(certificate_id))
+            status, locked = pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao ler situação do certificado do cache: {str(e)}")
+            return None
+        if status.get("status") == STATUS_QUEUED and not locked:
+            # A trava expirou sem o job terminar: o processo que o renderizava morreu
+            return {"status": STATUS_FAILED,
+                    "error": "Renderização interrompida; solicite o PDF novamente"}
+        return status or None
+
+    def enqueue(self, job: RenderJob, force: bool = False) -> Dict[str, str]:
+        """
+        Enfileira a renderização e retorna sem esperar por ela.
+
+        Args:
+            job: Dados do certificado
+            force: Renderiza de novo mesmo se o arquivo já existir
+
+        Returns:
+            Situação do certificado após o enfileiramento
+        """
+        certificate_id = job.certificate_id
+        with self._lock:
+            if certificate_id in self._pending:
+                return {"status": STATUS_QUEUED, "error": ""}
+            if not force and self.path(certificate_id):
+                return {"status": STATUS_DONE, "error": ""}
+            if not self._acquire(certificate_id):
+                # Outro processo do serviço já está renderizando o certificado
+                return {"status": STATUS_QUEUED, "error": ""}
+            self._set_status(certificate_id, STATUS_QUEUED)
+            try:
+                future = self._submit(_render, job)
+            except Exception as e:
+                self._set_status(certificate_id, STATUS_FAILED, str(e))
+                self._release_lock(certificate_id)
+                raise
+            self._pending[certificate_id] = future
+        future.add_done_callback(
+            functools.partial(self._finished, certificate_id))
+        return {"status": STATUS_QUEUED, "error": ""}
+
+    def _finished(self, certificate_id: str, future: Future) -> None:
+        with self._lock:
+            if self._pending.get(certificate_id) is not future:
+                # Job abandonado por tempo esgotado; a situação já foi gravada
+                return
+            self._pending.pop(certificate_id)
+            self._started.pop(certificate_id, None)
+        if future.cancelled():
+            self._set_status(certificate_id, STATUS_FAILED, "Renderização cancelada")
+        elif future.exception() is None:
+            logger.info(f"Certificado {certificate_id} gravado em {future.result()}")
+            self._set_status(certificate_id, STATUS_DONE)
+        else:
+            error = future.exception()
+            logger.error(f"Erro ao renderizar certificado {certificate_id}: {str(error)}")
+            self._set_status(certificate_id, STATUS_FAILED, str(error))
+        # A situação é gravada antes: sem trava, "queued" indica job interrompido
+        self._release_lock(certificate_id)
+
+    def shutdown(self) -> None:
+        self._stopping.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self._keepalive.join()
+
+
+# Pool do processo (criado no startup ou no primeiro uso)
+_renderer: Optional[CertificateRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_certificate_renderer() -> CertificateRenderer:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = CertificateRenderer()
+        return _renderer
+
+
+def init_certificate_renderer() -> CertificateRenderer:
+    """Cria o pool e inicia os processos de renderização."""
+    renderer = get_certificate_renderer()
+    renderer.warm_up()
+    logger.info(f"Renderizador de certificados iniciado com {renderer.workers} processos")
+    return renderer
+
+
+def shutdown_certificate_renderer() -> None:
+    global _renderer
+    with _renderer_lock:
+        if _renderer is not None:
+            _renderer.shutdown()
+            _renderer = None
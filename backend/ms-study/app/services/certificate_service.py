@@ -1,15 +1,10 @@
-import os
 import uuid
 import logging
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from io import BytesIO
-from pathlib import Path
 
 import httpx
-from weasyprint import HTML, CSS
-from jinja2 import Environment, FileSystemLoader
-from weasyprint.text.fonts import FontConfiguration
 
 from app.repositories.certificate_repository import CertificateRepository
 from app.repositories.study_plan_repository import StudyPlanRepository
@@ -18,6 +13,7 @@ from app.models.certificate import Certificate
 from app.schemas.certificate import ShareCertificateRequest, ShareCertificateResponse, CertificateList, Certificate as CertificateSchema, CertificateCreate, CertificateDetail
 from app.core.config import settings
 from app.services.user_service import UserService
+from app.services.certificate_renderer import RenderJob, certificate_path, get_certificate_renderer
 from sqlalchemy.orm import Session
 from sqlalchemy.future import select
 from sqlalchemy import desc, asc
@@ -26,17 +22,6 @@ from sqlalchemy.sql import func
 # Configurar logger
 logger = logging.getLogger(__name__)
 
-# Importar WeasyPrint de forma segura
-try:
-    from weasyprint import HTML, CSS
-    from weasyprint.text.fonts import FontConfiguration
-    WEASYPRINT_AVAILABLE = True
-    logging.info("WeasyPrint importado com sucesso. PDFs serão gerados.")
-except ImportError:
-    WEASYPRINT_AVAILABLE = False
-    logging.warning(
-        "WeasyPrint não está disponível. Serão gerados apenas certificados em texto.")
-
 
 class CertificateService:
     """
@@ -57,13 +42,28 @@ class CertificateService:
         self.user_service = user_service
         self.db = db
 
-        # Configurar o ambiente Jinja2 para os templates de certificados
-        self.template_dir = Path(__file__).parent.parent / "templates"
-        self.template_env = Environment(
-            loader=FileSystemLoader(self.template_dir))
+        # Renderização dos PDFs em um pool de processos (ver certificate_renderer)
+        self.renderer = get_certificate_renderer()
+
+    @classmethod
+    def from_db(cls, db: Session) -> "CertificateService":
+        """
+        Cria o serviço e seus repositórios a partir da sessão do banco
+        (usado pelas rotas, que recebem apenas a sessão).
+
+        Args:
+            db: Sessão do banco de dados
 
-        # Criar diretório de armazenamento de certificados, se não existir
-        os.makedirs(settings.CERTIFICATE_STORAGE_PATH, exist_ok=True)
+        Returns:
+            Instância de CertificateService
+        """
+        return cls(
+            CertificateRepository(db),
+            StudyPlanRepository(db),
+            UserStudyProgressRepository(db),
+            UserService(),
+            db
+        )
 
     async def generate_certificate(self, user_id: uuid.UUID, study_plan_id: uuid.UUID) -> Optional[Certificate]:
         """
@@ -113,7 +113,7 @@ class CertificateService:
             logger.info(
                 f"Certificado gerado com sucesso: {certificate.id} para plano {study_plan_id} do usuário {user_id}")
 
-            # Gerar o PDF do certificado (salvar no armazenamento)
+            # Enfileirar o PDF do certificado (gravado no armazenamento pelo pool)
             await self._generate_certificate_pdf(certificate.id)
 
             return certificate
@@ -290,15 +290,38 @@ class CertificateService:
 
         return generated_certificates
 
+    async def _render_job(self, certificate: Certificate, plan_title: str) -> RenderJob:
+        """
+        Dados do certificado para a renderização.
+
+        Args:
+            certificate: Certificado
+            plan_title: Título do plano de estudo concluído
+
+        Returns:
+            Job de renderização
+        """
+        user_name = await self.user_service.get_user_name(certificate.user_id)
+        return RenderJob(
+            certificate_id=str(certificate.id),
+            user_name=user_name,
+            plan_title=plan_title,
+            completion_date=certificate.completion_date.strftime("%d/%m/%Y"),
+            certificate_code=certificate.certificate_code
+        )
+
     async def _generate_certificate_pdf(self, certificate_id: uuid.UUID) -> bool:
         """
-        Gera o PDF de um certificado e o salva no armazenamento.
+        Enfileira a geração do PDF de um certificado.
+
+        A renderização roda no pool de processos e o PDF é gravado no
+        armazenamento; o método retorna sem esperar por ela.
 
         Args:
             certificate_id: ID do certificado.
 
         Returns:
-            True se o PDF foi gerado com sucesso, False caso contrário.
+            True se a renderização foi enfileirada, False caso contrário.
         """
         try:
             # Buscar dados do certificado
@@ -310,50 +333,16 @@ class CertificateService:
 
             cert, plan = result
 
-            # Obter o nome do usuário
-            user_name = await self.user_service.get_user_name(cert.user_id)
-
-            # Dados para o template
-            template_data = {
-                "certificate_code": cert.certificate_code,
-                "user_name": user_name,
-                "plan_title": plan.title,
-                "completion_date": cert.completed_at.strftime("%d/%m/%Y"),
-                "certificate_id": str(cert.id)
-            }
-
-            # Renderizar o HTML do certificado
-            template = self.template_env.get_template("certificate.html")
-            html_content = template.render(**template_data)
-
-            # Converter HTML para PDF com WeasyPrint
-            html = HTML(string=html_content)
-            css = CSS(string="""
-                @page {
-                    size: A4 landscape;
-                    margin: 0;
-                }
-                body {
-                    margin: 0;
-                    padding: 0;
-                }
-            """)
-
-            pdf_output = html.write_pdf(stylesheets=[css])
-
-            # Salvar o PDF no armazenamento
-            pdf_path = os.path.join(
-                settings.CERTIFICATE_STORAGE_PATH, f"{certificate_id}.pdf")
-            with open(pdf_path, "wb") as f:
-                f.write(pdf_output)
+            job = await self._render_job(cert, plan.title)
+            self.renderer.enqueue(job)
 
             logger.info(
-                f"PDF do certificado {certificate_id} gerado com sucesso em {pdf_path}")
+                f"PDF do certificado {certificate_id} enfileirado para renderização")
             return True
 
         except Exception as e:
             logger.exception(
-                f"Erro ao gerar PDF do certificado {certificate_id}: {str(e)}")
+                f"Erro ao enfileirar PDF do certificado {certificate_id}: {str(e)}")
             return False
 
     async def get_user_certificates(
@@ -382,7 +371,7 @@ class CertificateService:
 
         # Contar total para paginação
         count_query = select(Certificate).where(Certificate.user_id == user_id)
-        result = await self.db.execute(count_query)
+        result = self.db.execute(count_query)
         total = len(result.scalars().all())
 
         # Ordenar resultados
@@ -400,7 +389,7 @@ class CertificateService:
         query = query.offset(skip).limit(limit)
 
         # Executar a consulta
-        result = await self.db.execute(query)
+        result = self.db.execute(query)
         certificates = result.scalars().all()
 
         # Converter para o schema
@@ -424,7 +413,7 @@ class CertificateService:
             (Certificate.user_id == data.user_id) &
             (Certificate.plan_id == data.plan_id)
         )
-        result = await self.db.execute(existing_query)
+        result = self.db.execute(existing_query)
         existing = result.scalars().first()
 
         if existing:
@@ -434,8 +423,10 @@ class CertificateService:
             existing.verse_reference = data.verse_reference
             existing.plan_title = data.plan_title
             existing.user_name = data.user_name
-            await self.db.commit()
-            await self.db.refresh(existing)
+            self.db.commit()
+            self.db.refresh(existing)
+
+            await self._enqueue_pdf(existing)
 
             return CertificateDetail.model_validate(existing)
 
@@ -458,8 +449,11 @@ class CertificateService:
         )
 
         self.db.add(new_certificate)
-        await self.db.commit()
-        await self.db.refresh(new_certificate)
+        self.db.commit()
+        self.db.refresh(new_certificate)
+
+        # Enfileirar o PDF; a conclusão retorna sem esperar a renderização
+        await self._enqueue_pdf(new_certificate)
 
         return CertificateDetail.model_validate(new_certificate)
 
@@ -474,7 +468,7 @@ class CertificateService:
             Certificado encontrado ou None
         """
         query = select(Certificate).where(Certificate.id == certificate_id)
-        result = await self.db.execute(query)
+        result = self.db.execute(query)
         return result.scalars().first()
 
     async def get_certificate_detail(self, certificate_id: str) -> Optional[CertificateDetail]:
@@ -508,8 +502,8 @@ class CertificateService:
         if not certificate:
             return False
 
-        await self.db.delete(certificate)
-        await self.db.commit()
+        self.db.delete(certificate)
+        self.db.commit()
 
         return True
 
@@ -533,7 +527,7 @@ class CertificateService:
             (Certificate.plan_id == plan_id)
         )
 
-        result = await self.db.execute(query)
+        result = self.db.execute(query)
         certificate = result.scalars().first()
 
         if not certificate:
@@ -557,105 +551,63 @@ class CertificateService:
             return False
 
         certificate.download_count += 1
-        await self.db.commit()
+        self.db.commit()
 
         return True
 
-    async def generate_certificate_pdf(self, certificate_id: str) -> bytes:
+    async def _enqueue_pdf(self, certificate: Certificate) -> Dict[str, str]:
         """
-        Gera o PDF do certificado.
+        Enfileira a renderização do PDF do certificado, sem esperar por ela.
 
-        Em uma implementação real, isso usaria uma biblioteca como ReportLab ou WeasyPrint
-        para gerar um PDF bonito, ou chamaria um serviço externo como Microservice.
+        Args:
+            certificate: Certificado
+
+        Returns:
+            Situação da renderização
+        """
+        try:
+            job = await self._render_job(certificate, certificate.study_plan.title)
+            return self.renderer.enqueue(job)
+        except Exception as e:
+            logger.error(f"Erro ao enfileirar PDF do certificado: {str(e)}")
+            return {"status": "failed", "error": str(e)}
+
+    async def request_certificate_pdf(self, certificate_id: str) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Retorna o PDF do certificado se já estiver pronto; senão, enfileira a
+        renderização.
 
         Args:
             certificate_id: ID do certificado
 
         Returns:
-            PDF do certificado em binário
+            Tupla com o caminho do arquivo (ou None se ainda não estiver
+            pronto) e a situação da renderização
+
+        Raises:
+            ValueError: Se o certificado não existir
         """
-        certificate = await self.get_certificate_detail(certificate_id)
+        path = self.renderer.path(certificate_id)
+        if path:
+            return path, {"status": "done", "error": ""}
 
+        certificate = await self.get_certificate_by_id(certificate_id)
         if not certificate:
             raise ValueError("Certificado não encontrado")
 
-        try:
-            # Exemplo: chamada para um microservice de geração de PDF (mock)
-            # Na implementação real, isso seria integrado com um serviço de geração de PDF
-
-            # Opção 1: Gerar o PDF localmente com uma biblioteca
-            pdf_data = self._generate_pdf_locally(certificate)
-            return pdf_data
-
-            # Opção 2: Chamar um microservice dedicado (exemplo)
-            # return await self._call_pdf_service(certificate)
-
-        except Exception as e:
-            logger.error(f"Erro ao gerar PDF do certificado: {str(e)}")
-            raise
+        return None, await self._enqueue_pdf(certificate)
 
-    def _generate_pdf_locally(self, certificate: CertificateDetail) -> bytes:
+    def get_certificate_pdf_status(self, certificate_id: str) -> Optional[Dict[str, str]]:
         """
-        Gera um PDF simples localmente usando uma biblioteca como ReportLab.
-
-        Esta é uma implementação de exemplo/mock. Em uma aplicação real,
-        você precisaria instalar e usar uma biblioteca como ReportLab ou WeasyPrint.
+        Situação da renderização do PDF do certificado.
 
         Args:
-            certificate: Detalhes do certificado
+            certificate_id: ID do certificado
 
         Returns:
-            PDF do certificado em binário
+            {"status": "queued" | "done" | "failed", "error": ...} ou None
         """
-        # Simulação: em uma implementação real, este código geraria um PDF real
-        # Usando uma biblioteca como ReportLab:
-        #
-        # from reportlab.pdfgen import canvas
-        # from reportlab.lib.pagesizes import A4
-        # from reportlab.lib.units import cm
-        #
-        # buffer = BytesIO()
-        # c = canvas.Canvas(buffer, pagesize=A4)
-        #
-        # # Adicionar conteúdo ao PDF
-        # c.setFont("Helvetica", 24)
-        # c.drawCentredString(A4[0]/2, A4[1]-5*cm, "CERTIFICADO DE CONCLUSÃO")
-        #
-        # c.setFont("Helvetica", 16)
-        # c.drawCentredString(A4[0]/2, A4[1]-8*cm, f"Certifica-se que {certificate.user_name}")
-        # c.drawCentredString(A4[0]/2, A4[1]-10*cm, f"concluiu com sucesso o plano de estudos:")
-        # c.drawCentredString(A4[0]/2, A4[1]-12*cm, f"{certificate.plan_title}")
-        #
-        # c.setFont("Helvetica", 12)
-        # c.drawCentredString(A4[0]/2, A4[1]-16*cm, f"Data de conclusão: {certificate.completion_date.strftime('%d/%m/%Y')}")
-        # c.drawCentredString(A4[0]/2, A4[1]-17*cm, f"Código de validação: {certificate.certificate_code}")
-        #
-        # c.setFont("Helvetica-Italic", 14)
-        # c.drawCentredString(A4[0]/2, A4[1]-20*cm, f'"{certificate.verse}"')
-        # c.drawCentredString(A4[0]/2, A4[1]-21*cm, f"{certificate.verse_reference}")
-        #
-        # c.save()
-        # pdf_data = buffer.getvalue()
-        # buffer.close()
-        # return pdf_data
-
-        # Simulação para desenvolvimento (retorna um PDF simples)
-        pdf_content = f"""
-        CERTIFICADO DE CONCLUSÃO
-        
-        Certifica-se que {certificate.user_name}
-        concluiu com sucesso o plano de estudos:
-        
-        {certificate.plan_title}
-        
-        Data de conclusão: {certificate.completion_date.strftime('%d/%m/%Y')}
-        Código de validação: {certificate.certificate_code}
-        
-        "{certificate.verse}"
-        {certificate.verse_reference}
-        """.encode('utf-8')
-
-        return pdf_content
+        return self.renderer.status(certificate_id)
 
     async def _call_pdf_service(self, certificate: CertificateDetail) -> bytes:
         """
@@ -754,7 +706,7 @@ class CertificateService:
             (Certificate.plan_id == plan_id)
         )
 
-        result = await self.db.execute(query)
+        result = self.db.execute(query)
         certificate = result.scalars().first()
 
         if not certificate:
@@ -766,7 +718,7 @@ class CertificateService:
                                    plan_title: str, completion_date: datetime,
                                    certificate_code: str) -> str:
         """
-        Gera o arquivo de certificado (PDF ou TXT).
+        Enfileira a geração do arquivo de certificado (PDF ou TXT).
 
         Args:
             certificate_id: ID do certificado
@@ -776,97 +728,14 @@ class CertificateService:
             certificate_code: Código do certificado
 
         Returns:
-            str: Caminho para o arquivo gerado
-        """
-        if WEASYPRINT_AVAILABLE:
-            return self._generate_pdf_certificate(
-                certificate_id, user_name, plan_title,
-                completion_date, certificate_code
-            )
-        else:
-            return self._generate_text_certificate(
-                certificate_id, user_name, plan_title,
-                completion_date, certificate_code
-            )
-
-    def _generate_pdf_certificate(self, certificate_id: int, user_name: str,
-                                  plan_title: str, completion_date: datetime,
-                                  certificate_code: str) -> str:
-        """
-        Gera um certificado em PDF usando WeasyPrint.
-        """
-        try:
-            # Caminho para salvar o PDF
-            pdf_path = f"{settings.CERTIFICATE_STORAGE_PATH}/certificate_{certificate_id}.pdf"
-
-            # Ler o template HTML e substituir as variáveis
-            with open(self.template_dir / "certificate.html", 'r') as f:
-                html_template = f.read()
-
-            # Substituir variáveis no template
-            html_content = html_template.replace('{{user_name}}', user_name)
-            html_content = html_content.replace('{{plan_title}}', plan_title)
-            html_content = html_content.replace(
-                '{{completion_date}}', completion_date.strftime("%d/%m/%Y"))
-            html_content = html_content.replace(
-                '{{certificate_code}}', certificate_code)
-
-            # Configurar fontes e CSS
-            font_config = FontConfiguration()
-
-            # Gerar PDF
-            HTML(string=html_content).write_pdf(
-                pdf_path,
-                font_config=font_config
-            )
-
-            logger.info(f"Certificado PDF gerado com sucesso: {pdf_path}")
-            return pdf_path
-        except Exception as e:
-            logger.error(f"Erro ao gerar PDF do certificado: {str(e)}")
-            # Fallback para certificado em texto em caso de erro
-            return self._generate_text_certificate(
-                certificate_id, user_name, plan_title,
-                completion_date, certificate_code
-            )
-
-    def _generate_text_certificate(self, certificate_id: int, user_name: str,
-                                   plan_title: str, completion_date: datetime,
-                                   certificate_code: str) -> str:
-        """
-        Gera um certificado em texto simples como fallback.
-        """
-        try:
-            # Caminho para salvar o arquivo de texto
-            text_path = f"{settings.CERTIFICATE_STORAGE_PATH}/certificate_{certificate_id}.txt"
-
-            # Criar conteúdo do certificado em texto
-            certificate_text = f"""
-            =======================================
-                      CERTIFICADO
-            =======================================
-            
-            Certificamos que
-            
-            {user_name}
-            
-            concluiu com sucesso o plano de estudos
-            
-            "{plan_title}"
-            
-            em {completion_date.strftime("%d/%m/%Y")}
-            
-            Código de verificação: {certificate_code}
-            =======================================
-            """
-
-            # Salvar arquivo
-            with open(text_path, 'w') as f:
-                f.write(certificate_text)
-
-            logger.info(
-                f"Certificado em texto gerado com sucesso: {text_path}")
-            return text_path
-        except Exception as e:
-            logger.error(f"Erro ao gerar certificado em texto: {str(e)}")
-            return ""
+            str: Caminho em que o arquivo será gravado
+        """
+        job = RenderJob(
+            certificate_id=str(certificate_id),
+            user_name=user_name,
+            plan_title=plan_title,
+            completion_date=completion_date.strftime("%d/%m/%Y"),
+            certificate_code=certificate_code
+        )
+        self.renderer.enqueue(job)
+        return certificate_path(self.renderer.storage_path, job.certificate_id)
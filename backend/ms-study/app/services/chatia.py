@@ -1,6 +1,6 @@
-import httpx
 from typing import Dict, List
 from app.core.config import settings
+from app.core.internal_client import internal_client
 
 
 class ChatIAService:
@@ -14,18 +14,17 @@ class ChatIAService:
         """
         Gera um plano de estudo personalizado usando o MS-ChatIA.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{settings.CHATIA_URL}/api/v1/study/generate",
-                json={
-                    "objectives": objectives,
-                    "bible_experience_level": bible_experience_level,
-                    "content_preferences": content_preferences,
-                    "preferred_time": preferred_time
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await internal_client.post(
+            f"{settings.MS_CHATIA_URL}/api/v1/study/generate",
+            json={
+                "objectives": objectives,
+                "bible_experience_level": bible_experience_level,
+                "content_preferences": content_preferences,
+                "preferred_time": preferred_time
+            }
+        )
+        response.raise_for_status()
+        return response.json()
 
     @staticmethod
     async def get_study_content(
@@ -35,16 +34,15 @@ class ChatIAService:
         """
         Obtém conteúdo específico para uma seção de estudo.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.CHATIA_URL}/api/v1/study/content",
-                params={
-                    "section_id": section_id,
-                    "content_type": content_type
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await internal_client.get(
+            f"{settings.MS_CHATIA_URL}/api/v1/study/content",
+            params={
+                "section_id": section_id,
+                "content_type": content_type
+            }
+        )
+        response.raise_for_status()
+        return response.json()
 
     @staticmethod
     async def get_study_reflection(
@@ -54,13 +52,12 @@ class ChatIAService:
         """
         Obtém uma reflexão personalizada para uma seção de estudo.
         """
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{settings.CHATIA_URL}/api/v1/study/reflection",
-                params={
-                    "section_id": section_id,
-                    "user_id": user_id
-                }
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await internal_client.get(
+            f"{settings.MS_CHATIA_URL}/api/v1/study/reflection",
+            params={
+                "section_id": section_id,
+                "user_id": user_id
+            }
+        )
+        response.raise_for_status()
+        return response.json()
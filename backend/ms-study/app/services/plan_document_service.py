@@ -0,0 +1,244 @@
+"""
+Documento pré-montado dos planos de estudo.
+
+Cada plano é guardado como um único documento JSON (plano, seções em ordem e
+conteúdos de cada seção), na coluna `study_plans.document` (JSONB) e no
+Redis, na chave `study:plan:{schema}:{plan_id}`. A tela do plano é servida
+com uma leitura por chave: Redis e, na falta dele, a coluna.
+
+O documento é remontado em `create_plan`/`update_plan`, na mesma transação
+da alteração, e gravado no Redis depois do commit. Alterações de seções e
+conteúdos feitas fora desse serviço (repositórios, StudyService) descartam o
+documento na sua transação (`discard_documents`) e apagam a chave do Redis
+depois do commit; a leitura seguinte remonta. `version` aumenta a cada
+remontagem; `schema` muda quando o formato do documento muda, e documentos
+de um formato antigo (ou planos anteriores a este cache) são remontados na
+primeira leitura.
+
+O preenchimento do Redis a partir de uma leitura usa SET NX, para nunca
+sobrescrever um documento mais novo gravado por uma alteração; o TTL limita
+o tempo de vida de qualquer cópia antiga. Se o Redis estiver indisponível,
+as leituras vão direto à coluna.
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+import redis
+from sqlalchemy import null, update
+from sqlalchemy.sql.dml import Update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.redis import get_redis
+from app.models.study_plan import StudyPlan
+from app.models.study_section import StudySection
+from app.models.study_content import StudyContent
+
+logger = logging.getLogger(__name__)
+
+# Formato do documento; documentos de outro formato são remontados
+PLAN_DOCUMENT_SCHEMA = 1
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def discard_documents(plan_ids: Iterable[str]) -> Update:
+    """
+    UPDATE que descarta o documento dos planos, para a transação que alterou
+    seções ou conteúdos; a próxima leitura remonta a partir das tabelas.
+
+    Serve a sessões síncronas e assíncronas. Depois do commit, chame
+    `PlanDocumentService.invalidate` para cada plano.
+    """
+    # updated_at mantido, como em `build`
+    return (
+        update(StudyPlan)
+        .where(StudyPlan.id.in_(list(plan_ids)))
+        .values(document=null(), updated_at=StudyPlan.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+class PlanDocumentService:
+    """
+    Serviço para montar, ler e invalidar o documento de um plano de estudo.
+    """
+
+    def __init__(self, db: Session, redis_client: redis.Redis = None):
+        self.db = db
+        self.redis = redis_client or get_redis()
+
+    @staticmethod
+    def key(plan_id: str) -> str:
+        return f"study:plan:{PLAN_DOCUMENT_SCHEMA}:{plan_id}"
+
+    def build(self, study_plan: StudyPlan) -> Dict[str, Any]:
+        """
+        Monta o documento do plano a partir das tabelas e grava na coluna.
+
+        Seções e conteúdos vêm de uma única consulta. Não faz commit: o
+        documento entra na transação de quem alterou o plano.
+
+        Args:
+            study_plan: Plano de estudo (já na sessão)
+
+        Returns:
+            Documento do plano
+        """
+        self.db.flush()
+
+        rows = self.db.query(StudySection, StudyContent).outerjoin(
+            StudyContent, StudyContent.section_id == StudySection.id
+        ).filter(
+            StudySection.study_plan_id == study_plan.id
+        ).order_by(
+            StudySection.position, StudySection.id,
+            StudyContent.position, StudyContent.id
+        ).all()
+
+        sections = []
+        by_id = {}
+        for section, content in rows:
+            if section.id not in by_id:
+                by_id[section.id] = {
+                    "id": section.id,
+                    "study_plan_id": section.study_plan_id,
+                    "title": section.title,
+                    "description": section.description,
+                    "position": section.position,
+                    "duration_minutes": section.duration_minutes,
+                    "bible_reference": section.bible_reference,
+                    "created_at": _iso(section.created_at),
+                    "updated_at": _iso(section.updated_at),
+                    "contents": []
+                }
+                sections.append(by_id[section.id])
+            if content is not None:
+                by_id[section.id]["contents"].append({
+                    "id": content.id,
+                    "section_id": content.section_id,
+                    "content_type": content.content_type,
+                    "content": content.content,
+                    "position": content.position,
+                    "title": content.title,
+                    "created_at": _iso(content.created_at),
+                    "updated_at": _iso(content.updated_at)
+                })
+
+        version = (study_plan.document_version or 0) + 1
+        document = {
+            "schema": PLAN_DOCUMENT_SCHEMA,
+            "version": version,
+            "id": study_plan.id,
+            "title": study_plan.title,
+            "description": study_plan.description,
+            "category": study_plan.category,
+            "difficulty": study_plan.difficulty,
+            "duration_days": study_plan.duration_days,
+            "image_url": study_plan.image_url,
+            "is_public": bool(study_plan.is_public),
+            "user_id": study_plan.user_id,
+            "created_by_ia": bool(study_plan.created_by_ia),
+            "created_at": _iso(study_plan.created_at),
+            "updated_at": _iso(study_plan.updated_at),
+            "sections_count": len(sections),
+            "sections": sections
+        }
+
+        # updated_at mantido: montar o documento não é uma alteração do plano
+        self.db.execute(
+            update(StudyPlan)
+            .where(StudyPlan.id == study_plan.id)
+            .values(document=document, document_version=version,
+                    updated_at=StudyPlan.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.expire(study_plan, ["document", "document_version"])
+        return document
+
+    def get(self, plan_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Documento do plano: Redis, coluna ou, se ainda não montado, tabelas.
+
+        Args:
+            plan_id: ID do plano de estudo
+
+        Returns:
+            Documento do plano ou None se o plano não existir
+        """
+        try:
+            cached = self.redis.get(self.key(plan_id))
+            if cached:
+                return json.loads(cached)
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao ler documento do plano do cache: {str(e)}")
+
+        row = self.db.query(StudyPlan.document).filter(
+            StudyPlan.id == plan_id).first()
+        if row is None:
+            return None
+
+        document = row.document
+        if not document or document.get("schema") != PLAN_DOCUMENT_SCHEMA:
+            study_plan = self.db.query(StudyPlan).filter(
+                StudyPlan.id == plan_id).first()
+            document = self.build(study_plan)
+            self.db.commit()
+
+        self.store(document, only_missing=True)
+        return document
+
+    def store(self, document: Dict[str, Any], only_missing: bool = False) -> None:
+        """
+        Grava o documento no Redis (chamar depois do commit).
+
+        Args:
+            document: Documento montado por `build`
+            only_missing: Só grava se a chave não existir (preenchimento em leituras)
+        """
+        try:
+            self.redis.set(
+                self.key(document["id"]),
+                json.dumps(document, ensure_ascii=False, separators=(",", ":")),
+                ex=settings.PLAN_DOCUMENT_CACHE_TTL,
+                nx=only_missing
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao gravar documento do plano no cache: {str(e)}")
+
+    def invalidate(self, plan_id: str) -> None:
+        """Apaga o documento do Redis (chamar depois do commit)."""
+        try:
+            self.redis.delete(self.key(plan_id))
+        except redis.RedisError as e:
+            logger.warning(f"Erro ao invalidar documento do plano no cache: {str(e)}")
+
+    @staticmethod
+    def page(
+        document: Dict[str, Any],
+        section_offset: int = 0,
+        section_limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Documento com apenas uma página das seções, para planos muito longos.
+
+        Args:
+            document: Documento completo
+            section_offset: Quantas seções pular
+            section_limit: Quantas seções retornar (None para todas)
+
+        Returns:
+            Cópia rasa do documento com as seções da página
+        """
+        if not section_offset and section_limit is None:
+            return document
+        stop = None if section_limit is None else section_offset + section_limit
+        return {
+            **document,
+            "sections": document["sections"][section_offset:stop],
+            "section_offset": section_offset
+        }
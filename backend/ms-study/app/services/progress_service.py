@@ -1,7 +1,7 @@
 from typing import List, Tuple, Optional, Dict
 from datetime import datetime
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, asc
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, desc, asc, select
 from fastapi import HTTPException, status
 from uuid import uuid4
 
@@ -19,6 +19,72 @@ class ProgressService:
     def __init__(self, db: Session):
         self.db = db
 
+    def _detail_query(self, with_total: bool = False):
+        """
+        Query base dos detalhes de progresso.
+
+        Traz, em uma única consulta, o progresso, os dados do plano e da seção
+        atual (outer joins) e o total de seções do plano (subquery
+        correlacionada, atendida pelo índice (study_plan_id, position)).
+        Com `with_total`, cada linha traz também o total de linhas antes da
+        paginação (count(*) over ()).
+        """
+        current_section = aliased(StudySection)
+        total_sections = (
+            select(func.count(StudySection.id))
+            .where(StudySection.study_plan_id == UserStudyProgress.study_plan_id)
+            .correlate(UserStudyProgress)
+            .scalar_subquery()
+        )
+        columns = [
+            UserStudyProgress,
+            StudyPlan.title.label("plan_title"),
+            StudyPlan.description.label("plan_description"),
+            StudyPlan.duration_days.label("plan_duration_days"),
+            StudyPlan.category.label("plan_category"),
+            StudyPlan.difficulty.label("plan_difficulty"),
+            current_section.title.label("current_section_title"),
+            current_section.position.label("current_section_position"),
+            total_sections.label("total_sections")
+        ]
+        if with_total:
+            columns.append(func.count().over().label("total_count"))
+
+        return (
+            self.db.query(*columns)
+            .outerjoin(StudyPlan, StudyPlan.id == UserStudyProgress.study_plan_id)
+            .outerjoin(current_section,
+                       current_section.id == UserStudyProgress.current_section_id)
+        )
+
+    @staticmethod
+    def _to_detail(row) -> UserStudyProgressDetail:
+        """Converte uma linha de `_detail_query` em UserStudyProgressDetail."""
+        progress = row.UserStudyProgress
+        plan_found = row.plan_title is not None
+        return UserStudyProgressDetail(
+            id=progress.id,
+            user_id=progress.user_id,
+            study_plan_id=progress.study_plan_id,
+            current_section_id=progress.current_section_id,
+            completion_percentage=progress.completion_percentage,
+            last_activity_date=progress.last_activity_date,
+            started_at=progress.started_at,
+            completed_at=progress.completed_at,
+            created_at=progress.created_at,
+            updated_at=progress.updated_at,
+            # Adicionar informações do plano
+            plan_title=row.plan_title if plan_found else "Plano indisponível",
+            plan_description=row.plan_description,
+            plan_duration_days=row.plan_duration_days if plan_found else 0,
+            plan_category=row.plan_category,
+            plan_difficulty=row.plan_difficulty,
+            # Adicionar informações da seção atual
+            current_section_title=row.current_section_title,
+            current_section_position=row.current_section_position,
+            total_sections=row.total_sections or 0
+        )
+
     async def get_user_progress_list(
         self,
         user_id: str,
@@ -42,84 +108,38 @@ class ProgressService:
         Returns:
             Tupla contendo a lista de progressos com detalhes e o total de progressos
         """
-        # Construir a query base
-        query = self.db.query(UserStudyProgress).filter(
-            UserStudyProgress.user_id == user_id)
+        filters = [UserStudyProgress.user_id == user_id]
 
         # Aplicar filtro de conclusão se especificado
         if completed is not None:
             if completed:
-                query = query.filter(
-                    UserStudyProgress.completed_at.isnot(None))
+                filters.append(UserStudyProgress.completed_at.isnot(None))
             else:
-                query = query.filter(UserStudyProgress.completed_at.is_(None))
+                filters.append(UserStudyProgress.completed_at.is_(None))
 
-        # Contar total antes de aplicar paginação
-        total = query.count()
+        # Query base: progresso, plano, seção atual e totais em uma consulta
+        query = self._detail_query(with_total=True).filter(*filters)
 
-        # Aplicar ordenação
+        # Aplicar ordenação (apenas colunas do progresso)
         if sort_by:
-            sort_column = getattr(UserStudyProgress, sort_by,
-                                  UserStudyProgress.last_activity_date)
+            sort_column = UserStudyProgress.__table__.columns.get(
+                sort_by, UserStudyProgress.last_activity_date)
             query = query.order_by(
-                desc(sort_column) if sort_desc else asc(sort_column))
-
-        # Aplicar paginação
-        query = query.offset(skip).limit(limit)
-
-        # Executar a query
-        progress_list = query.all()
-
-        # Converter para objetos UserStudyProgressDetail com informações adicionais
-        result = []
-        for progress in progress_list:
-            # Buscar o plano associado
-            plan = self.db.query(StudyPlan).filter(
-                StudyPlan.id == progress.study_plan_id).first()
-
-            # Buscar a seção atual, se houver
-            current_section = None
-            current_section_title = None
-            current_section_position = None
-            if progress.current_section_id:
-                current_section = self.db.query(StudySection).filter(
-                    StudySection.id == progress.current_section_id
-                ).first()
-                if current_section:
-                    current_section_title = current_section.title
-                    current_section_position = current_section.position
-
-            # Contar total de seções
-            total_sections = self.db.query(StudySection).filter(
-                StudySection.study_plan_id == progress.study_plan_id
-            ).count()
-
-            # Criar objeto UserStudyProgressDetail
-            progress_detail = UserStudyProgressDetail(
-                id=progress.id,
-                user_id=progress.user_id,
-                study_plan_id=progress.study_plan_id,
-                current_section_id=progress.current_section_id,
-                completion_percentage=progress.completion_percentage,
-                last_activity_date=progress.last_activity_date,
-                started_at=progress.started_at,
-                completed_at=progress.completed_at,
-                created_at=progress.created_at,
-                updated_at=progress.updated_at,
-                # Adicionar informações do plano
-                plan_title=plan.title if plan else "Plano indisponível",
-                plan_description=plan.description if plan else None,
-                plan_duration_days=plan.duration_days if plan else 0,
-                plan_category=plan.category if plan else None,
-                plan_difficulty=plan.difficulty if plan else None,
-                # Adicionar informações da seção atual
-                current_section_title=current_section_title,
-                current_section_position=current_section_position,
-                total_sections=total_sections
-            )
-            result.append(progress_detail)
+                desc(sort_column) if sort_desc else asc(sort_column),
+                UserStudyProgress.id)
+
+        # Aplicar paginação e executar (uma ida ao banco)
+        rows = query.offset(skip).limit(limit).all()
+
+        if rows:
+            total = rows[0].total_count
+        elif skip:
+            # Página além do fim: o total vem de uma contagem separada
+            total = self.db.query(func.count(UserStudyProgress.id)).filter(*filters).scalar()
+        else:
+            total = 0
 
-        return result, total
+        return [self._to_detail(row) for row in rows], total
 
     async def get_progress_by_id(self, progress_id: str) -> Optional[UserStudyProgress]:
         """
@@ -143,55 +163,9 @@ class ProgressService:
         Returns:
             Objeto UserStudyProgressDetail ou None se não encontrado
         """
-        # Buscar o progresso
-        progress = await self.get_progress_by_id(progress_id)
-        if not progress:
-            return None
-
-        # Buscar o plano associado
-        plan = self.db.query(StudyPlan).filter(
-            StudyPlan.id == progress.study_plan_id).first()
-
-        # Buscar a seção atual, se houver
-        current_section = None
-        current_section_title = None
-        current_section_position = None
-        if progress.current_section_id:
-            current_section = self.db.query(StudySection).filter(
-                StudySection.id == progress.current_section_id
-            ).first()
-            if current_section:
-                current_section_title = current_section.title
-                current_section_position = current_section.position
-
-        # Contar total de seções
-        total_sections = self.db.query(StudySection).filter(
-            StudySection.study_plan_id == progress.study_plan_id
-        ).count()
-
-        # Criar objeto UserStudyProgressDetail
-        return UserStudyProgressDetail(
-            id=progress.id,
-            user_id=progress.user_id,
-            study_plan_id=progress.study_plan_id,
-            current_section_id=progress.current_section_id,
-            completion_percentage=progress.completion_percentage,
-            last_activity_date=progress.last_activity_date,
-            started_at=progress.started_at,
-            completed_at=progress.completed_at,
-            created_at=progress.created_at,
-            updated_at=progress.updated_at,
-            # Adicionar informações do plano
-            plan_title=plan.title if plan else "Plano indisponível",
-            plan_description=plan.description if plan else None,
-            plan_duration_days=plan.duration_days if plan else 0,
-            plan_category=plan.category if plan else None,
-            plan_difficulty=plan.difficulty if plan else None,
-            # Adicionar informações da seção atual
-            current_section_title=current_section_title,
-            current_section_position=current_section_position,
-            total_sections=total_sections
-        )
+        row = self._detail_query().filter(
+            UserStudyProgress.id == progress_id).first()
+        return self._to_detail(row) if row else None
 
     async def get_progress_by_plan(self, user_id: str, plan_id: str) -> Optional[UserStudyProgressDetail]:
         """
@@ -204,17 +178,11 @@ class ProgressService:
         Returns:
             Objeto UserStudyProgressDetail ou None se não encontrado
         """
-        # Buscar o progresso
-        progress = self.db.query(UserStudyProgress).filter(
+        row = self._detail_query().filter(
             UserStudyProgress.user_id == user_id,
             UserStudyProgress.study_plan_id == plan_id
         ).first()
-
-        if not progress:
-            return None
-
-        # Converter para detalhes completos
-        return await self.get_progress_detail(progress.id)
+        return self._to_detail(row) if row else None
 
     async def start_study_plan(self, progress_data: UserStudyProgressCreate) -> UserStudyProgress:
         """
@@ -461,14 +429,9 @@ class ProgressService:
         Returns:
             Objeto UserStudyProgressDetail ou None se não houver estudo ativo
         """
-        # Buscar o progresso não concluído mais recente
-        progress = self.db.query(UserStudyProgress).filter(
+        # Progresso não concluído mais recente, já com os detalhes
+        row = self._detail_query().filter(
             UserStudyProgress.user_id == user_id,
             UserStudyProgress.completed_at.is_(None)
         ).order_by(desc(UserStudyProgress.last_activity_date)).first()
-
-        if not progress:
-            return None
-
-        # Retornar os detalhes completos
-        return await self.get_progress_detail(progress.id)
+        return self._to_detail(row) if row else None
@@ -8,6 +8,7 @@ from app.schemas.study import (
     StudyContentCreate,
     UserStudyProgressCreate
 )
+from app.services.plan_document_service import PlanDocumentService, discard_documents
 
 
 class StudyService:
@@ -65,7 +66,10 @@ class StudyService:
             **section.model_dump()
         )
         db.add(db_section)
+        # A seção muda o documento pré-montado do plano
+        db.execute(discard_documents([study_plan_id]))
         db.commit()
+        PlanDocumentService(db).invalidate(study_plan_id)
         db.refresh(db_section)
         return db_section
 
@@ -83,7 +87,14 @@ class StudyService:
             **content.model_dump()
         )
         db.add(db_content)
+        # O conteúdo muda o documento pré-montado do plano da seção
+        plan_id = db.query(StudySection.study_plan_id).filter(
+            StudySection.id == section_id).scalar()
+        if plan_id:
+            db.execute(discard_documents([plan_id]))
         db.commit()
+        if plan_id:
+            PlanDocumentService(db).invalidate(plan_id)
         db.refresh(db_content)
         return db_content
 
@@ -1,13 +1,14 @@
 from typing import List, Tuple, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, desc, asc
+from sqlalchemy import func, or_, desc, asc, select
 from fastapi import HTTPException, status
 from uuid import uuid4
 
 from app.models.study_plan import StudyPlan
 from app.models.study_section import StudySection
 from app.models.study_content import StudyContent
-from app.schemas.study_plan import StudyPlanCreate, StudyPlanUpdate, StudyPlanSimple
+from app.schemas.study_plan import StudyPlanCreate, StudyPlanUpdate, StudyPlanSimple, StudyPlanDocument
+from app.services.plan_document_service import PlanDocumentService
 
 
 class StudyPlanService:
@@ -17,6 +18,32 @@ class StudyPlanService:
 
     def __init__(self, db: Session):
         self.db = db
+        self.documents = PlanDocumentService(db)
+
+    @staticmethod
+    def _sections_count():
+        """Total de seções do plano (subquery correlacionada)."""
+        return (
+            select(func.count(StudySection.id))
+            .where(StudySection.study_plan_id == StudyPlan.id)
+            .correlate(StudyPlan)
+            .scalar_subquery()
+            .label("sections_count")
+        )
+
+    @staticmethod
+    def _to_simple(plan: StudyPlan, sections_count: int) -> StudyPlanSimple:
+        return StudyPlanSimple(
+            id=plan.id,
+            title=plan.title,
+            description=plan.description,
+            category=plan.category,
+            difficulty=plan.difficulty,
+            duration_days=plan.duration_days,
+            image_url=plan.image_url,
+            created_at=plan.created_at,
+            sections_count=sections_count or 0
+        )
 
     async def get_plans(
         self,
@@ -85,72 +112,45 @@ class StudyPlanService:
         # Contar total antes de aplicar paginação
         total = query.count()
 
-        # Aplicar ordenação
+        # Aplicar ordenação (apenas colunas do plano)
         if sort_by:
-            sort_column = getattr(StudyPlan, sort_by, StudyPlan.created_at)
+            sort_column = StudyPlan.__table__.columns.get(
+                sort_by, StudyPlan.created_at)
             query = query.order_by(
                 desc(sort_column) if sort_desc else asc(sort_column))
 
-        # Aplicar paginação
-        query = query.offset(skip).limit(limit)
-
-        # Executar a query
-        study_plans = query.all()
-
-        # Converter para objetos StudyPlanSimple e adicionar contagem de seções
-        result = []
-        for plan in study_plans:
-            sections_count = self.db.query(StudySection).filter(
-                StudySection.study_plan_id == plan.id
-            ).count()
-
-            # Criar objeto StudyPlanSimple
-            plan_simple = StudyPlanSimple(
-                id=plan.id,
-                title=plan.title,
-                description=plan.description,
-                category=plan.category,
-                difficulty=plan.difficulty,
-                duration_days=plan.duration_days,
-                image_url=plan.image_url,
-                created_at=plan.created_at,
-                sections_count=sections_count
-            )
-            result.append(plan_simple)
+        # Aplicar paginação, com a contagem de seções na mesma consulta
+        rows = query.add_columns(self._sections_count()).offset(skip).limit(limit).all()
 
-        return result, total
+        return [self._to_simple(plan, sections_count) for plan, sections_count in rows], total
 
-    async def get_plan_by_id(self, plan_id: str) -> StudyPlan:
+    async def get_plan_by_id(
+        self,
+        plan_id: str,
+        section_offset: int = 0,
+        section_limit: Optional[int] = None
+    ) -> Optional[StudyPlanDocument]:
         """
         Retorna um plano de estudo pelo ID, incluindo seções e conteúdos.
 
+        Lê o documento pré-montado do plano (ver PlanDocumentService), uma
+        leitura por chave no Redis ou no banco.
+
         Args:
             plan_id: ID do plano de estudo
+            section_offset: Quantas seções pular (planos muito longos)
+            section_limit: Quantas seções retornar (None para todas)
 
         Returns:
             Plano de estudo com suas seções e conteúdos ou None se não encontrado
         """
-        # Buscar o plano de estudo
-        study_plan = self.db.query(StudyPlan).filter(
-            StudyPlan.id == plan_id).first()
+        document = self.documents.get(plan_id)
 
-        if not study_plan:
+        if not document:
             return None
 
-        # Carregar seções e conteúdos (alternativa a lazy loading)
-        sections = self.db.query(StudySection).filter(
-            StudySection.study_plan_id == plan_id
-        ).order_by(StudySection.position).all()
-
-        for section in sections:
-            contents = self.db.query(StudyContent).filter(
-                StudyContent.section_id == section.id
-            ).order_by(StudyContent.position).all()
-            section.contents = contents
-
-        study_plan.sections = sections
-
-        return study_plan
+        return StudyPlanDocument.model_validate(
+            self.documents.page(document, section_offset, section_limit))
 
     async def create_plan(self, plan_data: StudyPlanCreate) -> StudyPlan:
         """
@@ -209,12 +209,14 @@ class StudyPlanService:
 
                         self.db.add(content)
 
+        # Montar o documento do plano na mesma transação
+        document = self.documents.build(study_plan)
+
         # Salvar as alterações
         self.db.commit()
-        self.db.refresh(study_plan)
+        self.documents.store(document)
 
-        # Carregar o plano completo
-        return await self.get_plan_by_id(study_plan.id)
+        return StudyPlanDocument.model_validate(document)
 
     async def update_plan(self, plan_id: str, plan_update: StudyPlanUpdate) -> StudyPlan:
         """
@@ -245,12 +247,14 @@ class StudyPlanService:
         for key, value in update_data.items():
             setattr(study_plan, key, value)
 
+        # Remontar o documento do plano na mesma transação
+        document = self.documents.build(study_plan)
+
         # Salvar alterações
         self.db.commit()
-        self.db.refresh(study_plan)
+        self.documents.store(document)
 
-        # Carregar o plano completo
-        return await self.get_plan_by_id(study_plan.id)
+        return StudyPlanDocument.model_validate(document)
 
     async def delete_plan(self, plan_id: str) -> None:
         """
@@ -275,6 +279,7 @@ class StudyPlanService:
         # Excluir o plano (as seções e conteúdos serão excluídos automaticamente pelo CASCADE)
         self.db.delete(study_plan)
         self.db.commit()
+        self.documents.invalidate(plan_id)
 
     async def get_recommendations(self, user_id: str, limit: int = 5) -> List[StudyPlanSimple]:
         """
@@ -297,32 +302,9 @@ class StudyPlanService:
         # Por enquanto, retorna planos públicos populares que o usuário ainda não iniciou
         # Popularidade aqui é simulada pela ordem de criação (mais recentes primeiro)
 
-        query = self.db.query(StudyPlan).filter(
+        query = self.db.query(StudyPlan, self._sections_count()).filter(
             StudyPlan.is_public == True,
             StudyPlan.user_id != user_id  # Não recomendar planos criados pelo próprio usuário
         ).order_by(desc(StudyPlan.created_at)).limit(limit)
 
-        study_plans = query.all()
-
-        # Converter para objetos StudyPlanSimple e adicionar contagem de seções
-        result = []
-        for plan in study_plans:
-            sections_count = self.db.query(StudySection).filter(
-                StudySection.study_plan_id == plan.id
-            ).count()
-
-            # Criar objeto StudyPlanSimple
-            plan_simple = StudyPlanSimple(
-                id=plan.id,
-                title=plan.title,
-                description=plan.description,
-                category=plan.category,
-                difficulty=plan.difficulty,
-                duration_days=plan.duration_days,
-                image_url=plan.image_url,
-                created_at=plan.created_at,
-                sections_count=sections_count
-            )
-            result.append(plan_simple)
-
-        return result
+        return [self._to_simple(plan, sections_count) for plan, sections_count in query.all()]
@@ -1,8 +1,8 @@
 import uuid
 import logging
-import httpx
 from typing import Optional, Dict, Any
 from app.core.config import settings
+from app.core.internal_client import internal_client
 
 logger = logging.getLogger(__name__)
 
@@ -28,26 +28,25 @@ class UserService:
         try:
             auth_service_url = f"{settings.AUTH_SERVICE_URL}/api/users/{user_id}"
 
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    auth_service_url,
-                    headers={"Service-Auth-Key": settings.SERVICE_AUTH_KEY},
-                    timeout=10.0
-                )
+            response = await internal_client.get(
+                auth_service_url,
+                headers={"Service-Auth-Key": settings.SERVICE_AUTH_KEY},
+                timeout=10.0
+            )
 
-                if response.status_code == 200:
-                    user_data = response.json()
-                    logger.info(
-                        f"Dados do usuário {user_id} obtidos com sucesso do MS-Auth")
-                    return user_data
-                elif response.status_code == 404:
-                    logger.warning(
-                        f"Usuário {user_id} não encontrado no MS-Auth")
-                    return None
-                else:
-                    logger.error(
-                        f"Erro ao buscar usuário {user_id} no MS-Auth: {response.status_code} - {response.text}")
-                    return None
+            if response.status_code == 200:
+                user_data = response.json()
+                logger.info(
+                    f"Dados do usuário {user_id} obtidos com sucesso do MS-Auth")
+                return user_data
+            elif response.status_code == 404:
+                logger.warning(
+                    f"Usuário {user_id} não encontrado no MS-Auth")
+                return None
+            else:
+                logger.error(
+                    f"Erro ao buscar usuário {user_id} no MS-Auth: {response.status_code} - {response.text}")
+                return None
 
         except Exception as e:
             logger.exception(
@@ -9,6 +9,10 @@ from sqlalchemy.orm import Session
 # Alterar o import para a estrutura correta da API
 from app.api.api import api_router
 from app.core.config import settings
+from app.core.internal_client import (
+    internal_client, propagate_deadline, require_internal_caller
+)
+from app.services.certificate_renderer import init_certificate_renderer, shutdown_certificate_renderer
 from app.db.session import SessionLocal
 
 # Configurar logging
@@ -33,6 +37,23 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Propagar deadline recebido para as chamadas a outros microsserviços
+app.middleware("http")(propagate_deadline)
+
+
+@app.on_event("startup")
+async def startup_event():
+    # Processos de renderização dos certificados (carregam template e fontes)
+    init_certificate_renderer()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await internal_client.close()
+    logger.info("Pools do cliente HTTP interno fechados")
+    shutdown_certificate_renderer()
+    logger.info("Pool de renderização de certificados encerrado")
+
 # Função para obter a sessão do banco de dados
 
 
@@ -54,6 +75,13 @@ def health_check():
         "timestamp": datetime.datetime.now().isoformat()
     }
 
+# Métricas de latência das chamadas a outros microsserviços
+
+
+@app.get("/metrics/internal-http", dependencies=[Depends(require_internal_caller)])
+def internal_http_metrics():
+    return internal_client.get_metrics()
+
 # Rota raiz
 
 
@@ -0,0 +1,91 @@
+"""
+Configurações globais para testes do MS-Study.
+Este arquivo contém fixtures compartilhadas entre testes unitários e de integração.
+
+Os testes usam o fakeredis no lugar do Redis e um SQLite em memória no lugar
+do Postgres; nenhum serviço externo é necessário.
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import fakeredis
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Adicionar o diretório raiz ao PYTHONPATH
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+# Registra todos os modelos no metadata antes do create_all
+import app.models.reflection  # noqa: E402
+import app.models  # noqa: E402
+from app.database.base_class import Base  # noqa: E402
+from app.services.certificate_renderer import (  # noqa: E402
+    TEMPLATE_DIR, CertificateRenderer, _init_worker
+)
+
+
+@pytest.fixture
+def redis_client() -> fakeredis.FakeRedis:
+    """Cliente Redis em memória (equivalente a get_redis)."""
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def engine():
+    """Banco SQLite em memória com todas as tabelas do serviço."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """Sessão do SQLAlchemy ligada ao banco em memória."""
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def statements(engine):
+    """Lista dos comandos SQL executados no banco durante o teste."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+class ThreadRenderer(CertificateRenderer):
+    """Renderizador com o pool em threads do próprio processo."""
+
+    def _new_executor(self):
+        return ThreadPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(TEMPLATE_DIR, self.storage_path)
+        )
+
+
+@pytest.fixture
+def renderer(tmp_path, redis_client):
+    """Renderizador de certificados (um worker) com armazenamento temporário."""
+    renderer = ThreadRenderer(
+        workers=1,
+        storage_path=str(tmp_path / "certificates"),
+        redis_client=redis_client
+    )
+    yield renderer
+    renderer.shutdown()
@@ -0,0 +1,110 @@
+"""
+Testes de integração das rotas de PDF dos certificados.
+"""
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.routes import certificates
+from app.database.db import get_db
+from app.models.certificate import Certificate
+from app.models.study_plan import StudyPlan
+from app.repositories.certificate_repository import CertificateRepository
+from app.services import certificate_renderer
+from app.services.certificate_service import CertificateService
+from app.services.user_service import UserService
+
+USER = {"id": "user-1", "role": "user"}
+CERTIFICATE_ID = "cert-1"
+
+
+@pytest.fixture
+def seeded(db):
+    db.add(StudyPlan(id="plan-a", title="Evangelhos", duration_days=30))
+    db.add(Certificate(id=CERTIFICATE_ID, user_id=USER["id"], study_plan_id="plan-a",
+                       certificate_code="FCJ-TESTE",
+                       completion_date=datetime(2024, 5, 1)))
+    db.commit()
+    return db
+
+
+@pytest.fixture
+def client(seeded, renderer, monkeypatch):
+    async def get_user_name(self, user_id):
+        return "Maria da Silva"
+
+    monkeypatch.setattr(certificate_renderer, "_renderer", renderer)
+    monkeypatch.setattr(UserService, "get_user_name", get_user_name)
+
+    app = FastAPI()
+    app.include_router(certificates.router, prefix="/certificates")
+    app.dependency_overrides[get_db] = lambda: seeded
+    app.dependency_overrides[deps.get_current_active_user] = lambda: USER
+    return TestClient(app)
+
+
+def drain(renderer):
+    renderer.executor.submit(lambda: None).result(timeout=10)
+
+
+@pytest.mark.unit
+class TestCertificateServiceFactory:
+    """Testes da criação do serviço a partir da sessão."""
+
+    def test_from_db(self, db, renderer, monkeypatch):
+        """Testa se as rotas conseguem criar o serviço só com a sessão."""
+        monkeypatch.setattr(certificate_renderer, "_renderer", renderer)
+
+        service = CertificateService.from_db(db)
+
+        assert service.db is db
+        assert isinstance(service.certificate_repository, CertificateRepository)
+        assert service.certificate_repository.db is db
+        assert service.renderer is renderer
+
+
+@pytest.mark.integration
+class TestCertificatePdfRoutes:
+    """Testes do download e da situação do PDF."""
+
+    def test_pdf_is_enqueued_then_served(self, client, seeded, renderer):
+        """Testa o 202 enquanto renderiza e o arquivo depois de pronto."""
+        response = client.get(f"/certificates/{CERTIFICATE_ID}/pdf")
+        assert response.status_code == 202
+        assert response.json()["status"] == "queued"
+
+        drain(renderer)
+
+        response = client.get(f"/certificates/{CERTIFICATE_ID}/pdf")
+        assert response.status_code == 200
+        assert "Maria da Silva" in response.text
+        assert "Evangelhos" in response.text
+        seeded.expire_all()
+        assert seeded.get(Certificate, CERTIFICATE_ID).download_count == 1
+
+    def test_pdf_status(self, client, renderer):
+        """Testa a situação antes e depois da solicitação do PDF."""
+        url = f"/certificates/{CERTIFICATE_ID}/pdf/status"
+        assert client.get(url).status_code == 404
+
+        client.get(f"/certificates/{CERTIFICATE_ID}/pdf")
+        drain(renderer)
+
+        assert client.get(url).json() == {"status": "done", "error": ""}
+
+    def test_pdf_of_other_user(self, client, seeded):
+        """Testa o acesso ao certificado de outro usuário."""
+        seeded.add(Certificate(id="cert-2", user_id="user-2", study_plan_id="plan-a",
+                               certificate_code="FCJ-OUTRO",
+                               completion_date=datetime(2024, 5, 1)))
+        seeded.commit()
+
+        assert client.get("/certificates/cert-2/pdf").status_code == 403
+        assert client.get("/certificates/cert-2/pdf/status").status_code == 403
+
+    def test_pdf_not_found(self, client):
+        """Testa o certificado inexistente."""
+        assert client.get("/certificates/nope/pdf").status_code == 404
@@ -0,0 +1,272 @@
+"""
+Testes unitários do CertificateRenderer.
+
+Cobre a renderização fora do event loop, a trava do job no Redis entre
+processos do serviço (renovada enquanto o job está pendente), o tempo
+máximo de renderização, a situação "queued" interrompida e a recriação do
+pool quebrado.
+"""
+import os
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import certificate_renderer
+from app.services.certificate_renderer import (
+    STATUS_DONE, STATUS_FAILED, STATUS_QUEUED, CertificateRenderer, RenderJob, _time_limit
+)
+
+JOB = RenderJob(
+    certificate_id="cert-1",
+    user_name="Maria da Silva",
+    plan_title="Evangelhos",
+    completion_date="01/05/2024",
+    certificate_code="FCJ-TESTE"
+)
+
+
+def drain(renderer):
+    """Espera os jobs já enviados (pool de um worker, em ordem) terminarem."""
+    renderer.executor.submit(lambda: None).result(timeout=10)
+
+
+@pytest.fixture
+def blocked(monkeypatch):
+    """Renderização que só termina quando o evento é liberado."""
+    release = threading.Event()
+    render = certificate_renderer._render
+
+    def slow_render(job):
+        release.wait(10)
+        return render(job)
+
+    monkeypatch.setattr(certificate_renderer, "_render", slow_render)
+    yield release
+    release.set()
+
+
+class BrokenExecutor:
+    """Pool em que um processo morreu."""
+
+    def submit(self, fn, *args):
+        raise BrokenProcessPool("processo encerrado")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+@pytest.mark.unit
+class TestEnqueue:
+    """Testes do enfileiramento e da situação dos jobs."""
+
+    def test_render_writes_file(self, renderer):
+        """Testa a renderização e a situação final."""
+        assert renderer.status(JOB.certificate_id) is None
+        assert renderer.enqueue(JOB)["status"] == STATUS_QUEUED
+        drain(renderer)
+
+        path = renderer.path(JOB.certificate_id)
+        assert path is not None
+        with open(path, encoding="utf-8") as f:
+            assert "Maria da Silva" in f.read()
+        assert renderer.status(JOB.certificate_id)["status"] == STATUS_DONE
+        assert renderer.redis.hget(renderer.key(JOB.certificate_id), "status") == STATUS_DONE
+
+    def test_done_is_not_rendered_again(self, renderer, blocked):
+        """Testa se um certificado pronto só é renderizado de novo com force."""
+        blocked.set()
+        renderer.enqueue(JOB)
+        drain(renderer)
+
+        assert renderer.enqueue(JOB)["status"] == STATUS_DONE
+        assert renderer.enqueue(JOB, force=True)["status"] == STATUS_QUEUED
+        drain(renderer)
+
+    def test_pending_job_is_not_duplicated(self, renderer, blocked):
+        """Testa se o mesmo job não é enviado duas vezes pelo processo."""
+        renderer.enqueue(JOB)
+        future = renderer._pending[JOB.certificate_id]
+
+        assert renderer.enqueue(JOB)["status"] == STATUS_QUEUED
+        assert renderer._pending[JOB.certificate_id] is future
+        assert renderer.status(JOB.certificate_id)["status"] == STATUS_QUEUED
+
+    def test_lock_released_after_render(self, renderer):
+        """Testa se a trava do job é liberada ao terminar."""
+        renderer.enqueue(JOB)
+        drain(renderer)
+
+        assert not renderer.redis.exists(renderer.lock_key(JOB.certificate_id))
+
+    def test_failed_render(self, renderer, monkeypatch):
+        """Testa a situação de uma renderização com erro."""
+        def failing_render(job):
+            raise RuntimeError("fonte ausente")
+
+        monkeypatch.setattr(certificate_renderer, "_render", failing_render)
+        renderer.enqueue(JOB)
+        drain(renderer)
+
+        assert renderer.status(JOB.certificate_id) == {
+            "status": STATUS_FAILED, "error": "fonte ausente"}
+        assert not renderer.redis.exists(renderer.lock_key(JOB.certificate_id))
+
+
+@pytest.mark.unit
+class TestJobLock:
+    """Testes da trava do job entre processos do serviço."""
+
+    def test_other_process_does_not_render_again(self, renderer, blocked):
+        """Testa se outro processo com o job travado não o renderiza de novo."""
+        other = type(renderer)(
+            workers=1, storage_path=renderer.storage_path, redis_client=renderer.redis)
+        try:
+            renderer.enqueue(JOB)
+
+            assert other.enqueue(JOB)["status"] == STATUS_QUEUED
+            assert JOB.certificate_id not in other._pending
+            assert other.status(JOB.certificate_id)["status"] == STATUS_QUEUED
+
+            blocked.set()
+            drain(renderer)
+            assert other.status(JOB.certificate_id)["status"] == STATUS_DONE
+        finally:
+            other.shutdown()
+
+    def test_lock_has_timeout(self, renderer, blocked):
+        """Testa se a trava expira caso o processo que a gravou morra."""
+        renderer.enqueue(JOB)
+
+        assert 0 < renderer.redis.ttl(renderer.lock_key(JOB.certificate_id)) <= renderer.lock_ttl
+
+    def test_lock_is_renewed_while_pending(self, renderer, blocked):
+        """Testa se a trava de um job pendente é renovada pelo processo."""
+        renderer.enqueue(JOB)
+        lock_key = renderer.lock_key(JOB.certificate_id)
+        renderer.redis.expire(lock_key, 1)
+
+        renderer.renew_locks()
+
+        assert renderer.redis.ttl(lock_key) > 1
+        assert renderer.status(JOB.certificate_id)["status"] == STATUS_QUEUED
+
+    def test_renewal_keeps_lock_of_other_process(self, renderer, blocked):
+        """Testa se a renovação não estende a trava de outro processo."""
+        renderer.enqueue(JOB)
+        lock_key = renderer.lock_key(JOB.certificate_id)
+        renderer.redis.set(lock_key, "outro-processo", ex=1)
+
+        renderer.renew_locks()
+
+        assert renderer.redis.ttl(lock_key) == 1
+
+    def test_lock_of_other_process_is_kept(self, renderer):
+        """Testa se um processo só libera a própria trava."""
+        lock_key = renderer.lock_key(JOB.certificate_id)
+        renderer.redis.set(lock_key, "outro-processo")
+
+        renderer._release_lock(JOB.certificate_id)
+
+        assert renderer.redis.get(lock_key) == "outro-processo"
+
+    def test_interrupted_job(self, renderer):
+        """
+        Testa o job "queued" cujo processo morreu: a trava expirou, a
+        situação é informada como interrompida e o job pode ser reenviado.
+        """
+        renderer.redis.hset(renderer.key(JOB.certificate_id),
+                            mapping={"status": STATUS_QUEUED, "error": ""})
+
+        status = renderer.status(JOB.certificate_id)
+        assert status["status"] == STATUS_FAILED
+        assert "interrompida" in status["error"]
+
+        assert renderer.enqueue(JOB)["status"] == STATUS_QUEUED
+        drain(renderer)
+        assert renderer.status(JOB.certificate_id)["status"] == STATUS_DONE
+
+
+@pytest.mark.unit
+class TestRenderTimeout:
+    """Testes do tempo máximo de renderização."""
+
+    def test_time_limit_interrupts_render(self):
+        """Testa a interrupção por SIGALRM na thread principal do processo."""
+        with pytest.raises(TimeoutError):
+            with _time_limit(0.05):
+                time.sleep(5)
+
+    def test_time_limit_restores_alarm(self):
+        """Testa se um bloco que termina a tempo não deixa o alarme armado."""
+        with _time_limit(0.05):
+            pass
+        time.sleep(0.1)
+
+    def test_queue_wait_does_not_count(self, renderer, blocked):
+        """
+        Testa se o tempo conta do início da renderização: o job que excedeu
+        o limite é abandonado, e o que espera no pool continua travado.
+        """
+        waiting = RenderJob(**{**JOB.__dict__, "certificate_id": "cert-2"})
+        renderer.enqueue(JOB)
+        renderer.enqueue(waiting)
+        deadline = time.monotonic() + 10
+        while not renderer._pending[JOB.certificate_id].running():
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        renderer.timeout = 0
+
+        renderer.renew_locks()  # observa o início da renderização
+        time.sleep(0.01)
+        renderer.renew_locks()
+
+        assert renderer.status(JOB.certificate_id) == {
+            "status": STATUS_FAILED, "error": "Tempo de renderização esgotado"}
+        assert not renderer.redis.exists(renderer.lock_key(JOB.certificate_id))
+        assert renderer.status("cert-2")["status"] == STATUS_QUEUED
+        assert renderer.redis.exists(renderer.lock_key("cert-2"))
+
+
+@pytest.mark.unit
+class TestBrokenPool:
+    """Testes da recriação do pool quebrado."""
+
+    def test_broken_pool_is_recreated(self, renderer):
+        """Testa se o pool quebrado é recriado no envio seguinte."""
+        renderer.executor = BrokenExecutor()
+
+        assert renderer.enqueue(JOB)["status"] == STATUS_QUEUED
+        assert not isinstance(renderer.executor, BrokenExecutor)
+        drain(renderer)
+        assert renderer.path(JOB.certificate_id) is not None
+
+    def test_submit_error_releases_lock(self, renderer, monkeypatch):
+        """Testa se um envio que falha não deixa o job travado."""
+        renderer.executor = BrokenExecutor()
+        monkeypatch.setattr(renderer, "_new_executor", BrokenExecutor)
+
+        with pytest.raises(BrokenProcessPool):
+            renderer.enqueue(JOB)
+
+        assert renderer.status(JOB.certificate_id)["status"] == STATUS_FAILED
+        assert not renderer.redis.exists(renderer.lock_key(JOB.certificate_id))
+
+    def test_process_pool_recovers_from_dead_worker(self, tmp_path, redis_client):
+        """Testa, com processos reais, o pool após a morte de um processo."""
+        renderer = CertificateRenderer(
+            workers=1, storage_path=str(tmp_path), redis_client=redis_client)
+        try:
+            with pytest.raises(BrokenProcessPool):
+                renderer.executor.submit(os._exit, 1).result(timeout=60)
+
+            renderer.enqueue(JOB)
+            deadline = time.monotonic() + 60
+            while renderer.status(JOB.certificate_id)["status"] == STATUS_QUEUED:
+                assert time.monotonic() < deadline
+                time.sleep(0.05)
+
+            assert renderer.status(JOB.certificate_id)["status"] == STATUS_DONE
+        finally:
+            renderer.shutdown()
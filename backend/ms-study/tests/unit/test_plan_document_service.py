@@ -0,0 +1,248 @@
+"""
+Testes unitários do PlanDocumentService.
+
+Cobre a montagem do documento do plano, a leitura (Redis, coluna, tabelas),
+o preenchimento do Redis com SET NX, que nunca sobrescreve um documento
+mais novo gravado por uma alteração, e o descarte do documento nas escritas
+de seções e conteúdos pelos repositórios.
+"""
+import json
+
+import pytest
+import pytest_asyncio
+import redis
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.base_class import Base
+from app.models.study_content import StudyContent
+from app.models.study_plan import StudyPlan
+from app.models.study_section import StudySection
+from app.repositories.study_content_repository import StudyContentRepository
+from app.repositories.study_section_repository import StudySectionRepository
+from app.schemas.study_content import StudyContentUpdate
+from app.schemas.study_section import StudySectionUpdate
+from app.services import plan_document_service
+from app.services.plan_document_service import PLAN_DOCUMENT_SCHEMA, PlanDocumentService
+
+PLAN_ID = "plan-a"
+
+
+class BrokenRedis:
+    """Cliente Redis indisponível."""
+
+    def get(self, *args, **kwargs):
+        raise redis.ConnectionError("indisponível")
+
+    set = delete = get
+
+
+@pytest.fixture
+def plan(db):
+    """Plano com duas seções (fora de ordem) e conteúdos."""
+    study_plan = StudyPlan(id=PLAN_ID, title="Evangelhos", duration_days=30)
+    db.add(study_plan)
+    db.add_all([
+        StudySection(id="s2", study_plan_id=PLAN_ID, title="Segunda", position=2),
+        StudySection(id="s1", study_plan_id=PLAN_ID, title="Primeira", position=1),
+        StudyContent(id="c2", section_id="s1", content_type="text",
+                     content="Leitura", position=2),
+        StudyContent(id="c1", section_id="s1", content_type="text",
+                     content="Oração", position=1),
+    ])
+    db.commit()
+    return study_plan
+
+
+@pytest.fixture
+def service(db, redis_client):
+    return PlanDocumentService(db, redis_client)
+
+
+def cached(redis_client, plan_id=PLAN_ID):
+    raw = redis_client.get(PlanDocumentService.key(plan_id))
+    return json.loads(raw) if raw else None
+
+
+@pytest.mark.unit
+class TestBuild:
+    """Testes da montagem do documento."""
+
+    def test_build_orders_sections_and_contents(self, db, service, plan):
+        """Testa seções e conteúdos em ordem de posição."""
+        document = service.build(plan)
+        db.commit()
+
+        assert document["schema"] == PLAN_DOCUMENT_SCHEMA
+        assert document["sections_count"] == 2
+        assert [s["id"] for s in document["sections"]] == ["s1", "s2"]
+        assert [c["id"] for c in document["sections"][0]["contents"]] == ["c1", "c2"]
+        assert document["sections"][1]["contents"] == []
+
+    def test_build_increments_version(self, db, service, plan):
+        """Testa se cada remontagem aumenta a versão e grava na coluna."""
+        first = service.build(plan)
+        db.commit()
+        second = service.build(plan)
+        db.commit()
+
+        assert (first["version"], second["version"]) == (1, 2)
+        assert plan.document_version == 2
+        assert plan.document["version"] == 2
+
+
+@pytest.mark.unit
+class TestGet:
+    """Testes da leitura do documento."""
+
+    def test_get_builds_missing_document(self, db, service, plan):
+        """Testa se um plano sem documento é montado na primeira leitura."""
+        document = service.get(PLAN_ID)
+
+        assert document["version"] == 1
+        assert cached(service.redis) == document
+        db.expire_all()
+        assert db.get(StudyPlan, PLAN_ID).document_version == 1
+
+    def test_get_prefers_redis(self, service, plan):
+        """Testa se o documento do Redis é servido sem consultar o banco."""
+        service.redis.set(service.key(PLAN_ID), json.dumps({"id": PLAN_ID, "version": 9}))
+
+        assert service.get(PLAN_ID) == {"id": PLAN_ID, "version": 9}
+
+    def test_get_rebuilds_old_schema(self, db, service, plan):
+        """Testa se um documento de outro formato é remontado."""
+        plan.document = {"schema": PLAN_DOCUMENT_SCHEMA - 1, "id": PLAN_ID}
+        plan.document_version = 4
+        db.commit()
+
+        document = service.get(PLAN_ID)
+
+        assert document["schema"] == PLAN_DOCUMENT_SCHEMA
+        assert document["version"] == 5
+        assert len(document["sections"]) == 2
+
+    def test_get_unknown_plan(self, service, plan):
+        """Testa o plano inexistente."""
+        assert service.get("nope") is None
+        assert cached(service.redis, "nope") is None
+
+    def test_get_without_redis(self, db, plan):
+        """Testa se, sem Redis, a leitura vai direto à coluna."""
+        document = PlanDocumentService(db, BrokenRedis()).get(PLAN_ID)
+
+        assert document["id"] == PLAN_ID
+        assert len(document["sections"]) == 2
+
+
+@pytest.mark.unit
+class TestStore:
+    """Testes da gravação no Redis."""
+
+    def test_fill_does_not_overwrite_newer_document(self, db, service, plan):
+        """
+        Testa a corrida entre uma leitura e uma alteração.
+
+        A leitura montou a versão 1; antes de gravá-la no Redis, uma alteração
+        gravou a versão 2. O preenchimento (SET NX) não pode sobrescrevê-la.
+        """
+        stale = service.build(plan)
+        db.commit()
+        newer = service.build(plan)
+        db.commit()
+        service.store(newer)
+
+        service.store(stale, only_missing=True)
+
+        assert cached(service.redis)["version"] == 2
+
+    def test_write_overwrites(self, db, service, plan):
+        """Testa se a gravação de uma alteração substitui o documento."""
+        service.store({"id": PLAN_ID, "version": 1})
+        service.store({"id": PLAN_ID, "version": 2})
+
+        assert cached(service.redis)["version"] == 2
+
+    def test_store_sets_ttl(self, service, plan):
+        """Testa o tempo de vida da cópia no Redis."""
+        service.store({"id": PLAN_ID, "version": 1}, only_missing=True)
+
+        assert service.redis.ttl(service.key(PLAN_ID)) > 0
+
+    def test_invalidate(self, service, plan):
+        """Testa a remoção do documento do Redis."""
+        service.store({"id": PLAN_ID, "version": 1})
+        service.invalidate(PLAN_ID)
+
+        assert cached(service.redis) is None
+
+    def test_page(self):
+        """Testa a página das seções de um plano longo."""
+        document = {"id": PLAN_ID, "sections": [{"id": f"s{i}"} for i in range(5)]}
+
+        page = PlanDocumentService.page(document, section_offset=1, section_limit=2)
+
+        assert [s["id"] for s in page["sections"]] == ["s1", "s2"]
+        assert page["section_offset"] == 1
+        assert PlanDocumentService.page(document) is document
+
+
+@pytest.mark.unit
+class TestRepositoryWrites:
+    """
+    Testes do descarte do documento nas escritas dos repositórios.
+
+    Os repositórios usam sessão assíncrona; o banco fica em um arquivo para
+    ser compartilhado com a sessão síncrona do PlanDocumentService.
+    """
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'study.db'}")
+        Base.metadata.create_all(engine)
+        yield engine
+        engine.dispose()
+
+    @pytest_asyncio.fixture
+    async def async_db(self, tmp_path, engine, redis_client, monkeypatch):
+        monkeypatch.setattr(plan_document_service, "get_redis", lambda: redis_client)
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'study.db'}")
+        async with async_sessionmaker(async_engine, expire_on_commit=False)() as session:
+            yield session
+        await async_engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_section_edit_is_read_back(self, db, service, plan, async_db):
+        """Testa se a leitura após editar uma seção traz o título novo."""
+        assert service.get(PLAN_ID)["sections"][0]["title"] == "Primeira"
+
+        await StudySectionRepository(async_db).update(
+            "s1", StudySectionUpdate(title="Introdução"))
+
+        assert cached(service.redis) is None
+        db.expire_all()
+        document = service.get(PLAN_ID)
+        assert document["sections"][0]["title"] == "Introdução"
+        assert document["version"] == 2
+
+    @pytest.mark.asyncio
+    async def test_section_delete_is_read_back(self, db, service, plan, async_db):
+        """Testa se a seção excluída some do documento."""
+        service.get(PLAN_ID)
+
+        assert await StudySectionRepository(async_db).delete("s2") is True
+
+        db.expire_all()
+        assert [s["id"] for s in service.get(PLAN_ID)["sections"]] == ["s1"]
+
+    @pytest.mark.asyncio
+    async def test_content_edit_is_read_back(self, db, service, plan, async_db):
+        """Testa se a leitura após editar um conteúdo traz o texto novo."""
+        service.get(PLAN_ID)
+
+        await StudyContentRepository(async_db).update(
+            "c1", StudyContentUpdate(content="Oração da manhã"))
+
+        db.expire_all()
+        contents = service.get(PLAN_ID)["sections"][0]["contents"]
+        assert contents[0]["content"] == "Oração da manhã"
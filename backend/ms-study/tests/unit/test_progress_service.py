@@ -0,0 +1,168 @@
+"""
+Testes unitários do ProgressService.
+
+Cobre a listagem e os detalhes do progresso montados em uma única consulta
+(plano, seção atual, total de seções e total da paginação).
+"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.study_plan import StudyPlan
+from app.models.study_section import StudySection
+from app.models.user_study_progress import UserStudyProgress
+from app.services.progress_service import ProgressService
+
+USER_ID = "user-1"
+NOW = datetime(2024, 5, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def seeded(db):
+    """Dois planos com seções e três progressos do mesmo usuário."""
+    db.add_all([
+        StudyPlan(id="plan-a", title="Evangelhos", description="Jesus",
+                  category="Novo Testamento", difficulty="iniciante", duration_days=30),
+        StudyPlan(id="plan-b", title="Salmos", duration_days=7),
+    ])
+    db.add_all([
+        StudySection(id=f"a{i}", study_plan_id="plan-a", title=f"Seção A{i}", position=i)
+        for i in range(1, 4)
+    ] + [
+        StudySection(id="b1", study_plan_id="plan-b", title="Seção B1", position=1)
+    ])
+    db.add_all([
+        UserStudyProgress(id="p1", user_id=USER_ID, study_plan_id="plan-a",
+                          current_section_id="a2", completion_percentage=33.3,
+                          last_activity_date=NOW - timedelta(days=2)),
+        UserStudyProgress(id="p2", user_id=USER_ID, study_plan_id="plan-b",
+                          completion_percentage=100.0, completed_at=NOW,
+                          last_activity_date=NOW),
+        # Plano removido: o progresso continua listado
+        UserStudyProgress(id="p3", user_id=USER_ID, study_plan_id="plan-x",
+                          completion_percentage=0.0,
+                          last_activity_date=NOW - timedelta(days=1)),
+        UserStudyProgress(id="p4", user_id="user-2", study_plan_id="plan-a",
+                          completion_percentage=0.0, last_activity_date=NOW),
+    ])
+    db.commit()
+    return db
+
+
+@pytest.mark.unit
+class TestProgressList:
+    """Testes da listagem paginada de progresso."""
+
+    @pytest.mark.asyncio
+    async def test_list_runs_a_single_query(self, seeded, statements):
+        """Testa se progresso, plano, seção e totais vêm de uma consulta."""
+        items, total = await ProgressService(seeded).get_user_progress_list(USER_ID)
+
+        assert len(statements) == 1
+        assert total == 3
+        assert [item.id for item in items] == ["p2", "p3", "p1"]
+
+    @pytest.mark.asyncio
+    async def test_list_details(self, seeded, statements):
+        """Testa os dados do plano, da seção atual e o total de seções."""
+        items, _ = await ProgressService(seeded).get_user_progress_list(USER_ID)
+        by_id = {item.id: item for item in items}
+
+        assert by_id["p1"].plan_title == "Evangelhos"
+        assert by_id["p1"].plan_category == "Novo Testamento"
+        assert by_id["p1"].plan_duration_days == 30
+        assert by_id["p1"].current_section_title == "Seção A2"
+        assert by_id["p1"].current_section_position == 2
+        assert by_id["p1"].total_sections == 3
+        assert by_id["p2"].total_sections == 1
+        assert by_id["p2"].current_section_title is None
+
+    @pytest.mark.asyncio
+    async def test_list_missing_plan(self, seeded):
+        """Testa o progresso de um plano removido."""
+        items, _ = await ProgressService(seeded).get_user_progress_list(USER_ID)
+        missing = next(item for item in items if item.id == "p3")
+
+        assert missing.plan_title == "Plano indisponível"
+        assert missing.plan_duration_days == 0
+        assert missing.total_sections == 0
+
+    @pytest.mark.asyncio
+    async def test_list_total_ignores_pagination(self, seeded, statements):
+        """Testa se o total conta todas as linhas, não só as da página."""
+        items, total = await ProgressService(seeded).get_user_progress_list(
+            USER_ID, skip=1, limit=1)
+
+        assert len(statements) == 1
+        assert [item.id for item in items] == ["p3"]
+        assert total == 3
+
+    @pytest.mark.asyncio
+    async def test_list_completed_filter_and_sort(self, seeded):
+        """Testa o filtro de conclusão e a ordenação crescente."""
+        service = ProgressService(seeded)
+
+        done, done_total = await service.get_user_progress_list(USER_ID, completed=True)
+        open_, open_total = await service.get_user_progress_list(
+            USER_ID, completed=False, sort_desc=False)
+
+        assert [item.id for item in done] == ["p2"]
+        assert done_total == 1
+        assert [item.id for item in open_] == ["p1", "p3"]
+        assert open_total == 2
+
+    @pytest.mark.asyncio
+    async def test_page_beyond_the_end(self, seeded, statements):
+        """Testa se a página além do fim ainda informa o total."""
+        items, total = await ProgressService(seeded).get_user_progress_list(
+            USER_ID, skip=10)
+
+        assert items == []
+        assert total == 3
+        assert len(statements) == 2
+
+    @pytest.mark.asyncio
+    async def test_empty_list(self, db, statements):
+        """Testa a listagem de um usuário sem progresso."""
+        items, total = await ProgressService(db).get_user_progress_list(USER_ID)
+
+        assert items == []
+        assert total == 0
+        assert len(statements) == 1
+
+
+@pytest.mark.unit
+class TestProgressDetail:
+    """Testes dos detalhes de um progresso."""
+
+    @pytest.mark.asyncio
+    async def test_detail_runs_a_single_query(self, seeded, statements):
+        """Testa os detalhes por id em uma consulta."""
+        detail = await ProgressService(seeded).get_progress_detail("p1")
+
+        assert len(statements) == 1
+        assert detail.plan_title == "Evangelhos"
+        assert detail.current_section_title == "Seção A2"
+        assert detail.total_sections == 3
+
+    @pytest.mark.asyncio
+    async def test_detail_not_found(self, seeded):
+        """Testa o progresso inexistente."""
+        assert await ProgressService(seeded).get_progress_detail("nope") is None
+
+    @pytest.mark.asyncio
+    async def test_progress_by_plan(self, seeded, statements):
+        """Testa o progresso do usuário em um plano."""
+        detail = await ProgressService(seeded).get_progress_by_plan(USER_ID, "plan-b")
+
+        assert len(statements) == 1
+        assert detail.id == "p2"
+        assert detail.plan_title == "Salmos"
+
+    @pytest.mark.asyncio
+    async def test_active_study(self, seeded, statements):
+        """Testa o estudo ativo: o não concluído mais recente."""
+        detail = await ProgressService(seeded).get_active_study(USER_ID)
+
+        assert len(statements) == 1
+        assert detail.id == "p3"